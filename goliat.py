@@ -50,6 +50,8 @@ savepath = filepath + "/"
 import fcfun   # import my functions for freecad. FreeCad Functions
 import kcomp   # import material constants and other constants
 import comps   # import my CAD components
+import dedup   # to share the shapes that are the same
+import manifest # to know what changes from one build to another
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, fillet_len
 from fcfun import addBolt, addBoltNut_hole, NutHole
@@ -68,8 +70,10 @@ logging.basicConfig(level=logging.DEBUG,
 
 doc = FreeCAD.newDocument()
 
-Gui.ActiveDocument = Gui.getDocument(doc.Label)
-guidoc = Gui.getDocument(doc.Label)
+# without the GUI (freecadcmd, buildsrv) there is no document to view
+if FreeCAD.GuiUp:
+    Gui.ActiveDocument = Gui.getDocument(doc.Label)
+    guidoc = Gui.getDocument(doc.Label)
 
 # real scale is 1. but you may want to have it to a different scale
 SCALE = 1 
@@ -156,7 +160,7 @@ h_framez_00 = comps.RectRndBar (Base = FRAM_RBAR_W, Height = FRAM_RBAR_W,
 framez_00 = h_framez_00.fco # the FreeCad Object
 frame_list.append (framez_00)
 frame_posx = FRAME_W/2 - FRAM_RBAR_W/2.
-print "frame_pos_x "  + str(frame_posx) +  ' has to be 770'
+print ("frame_pos_x "  + str(frame_posx) +  ' has to be 770')
 frame_posy = FRAME_L/2 - FRAM_RBAR_W/2.
 
 framez_00.Placement.Base = FreeCAD.Vector(-frame_posx, -frame_posy, 0)
@@ -185,7 +189,7 @@ frame_list.append (framez_11)
 # os: translate([-77, 75, 10]) rotate([90, 0, 0]) rounded_square(4, 4, 150, 1);
 # smaller length, take away the vertical bars thickness
 framey_l = FRAME_L - 2*FRAM_RBAR_W
-print "framey_l "  + str(framey_l) + ' has to be 1500'
+print ("framey_l "  + str(framey_l) + ' has to be 1500')
 h_framey_00 = comps.RectRndBar (Base = FRAM_RBAR_W, Height = FRAM_RBAR_W,
                                 Length = framey_l, Radius = RBAR_R, 
                                 Thick = RBAR_T, inrad_same = False,
@@ -208,7 +212,7 @@ frame_list.append (framey_10)
 # X lower Bar 
 # os: translate([-75, -77, 10]) rotate([0, 90, 0]) rounded_square(4, 4, 150, 1);
 framex_l = FRAME_W - 2*FRAM_RBAR_W
-print "framex_l "  + str(framex_l) + ' has to be 1500'
+print ("framex_l "  + str(framex_l) + ' has to be 1500')
 h_framex_00 = comps.RectRndBar (Base = FRAM_RBAR_W, Height = FRAM_RBAR_W,
                                 Length = framex_l, Radius = RBAR_R, 
                                 Thick = RBAR_T, inrad_same = False,
@@ -306,7 +310,7 @@ gantry_posx = FRAME_W/2 - SIDEGTRY_RBAR_W/2.
 # Gantry Vertical Bars
 # os: translate([-77, -8, 17]) rounded_square(4, 4, 71, 1);
 gantryz_l = T_RODY_H - B_RODY_H - RBAR_H
-print "gantryz_l: "  + str(gantryz_l) +  ' has to be 710'
+print ("gantryz_l: "  + str(gantryz_l) +  ' has to be 710')
 
 h_gantryz_00 = comps.RectRndBar (Base = SIDEGTRY_RBAR_W,
                                 Height = SIDEGTRY_RBAR_W,
@@ -318,9 +322,9 @@ h_gantryz_00 = comps.RectRndBar (Base = SIDEGTRY_RBAR_W,
 gantryz_00 = h_gantryz_00.fco
 
 gantry_posy = GANTRY_L/2. - SIDEGTRY_RBAR_W/2.
-print "gantry_posy: "  + str(gantry_posy) +  ' has to be 80'
+print ("gantry_posy: "  + str(gantry_posy) +  ' has to be 80')
 gantry_posz = B_RODY_H + RBAR_H/2.
-print "gantry_posz: "  + str(gantry_posz) +  ' has to be 170'
+print ("gantry_posz: "  + str(gantry_posz) +  ' has to be 170')
 gantryz_00.Placement.Base = FreeCAD.Vector(- gantry_posx,
                                            -gantry_posy,
                                             gantry_posz)
@@ -438,8 +442,25 @@ leadscrew.Placement.Base = FreeCAD.Vector( 0, 0, T_RODY_H)
 
 
 doc.recompute()
+# the objects with the same shape share it
+dedup.dedup_doc(doc)
 
 # to se the origin and the axis
-guidoc.ActiveView.setAxisCross(True)
+if FreeCAD.GuiUp:
+    guidoc.ActiveView.setAxisCross(True)
 
 doc.saveAs (savepath + filename + '.FCStd')
+
+# the manifest of the build: compare it with the one of the last build
+# (manifest.diff_manifest) to know the parts that have changed
+manifest.write_manifest (
+             manifest.build_manifest (doc,
+                                      handlers = {'framez_00' : h_framez_00,
+                                                  'framey_00' : h_framey_00,
+                                                  'framex_00' : h_framex_00,
+                                                  'gantryz_00': h_gantryz_00,
+                                                  'gantryy_00': h_gantryy_00,
+                                                  'gantryx_0' : h_gantryx_0,
+                                                  'lsplate_0' : h_lsplate_0},
+                                      consts = [kcomp, globals()]),
+             savepath + filename + '_manifest.json')
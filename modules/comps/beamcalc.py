@@ -0,0 +1,476 @@
+# ----------------------------------------------------------------------------
+# -- Beam calculations
+# -- comps library
+# -- Stiffness of the frame: a model of beams of the bars of the assembly
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The bars of the frame (comps.RectRndBar) are taken as 3D beams
+# (Euler-Bernoulli, 6 degrees of freedom on each node). The properties of
+# the section are calculated from the dimensions of the bar, and the beam
+# is the center line of the bar, taken from its bounding box.
+# The bars of the frame touch each other on their sides, their center lines
+# don't meet: the end of a bar is joined to the nearest point of the center
+# line of the bar it touches with a rigid link.
+# The stiffness matrices of all the elements are made at once with numpy,
+# and the global matrix is a sparse matrix (scipy, if it is not available
+# it is solved with a dense matrix).
+#
+#  frame = beamcalc.FrameModel ()
+#  frame.add_bar (framez_00, h_framez_00)
+#  frame.add_bar (framez_10, h_framez_00)  # a clone of framez_00
+#  ...
+#  res = frame.solve ([(tool_pos, (0, 0, -200))])
+#  logger.info ('%.3f mm' % res['max_disp'])
+
+import numpy
+import logging
+import math
+
+try:
+    import scipy.sparse
+    import scipy.sparse.linalg
+except ImportError:
+    scipy = None
+
+logger = logging.getLogger(__name__)
+
+
+# aluminium (N/mm2)
+E_ALU = 69000.
+G_ALU = 26000.
+# the rigid links are this times stiffer than the bars they join
+LINK_FACTOR = 100.
+# nodes closer than this are the same node (mm)
+NODE_TOL = 0.01
+
+AXIS_VEC = { 'x' : (1., 0., 0.),
+             'y' : (0., 1., 0.),
+             'z' : (0., 0., 1.) }
+
+
+# ---------- rndrect_area ---------------------------------------------
+# area of a rectangle with rounded corners
+# b, h: sides. r: radius of the corners
+
+def rndrect_area (b, h, r):
+    return b * h - (4 - math.pi) * r * r
+
+
+# ---------- rndrect_inertia ------------------------------------------
+# second moment of area of a rectangle with rounded corners, around the
+# axis through its center parallel to the side b
+# b, h: sides. r: radius of the corners
+# It is the rectangle minus the 4 corners that are out of the rounding:
+# each corner has area (1 - pi/4) r^2, its centroid at d from the sides,
+# and a second moment of (1 - 5pi/16) r^4 around the side
+
+def rndrect_inertia (b, h, r):
+
+    corner_a = (1 - math.pi / 4.) * r * r
+    corner_d = r * (10 - 3 * math.pi) / (12 - 3 * math.pi)
+    corner_i = (  (h / 2.) ** 2 * corner_a - h * corner_a * corner_d
+                + (1 - 5 * math.pi / 16.) * r ** 4)
+    return b * h ** 3 / 12. - 4 * corner_i
+
+
+# ---------- rndbar_section -------------------------------------------
+# properties of the section of a RectRndBar (see comps.RectRndBar), the
+# same arguments: if Thick is 0, it is not hollow
+# The local axes of the section: y on the Base, z on the Height
+# returns a dictionary:
+#   'A' : area
+#   'Iy': second moment around the y axis (bending on the Height)
+#   'Iz': second moment around the z axis (bending on the Base)
+#   'J' : torsion constant
+#   'w' : largest side
+
+def rndbar_section (Base, Height, Radius, Thick = 0, inRad = 0):
+
+    area = rndrect_area(Base, Height, Radius)
+    i_y = rndrect_inertia(Base, Height, Radius)
+    i_z = rndrect_inertia(Height, Base, Radius)
+    if Thick > 0 and Thick < min(Base, Height) / 2.:
+        in_b = Base - 2 * Thick
+        in_h = Height - 2 * Thick
+        area -= rndrect_area(in_b, in_h, inRad)
+        i_y -= rndrect_inertia(in_b, in_h, inRad)
+        i_z -= rndrect_inertia(in_h, in_b, inRad)
+        # thin walled closed section (Bredt): the line in the middle of
+        # the wall
+        mid_b = Base - Thick
+        mid_h = Height - Thick
+        mid_r = max(Radius - Thick / 2., 0)
+        mid_area = rndrect_area(mid_b, mid_h, mid_r)
+        mid_len = 2 * (mid_b + mid_h) - (8 - 2 * math.pi) * mid_r
+        tors = 4 * mid_area ** 2 * Thick / mid_len
+    else:
+        # solid rectangle
+        long_s = max(Base, Height)
+        short_s = min(Base, Height)
+        tors = long_s * short_s ** 3 * (
+                       1 / 3. - 0.21 * short_s / long_s
+                              * (1 - short_s ** 4 / (12. * long_s ** 4)))
+    return {'A'  : area,
+            'Iy' : i_y,
+            'Iz' : i_z,
+            'J'  : tors,
+            'w'  : max(Base, Height)}
+
+
+# section of a RectRndBar handler
+def bar_section (h_bar):
+    return rndbar_section(h_bar.Base, h_bar.Height, h_bar.Radius,
+                          h_bar.Thick, h_bar.inRad)
+
+
+# ---------- beam_stiffness -------------------------------------------
+# stiffness matrices of a list of beams, on the global axes, at once
+# p0, p1: numpy arrays (n, 3) with the ends of the beams
+# ydir:   numpy array (n, 3) with the y axis of the section of each beam
+# sect:   numpy array (n, 4) with A, Iy, Iz, J of each beam
+# e_mod, g_mod: elastic and shear modulus
+# returns a numpy array (n, 12, 12). The degrees of freedom of each node:
+# ux, uy, uz, rx, ry, rz
+
+def beam_stiffness (p0, p1, ydir, sect, e_mod = E_ALU, g_mod = G_ALU):
+
+    n_beams = len(p0)
+    vec = p1 - p0
+    length = numpy.sqrt(numpy.sum(vec * vec, axis = 1))
+    xloc = vec / length[:, numpy.newaxis]
+    # y perpendicular to x, and z
+    yloc = ydir - numpy.sum(ydir * xloc, axis = 1)[:, numpy.newaxis] * xloc
+    yloc = yloc / numpy.sqrt(numpy.sum(yloc * yloc, axis = 1))[:,
+                                                               numpy.newaxis]
+    zloc = numpy.cross(xloc, yloc)
+
+    area = sect[:, 0]
+    i_y = sect[:, 1]
+    i_z = sect[:, 2]
+    tors = sect[:, 3]
+    l1 = length
+    l2 = length ** 2
+    l3 = length ** 3
+
+    kloc = numpy.zeros((n_beams, 12, 12))
+    def put (row, col, val):
+        kloc[:, row, col] = val
+        kloc[:, col, row] = val
+    # axial
+    put(0, 0, e_mod * area / l1)
+    put(6, 6, e_mod * area / l1)
+    put(0, 6, - e_mod * area / l1)
+    # torsion
+    put(3, 3, g_mod * tors / l1)
+    put(9, 9, g_mod * tors / l1)
+    put(3, 9, - g_mod * tors / l1)
+    # bending on the xy plane: uy, rz
+    eiz = e_mod * i_z
+    put(1, 1, 12 * eiz / l3)
+    put(7, 7, 12 * eiz / l3)
+    put(1, 7, -12 * eiz / l3)
+    put(1, 5, 6 * eiz / l2)
+    put(1, 11, 6 * eiz / l2)
+    put(5, 7, -6 * eiz / l2)
+    put(7, 11, -6 * eiz / l2)
+    put(5, 5, 4 * eiz / l1)
+    put(11, 11, 4 * eiz / l1)
+    put(5, 11, 2 * eiz / l1)
+    # bending on the xz plane: uz, ry
+    eiy = e_mod * i_y
+    put(2, 2, 12 * eiy / l3)
+    put(8, 8, 12 * eiy / l3)
+    put(2, 8, -12 * eiy / l3)
+    put(2, 4, -6 * eiy / l2)
+    put(2, 10, -6 * eiy / l2)
+    put(4, 8, 6 * eiy / l2)
+    put(8, 10, 6 * eiy / l2)
+    put(4, 4, 4 * eiy / l1)
+    put(10, 10, 4 * eiy / l1)
+    put(4, 10, 2 * eiy / l1)
+
+    # rotation: the rows are the local axes
+    rot = numpy.stack((xloc, yloc, zloc), axis = 1)
+    trans = numpy.zeros((n_beams, 12, 12))
+    for blk in range(4):
+        trans[:, 3*blk:3*blk+3, 3*blk:3*blk+3] = rot
+    return numpy.einsum('nji,njk,nkl->nil', trans, kloc, trans)
+
+
+# ---------- class FrameModel ------------------------------------------
+# Model of beams of a frame
+# ----- Attributes:
+# members: list of the bars, dictionaries with the keys:
+#          'p0', 'p1': ends (numpy arrays), 'ydir': y axis of the section,
+#          'sect': section (see rndbar_section), 'name'
+# nodes:   numpy array (n, 3) of the nodes, once it is built
+# elems:   list of the elements, tuples (node0, node1, ydir, sect), once
+#          it is built. The rigid links are elements too
+# fixed:   list of the nodes that are fixed
+# load_nodes_pts: points of the center lines of the bars where the loads
+#          of the last build are
+
+class FrameModel (object):
+
+    def __init__ (self, e_mod = E_ALU, g_mod = G_ALU):
+        self.e_mod = e_mod
+        self.g_mod = g_mod
+        self.members = []
+        self.nodes = None
+        self.elems = None
+        self.fixed = None
+        self.joint_tol = 1.05
+        self.load_nodes_pts = []
+
+    # adds a beam from p0 to p1
+    # sect: see rndbar_section
+    # ydir: direction of the y axis of the section
+    def add_beam (self, p0, p1, sect, ydir = (0, 0, 1), name = ''):
+        self.members.append({'p0'   : numpy.array(tuple(p0), dtype = float),
+                             'p1'   : numpy.array(tuple(p1), dtype = float),
+                             'ydir' : numpy.array(tuple(ydir), dtype = float),
+                             'sect' : sect,
+                             'name' : name})
+        self.nodes = None
+
+    # adds the beam of a RectRndBar
+    # fco:   FreeCAD object of the bar, or a clone of it
+    # h_bar: the RectRndBar
+    def add_bar (self, fco, h_bar):
+        bbox = fco.Shape.BoundBox
+        cen = numpy.array([(bbox.XMin + bbox.XMax) / 2.,
+                           (bbox.YMin + bbox.YMax) / 2.,
+                           (bbox.ZMin + bbox.ZMax) / 2.])
+        axis = numpy.array(AXIS_VEC[h_bar.axis])
+        half_l = numpy.dot(numpy.array([bbox.XLength, bbox.YLength,
+                                        bbox.ZLength]), axis) / 2.
+        self.add_beam(cen - half_l * axis, cen + half_l * axis,
+                      bar_section(h_bar), AXIS_VEC[h_bar.baseaxis],
+                      name = fco.Label)
+
+    # ---------- build
+    # makes the nodes and the elements: the ends of the bars that are near
+    # the center line of another bar are joined to it with a rigid link
+    # joint_tol: maximum distance from the end of the bar to the center
+    #            line of the other bar, as a factor of the half of the sum
+    #            of the largest sides of both bars
+    # load_pts:  list of positions of the loads: each one is taken to the
+    #            nearest point of the center line of the nearest bar, and
+    #            the bar is split there (a node for the load)
+    # The fixed nodes of the previous build are kept
+
+    def build (self, joint_tol = 1.05, load_pts = None):
+
+        self.joint_tol = joint_tol
+        if self.fixed is not None and self.nodes is not None:
+            fixed_pts = self.nodes[self.fixed]
+        else:
+            fixed_pts = None
+        node_list = []
+        def get_node (pt):
+            for ind, node in enumerate(node_list):
+                if numpy.linalg.norm(node - pt) < NODE_TOL:
+                    return ind
+            node_list.append(pt)
+            return len(node_list) - 1
+
+        # points of each member (its ends, and where others join): t
+        member_t = [[0., 1.] for member in self.members]
+        links = []
+        for ind, member in enumerate(self.members):
+            for pt in (member['p0'], member['p1']):
+                best = None
+                for oth_ind, other in enumerate(self.members):
+                    if oth_ind == ind:
+                        continue
+                    seg = other['p1'] - other['p0']
+                    t = numpy.dot(pt - other['p0'], seg) / numpy.dot(seg, seg)
+                    t = min(max(t, 0.), 1.)
+                    dist = numpy.linalg.norm(other['p0'] + t * seg - pt)
+                    max_dist = joint_tol * (  member['sect']['w']
+                                            + other['sect']['w']) / 2.
+                    if dist <= max_dist and (best is None or dist < best[0]):
+                        best = (dist, oth_ind, t)
+                if best is not None:
+                    dist, oth_ind, t = best
+                    member_t[oth_ind].append(t)
+                    links.append((ind, pt, oth_ind, t))
+        self.load_nodes_pts = []
+        for pos in load_pts or []:
+            pos = numpy.array(tuple(pos), dtype = float)
+            best = None
+            for ind, member in enumerate(self.members):
+                seg = member['p1'] - member['p0']
+                t = numpy.dot(pos - member['p0'], seg) / numpy.dot(seg, seg)
+                t = min(max(t, 0.), 1.)
+                dist = numpy.linalg.norm(member['p0'] + t * seg - pos)
+                if best is None or dist < best[0]:
+                    best = (dist, ind, t)
+            dist, ind, t = best
+            member_t[ind].append(t)
+            member = self.members[ind]
+            self.load_nodes_pts.append(member['p0']
+                                       + t * (member['p1'] - member['p0']))
+
+        elems = []
+        for ind, member in enumerate(self.members):
+            seg = member['p1'] - member['p0']
+            t_list = sorted(set([round(t, 9) for t in member_t[ind]]))
+            node_ind = [get_node(member['p0'] + t * seg) for t in t_list]
+            for n0, n1 in zip(node_ind[:-1], node_ind[1:]):
+                if n0 != n1:
+                    elems.append((n0, n1, member['ydir'], member['sect']))
+        for ind, pt, oth_ind, t in links:
+            other = self.members[oth_ind]
+            n0 = get_node(pt)
+            n1 = get_node(other['p0'] + t * (other['p1'] - other['p0']))
+            if n0 == n1:
+                continue
+            sect = self.members[ind]['sect']
+            link_sect = dict([(key, LINK_FACTOR * max(sect[key],
+                                                      other['sect'][key]))
+                              for key in ('A', 'Iy', 'Iz', 'J', 'w')])
+            vec = node_list[n1] - node_list[n0]
+            # any y axis perpendicular to the link
+            ydir = numpy.cross(vec, (0, 0, 1))
+            if numpy.linalg.norm(ydir) < NODE_TOL:
+                ydir = numpy.cross(vec, (1, 0, 0))
+            elems.append((n0, n1, ydir, link_sect))
+
+        self.nodes = numpy.array(node_list)
+        self.elems = elems
+        if fixed_pts is None:
+            self.fix_bottom()
+        else:
+            self.fixed = [get_node(pt) for pt in fixed_pts]
+        logger.debug('frame: %d bars, %d nodes, %d elements, %d links'
+                     % (len(self.members), len(node_list), len(elems),
+                        len(links)))
+
+    # fixes the nodes on the lowest Z (the feet of the frame)
+    def fix_bottom (self, tol = 1.):
+        zmin = self.nodes[:, 2].min()
+        self.fixed = numpy.nonzero(self.nodes[:, 2] < zmin + tol)[0].tolist()
+
+    # ---------- stiffness
+    # returns the global stiffness matrix (sparse if scipy is available)
+
+    def stiffness (self):
+
+        if self.nodes is None:
+            self.build()
+        n_dof = 6 * len(self.nodes)
+        n0 = numpy.array([elem[0] for elem in self.elems])
+        n1 = numpy.array([elem[1] for elem in self.elems])
+        ydir = numpy.array([elem[2] for elem in self.elems], dtype = float)
+        sect = numpy.array([(elem[3]['A'], elem[3]['Iy'], elem[3]['Iz'],
+                             elem[3]['J']) for elem in self.elems])
+        kel = beam_stiffness(self.nodes[n0], self.nodes[n1], ydir, sect,
+                             self.e_mod, self.g_mod)
+        # degrees of freedom of each element
+        dofs = numpy.hstack((6 * n0[:, numpy.newaxis] + numpy.arange(6),
+                             6 * n1[:, numpy.newaxis] + numpy.arange(6)))
+        rows = numpy.repeat(dofs, 12, axis = 1).ravel()
+        cols = numpy.tile(dofs, (1, 12)).ravel()
+        if scipy is not None:
+            return scipy.sparse.coo_matrix((kel.ravel(), (rows, cols)),
+                                           shape = (n_dof, n_dof)).tocsr()
+        kglob = numpy.zeros((n_dof, n_dof))
+        numpy.add.at(kglob, (rows, cols), kel.ravel())
+        return kglob
+
+    # ---------- solve
+    # displacements of the frame under the loads
+    # load_list: list of tuples (position, force) or (position, force,
+    #            moment): the force (N) and the moment (N mm) are applied on
+    #            the nearest point of the center line of the nearest bar,
+    #            the bar is split there (see build)
+    # returns a dictionary:
+    #   'nodes'    : numpy array (n, 3) of the nodes
+    #   'disp'     : numpy array (n, 6) with the displacements (mm) and
+    #                rotations (rad) of the nodes
+    #   'max_disp' : largest displacement (mm)
+    #   'max_node' : node with the largest displacement
+    #   'load_disp': list of the displacements (numpy (3)) of the nodes of
+    #                the loads
+    #   'stiffness': list of the stiffness (N/mm) on each load: the force
+    #                over the displacement in its direction
+
+    def solve (self, load_list):
+
+        self.build(self.joint_tol, [load[0] for load in load_list])
+        kglob = self.stiffness()
+        n_nodes = len(self.nodes)
+        n_dof = 6 * n_nodes
+        force = numpy.zeros(n_dof)
+        load_nodes = []
+        for load, pos in zip(load_list, self.load_nodes_pts):
+            node = int(numpy.argmin(numpy.sum((self.nodes - pos) ** 2,
+                                              axis = 1)))
+            load_nodes.append(node)
+            force[6*node:6*node+3] += load[1]
+            if len(load) > 2:
+                force[6*node+3:6*node+6] += load[2]
+
+        # only the nodes connected to the fixed nodes: the bars that are
+        # not joined to the frame are not taken
+        active = self.connected_nodes()
+        free = numpy.ones(n_dof, dtype = bool)
+        free[numpy.repeat(6 * numpy.array(self.fixed, dtype = int), 6)
+             + numpy.tile(numpy.arange(6), len(self.fixed))] = False
+        free &= numpy.repeat(active, 6)
+        for node in load_nodes:
+            if not active[node]:
+                logger.warning('frame: load on a node not joined to the '
+                               'frame: %s' % str(self.nodes[node]))
+        free_ind = numpy.nonzero(free)[0]
+
+        disp = numpy.zeros(n_dof)
+        if scipy is not None:
+            kfree = kglob[free_ind][:, free_ind].tocsc()
+            disp[free_ind] = scipy.sparse.linalg.spsolve(kfree,
+                                                         force[free_ind])
+        else:
+            kfree = kglob[numpy.ix_(free_ind, free_ind)]
+            disp[free_ind] = numpy.linalg.solve(kfree, force[free_ind])
+
+        disp = disp.reshape(n_nodes, 6)
+        trans = numpy.sqrt(numpy.sum(disp[:, :3] ** 2, axis = 1))
+        max_node = int(numpy.argmax(trans))
+        load_disp = [disp[node, :3] for node in load_nodes]
+        stiff = []
+        for load, node_disp in zip(load_list, load_disp):
+            load_f = numpy.array(tuple(load[1]), dtype = float)
+            f_mod = numpy.linalg.norm(load_f)
+            d_dir = numpy.dot(node_disp, load_f) / f_mod if f_mod else 0
+            stiff.append(float(f_mod / d_dir) if d_dir > 0
+                         else float('inf'))
+        return {'nodes'     : self.nodes,
+                'disp'      : disp,
+                'max_disp'  : float(trans[max_node]),
+                'max_node'  : max_node,
+                'load_disp' : load_disp,
+                'stiffness' : stiff}
+
+    # numpy array of booleans: the nodes that are joined by elements to a
+    # fixed node
+    def connected_nodes (self):
+        n_nodes = len(self.nodes)
+        neighbors = [[] for ind in range(n_nodes)]
+        for elem in self.elems:
+            neighbors[elem[0]].append(elem[1])
+            neighbors[elem[1]].append(elem[0])
+        active = numpy.zeros(n_nodes, dtype = bool)
+        stack = list(self.fixed)
+        while stack:
+            node = stack.pop()
+            if active[node]:
+                continue
+            active[node] = True
+            stack.extend(neighbors[node])
+        return active
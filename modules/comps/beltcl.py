@@ -13,6 +13,7 @@
 import FreeCAD;
 import Part;
 import Draft;
+import numpy
 
 
 import os
@@ -28,11 +29,13 @@ sys.path.append(filepath)
 
 import kcomp  # import material constants and other constants
 import fcfun      # import my functions for freecad
+import partdims   # dimensions of the parts, without geometry
+import prof2d     # 2D profiles and their offsets
 
 
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, fillet_len
-from fcfun import addBolt, addBoltNut_hole, NutHole
+from fcfun import addBolt, addBoltNut_hole, NutHole, lazyprop
 from kcomp import TOL
 
 
@@ -62,102 +65,98 @@ from kcomp import TOL
 #  midblock: 0 or 1. It will add a none/single width middle block
 #                   In the future I may consider a double middle block (2)
 #  base_h:  height of the base
+#  tol:     tolerance of the printer, see partdims.Gt2BeltClampDims
 
 
 # Attributes:
 # fco : the FreeCAD Object of the belt clamp
 # fco_cont : the FreeCAD object of the belt clamp offset. To make a cut
 #              on the FreeCAD object where the belt tensioner will be.
+#
+# fco and fco_cont are built the first time they are used (fcfun.lazyprop)
+# so, if only one of them is needed, the other one is not in the document.
+# Only the first clamp of each (base_h, midblock) on a document builds the
+# geometry (the prototype, see proto_dict). The next clamps are clones of
+# it, and their fco_cont is an extrusion of the same base of the prototype,
+# so its Dir can be changed
+
+
+class Gt2BeltClamp (partdims.Gt2BeltClampDims):
 
+    # the class constants and the dimensions are in
+    # partdims.Gt2BeltClampDims
 
-class Gt2BeltClamp (object):
-
-    # space for the 2 belts to clamp them
-    # the GT2 belt is 1.38mm width. 2 together facing teeth will be about 2mm
-    # I make it 2.8mm
-    # Internal Width of the Clamp Block
-    CB_IW = 2.8
-    # Width of the exterior clamp blocks (Y axis)
-    CB_W = 4.0
-    # Length of the clamp blocks (X axis)
-    CB_L = 12.0
-    # GT2 height is 6 mm, making the heigth 8mm
-    C_H = 8.0
-    # GT2 Clamp Cylinder radius
-    CCYL_R = 4.0
-    # separation between the clamp blocks and the clamp cylinder
-    CS = 3.0
-
-    # separation of the nut hole from the edge
-    NUT_HOLE_EDGSEP = 3 
-
-
-    """
-    how much the rail is inside
-
-     ________________________________________________    
-    |        
-    |   __________________________
-     \                        ____ CBASERAILIND 
-      |       
-     /  _____ CBASE_RAIL ___
-    |
-    |_________________________ CBASE_WALL _________ CBASE_H
-
-    |-|
-      CBASERAILIND_SIG (it is 45 degrees). SIG: can be + or -
-
-    if midblock > 0 this will be the indentation, 
-    if midblock == 0 it will be outward, like this:
-        _________
-       |         |
-      /           \ 
-     |             |
-      \           /
-       |_________|
-      
-    """
-  
-    CBASE_L = CB_L + CS + 2*CCYL_R
-
-    def __init__(self, base_h, midblock, name):
+    # dictionary of the prototypes already built:
+    # key: (document name, base_h, midblock, tol)
+    # value: dictionary with the names of the FreeCAD objects, keys:
+    #        'fco': the clamp, 'baseof_plane': the base of the container.
+    #        Each one is there once it has been built
+    proto_dict = {}
+
+    def __init__(self, base_h, midblock, name, tol = TOL):
+        doc = FreeCAD.ActiveDocument
+        partdims.Gt2BeltClampDims.__init__ (self, base_h = base_h,
+                                            midblock = midblock,
+                                            tol = tol)
+        self.name = name
+        self.proto_key = (doc.Name, base_h, midblock, tol)
+
+    # name of the object of the prototype, None if it has not been built,
+    # or if it has been deleted
+    def get_proto_name (self, fco_key):
         doc = FreeCAD.ActiveDocument
-        self.base_place = (0,0,0)
-        # Clamp base
-        self.CBASE_H = base_h
-        # divides how much is rail and how much is wall
-        # It has to be greater than 1. If it is 1, there is no wall.
-        # if it is 2. Half is wall, half is indent
-        self.CBASE_RAIL_DIV = 1.6 #2.0
-        self.CBASE_RAIL = self.CBASE_H / self.CBASE_RAIL_DIV # rail for the base
-        # the part that is wall, divided by 2, because one goes at the bottom
-        # and the other on top
-        # rail for the base
-        self.CBASE_WALL = (self.CBASE_H - self.CBASE_RAIL)/2.0 
-        # Indentation, if midblock == 0, the Indentation is negative, which
-        # means it will be outward, otherwise, inward
-        self.CBASERAILIND = self.CBASE_RAIL/3.0
-
-        self.midblock = midblock
-        # Width of the interior/middle clamp blocks
-        self.CB_MW = midblock * self.CB_W
-        if midblock == 0:
-            self.CBASE_W =     self.CB_IW + 2 * self.CB_W 
-            self.CBASERAILIND_SIG = - self.CBASERAILIND 
-            # Since the indentation is outwards, we have to add it
-            self.TotW = self.CBASE_W + 2 *  self.CBASERAILIND
-            # external indent, so all the internal elements have to have this
-            # nternal offset. In Y axis
-            self.extind = self.CBASERAILIND 
+        fco_name = self.proto_dict.get(self.proto_key, {}).get(fco_key)
+        if fco_name is not None and doc.getObject(fco_name) is None:
+            fco_name = None
+        return fco_name
+
+    @lazyprop
+    def fco (self):
+        doc = FreeCAD.ActiveDocument
+        fco_name = self.get_proto_name('fco')
+        if fco_name is None:
+            fco_name = self.build (self.name)
+            self.proto_dict.setdefault(self.proto_key, {})['fco'] = fco_name
+            fco = doc.getObject(fco_name)
         else:
-            self.CBASE_W = 2 * self.CB_IW + 2 * self.CB_W + self.CB_MW
-            self.CBASERAILIND_SIG = self.CBASERAILIND 
-            # Since the indentation is inward, it is just the base
-            self.TotW = self.CBASE_W 
-            # no external indent, so the internal elements don't have to have 
-            # this internal offset
-            self.extind = 0
-  
+            fco = Draft.clone(doc.getObject(fco_name))
+            fco.Label = self.name
+        fco.Placement.Base = FreeCAD.Vector(self.base_place)
+        return fco
+
+    @lazyprop
+    def fco_cont (self):
+        doc = FreeCAD.ActiveDocument
+        plane_name = self.get_proto_name('baseof_plane')
+        if plane_name is None:
+            # creation of the same base, but with a little offset to be able
+            # to cut the piece where it will be inserted
+            #gt2_baseof_list = self.get_base_list_v(offs_y = TOL,
+            #                                       offs_z = TOL/2.0)
+            # CHANGE TO THE UPPER SENTENCE
+            gt2_baseof_list = self.get_base_list_v(offs_y = self.tol,
+                                                   offs_z = 0)
+            gt2_baseof_plane_yz = doc.addObject("Part::Polygon",
+                                               self.name + "_baseof_plane_yz")
+            gt2_baseof_plane_yz.Nodes = gt2_baseof_list
+            gt2_baseof_plane_yz.Close = True
+            plane_name = gt2_baseof_plane_yz.Name
+            self.proto_dict.setdefault(self.proto_key, {})['baseof_plane'] = (
+                                                                    plane_name)
+        gt2_baseof = doc.addObject("Part::Extrusion", self.name + "_baseof")
+        gt2_baseof.Base = doc.getObject(plane_name)
+        gt2_baseof.Dir = (self.CBASE_L,0,0)
+        gt2_baseof.Solid = True
+        gt2_baseof.Placement.Base = FreeCAD.Vector(self.base_place)
+        return gt2_baseof
+
+    # builds the geometry of the clamp of the prototype, returns the name
+    # of its FreeCAD object
+
+    def build (self, name):
+        doc = FreeCAD.ActiveDocument
+        midblock = self.midblock
+
         gt2_clamp_list = []
         # we make it using points-plane and extrusions
         #gt2_base =addBox (self.CBASE_L, self.CBASE_W, self.CBASE_H, "gt2_base")
@@ -191,7 +190,8 @@ class Gt2BeltClamp (object):
         #gt2_base_list = self.get_base_list_v()
         # doing this because the carriage is already printed, so I am going
         # to make the base smaller to fit. CHANGE to the upper sentence
-        gt2_base_list = self.get_base_list_v(offs_y = -TOL/2, offs_z = - TOL)
+        gt2_base_list = self.get_base_list_v(offs_y = -self.tol/2,
+                                             offs_z = - self.tol)
         """
         gt2_base_plane_yz = Part.makePolygon(gt2_base_list)
         gt2_base = gt2_base_plane_xy.extrude(FreeCAD.Vector(self.CBASE_L,0,0))
@@ -211,28 +211,11 @@ class Gt2BeltClamp (object):
         gt2_clamp_basic = doc.addObject("Part::MultiFuse", name + "clamp_base")
         gt2_clamp_basic.Shapes = gt2_clamp_list
 
-        # creation of the same base, but with a little offset to be able to 
-        # cut the piece where it will be inserted
-        #gt2_baseof_list = self.get_base_list_v(offs_y = TOL, offs_z = TOL/2.0)
-        # CHANGE TO THE UPPER SENTENCE
-        gt2_baseof_list = self.get_base_list_v(offs_y = TOL, offs_z = 0)
-        gt2_baseof_plane_yz = doc.addObject("Part::Polygon",
-                                           name + "_baseof_plane_yz")
-        gt2_baseof_plane_yz.Nodes = gt2_baseof_list
-        gt2_baseof_plane_yz.Close = True
-        gt2_baseof = doc.addObject("Part::Extrusion",
-                                   name + "_baseof")
-        gt2_baseof.Base = gt2_baseof_plane_yz
-        gt2_baseof.Dir = (self.CBASE_L,0,0)
-        gt2_baseof.Solid = True
-
-        self.fco_cont = gt2_baseof
-
         # hole for the leadscrew bolt
         # the head is longer because it can be inserted deeper into the piece
         # so a shorter bolt will be needed
-        gt2_base_lscrew = addBolt (kcomp.M3_SHANK_R_TOL, self.CBASE_L,
-                                   kcomp.M3_HEAD_R_TOL, 2.5*kcomp.M3_HEAD_L,
+        gt2_base_lscrew = addBolt (self.M3_SHANK_R_TOL, self.CBASE_L,
+                                   self.M3_HEAD_R_TOL, 2.5*self.M3_HEAD_L,
                                    extra = 1, support = 0,
                                    name= name + "_base_lscrew")
     
@@ -245,8 +228,8 @@ class Gt2BeltClamp (object):
         gt2_base_lscrew_nut = doc.addObject("Part::Prism", 
                                             name + "_base_lscrew_nut")
         gt2_base_lscrew_nut.Polygon = 6
-        gt2_base_lscrew_nut.Circumradius = kcomp.M3_NUT_R_TOL
-        gt2_base_lscrew_nut.Height = kcomp.M3NUT_HOLE_H 
+        gt2_base_lscrew_nut.Circumradius = self.M3_NUT_R_TOL
+        gt2_base_lscrew_nut.Height = self.M3NUT_HOLE_H 
         gt2_base_lscrew_nut.Placement.Rotation = \
                                       gt2_base_lscrew.Placement.Rotation 
                   # + TOL so it will be a little bit higher, so more room
@@ -254,19 +237,19 @@ class Gt2BeltClamp (object):
                   #(self.CBASE_L-kcomp.M3_HEAD_L)/2.0 - kcomp.M3NUT_HOLE_H/2.0,
                                self.NUT_HOLE_EDGSEP,
                                self.CBASE_W/2.0 + self.extind,
-                               self.CBASE_H/2.0 + TOL) 
+                               self.CBASE_H/2.0 + self.tol) 
         gt2_base_lscrew_nut.Placement.Rotation = FreeCAD.Rotation (VY, 90)
         # ------------ hole to reach out the nut hole
  
         # X is the length: M3NUT_HOLE_H. Y is the width. M3_2APOT_TOL
-        gt2_base_lscrew_nut2 = addBox (kcomp.M3NUT_HOLE_H,
-                                       kcomp.M3_2APOT_TOL,
-                                       self.CBASE_H/2.0 + TOL,
+        gt2_base_lscrew_nut2 = addBox (self.M3NUT_HOLE_H,
+                                       self.M3_2APOT_TOL,
+                                       self.CBASE_H/2.0 + self.tol,
                                        name + "_base_lscrew_nut2")
         gt2_base_lscrew_nut2.Placement.Base = (
                     #((self.CBASE_L-kcomp.M3_HEAD_L) - kcomp.M3NUT_HOLE_H)/2.0,
                        self.NUT_HOLE_EDGSEP,
-                       (self.CBASE_W - kcomp.M3_2APOT_TOL)/2.0 + self.extind,
+                       (self.CBASE_W - self.M3_2APOT_TOL)/2.0 + self.extind,
                        0)
 
         gt2_base_holes_l = [ gt2_base_lscrew,
@@ -281,12 +264,15 @@ class Gt2BeltClamp (object):
         gt2_clamp.Base = gt2_clamp_basic
         gt2_clamp.Tool = gt2_clamp_holes
 
-        self.fco = gt2_clamp   # the FreeCad Object
+        return gt2_clamp.Name
 
+    # moves the objects that have been built
     def BasePlace (self, position = (0,0,0)):
         self.base_place = position
-        self.fco.Placement.Base = FreeCAD.Vector(position)
-        self.fco_cont.Placement.Base = FreeCAD.Vector(position)
+        if lazyprop.is_built(self, 'fco'):
+            self.fco.Placement.Base = FreeCAD.Vector(position)
+        if lazyprop.is_built(self, 'fco_cont'):
+            self.fco_cont.Placement.Base = FreeCAD.Vector(position)
 
     # --------------------------------------------------------------------
     # obtains the list of vectors for the base of the clamp
@@ -305,75 +291,51 @@ class Gt2BeltClamp (object):
     #
     def get_base_list_v(self, offs_y = 0, offs_z = 0):
 
+        base_prof = self.get_base_prof2d().offset(offs_y, offs_z)
+        return base_prof.vectors(plane = 'yz')
+
+    # --------------------------------------------------------------------
+    # obtains the profile (prof2d.Profile2D) of the base of the clamp,
+    # on the YZ plane (u: Y, v: Z). See get_base_list_v. 
+    # The offset directions of the points:
+    #   Y: outwards: -1 on the left side, 1 on the right side
+    #   Z: the rail gets wider with offs_z when CBASERAILIND_SIG > 0 and 
+    #      narrower when CBASERAILIND_SIG < 0. No offset on lv0 and lv5
+
+    def get_base_prof2d (self):
+
         if self.CBASERAILIND_SIG < 0:
-            offs_zsig = - offs_z
+            zsig = -1
         else:
-            offs_zsig =  offs_z
-
-        # Points that make the shape of the base
-        # left side (offs is negative
-        gt2_base_lv00 = FreeCAD.Vector (0,
-                                        0 - offs_y,
-                                        0)
-        # offs_z higher when CBASERAILIND_SIG > 0
-        gt2_base_lv01 = FreeCAD.Vector (0,
-                                        0 - offs_y,
-                                        self.CBASE_WALL + offs_zsig)
-        gt2_base_lv02 = FreeCAD.Vector (
-                                0,
-                                self.CBASERAILIND_SIG - offs_y,
-                                self.CBASE_WALL + self.CBASERAILIND + offs_zsig)
-        # offs_z negative (lower)
-        gt2_base_lv03 = FreeCAD.Vector (0,
-                            self.CBASERAILIND_SIG - offs_y,
-                            self.CBASE_WALL + 2*self.CBASERAILIND - offs_zsig)
-        gt2_base_lv04 = FreeCAD.Vector (0,0 - offs_y,
-                                self.CBASE_WALL + self.CBASE_RAIL - offs_zsig)
-        gt2_base_lv05 = FreeCAD.Vector (0,0 - offs_y,
-                                        self.CBASE_H)
-        # right side (offs_y is positive
-        gt2_base_rv00 = FreeCAD.Vector (0,
-                                        self.CBASE_W + offs_y,
-                                        0)
-        gt2_base_rv01 = FreeCAD.Vector (0,
-                                        self.CBASE_W + offs_y,
-                                        self.CBASE_WALL + offs_zsig)
-        gt2_base_rv02 = FreeCAD.Vector (0,
-                               self.CBASE_W - self.CBASERAILIND_SIG + offs_y,
-                               self.CBASE_WALL + self.CBASERAILIND + offs_zsig)
-        gt2_base_rv03 = FreeCAD.Vector (0,
-                             self.CBASE_W - self.CBASERAILIND_SIG + offs_y,
-                             self.CBASE_WALL + 2*self.CBASERAILIND - offs_zsig)
-        gt2_base_rv04 = FreeCAD.Vector (0,
-                             self.CBASE_W + offs_y,
-                             self.CBASE_WALL + self.CBASE_RAIL - offs_zsig)
-        gt2_base_rv05 = FreeCAD.Vector (0,
-                                        self.CBASE_W + offs_y,
-                                        self.CBASE_H)
-    
-        gt2_base_list = [
-                         gt2_base_lv00,
-                         gt2_base_lv01,
-                         gt2_base_lv02,
-                         gt2_base_lv03,
-                         gt2_base_lv04,
-                         gt2_base_lv05,
-                         gt2_base_rv05,
-                         gt2_base_rv04,
-                         gt2_base_rv03,
-                         gt2_base_rv02,
-                         gt2_base_rv01,
-                         gt2_base_rv00
-                        ]
+            zsig = 1
+
+        # Points that make the shape of the base, left side
+        lv_list = [ (0, 0),                                        # lv0
+                    (0, self.CBASE_WALL),                          # lv1
+                    (self.CBASERAILIND_SIG,
+                     self.CBASE_WALL + self.CBASERAILIND),         # lv2
+                    (self.CBASERAILIND_SIG,
+                     self.CBASE_WALL + 2*self.CBASERAILIND),       # lv3
+                    (0, self.CBASE_WALL + self.CBASE_RAIL),        # lv4
+                    (0, self.CBASE_H) ]                            # lv5
+        lv_offs = [ (-1, 0), (-1, zsig), (-1, zsig),
+                    (-1, -zsig), (-1, -zsig), (-1, 0)]
+
+        # the right side is the left side mirrored, in reverse order
+        base_prof = prof2d.Profile2D (lv_list, lv_offs)
+        base_prof = prof2d.Profile2D (
+                 numpy.vstack((base_prof.pts,
+                               base_prof.mirror('u', self.CBASE_W/2.).pts)),
+                 numpy.vstack((base_prof.offs_dir,
+                               base_prof.mirror('u').offs_dir)))
 
         # if it is negative, the indentation will be outwards, so we will
         # make the Y=0 on the most outward point, except for the offs_y
         # that will be negative when Y=0
         if self.CBASERAILIND_SIG < 0:
-            addofs = FreeCAD.Vector (0, - self.CBASERAILIND_SIG,0)
-            gt2_base_list = [x + addofs for x in gt2_base_list]
+            base_prof = base_prof.translate(- self.CBASERAILIND_SIG, 0)
 
-        return gt2_base_list
+        return base_prof
     
 # end class Gt2BeltClamp:
 
@@ -381,6 +343,9 @@ class Gt2BeltClamp (object):
 # Creates a shape of a belt clamp. Just the rail and the cylinder
 # just one way: 2 clamp blocks
 # It is references at the end of the rail
+# The shape is the clamp made on the origin (topbeltclamp_shp_dict) placed
+# on its position: the booleans of the clamp are made only once, and all
+# the clamps share the same solid (see fcfun.shp_placed)
 
 #""                           
 #          TOPVIEW                    
@@ -394,7 +359,14 @@ class Gt2BeltClamp (object):
 #                    CB_L  CS
 #
 
-def shp_topbeltclamp (railaxis = 'x', bot_norm = '-z', pos = V0, extra=1):
+# dictionary of the clamps made on the origin: rail on X, bottom on -Z
+# key: extra
+topbeltclamp_shp_dict = {}
+
+def shp_topbeltclamp_orig (extra=1):
+
+    if extra in topbeltclamp_shp_dict:
+        return topbeltclamp_shp_dict[extra]
 
     cyl_posx = Gt2BeltClamp.CB_L + Gt2BeltClamp.CS + Gt2BeltClamp.CCYL_R
     height =  Gt2BeltClamp.C_H + extra
@@ -426,20 +398,84 @@ def shp_topbeltclamp (railaxis = 'x', bot_norm = '-z', pos = V0, extra=1):
     shpblb = shp_face_blb.extrude(FreeCAD.Vector(0,0,height))
 
     shp_clamp = shpcyl.multiFuse([shpblt, shpblb])
+    topbeltclamp_shp_dict[extra] = shp_clamp
+
+    return shp_clamp
+
+
+def shp_topbeltclamp (railaxis = 'x', bot_norm = '-z', pos = V0, extra=1):
 
     vec_railaxis = fcfun.getvecofname(railaxis)
     vec_botnorm = fcfun.getvecofname(bot_norm)
 
     vrot = fcfun.calc_rot(vec_railaxis, vec_botnorm)
 
-    shp_clamp.Placement.Rotation = vrot
-    shp_clamp.Placement.Base = pos
+    # the solid is not copied, just placed
+    shp_clamp = fcfun.shp_placed(shp_topbeltclamp_orig(extra),
+                                 FreeCAD.Placement(FreeCAD.Vector(pos), vrot))
 
     return shp_clamp
 
     #Part.show (shp_clamp)
 
 
+# ----------- shp_topbeltclamp_list
+# Creates the shapes of a list of belt clamps, with the bases where they
+# are going to be, and the containers to cut the space of the bases in
+# the other piece. It just calls shp_topbeltclamp for each clamp, and
+# makes a box for each base and container
+# Arguments:
+# clamp_list: list of tuples (railaxis, bot_norm, pos), one for each clamp,
+#             the same as the arguments of shp_topbeltclamp
+# extra:      the same as shp_topbeltclamp
+# base_list:  list of tuples (xmin, xmax, ymin, ymax), one for each clamp,
+#             with the limits of its base on the XY plane. If None,
+#             no bases and containers are made
+# base_z:     Z of the bottom of the bases and the containers
+# base_h:     height of the bases
+# cont_h:     height of the containers
+# cont_offs:  tuple with the offsets of the container over the base, on
+#             each side: (xmin, xmax, ymin, ymax). Positive is outwards
+# base_common: if not None, shape that the bases are intersected with,
+#             usually the piece where they are
+# Returns a tuple of 3 lists (shp_clamp_list, shp_base_list, shp_cont_list)
+#  the last 2 lists are empty if there is no base_list
+
+def shp_topbeltclamp_list (clamp_list, extra = 1,
+                           base_list = None, base_z = 0, base_h = 1,
+                           cont_h = None, cont_offs = (TOL, TOL, TOL, TOL),
+                           base_common = None):
+
+    shp_clamp_list = []
+    for railaxis, bot_norm, pos in clamp_list:
+        shp_clamp_list.append(shp_topbeltclamp(railaxis = railaxis,
+                                               bot_norm = bot_norm,
+                                               pos = pos, extra = extra))
+    shp_base_list = []
+    shp_cont_list = []
+    if base_list is None:
+        return shp_clamp_list, shp_base_list, shp_cont_list
+
+    if cont_h is None:
+        cont_h = base_h
+    offs_xmin, offs_xmax, offs_ymin, offs_ymax = cont_offs
+    for xmin, xmax, ymin, ymax in base_list:
+        shp_base = Part.makeBox(xmax - xmin, ymax - ymin, base_h,
+                                FreeCAD.Vector(xmin, ymin, base_z))
+        if base_common is not None:
+            shp_base = shp_base.common(base_common)
+        shp_base_list.append(shp_base)
+        shp_cont = Part.makeBox(xmax - xmin + offs_xmin + offs_xmax,
+                                ymax - ymin + offs_ymin + offs_ymax,
+                                cont_h,
+                                FreeCAD.Vector(xmin - offs_xmin,
+                                               ymin - offs_ymin,
+                                               base_z))
+        shp_cont_list.append(shp_cont)
+
+    return shp_clamp_list, shp_base_list, shp_cont_list
+
+
 def fco_topbeltclamp (railaxis = 'x', bot_norm = '-z', pos = V0, extra=1,
                       name = "bclamp"):
 
@@ -0,0 +1,217 @@
+# ----------------------------------------------------------------------------
+# -- Belt path
+# -- comps library
+# -- Length of the GT2 belts, from the positions of the pulleys
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The belt goes on a plane, from pulley to pulley, along the lines tangent
+# to them, and wraps an arc around each pulley. The radius of a pulley is
+# the radius of the pitch line of the belt on it. The belt can have the
+# pulley on its left (it turns counterclockwise around it) or on its right.
+# The ends of an open belt are the clamps: pulleys of radius 0.
+# Some pulleys move with the gantry (on the sliders): the lengths of the
+# belt for all the positions of the gantry are calculated at once with
+# numpy:
+#
+#  route = [beltpath.pulley ('clamp_0', (0, 50), 0, moves = (1, 1)),
+#           beltpath.pulley ('idlepull_0', (-400, 60), idler_r,
+#                            moves = (0, 1)),
+#           ...]
+#  rep = beltpath.route_length (route, gantry_pos)
+#  logger.info ('%.1f mm, %d teeth' % (rep['length'][0], rep['teeth'][0]))
+
+import numpy
+import logging
+import math
+
+import kcomp
+
+logger = logging.getLogger(__name__)
+
+
+# GT2 belt: pitch, thickness and height of the teeth
+GT2_PITCH = 2.0
+GT2_BELT_T = 1.38
+GT2_TOOTH_H = 0.75
+# distance from the tips of the teeth of the pulley to the pitch line
+GT2_PLD = 0.254
+# the belt that turns less than this (radians) backwards on a pulley goes
+# straight by it: the turn is rounding, it doesn't wrap the pulley
+WRAP_TOL = 1e-6
+
+
+# ---------- gt2_pulley_r ---------------------------------------------
+# radius of the pitch line of a GT2 toothed pulley
+
+def gt2_pulley_r (teeth = 20):
+    return teeth * GT2_PITCH / (2 * math.pi)
+
+
+# ---------- idler_r --------------------------------------------------
+# radius of the pitch line of the belt on a smooth idler pulley
+# r:    radius of the idler, if None: the bearing of the idler pulley made
+#       of washers and bearings (kcomp.idlepull_name_list)
+# face: 'teeth' if the belt touches the idler with its teeth, 'back' if it
+#       touches with its back
+
+def idler_r (r = None, face = 'teeth'):
+    if r is None:
+        r = kcomp.get_idlepull_maxbear_d(kcomp.idlepull_name_list) / 2.
+    if face == 'teeth':
+        return r + GT2_TOOTH_H + GT2_PLD
+    else:
+        return r + GT2_BELT_T - GT2_TOOTH_H - GT2_PLD
+
+
+# ---------- pulley ---------------------------------------------------
+# dictionary with the data of a pulley of the route of the belt
+# name:  name of the pulley
+# pos:   (x, y) position of its center, when the gantry is on (0, 0)
+# r:     radius of the pitch line, 0 for the clamps
+# side:  1: the pulley is on the left of the belt (the belt turns
+#        counterclockwise), -1: on its right
+# moves: (x, y) factors of the position of the gantry that are added to
+#        the position of the pulley: (0, 0) fixed (i.e. the motors),
+#        (0, 1) on the slider that moves on Y (EndShaftSlider),
+#        (1, 1) on the slider that moves on X and Y (CentralSlider)
+
+def pulley (name, pos, r, side = 1, moves = (0, 0)):
+    return {'name'  : name,
+            'pos'   : (float(pos[0]), float(pos[1])),
+            'r'     : float(r),
+            'side'  : side,
+            'moves' : (float(moves[0]), float(moves[1]))}
+
+
+# ---------- endslider_idlers -----------------------------------------
+# the 2 idler pulleys of an EndShaftSlider (see
+# partdims.EndShaftSliderDims), on the positions of its bolts, rotated by
+# its side
+# h_endsl: EndShaftSliderDims (or EndShaftSlider)
+# pos:     (x, y) position of the slider
+# side, face: of the belt on the pulleys, see pulley and idler_r
+# returns a list of 2 pulley dictionaries, that move on Y
+
+def endslider_idlers (h_endsl, pos = (0, 0), side = 1, face = 'teeth',
+                      name = 'idlepull'):
+
+    ang = math.radians(h_endsl.rotz)
+    cos_a = round(math.cos(ang), 12)
+    sin_a = round(math.sin(ang), 12)
+    pull_list = []
+    for ind, pos_y in enumerate((h_endsl.bolt_pulhigh_pos_y,
+                                 h_endsl.bolt_pullow_pos_y)):
+        pos_x = h_endsl.bolt_pull_pos_x
+        cen = (  cos_a * pos_x - sin_a * pos_y
+               + h_endsl.rotz_base[0] + pos[0],
+                 sin_a * pos_x + cos_a * pos_y
+               + h_endsl.rotz_base[1] + pos[1])
+        pull_list.append(pulley(name + '_' + str(ind), cen,
+                                idler_r(face = face), side = side,
+                                moves = (0, 1)))
+    return pull_list
+
+
+# left normal: the vectors (last dimension) turned 90 degrees
+def left_normal (vec):
+    return numpy.stack((- vec[..., 1], vec[..., 0]), axis = -1)
+
+
+# ---------- belt_length ----------------------------------------------
+# length of the belt through the pulleys, for many positions at once
+# centers: numpy array (n_pos, n_pulleys, 2) of the centers of the
+#          pulleys, in the order of the belt
+# radii:   (n_pulleys) radius of the pitch line of the pulleys
+# sides:   (n_pulleys) 1 or -1, see pulley
+# closed:  True if the belt is a loop, if False the first and the last
+#          pulleys are the ends of the belt (the arcs on them are not taken)
+# returns a dictionary:
+#   'length' : (n_pos) length of the belt
+#   'spans'  : (n_pos, n_spans) length of the straight segments
+#   'wrap'   : (n_pos, n_pulleys) angle (radians) that the belt wraps
+#              each pulley
+#   'p0', 'p1': (n_pos, n_spans, 2) points where each straight segment
+#              leaves a pulley and gets to the next one
+#   'teeth'  : (n_pos) length of the belt in teeth
+
+def belt_length (centers, radii, sides, closed = False):
+
+    centers = numpy.asarray(centers, dtype = float)
+    srad = numpy.asarray(radii, dtype = float) * numpy.asarray(sides)
+    if closed:
+        nxt = numpy.roll(numpy.arange(len(srad)), -1)
+    else:
+        nxt = numpy.arange(1, len(srad))
+    cur = nxt - 1
+
+    dvec = centers[:, nxt] - centers[:, cur]
+    dist2 = numpy.sum(dvec * dvec, axis = -1)
+    delta = srad[nxt] - srad[cur]
+    span2 = dist2 - delta ** 2
+    if (span2 < 0).any():
+        logger.error('belt_length: pulleys too close, the belt cannot go '
+                     'between them')
+    spans = numpy.sqrt(numpy.maximum(span2, 0))
+    # direction of the belt on each segment
+    tdir = (  spans[..., numpy.newaxis] * dvec
+            - delta[:, numpy.newaxis] * left_normal(dvec)) / dist2[
+                                                        ..., numpy.newaxis]
+    p0 = centers[:, cur] - srad[cur][:, numpy.newaxis] * left_normal(tdir)
+    p1 = centers[:, nxt] - srad[nxt][:, numpy.newaxis] * left_normal(tdir)
+
+    # the belt turns on each pulley from the segment that gets to it to the
+    # segment that leaves it
+    wrap = numpy.zeros(centers.shape[:2])
+    if closed:
+        t_in = numpy.roll(tdir, 1, axis = 1)
+        t_out = tdir
+        wrap_ind = numpy.arange(len(srad))
+    else:
+        t_in = tdir[:, :-1]
+        t_out = tdir[:, 1:]
+        wrap_ind = numpy.arange(1, len(srad) - 1)
+    cross = t_in[..., 0] * t_out[..., 1] - t_in[..., 1] * t_out[..., 0]
+    dot = numpy.sum(t_in * t_out, axis = -1)
+    turn = numpy.arctan2(cross, dot) * numpy.asarray(sides)[wrap_ind]
+    turn[(turn < 0) & (turn > - WRAP_TOL)] = 0
+    wrap[:, wrap_ind] = numpy.mod(turn, 2 * math.pi)
+    arcs = wrap * numpy.abs(srad)
+    length = spans.sum(axis = 1) + arcs.sum(axis = 1)
+    return {'length' : length,
+            'spans'  : spans,
+            'wrap'   : wrap,
+            'p0'     : p0,
+            'p1'     : p1,
+            'teeth'  : length / GT2_PITCH}
+
+
+# ---------- route_length ---------------------------------------------
+# length of the belt on a route of pulleys (see pulley) for all the
+# positions of the gantry
+# route:      list of pulley dictionaries, in the order of the belt
+# gantry_pos: list or numpy array (n_pos, 2) of (x, y) positions of the
+#             gantry
+# closed:     see belt_length
+# returns the dictionary of belt_length, and also:
+#   'names'     : names of the pulleys
+#   'variation' : largest length - smallest length along the travel, it
+#                 has to be taken by the tensioner if it is not 0
+
+def route_length (route, gantry_pos, closed = False):
+
+    gantry_pos = numpy.asarray(gantry_pos, dtype = float).reshape(-1, 2)
+    pos = numpy.array([pull['pos'] for pull in route])
+    moves = numpy.array([pull['moves'] for pull in route])
+    centers = pos + gantry_pos[:, numpy.newaxis, :] * moves
+    rep = belt_length(centers,
+                      [pull['r'] for pull in route],
+                      [pull['side'] for pull in route],
+                      closed = closed)
+    rep['names'] = [pull['name'] for pull in route]
+    rep['variation'] = float(rep['length'].max() - rep['length'].min())
+    return rep
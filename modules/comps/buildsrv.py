@@ -0,0 +1,610 @@
+# ----------------------------------------------------------------------------
+# -- Build server
+# -- comps library
+# -- Keeps the modules and their caches loaded, and builds on request
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Each time a script as goliat.py is run on a new FreeCAD session, FreeCAD
+# starts, the modules are imported and the caches of the shapes are empty.
+# This server is run once (with freecadcmd, or with python and the stand-in
+# of fcstub.py if FreeCAD is not found) and it keeps all the modules of
+# the library loaded, with their caches. It listens on a Unix socket, and
+# runs the scripts that are requested. The modules and the scripts that
+# have been edited are loaded again before the build.
+#
+# The requests and the answers are lines of JSON. Each request is answered
+# with several lines: 'log' (the log messages of the build), 'progress'
+# (on sweeps) and, at the end, 'result' or 'error'.
+#
+#   {"cmd": "build", "script": "goliat.py", "params": {"kcomp.TOL": 0.3}}
+#   {"cmd": "build", "script": "goliat.py", "force": true}
+#   {"cmd": "sweep", "script": "goliat.py", "variants": [{...}, {...}]}
+#   {"cmd": "export", "doc": "goliat", "path": "goliat.snap"}
+#   {"cmd": "status"}
+#   {"cmd": "shutdown"}
+#
+# params: "module.NAME" changes the constant NAME of a module of
+#         WARM_MODULES during the build: the module is loaded again with
+#         the new value on the assignment of NAME (so the constants that are
+#         calculated from it change too), and the modules after it are
+#         loaded again (so their 'from module import NAME' and their
+#         default arguments take it). After the build they are loaded again
+#         with their values. Loading a module again empties its caches of
+#         shapes, so the caches are carried across: the ones of the modules
+#         with their values are put back after the build, and the ones made
+#         with each set of parameters are kept (the last MAX_PARAM_CACHES)
+#         and put back when the same parameters are built again.
+#         The parameters without a module are only in the dictionary
+#         BUILD_PARAMS of the script, that has to read them (all of them
+#         are in BUILD_PARAMS)
+# force:  build it even if nothing has changed since the last build
+#
+# To start the server, and to send requests from the command line:
+#   freecadcmd buildsrv.py serve
+#   python buildsrv.py build goliat.py
+#   python buildsrv.py stop
+
+import os
+import sys
+import ast
+import json
+import time
+import socket
+import logging
+import tempfile
+import traceback
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+try:
+    from importlib import reload
+except ImportError:
+    pass  # python 2: reload is a builtin
+
+# FreeCAD, or the stand-in of fcstub.py if FreeCAD is not found (see fcfun)
+os.environ.setdefault('COMPS_BACKEND', 'auto')
+import fcfun
+
+import FreeCAD
+import FreeCADGui
+import Part
+
+logger = logging.getLogger(__name__)
+
+
+# Unix socket of the server
+SOCK_PATH = os.path.join(tempfile.gettempdir(), 'comps_build.sock')
+
+# modules that are kept loaded, in order of dependency: when one of them
+# changes, it and the ones after it are loaded again
+WARM_MODULES = ['kcomp', 'fcfun', 'partdims', 'prof2d', 'featplan', 'comps',
+                'partgroup', 'beltcl', 'parts3d', 'dedup', 'print3d',
+                'snapshot', 'manifest', 'beamcalc', 'rodcalc', 'beltpath']
+
+# number of sets of parameters whose caches are kept
+MAX_PARAM_CACHES = 4
+
+
+# ---------- mod_mtime ------------------------------------------------
+# modification time of the source file of a module
+
+def mod_mtime (mod):
+    filename = getattr(mod, '__file__', None)
+    if filename is None:
+        return 0
+    if filename.endswith('.pyc'):
+        filename = filename[:-1]
+    try:
+        return os.path.getmtime(filename)
+    except OSError:
+        return 0
+
+
+# ---------- mod_source -----------------------------------------------
+# path of the source file of a module
+
+def mod_source (mod):
+    filename = mod.__file__
+    if filename.endswith('.pyc'):
+        filename = filename[:-1]
+    return filename
+
+
+# ---------- load_with_params -----------------------------------------
+# loads again a module with some of its constants changed: the value of
+# the top level assignment of each name of param_dict is replaced by the
+# new value, before running the source of the module. The constants that
+# are calculated from them take the new values
+# param_dict: dictionary of the new values, key: name of the constant
+
+def load_with_params (mod, param_dict):
+
+    filename = mod_source(mod)
+    with open(filename) as fil:
+        tree = ast.parse(fil.read(), filename)
+    found = set()
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name) and target.id in param_dict:
+                value = ast.parse(repr(param_dict[target.id]),
+                                  mode = 'eval').body
+                node.value = ast.copy_location(value, node.value)
+                found.add(target.id)
+    missing = [name for name in param_dict if name not in found]
+    if missing:
+        raise KeyError('buildsrv: %s has no constant %s'
+                       % (mod.__name__, ', '.join(missing)))
+    ast.fix_missing_locations(tree)
+    exec(compile(tree, filename, 'exec'), vars(mod))
+    return mod
+
+
+# ---------- mod_caches -----------------------------------------------
+# The caches of some modules: the dictionaries of the module whose names
+# are in lower case and end with _dict (fcfun.bolthole_shp_dict,
+# partgroup.holcyl_shp_dict, ...) and the ones of the classes defined in
+# the module (parts3d.EndShaftSlider.build_dict, comps.RectRndBar.face_dict,
+# ...)
+# Returns a dictionary, key: (module name, class name or None, name),
+# value: the cache (the same dictionary, not a copy)
+
+def mod_caches (mod_names):
+
+    cache_dict = {}
+    for mod_name in mod_names:
+        mod = sys.modules.get(mod_name)
+        if mod is None:
+            continue
+        for attr, value in vars(mod).items():
+            if (attr.islower() and attr.endswith('_dict')
+                and isinstance(value, dict)):
+                cache_dict[(mod_name, None, attr)] = value
+            elif (isinstance(value, type)
+                  and value.__module__ == mod_name):
+                for cls_attr, cache in vars(value).items():
+                    if cls_attr.endswith('_dict') and isinstance(cache, dict):
+                        cache_dict[(mod_name, attr, cls_attr)] = cache
+    return cache_dict
+
+
+# ---------- set_caches -----------------------------------------------
+# Puts the caches of mod_caches on the modules (i.e. after they have been
+# loaded again). The ones whose module or class is not there are skipped
+
+def set_caches (cache_dict):
+
+    for (mod_name, cls_name, attr), cache in cache_dict.items():
+        owner = sys.modules.get(mod_name)
+        if owner is not None and cls_name is not None:
+            owner = getattr(owner, cls_name, None)
+        if owner is not None:
+            setattr(owner, attr, cache)
+
+
+# ---------- drop_doc_cache -------------------------------------------
+# Removes from the caches of the classes the objects of a document that
+# is closed. Their keys start with the document name (see
+# parts3d.EndShaftSlider.build_dict, beltcl.Gt2BeltClamp.proto_dict, ...)
+# A new document may have the same name than a closed one
+# cache_dict: the caches, as returned by mod_caches. If None, the ones of
+#             WARM_MODULES
+
+def drop_doc_cache (doc_name, cache_dict = None):
+
+    if cache_dict is None:
+        cache_dict = mod_caches(WARM_MODULES)
+    n_drop = 0
+    for (mod_name, cls_name, attr), cache in cache_dict.items():
+        if cls_name is None:
+            continue
+        for key in list(cache.keys()):
+            if isinstance(key, tuple) and key and key[0] == doc_name:
+                del cache[key]
+                n_drop += 1
+    return n_drop
+
+
+# ---------- class BuildState -----------------------------------------
+# State of the server: the loaded modules, the compiled scripts and the
+# documents of the last build
+# Attributes:
+# mod_time:   dictionary with the modification time of each module
+# code_dict:  dictionary of the compiled scripts, key: path, value:
+#             (modification time, code)
+# build_docs: names of the documents made by the last build
+# n_builds:   number of builds done
+# last_build: (key, result) of the last build, the key has the script, its
+#             modification time and the parameters
+# param_caches: the caches (see mod_caches) of the modules loaded with
+#             parameters, key: JSON of the parameters "module.NAME". The
+#             last MAX_PARAM_CACHES
+# param_order: keys of param_caches, the last used at the end
+
+class BuildState (object):
+
+    def __init__ (self):
+        self.mod_time = {}
+        self.code_dict = {}
+        self.build_docs = []
+        self.n_builds = 0
+        self.last_build = (None, None)
+        self.param_caches = {}
+        self.param_order = []
+        self.load_modules()
+
+    # imports the modules, and loads again the ones that have changed and
+    # the ones that depend on them. Returns the list of the loaded modules
+    def load_modules (self):
+
+        loaded = []
+        changed = False
+        for mod_name in WARM_MODULES:
+            mod = sys.modules.get(mod_name)
+            if mod is None:
+                mod = __import__(mod_name)
+                loaded.append(mod_name)
+            elif mod_name not in self.mod_time:
+                pass  # imported before the server
+            elif changed or mod_mtime(mod) != self.mod_time[mod_name]:
+                changed = True
+                mod = reload(mod)
+                loaded.append(mod_name)
+            self.mod_time[mod_name] = mod_mtime(mod)
+        if loaded:
+            logger.debug('buildsrv: modules loaded: ' + ', '.join(loaded))
+            # the shapes of the caches may be made by the old code
+            self.param_caches = {}
+            self.param_order = []
+        return loaded
+
+    # keeps the caches of the modules loaded with the parameters of key
+    def keep_param_caches (self, key, cache_dict):
+        if key in self.param_order:
+            self.param_order.remove(key)
+        self.param_order.append(key)
+        self.param_caches[key] = cache_dict
+        while len(self.param_order) > MAX_PARAM_CACHES:
+            del self.param_caches[self.param_order.pop(0)]
+
+    # loads again the modules with the parameters "module.NAME" (see the
+    # header), and the modules after them. Returns the names of the
+    # modules that have been loaded
+    def load_params (self, params):
+
+        mod_params = {}
+        for key, value in params.items():
+            if '.' in key:
+                mod_name, attr = key.rsplit('.', 1)
+                if mod_name not in WARM_MODULES:
+                    raise ValueError('buildsrv: parameter of a module that '
+                                     'is not in WARM_MODULES: ' + key)
+                mod_params.setdefault(mod_name, {})[attr] = value
+        if not mod_params:
+            return []
+        first = min([WARM_MODULES.index(mod_name)
+                     for mod_name in mod_params])
+        loaded = []
+        try:
+            for mod_name in WARM_MODULES[first:]:
+                mod = sys.modules.get(mod_name)
+                if mod is None:
+                    continue
+                loaded.append(mod_name)
+                if mod_name in mod_params:
+                    load_with_params(mod, mod_params[mod_name])
+                else:
+                    reload(mod)
+        except Exception:
+            # back to their values
+            for mod_name in loaded:
+                reload(sys.modules[mod_name])
+            raise
+        logger.debug('buildsrv: modules loaded with the parameters: '
+                     + ', '.join(loaded))
+        return loaded
+
+    # compiled code of the script, compiled again if it has changed
+    def get_code (self, path):
+        mtime = os.path.getmtime(path)
+        if path not in self.code_dict or self.code_dict[path][0] != mtime:
+            with open(path) as fil:
+                src = fil.read()
+            self.code_dict[path] = (mtime, compile(src, path, 'exec'))
+        return self.code_dict[path][1]
+
+    # closes the documents of the last build
+    def close_docs (self):
+        for doc_name in self.build_docs:
+            if doc_name in FreeCAD.listDocuments():
+                FreeCAD.closeDocument(doc_name)
+            drop_doc_cache(doc_name)
+            for cache_dict in self.param_caches.values():
+                drop_doc_cache(doc_name, cache_dict)
+        self.build_docs = []
+
+    # ---------- build
+    # runs a script
+    # path:   path of the script
+    # params: dictionary of the parameters, see the header
+    # keep:   if True, the documents of the previous build are not closed
+    # force:  if False, and nothing has changed since the last build (the
+    #         script, the modules and the parameters), it is not built
+    #         again, and its documents are kept
+    # returns a dictionary:
+    #   'time'    : time of the build (s)
+    #   'docs'    : names of the documents made by the script
+    #   'objects' : number of objects of the documents
+    #   'loaded'  : modules loaded again
+    #   'same'    : True if it was not built again
+
+    def build (self, path, params = None, keep = False, force = True):
+
+        params = params or {}
+        start = time.time()
+        loaded = self.load_modules()
+        path = os.path.abspath(path)
+        build_key = (path, os.path.getmtime(path),
+                     json.dumps(params, sort_keys = True))
+        last_key, last_res = self.last_build
+        if (not force and not loaded and build_key == last_key
+            and all([name in FreeCAD.listDocuments()
+                     for name in self.build_docs])):
+            res = dict(last_res)
+            res.update({'time': time.time() - start, 'same': True})
+            return res
+        if not keep:
+            self.close_docs()
+        code = self.get_code(path)
+        self.last_build = (None, None)
+
+        # the caches of the modules with their values, to put them back
+        # after the build, and the ones of a previous build with the same
+        # parameters
+        saved_caches = mod_caches(WARM_MODULES)
+        param_key = json.dumps(dict([(key, value)
+                                     for key, value in params.items()
+                                     if '.' in key]), sort_keys = True)
+        # the modules loaded with the parameters, to load them again
+        try:
+            restore = self.load_params(params)
+        except Exception:
+            set_caches(saved_caches)
+            raise
+        if restore:
+            set_caches(self.param_caches.get(param_key, {}))
+
+        docs_before = set(FreeCAD.listDocuments().keys())
+        namespace = {'__name__'     : '__main__',
+                     '__file__'     : path,
+                     'Gui'          : FreeCADGui,
+                     'BUILD_PARAMS' : params}
+        cwd = os.getcwd()
+        os.chdir(os.path.dirname(path))
+        try:
+            exec(code, namespace)
+        finally:
+            os.chdir(cwd)
+            if restore:
+                self.keep_param_caches(param_key, mod_caches(restore))
+                for mod_name in restore:
+                    sys.modules[mod_name] = reload(sys.modules[mod_name])
+                set_caches(saved_caches)
+            new_docs = [name for name in FreeCAD.listDocuments().keys()
+                        if name not in docs_before]
+            self.build_docs.extend(new_docs)
+            self.n_builds += 1
+
+        n_obj = sum([len(FreeCAD.getDocument(name).Objects)
+                     for name in new_docs])
+        res = {'time'    : time.time() - start,
+               'docs'    : new_docs,
+               'objects' : n_obj,
+               'loaded'  : loaded,
+               'same'    : False}
+        self.last_build = (build_key, res)
+        return res
+
+    # ---------- export
+    # exports a document: .FCStd saves the document, .snap writes a
+    # snapshot of its parts (see snapshot.py), .brep exports the compound of
+    # the shapes of its objects (all of them, or the ones with the labels of
+    # the list)
+    def export (self, path, doc_name = None, labels = None):
+
+        if doc_name is None:
+            doc = FreeCAD.ActiveDocument
+        else:
+            doc = FreeCAD.getDocument(doc_name)
+        path = os.path.abspath(path)
+        if path.lower().endswith('.fcstd'):
+            doc.saveAs(path)
+            return {'path': path, 'objects': len(doc.Objects)}
+        if path.lower().endswith('.snap'):
+            snap_rep = sys.modules['snapshot'].write_snapshot(doc, path)
+            return {'path': path, 'objects': snap_rep['parts']}
+        fco_list = [fco for fco in doc.Objects
+                    if labels is None or fco.Label in labels]
+        # only the objects that are not inside others
+        if labels is None:
+            fco_list = [fco for fco in fco_list if not fco.InList]
+        shp = Part.makeCompound([fco.Shape for fco in fco_list])
+        shp.exportBrep(path)
+        return {'path': path, 'objects': len(fco_list)}
+
+    def status (self):
+        cache_list = []
+        for mod_name in WARM_MODULES:
+            mod = sys.modules.get(mod_name)
+            for attr, cache in vars(mod).items():
+                if attr.endswith('_dict') and isinstance(cache, dict):
+                    cache_list.append((mod_name + '.' + attr, len(cache)))
+        return {'backend' : getattr(FreeCAD, 'BACKEND', 'freecad'),
+                'builds'  : self.n_builds,
+                'docs'    : sorted(FreeCAD.listDocuments().keys()),
+                'modules' : WARM_MODULES,
+                'caches'  : cache_list}
+
+
+# ---------- class StreamLogHandler -----------------------------------
+# sends the log messages to the client while it builds
+
+class StreamLogHandler (logging.Handler):
+
+    def __init__ (self, send, level = logging.INFO):
+        logging.Handler.__init__(self, level)
+        self.send = send
+
+    def emit (self, record):
+        try:
+            self.send({'event' : 'log',
+                       'level' : record.levelname,
+                       'name'  : record.name,
+                       'msg'   : record.getMessage()})
+        except Exception:
+            pass  # the client may be gone
+
+
+# ---------- class BuildHandler ---------------------------------------
+# handles the requests of a client: a JSON line each
+
+class BuildHandler (socketserver.StreamRequestHandler):
+
+    def send (self, msg):
+        self.wfile.write((json.dumps(msg) + '\n').encode())
+        self.wfile.flush()
+
+    def handle (self):
+        for line in iter(self.rfile.readline, b''):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                req = json.loads(line.decode())
+            except ValueError:
+                self.send({'event': 'error', 'msg': 'not JSON'})
+                continue
+            cmd = req.get('cmd')
+            log_hdl = StreamLogHandler(self.send,
+                                       req.get('log_level', logging.INFO))
+            logging.getLogger().addHandler(log_hdl)
+            try:
+                self.send(self.run(cmd, req))
+            except Exception:
+                self.send({'event' : 'error',
+                           'cmd'   : cmd,
+                           'msg'   : traceback.format_exc()})
+            finally:
+                logging.getLogger().removeHandler(log_hdl)
+            if cmd == 'shutdown':
+                return
+
+    def run (self, cmd, req):
+        state = self.server.state
+        if cmd == 'build':
+            res = state.build(req['script'], req.get('params'),
+                              req.get('keep', False), req.get('force', False))
+        elif cmd == 'sweep':
+            variants = req['variants']
+            res = {'variants': []}
+            for ind, params in enumerate(variants):
+                self.send({'event'  : 'progress',
+                           'index'  : ind,
+                           'total'  : len(variants),
+                           'params' : params})
+                try:
+                    var_res = state.build(req['script'], params)
+                    if req.get('export'):
+                        var_res['export'] = state.export(
+                                     req['export'] % ind,
+                                     var_res['docs'][0] if var_res['docs']
+                                     else None)
+                except Exception:
+                    var_res = {'error': traceback.format_exc()}
+                res['variants'].append(var_res)
+        elif cmd == 'export':
+            res = state.export(req['path'], req.get('doc'),
+                               req.get('labels'))
+        elif cmd == 'status':
+            res = state.status()
+        elif cmd == 'shutdown':
+            self.server.stop = True
+            res = {}
+        else:
+            raise ValueError('buildsrv: unknown command: %s' % cmd)
+        res.update({'event': 'result', 'cmd': cmd})
+        return res
+
+
+# ---------- class BuildServer ----------------------------------------
+# the requests are handled one after the other: FreeCAD builds one
+# document at a time
+
+class BuildServer (socketserver.UnixStreamServer):
+
+    def __init__ (self, sock_path = SOCK_PATH):
+        if os.path.exists(sock_path):
+            os.remove(sock_path)
+        socketserver.UnixStreamServer.__init__(self, sock_path, BuildHandler)
+        self.sock_path = sock_path
+        self.state = BuildState()
+        self.stop = False
+
+    def serve (self):
+        logger.info('buildsrv: listening on ' + self.sock_path)
+        try:
+            while not self.stop:
+                self.handle_request()
+        finally:
+            self.server_close()
+            os.remove(self.sock_path)
+
+
+# ---------- request --------------------------------------------------
+# sends a request to the server, and yields the answers (dictionaries)
+# until the result or the error
+
+def request (req, sock_path = SOCK_PATH):
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(sock_path)
+    try:
+        sock.sendall((json.dumps(req) + '\n').encode())
+        rfile = sock.makefile('rb')
+        for line in iter(rfile.readline, b''):
+            msg = json.loads(line.decode())
+            yield msg
+            if msg['event'] in ('result', 'error'):
+                break
+    finally:
+        sock.close()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level = logging.INFO)
+    args = sys.argv[1:]
+    if not args or args[0] == 'serve':
+        BuildServer(*args[1:2]).serve()
+    else:
+        if args[0] == 'build':
+            req = {'cmd': 'build', 'script': os.path.abspath(args[1])}
+        elif args[0] == 'export':
+            req = {'cmd': 'export', 'path': os.path.abspath(args[1])}
+        elif args[0] == 'stop':
+            req = {'cmd': 'shutdown'}
+        else:
+            req = {'cmd': args[0]}
+        for msg in request(req):
+            if msg['event'] == 'log':
+                print (msg['level'] + ' - ' + msg['msg'])
+            else:
+                print (json.dumps(msg, indent = 1))
@@ -34,7 +34,7 @@ import kcomp # before, it was called mat_cte
 import fcfun
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, addCyl_pos, fillet_len
-from fcfun import addBolt, addBoltNut_hole, NutHole
+from fcfun import addBolt, addBoltNut_hole, NutHole, lazyprop
 
 
 logging.basicConfig(level=logging.DEBUG,
@@ -444,9 +444,19 @@ class MisumiAlu30s6w8 (object):
 # hollow   : True, if it is hollow, False if it is not
 # face     : the face has been extruded
 # fco      : FreeCad Object
+#
+# The section (face) is made once for each (Base, Height, Radius, Thick,
+# inRad), see face_dict, and the bars with the same section are extruded
+# from it. The hollow face is made with the outer and the inner wire,
+# without a boolean cut
 
 class RectRndBar (object):
 
+    # dictionary of the sections already made, on the XY plane, at Z=0
+    # key: (Base, Height, Radius, Thick, inRad)
+    # value: the face (shape)
+    face_dict = {}
+
     def __init__ (self, Base, Height, Length, Radius, Thick = 0, 
                   inrad_same = False, axis = 'x',
                   baseaxis = 'y', name = "rectrndbar",
@@ -485,19 +495,8 @@ class RectRndBar (object):
                else:
                    self.inRad = 0  # a rectangle, with no rounded edges (inside)
 
-        wire_ext = fcfun.shpRndRectWire (x=Base, y=Height, r=Radius,
-                                         zpos= Length/2.0)
-        face_ext = Part.Face(wire_ext)
-        if self.hollow == True:
-            wire_int = fcfun.shpRndRectWire (x=self.inBase, 
-                                             y=self.inHeight,
-                                             r=self.inRad,
-                                             zpos= Length/2.0)
-            face_int = Part.Face(wire_int)
-            face = face_ext.cut(face_int)
-        else:
-            face = face_ext  # is not hollow
-
+        # the section is on Z=0, it is moved to Z=Length/2 when it is placed
+        face = self.get_face().copy()
         self.face = face
 
         # Rotate and extrude in the appropiate direction
@@ -528,14 +527,38 @@ class RectRndBar (object):
                                       vec1 = vec1, vec2 = vec2,
                                       cx = cx, cy=cy, cz=cz)
 
-        face.Placement.Base = vdesp
-        face.Placement.Rotation = vrot
+        face.Placement = FreeCAD.Placement(
+                       vdesp + vrot.multVec(FreeCAD.Vector(0,0,Length/2.0)),
+                       vrot)
 
         shp_extr = face.extrude(dir_extr)
         rndbar = doc.addObject("Part::Feature", name)
         rndbar.Shape = shp_extr
 
         self.fco = rndbar
+
+    # returns the section of the bar from face_dict, makes it if it is not
+    # there. If it is hollow, it is a face with 2 wires: the outer wire and
+    # the inner one, that is the hole
+
+    def get_face (self):
+        key = (self.Base, self.Height, self.Radius, self.Thick, self.inRad)
+        face = self.face_dict.get(key)
+        if face is None:
+            wire_ext = fcfun.shpRndRectWire (x=self.Base, y=self.Height,
+                                             r=self.Radius)
+            if self.hollow == True:
+                wire_int = fcfun.shpRndRectWire (x=self.inBase, 
+                                                 y=self.inHeight,
+                                                 r=self.inRad)
+                face = Part.Face([wire_ext, wire_int])
+                if not face.isValid():
+                    # the orientation of the inner wire
+                    face.fix(fcfun.LEN_TOL, fcfun.LEN_TOL, fcfun.LEN_TOL)
+            else:
+                face = Part.Face(wire_ext)  # is not hollow
+            self.face_dict[key] = face
+        return face
         
 # ----------- end class RectRndBar ----------------------------------------
             
@@ -557,6 +580,7 @@ class RectRndBar (object):
 # bolt_out: length of the bolts holes outside the motor
 # container: 1: if you want to have a container to make a hole to fit it in
 #               a piece
+# tol: tolerance of the printer, of the bolt holes and the container
 # normal: direction of the shaft
 # pos   : position of the base of the shaft. Not considering the circle that
 #         usually is on the base of the shaft
@@ -565,9 +589,13 @@ class RectRndBar (object):
 # fco: the FreeCad Object of the motor
 # shp_cont: the container of the motor. To cut other pieces. It is a shape
 #           not a FreeCad Object (fco)
+# shp_b2holes: shape of the bolt holes
 # fco_cont: Having problems with shapes and fco. So I will do it with fco 
 #           instead of shapes  To cut other pieces.
 #           Make decision about how to finally do it
+# fco, shp_cont and shp_b2holes are built the first time they are used
+# (fcfun.lazyprop), so the motor doesn't make the container if it is not
+# used, and the container doesn't add the motor to the document
 
 # base_place: position of the 2 elements: All of them have the same base
 #             position.
@@ -580,10 +608,10 @@ class NemaMotor (object):
     def __init__ (self, size, length, shaft_l, 
                   circle_r, circle_h, name = "nemamotor", chmf = 1, 
                   rshaft_l=0, bolt_depth = 3, bolt_out = 2, container=1,
-                  normal = VZ, pos = V0):
+                  normal = VZ, pos = V0, tol = kcomp.TOL):
 
-        doc = FreeCAD.ActiveDocument
         self.base_place = (0,0,0)
+        self.name = name
         self.size = size
         self.width = kcomp.NEMA_W[size]
         self.length = length
@@ -600,15 +628,15 @@ class NemaMotor (object):
         self.pos = pos
         nemabolt_d = kcomp.NEMA_BOLT_D[size]
         self.nemabolt_d = nemabolt_d
-        mtol = kcomp.TOL - 0.1
+        self.tol = tol
+        self.mtol = tol - 0.1
 
         lnormal = DraftVecUtils.scaleTo(nnormal,length)
-        neg_lnormal = DraftVecUtils.neg(lnormal)
+        self.neg_lnormal = DraftVecUtils.neg(lnormal)
+        if rshaft_l != 0: # rear shaft
+            self.rshaft_posend = DraftVecUtils.scaleTo(self.neg_lnormal,
+                                                       rshaft_l+length)
 
-        # motor shape
-        v1 = FreeCAD.Vector(self.width/2.-chmf, self.width/2.,0)
-        v2 = FreeCAD.Vector(self.width/2.,   self.width/2.-chmf,0)
-        motorwire = fcfun.wire_sim_xy([v1,v2])
         # motor wire normal is VZ
         # DraftVecUtils doesnt work as well
         # rot = DraftVecUtils.getRotation(VZ, nnormal)
@@ -616,28 +644,26 @@ class NemaMotor (object):
         # this is valid:
         #rot = DraftGeomUtils.getRotation(VZ,nnormal)
         #print rot
-        rot = FreeCAD.Rotation(VZ,nnormal)
-        print rot
-        motorwire.Placement.Rotation = rot
-        motorwire.Placement.Base = pos
-        motorface = Part.Face(motorwire)
-        shp_motorbox = motorface.extrude(neg_lnormal)
-        # shaft shape
-        if rshaft_l == 0: # no rear shaft
-            shp_shaft = fcfun.shp_cyl (
-                               r=kcomp.NEMA_SHAFT_D[size]/2.,
-                               h= shaft_l,
-                               normal = nnormal,
-                               pos = pos)
+        self.rot = FreeCAD.Rotation(VZ,nnormal)
+
+        # Circle on the base of the shaft
+        if circle_r == 0:
+            self.calcircle_r = kcomp.NEMA_BOLT_SEP[size]/2.
         else:
-            rshaft_posend = DraftVecUtils.scaleTo(neg_lnormal, rshaft_l+length)
-            shp_shaft = fcfun.shp_cyl (
-                               r=kcomp.NEMA_SHAFT_D[size]/2.,
-                               h= shaft_l + rshaft_l + length,
-                               normal = nnormal,
-                               pos = pos + rshaft_posend)
-                               
-        shp_motorshaft = shp_motorbox.fuse(shp_shaft)
+            self.calcircle_r = circle_r
+
+        # the geometry is built when it is used: fco, shp_cont, shp_b2holes
+
+    # shape of the bolt holes, they are cut to the motor, and are part of
+    # the container
+    @lazyprop
+    def shp_b2holes (self):
+
+        doc = FreeCAD.ActiveDocument
+        size = self.size
+        bolt_depth = self.bolt_depth
+        nemabolt_d = self.nemabolt_d
+        mtol = self.mtol
         # Bolt holes
         # AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA
         # There is something wrong with the position of these bolts
@@ -679,11 +705,6 @@ class NemaMotor (object):
 #                                   pos= bhole11_posrot)
 #        shp_bolts = shp_bolt00.multiFuse([shp_bolt01, shp_bolt10, shp_bolt11])
 
-
-        # list of shapes to make a fusion of the container
-        shp_contfuselist = []
-#        shp_contfuselist.append(shp_bolts)
-
         b2hole00_pos = FreeCAD.Vector(-kcomp.NEMA_BOLT_SEP[size]/2,
                                       -kcomp.NEMA_BOLT_SEP[size]/2,
                                       -bolt_depth)
@@ -699,7 +720,7 @@ class NemaMotor (object):
 
         b2hole00 = addBolt (
             r_shank = nemabolt_d/2. + mtol/2.,
-            l_bolt = bolt_out + bolt_depth,
+            l_bolt = self.bolt_out + bolt_depth,
             r_head = kcomp.D912_HEAD_D[nemabolt_d]/2. + mtol/2.,
             l_head = kcomp.D912_HEAD_L[nemabolt_d] + mtol,
             hex_head = 0, extra =1, support=1, headdown = 0, name ="b2hole00")
@@ -735,20 +756,49 @@ class NemaMotor (object):
         b2holes.Shapes = b2holes_list
         b2holes.ViewObject.Visibility=False
 
-        shp_b2holes.Placement.Base = pos
-        shp_b2holes.Placement.Rotation = rot
-        shp_contfuselist.append(shp_b2holes)
+        shp_b2holes.Placement.Base = self.pos
+        shp_b2holes.Placement.Rotation = self.rot
+        return shp_b2holes
 
+    # shape of the motor
+    @lazyprop
+    def shp_motor (self):
 
-        # Circle on the base of the shaft
-        if circle_r == 0:
-            calcircle_r = kcomp.NEMA_BOLT_SEP[size]/2.
+        size = self.size
+        chmf = self.chmf
+        pos = self.pos
+        nnormal = self.normal
+        rot = self.rot
+        print (rot)
+        # motor shape
+        v1 = FreeCAD.Vector(self.width/2.-chmf, self.width/2.,0)
+        v2 = FreeCAD.Vector(self.width/2.,   self.width/2.-chmf,0)
+        motorwire = fcfun.wire_sim_xy([v1,v2])
+        motorwire.Placement.Rotation = rot
+        motorwire.Placement.Base = pos
+        motorface = Part.Face(motorwire)
+        shp_motorbox = motorface.extrude(self.neg_lnormal)
+        # shaft shape
+        if self.rshaft_l == 0: # no rear shaft
+            shp_shaft = fcfun.shp_cyl (
+                               r=kcomp.NEMA_SHAFT_D[size]/2.,
+                               h= self.shaft_l,
+                               normal = nnormal,
+                               pos = pos)
         else:
-            calcircle_r = circle_r
-        if circle_h != 0:
+            shp_shaft = fcfun.shp_cyl (
+                               r=kcomp.NEMA_SHAFT_D[size]/2.,
+                               h= self.shaft_l + self.rshaft_l + self.length,
+                               normal = nnormal,
+                               pos = pos + self.rshaft_posend)
+                               
+        shp_motorshaft = shp_motorbox.fuse(shp_shaft)
+
+        # Circle on the base of the shaft
+        if self.circle_h != 0:
             shp_circle = fcfun.shp_cyl (
-                               r=calcircle_r,
-                               h= circle_h + 1, #supperposition for union
+                               r=self.calcircle_r,
+                               h= self.circle_h + 1, #supperposition for union
                                normal = nnormal,
                                #supperposition for union
                                pos = pos - nnormal)
@@ -761,64 +811,73 @@ class NemaMotor (object):
         #fmotor.Shape = shp_fmotor
 
         #shp_motor = shp_fmotor.cut(shp_bolts)
-        shp_motor = shp_fmotor.cut(shp_b2holes)
+        shp_motor = shp_fmotor.cut(self.shp_b2holes)
         #Part.show(shp_bolts)
-        
-        # container
-        if container == 1:
-            # 2*TOL to make sure it fits
-            v1 = FreeCAD.Vector(self.width/2.-chmf/2. + 2*kcomp.TOL,
-                                self.width/2. + 2*kcomp.TOL, 0)
-            v2 = FreeCAD.Vector(self.width/2.+ 2*kcomp.TOL,
-                                self.width/2.-chmf/2. + 2*kcomp.TOL,0)
-            cont_motorwire = fcfun.wire_sim_xy([v1,v2])
-            cont_motorwire.Placement.Rotation = rot
-            cont_motorwire.Placement.Base = pos
-            cont_motorface = Part.Face(cont_motorwire)
-            shp_contmotor_box = cont_motorface.extrude(neg_lnormal)
-
-            # the container is much wider than the shaft
-
-            if rshaft_l == 0: # no rear shaft
-                shp_contshaft = fcfun.shp_cyl (
-                                   r=calcircle_r + kcomp.TOL,
-                                   h= shaft_l + 1,
-                                   normal = nnormal,
-                                   pos = pos - nnormal )
-            else:
-                shp_contshaft = fcfun.shp_cyl (
-                                   r=calcircle_r + kcomp.TOL,
-                                   h= shaft_l + rshaft_l + length,
-                                   normal = nnormal,
-                                   pos = pos + rshaft_posend)
-            shp_contfuselist.append(shp_contshaft)
-            shp_contmotor = shp_contmotor_box.multiFuse(shp_contfuselist)
-        else:
-            shp_contmotor = shp_motor # we put the same shape
-        
+        return shp_motor
 
-        doc.recompute()
+    # FreeCAD object of the motor
+    @lazyprop
+    def fco (self):
 
+        doc = FreeCAD.ActiveDocument
         #fco_motor = doc.addObject("Part::Cut", name)
         #fco_motor.Base = fmotor
         #fco_motor.Tool = b2holes
-        fco_motor = doc.addObject("Part::Feature", name)
-        fco_motor.Shape = shp_motor
+        fco_motor = doc.addObject("Part::Feature", self.name)
+        fco_motor.Shape = self.shp_motor
+        fco_motor.Placement.Base = FreeCAD.Vector(self.base_place)
+        doc.recompute()
+        return fco_motor
 
-        self.fco = fco_motor
-        self.shp_cont = shp_contmotor
-        #Part.show(shp_contmotor)
+    # container of the motor, to cut other pieces, it is a shape
+    @lazyprop
+    def shp_cont (self):
 
+        if self.container != 1:
+            return self.shp_motor # we put the same shape
 
-        doc.recompute()
+        chmf = self.chmf
+        pos = self.pos
+        nnormal = self.normal
+        # list of shapes to make a fusion of the container
+        shp_contfuselist = [self.shp_b2holes]
+        # 2*TOL to make sure it fits
+        v1 = FreeCAD.Vector(self.width/2.-chmf/2. + 2*self.tol,
+                            self.width/2. + 2*self.tol, 0)
+        v2 = FreeCAD.Vector(self.width/2.+ 2*self.tol,
+                            self.width/2.-chmf/2. + 2*self.tol,0)
+        cont_motorwire = fcfun.wire_sim_xy([v1,v2])
+        cont_motorwire.Placement.Rotation = self.rot
+        cont_motorwire.Placement.Base = pos
+        cont_motorface = Part.Face(cont_motorwire)
+        shp_contmotor_box = cont_motorface.extrude(self.neg_lnormal)
+
+        # the container is much wider than the shaft
+
+        if self.rshaft_l == 0: # no rear shaft
+            shp_contshaft = fcfun.shp_cyl (
+                               r=self.calcircle_r + self.tol,
+                               h= self.shaft_l + 1,
+                               normal = nnormal,
+                               pos = pos - nnormal )
+        else:
+            shp_contshaft = fcfun.shp_cyl (
+                               r=self.calcircle_r + self.tol,
+                               h= self.shaft_l + self.rshaft_l + self.length,
+                               normal = nnormal,
+                               pos = pos + self.rshaft_posend)
+        shp_contfuselist.append(shp_contshaft)
+        shp_contmotor = shp_contmotor_box.multiFuse(shp_contfuselist)
+        #Part.show(shp_contmotor)
+        return shp_contmotor
 
 
-   # Move the motor and its container
+   # Move the motor. The container is a shape, it is not moved
     def BasePlace (self, position = (0,0,0)):
         self.base_place = position
-        self.fco.Placement.Base = FreeCAD.Vector(position)
+        if lazyprop.is_built(self, 'fco'):
+            self.fco.Placement.Base = FreeCAD.Vector(position)
         #self.shp_cont.Placement.Base = FreeCAD.Vector(position)
-        self.fco_cont.Placement.Base = FreeCAD.Vector(position)
 
 #doc =FreeCAD.newDocument()
 
@@ -856,6 +915,8 @@ class NemaMotor (object):
 # bearing: the fco (FreeCAD object) of the bearing
 # bearing_cont: the fco (FreeCAD object) of the container bearing. 
 #               to cut it
+# bearing and bearing_cont are built the first time they are used
+# (fcfun.lazyprop)
 
 # base_place: position of the 3 elements: All of them have the same base
 #             position.
@@ -877,30 +938,38 @@ class LinBearing (object):
         self.r_tol  = r_tol
         self.h_tol  = h_tol
 
-        bearing = fcfun.addCylHole (r_ext = r_ext,
-                              r_int = r_int,
-                              h= h,
-                              name = name,
-                              axis = axis,
-                              h_disp = h_disp)
-        self.bearing = bearing
-
-        bearing_cont = fcfun.addCyl_pos (r = r_ext + r_tol,
-                                         h= h + h_tol,
-                                         name = name + "_cont",
-                                         axis = axis,
-                                         h_disp = h_disp - h_tol/2.0)
+    @lazyprop
+    def bearing (self):
+        bearing = fcfun.addCylHole (r_ext = self.r_ext,
+                              r_int = self.r_int,
+                              h= self.h,
+                              name = self.name,
+                              axis = self.axis,
+                              h_disp = self.h_disp)
+        bearing.Placement.Base = FreeCAD.Vector(self.base_place)
+        return bearing
+
+    @lazyprop
+    def bearing_cont (self):
+        bearing_cont = fcfun.addCyl_pos (r = self.r_ext + self.r_tol,
+                                         h= self.h + self.h_tol,
+                                         name = self.name + "_cont",
+                                         axis = self.axis,
+                                         h_disp = self.h_disp - self.h_tol/2.0)
         # Hide the container
-        self.bearing_cont = bearing_cont
         if bearing_cont.ViewObject != None:
             bearing_cont.ViewObject.Visibility=False
+        bearing_cont.Placement.Base = FreeCAD.Vector(self.base_place)
+        return bearing_cont
 
 
-    # Move the bearing and its container
+    # Move the bearing and its container, the ones that have been built
     def BasePlace (self, position = (0,0,0)):
         self.base_place = position
-        self.bearing.Placement.Base = FreeCAD.Vector(position)
-        self.bearing_cont.Placement.Base = FreeCAD.Vector(position)
+        if lazyprop.is_built(self, 'bearing'):
+            self.bearing.Placement.Base = FreeCAD.Vector(position)
+        if lazyprop.is_built(self, 'bearing_cont'):
+            self.bearing_cont.Placement.Base = FreeCAD.Vector(position)
 
 
 # ---------- class LinBearingClone ----------------------------------------
@@ -929,16 +998,24 @@ class LinBearingClone (LinBearing):
         self.h_disp     = h_bearing.h_disp
         self.r_tol      = h_bearing.r_tol
         self.h_tol      = h_bearing.h_tol
+        self.h_bearing  = h_bearing
 
-        bearing_clone = Draft.clone(h_bearing.bearing)
+    # the clones are made when they are used, and so the originals
+    @lazyprop
+    def bearing (self):
+        bearing_clone = Draft.clone(self.h_bearing.bearing)
         bearing_clone.Label = self.name
-        self.bearing = bearing_clone
+        bearing_clone.Placement.Base = FreeCAD.Vector(self.base_place)
+        return bearing_clone
 
-        bearing_cont_clone = Draft.clone(h_bearing.bearing_cont)
+    @lazyprop
+    def bearing_cont (self):
+        bearing_cont_clone = Draft.clone(self.h_bearing.bearing_cont)
         bearing_cont_clone.Label = self.name + "_cont"
-        self.bearing_cont = bearing_cont_clone
         if bearing_cont_clone.ViewObject != None:
             bearing_cont_clone.ViewObject.Visibility=False
+        bearing_cont_clone.Placement.Base = FreeCAD.Vector(self.base_place)
+        return bearing_cont_clone
 
 
 # ---------- class T8Nut ----------------------
@@ -983,27 +1060,30 @@ class T8Nut (object):
         self.name = name
         self.nutaxis = nutaxis
 
-        flange_cyl = addCyl_pos (r = self.FlangeR,
-                                 h = self.FlangeL,
-                                 name = "flange_cyl",
-                                 axis = 'z',
-                                 h_disp = - self.FlangeL)
-                      
-        shaft_cyl = addCyl_pos ( r = self.ShaftR,
-                                 h = self.NutL,
-                                 name = "shaft_cyl",
-                                 axis = 'z',
-                                 h_disp = - self.NutL + self.ShaftOut)
+        # flange, shaft and the hole of the leadscrew in one revolve.
+        # Profile (r, z), from the leadscrew hole to the outside:
+        #
+        #       LeadScrewR
+        #        :  _     ShaftOut
+        #        : | |___ 0
+        #        : |     |
+        #        : |  ___| -FlangeL
+        #        : | |
+        #        : |_|    ShaftOut - NutL
+        #        :   ShaftR  FlangeR
+        #
+        nut_rz = [(self.LeadScrewR, - self.NutL + self.ShaftOut),
+                  (self.ShaftR,     - self.NutL + self.ShaftOut),
+                  (self.ShaftR,     - self.FlangeL),
+                  (self.FlangeR,    - self.FlangeL),
+                  (self.FlangeR,    0),
+                  (self.ShaftR,     0),
+                  (self.ShaftR,     self.ShaftOut),
+                  (self.LeadScrewR, self.ShaftOut)]
+        nut_cyls = fcfun.addRevolve_rz (nut_rz, "nut_cyls")
 
         holes_list = []
                       
-        leadscrew_hole = addCyl_pos ( r = self.LeadScrewR,
-                                      h = self.NutL + 2,
-                                      name = "leadscrew_hole",
-                                      axis = 'z',
-                                      h_disp = - self.NutL + self.ShaftOut -1)
-        holes_list.append (leadscrew_hole)
-
         flangescrew_hole1 = addCyl_pos ( r = self.FlangeScrewHoleD/2.0,
                                          h = self.FlangeL + 2,
                                          name = "flangescrew_hole1",
@@ -1039,10 +1119,6 @@ class T8Nut (object):
         nut_holes = doc.addObject("Part::MultiFuse", "nut_holes")
         nut_holes.Shapes = holes_list
 
-        nut_cyls = doc.addObject("Part::Fuse", "nut_cyls")
-        nut_cyls.Base = flange_cyl
-        nut_cyls.Tool = shaft_cyl
-
         if nutaxis == 'x':
             vrot = FreeCAD.Rotation (VY,90)
         elif nutaxis == '-x':
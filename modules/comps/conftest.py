@@ -0,0 +1,27 @@
+# ----------------------------------------------------------------------------
+# -- pytest configuration
+# -- comps library
+# -- The tests run on the FreeCAD stand-in (fcstub), without FreeCAD
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The tests are in tests/, run from this directory:
+#    python -m pytest tests
+# test_comps.py and test_parts3d.py are FreeCAD scripts, not pytest tests
+
+import os
+import sys
+
+filepath = os.path.dirname(os.path.abspath(__file__))
+if filepath not in sys.path:
+    sys.path.insert(0, filepath)
+
+# the stand-in, only if FreeCAD cannot be imported (see fcfun)
+os.environ.setdefault('COMPS_BACKEND', 'auto')
+import fcfun
+
+collect_ignore = ['test_comps.py', 'test_parts3d.py']
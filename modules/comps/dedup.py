@@ -0,0 +1,289 @@
+# ----------------------------------------------------------------------------
+# -- Shape deduplication
+# -- comps library
+# -- Finds the objects with the same shape, and makes them share it
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Many objects of the assembly have the same shape, made with different
+# names: bolt holes, bearings, ... Each Part::Feature keeps its own copy
+# of the shape. This pass takes a fingerprint of the shapes of the
+# Part::Feature objects of a document, and the objects with the same
+# fingerprint are made to share the shape of the first one, each one with
+# its own placement. The shapes are compared on their own coordinates
+# (without the placement of the object). By default the fingerprint has
+# the hash of the BREP, so only the shapes that are equal on their own
+# coordinates share it. Without it (brep = False) the shapes are compared
+# by their vertexes, that can be translated and rotated by multiples of
+# 90 degrees around the axes (AXIS_ROT_LIST), the way the parts are placed
+# in this library, but 2 shapes with the same vertexes and different faces
+# would be taken as the same.
+# It saves memory and the work of the recomputes, not disk: FreeCAD saves
+# the shape of each Part::Feature on its own .brp file of the FCStd, even
+# if it is shared with other objects.
+# The parametric objects (Part::Cut, Part::Cylinder, clones, ...) are not
+# changed, because their shape is computed again on each recompute. But
+# the objects that are repeated in the assembly are usually Draft clones
+# of a Part::Feature (i.e. the bars of the frame), and the Part::Feature
+# of different families of clones may be the same (i.e. the X and Y bars
+# of the frame): when the shape of that object is changed, its clones get
+# the same change of placement, so they stay where they were.
+#
+#  report = dedup.dedup_doc (doc)
+#  logger.info (report['collapsed'])
+
+import FreeCAD
+import hashlib
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- axis rotations -------------------------------------------
+# The 24 rotations that take the axes to the axes, as tuples of the rows
+# of the 3x3 matrix. The first one is the identity
+
+def axis_rotations ():
+
+    rot_list = []
+    for perm in itertools.permutations(range(3)):
+        # parity of the permutation
+        perm_sign = 1
+        for i, j in itertools.combinations(range(3), 2):
+            if perm[i] > perm[j]:
+                perm_sign = - perm_sign
+        for signs in itertools.product((1, -1), repeat = 3):
+            if perm_sign * signs[0] * signs[1] * signs[2] != 1:
+                continue  # it would be a mirror
+            mat = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+            for row in range(3):
+                mat[row][perm[row]] = signs[row]
+            rot_list.append(tuple([tuple(row) for row in mat]))
+    return rot_list
+
+AXIS_ROT_LIST = axis_rotations()
+
+
+def mat_vec (mat, pt):
+    return tuple([mat[row][0] * pt[0] + mat[row][1] * pt[1]
+                  + mat[row][2] * pt[2] for row in range(3)])
+
+
+def mat_transp (mat):
+    return tuple([tuple([mat[col][row] for col in range(3)])
+                  for row in range(3)])
+
+
+def mat_mult (mat1, mat2):
+    return tuple([tuple([sum([mat1[row][k] * mat2[k][col] for k in range(3)])
+                         for col in range(3)]) for row in range(3)])
+
+
+# FreeCAD.Placement of a rotation matrix (AXIS_ROT_LIST) and a translation
+def mat_placement (mat, pos):
+    fcmat = FreeCAD.Matrix(mat[0][0], mat[0][1], mat[0][2], pos[0],
+                           mat[1][0], mat[1][1], mat[1][2], pos[1],
+                           mat[2][0], mat[2][1], mat[2][2], pos[2],
+                           0, 0, 0, 1)
+    return FreeCAD.Placement(fcmat)
+
+
+# ---------- local_shape ----------------------------------------------
+# copy of the shape on its own coordinates, without its placement
+
+def local_shape (shp):
+    shp_local = shp.copy()
+    shp_local.Placement = FreeCAD.Placement()
+    return shp_local
+
+
+# ---------- canonical_vertexes ---------------------------------------
+# Takes the shape to a canonical position: rotated by the rotation of
+# AXIS_ROT_LIST that gives the smallest list of vertexes, and translated to
+# have the minimum of its bounding box on the origin.
+# shp:     shape on its own coordinates (local_shape)
+# ndigits: decimal digits that are compared
+# rotate:  if False, only the identity rotation is used
+# Returns a tuple (vtx_list, mat, offs):
+#   vtx_list: sorted list of the vertexes on the canonical position
+#   mat:      rotation matrix (AXIS_ROT_LIST)
+#   offs:     translation (tuple), canonical point = mat * point - offs
+
+def canonical_vertexes (shp, ndigits = 3, rotate = True):
+
+    bbox = shp.BoundBox
+    corner_list = list(itertools.product((bbox.XMin, bbox.XMax),
+                                         (bbox.YMin, bbox.YMax),
+                                         (bbox.ZMin, bbox.ZMax)))
+    pt_list = [(vtx.Point.x, vtx.Point.y, vtx.Point.z)
+               for vtx in shp.Vertexes]
+    if rotate:
+        rot_list = AXIS_ROT_LIST
+    else:
+        rot_list = AXIS_ROT_LIST[:1]
+    canon = None
+    for mat in rot_list:
+        # the rotated bounding box is the box of the rotated corners
+        rcorner_list = [mat_vec(mat, pt) for pt in corner_list]
+        offs = tuple([min([pt[i] for pt in rcorner_list]) for i in range(3)])
+        # + 0. to take the -0.0 to 0.0
+        vtx_list = sorted([tuple([round(rpt[i] - offs[i], ndigits) + 0.
+                                  for i in range(3)])
+                           for rpt in [mat_vec(mat, pt) for pt in pt_list]])
+        # the box lengths too, the vertexes may not reach the box
+        vtx_list.insert(0, tuple([round(max([pt[i] for pt in rcorner_list])
+                                        - offs[i], ndigits) + 0.
+                                  for i in range(3)]))
+        if canon is None or vtx_list < canon[0]:
+            canon = (vtx_list, mat, offs)
+    return canon
+
+
+# ---------- shape_fingerprint ----------------------------------------
+# returns a tuple that is the same for the shapes that are equal, but
+# translated or rotated (see canonical_vertexes).
+# The shape has to be on its own coordinates (local_shape)
+# It has:
+#   - the shape type and the number of solids, faces, edges and vertexes
+#   - the volume
+#   - the principal values of the matrix of inertia, if the shape has it
+#   - a hash of the vertexes on the canonical position (canonical_vertexes)
+#     that includes the dimensions of the bounding box
+#   - if brep (default): a hash of the BREP of the shape, this is slower,
+#     but it doesn't take as equal the shapes that only have the same
+#     vertexes.
+#     The BREP also depends on the position of the shape, so only the
+#     shapes that are equal on their own coordinates have the same.
+# ndigits: decimal digits that are compared
+# canon: the result of canonical_vertexes, if it has been calculated
+
+def shape_fingerprint (shp, ndigits = 3, brep = True, canon = None):
+
+    if canon is None:
+        canon = canonical_vertexes(shp, ndigits = ndigits)
+    fprint = [shp.ShapeType,
+              len(shp.Solids), len(shp.Faces),
+              len(shp.Edges), len(shp.Vertexes),
+              round(shp.Volume, ndigits)]
+    inertia = getattr(shp, 'MatrixOfInertia', None)
+    if inertia is not None:
+        # the rotations of the axes exchange the diagonal values and
+        # change the sign of the others
+        fprint.extend(sorted([round(inertia.A11, ndigits),
+                              round(inertia.A22, ndigits),
+                              round(inertia.A33, ndigits)]))
+        fprint.extend(sorted([round(abs(inertia.A12), ndigits),
+                              round(abs(inertia.A13), ndigits),
+                              round(abs(inertia.A23), ndigits)]))
+    fprint.append(hashlib.md5(repr(canon[0]).encode()).hexdigest())
+    if brep:
+        fprint.append(hashlib.md5(
+                          shp.exportBrepToString().encode()).hexdigest())
+    return tuple(fprint)
+
+
+# ---------- clone_list -----------------------------------------------
+# The Draft clones of the object. The clones take the shape of the
+# object on its own coordinates, without its placement, so when its shape
+# is changed for another one with a different placement, the placement of
+# the clones has to change the same way
+
+def clone_list (fco):
+    return [fco_in for fco_in in fco.InList
+            if fco_in.TypeId == 'Part::FeaturePython'
+            and hasattr(fco_in, 'Objects')]
+
+
+# True if the object has Draft clones
+def is_clone_source (fco):
+    return len(clone_list(fco)) > 0
+
+
+# ---------- dedup_doc -----------------------------------------------
+# The Part::Feature objects of the document with the same shape share the
+# shape of the first of them. The clones of an object whose shape is
+# changed take the same change on their placement (see clone_list), the
+# clones of clones are not supported: these objects are not changed
+# doc:     FreeCAD document, if None, the active document
+# ndigits, brep: see shape_fingerprint
+# rotate:  see canonical_vertexes, only if not brep: the BREP is not the
+#          same for the rotated shapes
+# Returns a dictionary with the report:
+#   'objects'  : number of Part::Feature objects checked
+#   'groups'   : number of different shapes
+#   'collapsed': list of tuples (object name, name of the object whose
+#                shape it takes now)
+#   'clones'   : number of clones of the collapsed objects, whose
+#                placement has been changed
+#   'subshapes_saved': faces, edges and vertexes that are not in memory
+#                any more (an estimation of the memory saved)
+#   'brep_bytes_saved': size of the BREP of the shapes that are not in
+#                memory any more, only if brep
+
+def dedup_doc (doc = None, ndigits = 3, brep = True, rotate = True):
+
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+
+    # key: fingerprint, value: (reference object, its canonical_vertexes)
+    ref_dict = {}
+    report = {'objects'          : 0,
+              'groups'           : 0,
+              'collapsed'        : [],
+              'clones'           : 0,
+              'subshapes_saved'  : 0,
+              'brep_bytes_saved' : 0}
+
+    for fco in doc.Objects:
+        if fco.TypeId != 'Part::Feature' or fco.Shape.isNull():
+            continue
+        report['objects'] += 1
+        shp_local = local_shape(fco.Shape)
+        canon = canonical_vertexes(shp_local, ndigits = ndigits,
+                                   rotate = rotate and not brep)
+        fprint = shape_fingerprint(shp_local, ndigits = ndigits, brep = brep,
+                                   canon = canon)
+        if fprint not in ref_dict:
+            ref_dict[fprint] = (fco, canon)
+            continue
+        fco_clones = clone_list(fco)
+        if [clone for clone in fco_clones if is_clone_source(clone)]:
+            logger.debug('dedup: %s has clones of clones, not changed'
+                         % fco.Name)
+            continue
+        ref_fco, ref_canon = ref_dict[fprint]
+        # on the canonical position both are the same:
+        #   mat * point - offs = ref_mat * ref_point - ref_offs
+        # so, on its own coordinates, the shape of the object is:
+        #   point = mat^T * ref_mat * ref_point + mat^T * (offs - ref_offs)
+        mat_t = mat_transp(canon[1])
+        rel_pos = mat_vec(mat_t, [canon[2][i] - ref_canon[2][i]
+                                  for i in range(3)])
+        rel_plm = mat_placement(mat_mult(mat_t, ref_canon[1]), rel_pos)
+        plm = fco.Placement.multiply(rel_plm)
+        report['subshapes_saved'] += (  len(shp_local.Faces)
+                                      + len(shp_local.Edges)
+                                      + len(shp_local.Vertexes))
+        if brep:
+            report['brep_bytes_saved'] += len(shp_local.exportBrepToString())
+        # the shape is shared, and its placement is the one of the object
+        fco.Shape = ref_fco.Shape
+        fco.Placement = plm
+        # the clones have the old shape of the object on their placement
+        for clone in fco_clones:
+            clone.Placement = clone.Placement.multiply(rel_plm)
+        report['clones'] += len(fco_clones)
+        report['collapsed'].append((fco.Name, ref_fco.Name))
+
+    report['groups'] = len(ref_dict)
+    logger.info('dedup: %d objects, %d shapes, %d collapsed (and %d '
+                'clones), %d subshapes saved'
+                % (report['objects'], report['groups'],
+                   len(report['collapsed']), report['clones'],
+                   report['subshapes_saved']))
+    return report
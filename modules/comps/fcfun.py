@@ -10,6 +10,25 @@
 # --- LGPL Licence
 # ----------------------------------------------------------------------------
 
+import os;
+import fcstub;
+
+# geometry backend: FreeCAD, or the pure python stand-in of fcstub.py.
+# It is chosen with the environment variable COMPS_BACKEND, so fcfun has
+# to be imported before the other modules of the library (that import
+# FreeCAD at the top):
+#   'freecad': FreeCAD (default)
+#   'stub':    the stand-in, even if FreeCAD can be imported
+#   'auto':    FreeCAD, or the stand-in if FreeCAD cannot be imported
+# BACKEND tells the one in use: 'freecad' or 'stub'
+BACKEND_CHOICES = ('freecad', 'stub', 'auto')
+backend_choice = os.environ.get('COMPS_BACKEND', 'freecad')
+if backend_choice not in BACKEND_CHOICES:
+    raise ValueError('fcfun: COMPS_BACKEND has to be one of %s, not %s'
+                     % (', '.join(BACKEND_CHOICES), backend_choice))
+if backend_choice != 'freecad':
+    fcstub.install(force = (backend_choice == 'stub'))
+
 import FreeCAD;
 import Part;
 import math;
@@ -38,6 +57,9 @@ from kcomp import LAYER3D_H
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# the backend in use, see COMPS_BACKEND above
+BACKEND = getattr(FreeCAD, 'BACKEND', 'freecad')
+
 # vector constants
 V0 = FreeCAD.Vector(0,0,0)
 VX = FreeCAD.Vector(1,0,0)
@@ -72,6 +94,45 @@ CIAN_05   = (0.5, 1.0, 1.0)
 # no rotation vector
 V0ROT = FreeCAD.Rotation(VZ,0)
 
+# tolerance to compare lengths and positions of the geometry
+# not the same as kcomp.TOL, which is the tolerance for printing
+LEN_TOL = 0.0001
+
+
+# ---------- class lazyprop ------------------------------------------------
+# Decorator of a method without arguments, that makes it an attribute that
+# is computed the first time that it is read, and kept for the next times:
+# it is stored on the object, with the same name.
+# So the components only build the geometry (FreeCAD objects or shapes)
+# that is used. The dimensions are computed on __init__
+#
+#  class Comp (object):
+#      @lazyprop
+#      def fco (self):
+#          ... build the FreeCAD object
+#          return fco
+#
+#  lazyprop.is_built (comp, 'fco') : if it has been built
+
+class lazyprop (object):
+
+    def __init__ (self, fget):
+        self.fget = fget
+        self.__name__ = fget.__name__
+        self.__doc__ = fget.__doc__
+
+    def __get__ (self, obj, objtype = None):
+        if obj is None:
+            return self
+        value = self.fget(obj)
+        # it is stored on the object, so next time this is not called
+        obj.__dict__[self.__name__] = value
+        return value
+
+    @staticmethod
+    def is_built (obj, name):
+        return name in obj.__dict__
+
 
 def addBox(x, y, z, name, cx= False, cy=False):
     # we have to bring the active document
@@ -94,43 +155,15 @@ def addBox(x, y, z, name, cx= False, cy=False):
 # adds a box, centered on the specified axis, with its
 # Placement and Rotation at zero. So it can be referenced absolutely from
 # its given position
+# It is a Part::Feature with the shape of shp_boxcen, so its shape is there
+# without recomputing the document
 
 def addBox_cen(x, y, z, name, cx= False, cy=False, cz=False):
     # we have to bring the active document
     doc = FreeCAD.ActiveDocument
 
-    if cx == True:
-        x0 = -x/2.0
-        x1 =  x/2.0
-    else:
-        x0 =  0
-        x1 =  x
-    if cy == True:
-        y0 = -y/2.0
-        y1 =  y/2.0
-    else:
-        y0 =  0
-        y1 =  y
-    if cz == True:
-        z0 = - z/2.0
-    else:
-        z0 = 0
-
-    p00 = FreeCAD.Vector (x0,y0,z0)
-    p10 = FreeCAD.Vector (x1,y0,z0)
-    p11 = FreeCAD.Vector (x1,y1,z0)
-    p01 = FreeCAD.Vector (x0,y1,z0)
-    sq_list = [p00, p10, p11, p01]
-    square =  doc.addObject("Part::Polygon",name + "_sq")
-    square.Nodes =sq_list
-    square.Close = True
-    square.ViewObject.Visibility = False
-    box = doc.addObject ("Part::Extrusion", name)
-    box.Base = square
-    box.Dir = (0,0, z)
-    box.Solid = True
-    # we need to recompute if we want to do operations on this object
-    doc.recompute()
+    box = doc.addObject ("Part::Feature", name)
+    box.Shape = shp_boxcen (x, y, z, cx=cx, cy=cy, cz=cz)
     
     return box
 
@@ -140,37 +173,22 @@ def addBox_cen(x, y, z, name, cx= False, cy=False, cz=False):
 # its given position
 
 def shp_boxcen(x, y, z, cx= False, cy=False, cz=False, pos=V0):
-    # we have to bring the active document
-    doc = FreeCAD.ActiveDocument
 
     if cx == True:
         x0 = -x/2.0
-        x1 =  x/2.0
     else:
         x0 =  0
-        x1 =  x
     if cy == True:
         y0 = -y/2.0
-        y1 =  y/2.0
     else:
         y0 =  0
-        y1 =  y
     if cz == True:
         z0 = - z/2.0
     else:
         z0 = 0
 
-    p00 = FreeCAD.Vector (x0,y0,z0) + pos
-    p10 = FreeCAD.Vector (x1,y0,z0) + pos
-    p11 = FreeCAD.Vector (x1,y1,z0) + pos
-    p01 = FreeCAD.Vector (x0,y1,z0) + pos
-    # the square
-    shp_wire_sq = Part.makePolygon([p00, p10, p11, p01, p00])
-    # the face
-    shp_face_sq = Part.Face(shp_wire_sq)
-    shp_box = shp_face_sq.extrude(FreeCAD.Vector(0,0,z))
-
-    doc.recompute()
+    # the box primitive, instead of the extrusion of a square
+    shp_box = Part.makeBox (x, y, z, FreeCAD.Vector (x0,y0,z0) + pos)
     
     return shp_box
 
@@ -180,19 +198,11 @@ def shp_boxcenfill (x, y, z, fillrad,
                    cx= False, cy=False, cz=False, pos=V0):
 
     shp_box = shp_boxcen (x=x, y=y, z=z, cx=cx, cy=cy, cz=cz, pos=pos)
+    edgind = EdgeIndex(shp_box)
     edg_list = []
-    for ind, edge in enumerate(shp_box.Edges):
-        vertex0 = edge.Vertexes[0]
-        vertex1 = edge.Vertexes[1]
-        p0 = vertex0.Point
-        p1 = vertex1.Point
-        vdif = p1 - p0
-        if vdif.x != 0 and fx==True:
-            edg_list.append(edge)
-        elif vdif.y != 0 and fy==True:
-            edg_list.append(edge)
-        elif vdif.z != 0 and fz==True:
-            edg_list.append(edge)
+    for axis, fillaxis in (('x', fx), ('y', fy), ('z', fz)):
+        if fillaxis == True:
+            edg_list.extend(edgind.get_edges(axis = axis))
     shp_boxfill = shp_box.makeFillet(fillrad, edg_list)
     return (shp_boxfill)
 
@@ -219,37 +229,32 @@ def addCyl (r, h, name):
 #     h_disp: displacement on the height. 
 #             if 0, the base of the cylinder will be on the plane
 #             if -h/2: the plane will be cutting h/2
+# It is a Part::Feature with the shape of shp_cyl_pos
 def addCyl_pos (r, h, name, axis = 'z', h_disp = 0):
     # we have to bring the active document
     doc = FreeCAD.ActiveDocument
-    cir =  doc.addObject("Part::Circle", name + "_circ")
-    cir.Radius = r
+
+    cyl = doc.addObject ("Part::Feature", name)
+    cyl.Shape = shp_cyl_pos (r, h, axis = axis, h_disp = h_disp)
+
+    return cyl
+
+
+# same as addCyl_pos, but just creates the shape, with the cylinder
+# primitive, instead of the extrusion of a circle
+
+def shp_cyl_pos (r, h, axis = 'z', h_disp = 0):
 
     if axis == 'x':
-        rot = FreeCAD.Rotation (VY, 90)
-        cir.Placement.Base = (h_disp, 0, 0)
-        extdir = (h,0,0) # direction for the extrusion
+        normal = VX
     elif axis == 'y':
-        rot = FreeCAD.Rotation (VX, -90)
-        cir.Placement.Base = (0, h_disp, 0)
-        extdir = (0,h,0)
+        normal = VY
     else: # 'z' or any other 
-        rot = FreeCAD.Rotation (VZ, 0)
-        cir.Placement.Base = (0, 0, h_disp)
-        extdir = (0,0,h)
+        normal = VZ
 
-    cir.Placement.Rotation = rot
+    shpcyl = Part.makeCylinder (r, h, normal * h_disp, normal)
 
-    # to hide the circle
-    if cir.ViewObject != None:
-      cir.ViewObject.Visibility=False
-
-    cyl = doc.addObject ("Part::Extrusion", name)
-    cyl.Base = cir 
-    cyl.Dir  = extdir 
-    cyl.Solid  = True 
-
-    return cyl
+    return shpcyl
 
 
 
@@ -311,6 +316,18 @@ def shp_cyl (r, h, normal = VZ, pos = V0):
     return shpcyl
 
 
+# returns the shape shp on the placement plm, sharing its geometry: the
+# TShape of OCC is not copied, only the location of the new shape is set,
+# as the Placement of an object (Shape.isPartner is True).
+# Used to place many times a shape that is kept to be reused
+#     shp: shape, on the origin (identity placement)
+#     plm: FreeCAD.Placement, that can only translate and rotate
+
+def shp_placed (shp, plm):
+    # a rigid transformation only changes the location
+    return shp.transformed(plm.toMatrix())
+
+
 
 # Add cylinder, with inner hole:
 #     r_ext: external radius,
@@ -328,28 +345,21 @@ def shp_cyl (r, h, normal = VZ, pos = V0):
 def addCylHole (r_ext, r_int, h, name, axis = 'z', h_disp = 0):
     # we have to bring the active document
     doc = FreeCAD.ActiveDocument
-    cyl_ext =  addCyl (r_ext, h, name + "_ext")
-    cyl_int =  addCyl (r_int, h + 2, name + "_int")
 
     if axis == 'x':
-        rot = FreeCAD.Rotation (VY, 90)
-        cyl_ext.Placement.Base = (h_disp, 0, 0)
-        cyl_int.Placement.Base = (h_disp-1, 0, 0)
+        normal = VX
     elif axis == 'y':
-        rot = FreeCAD.Rotation (VX, -90)
-        cyl_ext.Placement.Base = (0, h_disp, 0)
-        cyl_int.Placement.Base = (0, h_disp-1, 0)
+        normal = VY
     else: # 'z' or any other 
-        rot = FreeCAD.Rotation (VZ, 0)
-        cyl_ext.Placement.Base = (0, 0, h_disp)
-        cyl_int.Placement.Base = (0, 0, h_disp-1)
+        normal = VZ
 
-    cyl_ext.Placement.Rotation = rot
-    cyl_int.Placement.Rotation = rot
+    # the displacement is in the profile, so the placement base is free
+    # to be changed
+    shp_cylhole = shp_revolve_rz (rz_hollowcyl (r_ext, r_int, h, h_disp),
+                                  normal = normal)
 
-    cylHole = doc.addObject("Part::Cut", name)
-    cylHole.Base = cyl_ext
-    cylHole.Tool = cyl_int
+    cylHole = doc.addObject("Part::Feature", name)
+    cylHole.Shape = shp_cylhole
 
     return cylHole
 
@@ -368,30 +378,121 @@ def addCylHolePos (r_out, r_in, h, name, normal = VZ, pos = V0):
     # we have to bring the active document
     doc = FreeCAD.ActiveDocument
 
-    cir_out =  Part.makeCircle (r_out,   # Radius
-                                pos,     # Position
-                                normal)  # direction
-    cir_in =  Part.makeCircle (r_in,   # Radius
-                                pos,     # Position
-                                normal)  # direction
-
-    #print "in: %", cir_in.Curve
-    #print "out: %", cir_out.Curve
-
-    wire_cir_out = Part.Wire(cir_out)
-    wire_cir_in  = Part.Wire(cir_in)
-    face_cir_out = Part.Face(wire_cir_out)
-    face_cir_in  = Part.Face(wire_cir_in)
-
-    face_cir_hole = face_cir_out.cut(face_cir_in)
-    dir_extrus = DraftVecUtils.scaleTo(normal, h)
-    shp_cyl_hole = face_cir_hole.extrude(dir_extrus)
+    shp_cyl_hole = shp_revolve_rz (rz_hollowcyl (r_out, r_in, h),
+                                   normal = normal,
+                                   pos = pos)
 
     cyl_hole = doc.addObject("Part::Feature", name)
     cyl_hole.Shape = shp_cyl_hole
 
     return cyl_hole
 
+
+# ------------------- def shp_revolve_rz
+# Creates a solid of revolution (shape) revolving a profile around its axis.
+# Axisymmetric parts (washers, bearings, nuts, bolts, ...) are made with
+# just one revolve, instead of fusing and cutting cylinders.
+#     rz_list: list of tuples (r, z) of the points of the closed profile,
+#              r is the distance to the axis (r >= 0), z the position on
+#              the axis. The last point will be joined to the first one
+#     normal: FreeCAD.Vector of the direction of the axis (z of the profile)
+#     pos: FreeCAD.Vector of the position of z=0 on the axis
+#
+#                   z
+#          r_in     |  r_out
+#           ___     |     ___
+#          |   |    |    |   |    rz_hollowcyl (r_out, r_in, h) is
+#          |   |    |    |   |    [(r_in,0), (r_out,0), (r_out,h), (r_in,h)]
+#          |___|    |    |___|
+#                   |___________ r
+
+def shp_revolve_rz (rz_list, normal = VZ, pos = V0):
+
+    nnormal = DraftVecUtils.scaleTo(normal, 1)
+    # radial direction of the profile: any perpendicular to the normal
+    if abs(nnormal.x) < 0.9:
+        rdir = DraftVecUtils.scaleTo(nnormal.cross(VX), 1)
+    else:
+        rdir = DraftVecUtils.scaleTo(nnormal.cross(VY), 1)
+    # the profile is made on its place, so the shape has no placement
+    pts = [pos + rdir * r + nnormal * z for (r, z) in rz_list]
+    if tuple(rz_list[0]) != tuple(rz_list[-1]):
+        pts.append(pts[0])
+
+    face_prof = Part.Face(Part.makePolygon(pts))
+    shp_rev = face_prof.revolve(pos, nnormal, 360)
+
+    return shp_rev
+
+
+# same as shp_revolve_rz, but creates a FreeCAD object
+
+def addRevolve_rz (rz_list, name, normal = VZ, pos = V0):
+    # we have to bring the active document
+    doc = FreeCAD.ActiveDocument
+
+    rev = doc.addObject("Part::Feature", name)
+    rev.Shape = shp_revolve_rz (rz_list, normal = normal, pos = pos)
+
+    return rev
+
+
+# ------------------- def rz_hollowcyl
+# profile (list of (r, z)) of a cylinder with an inner hole, for
+# shp_revolve_rz. If r_in is 0, it is a cylinder
+#     z0: position of the base of the cylinder
+
+def rz_hollowcyl (r_out, r_in, h, z0 = 0):
+
+    return [(r_in, z0), (r_out, z0), (r_out, z0 + h), (r_in, z0 + h)]
+
+
+# ------------------- def rz_hollowcyl_stack
+# profile (list of (r, z)) of a stack of hollow cylinders, one on top
+# of the other, as a single solid for shp_revolve_rz.
+# Each cylinder has to overlap radially with the next one, if not, they
+# would not be a single solid, and it raises a ValueError
+#     cyl_list: list of tuples (r_out, r_in, h), from bottom to top
+#     z0: position of the base of the stack
+#
+#         ____          the outer side goes up, and the inner side
+#        |    |___      goes down
+#     ___|        |
+#    |            |
+#    |____________|
+
+def rz_hollowcyl_stack (cyl_list, z0 = 0):
+
+    for ind in range(len(cyl_list) - 1):
+        r_out0, r_in0 = cyl_list[ind][:2]
+        r_out1, r_in1 = cyl_list[ind + 1][:2]
+        if max(r_in0, r_in1) >= min(r_out0, r_out1):
+            raise ValueError('rz_hollowcyl_stack: cylinders %d and %d do '
+                             'not overlap radially' % (ind, ind + 1))
+    outside = []
+    inside = []
+    z = z0
+    for (r_out, r_in, h) in cyl_list:
+        outside.extend([(r_out, z), (r_out, z + h)])
+        inside.extend([(r_in, z), (r_in, z + h)])
+        z += h
+    rz_list = [inside[0]] + outside + inside[:0:-1]
+    # points that repeat, when 2 cylinders have the same radius
+    rz_clean = []
+    for rz in rz_list:
+        if not rz_clean or rz != rz_clean[-1]:
+            rz_clean.append(rz)
+    # and points in the middle of a straight side, to have less faces
+    npts = len(rz_clean)
+    rz_simple = []
+    for ind, (r, z) in enumerate(rz_clean):
+        r_prev, z_prev = rz_clean[ind - 1]
+        r_next, z_next = rz_clean[(ind + 1) % npts]
+        if not ((r_prev == r == r_next) or (z_prev == z == z_next)):
+            rz_simple.append((r, z))
+    return rz_simple
+
+
 # ------------------- def shpRndRectWire
 # Creates a wire (shape), that is a rectangle with rounded edges.
 # if r== 0, it will be a rectangle
@@ -418,7 +519,7 @@ def shpRndRectWire (x=1, y=1, r= 0.5, zpos = 0):
     #doc = FreeCAD.ActiveDocument
 
     if 2*r >= x or 2*r >= y:
-        print "Radius too large: addRoundRectan"
+        print ("Radius too large: addRoundRectan")
         if x > y:
             r = y/2.0 - 0.1 # otherwise there will be a problem
         else:
@@ -658,84 +759,11 @@ def addBolt (r_shank, l_bolt, r_head, l_head,
 
     # we have to bring the active document
     doc = FreeCAD.ActiveDocument
-    elements = []
-    # shank
-    shank =  doc.addObject("Part::Cylinder", name + "_shank")
-    shank.Radius = r_shank
-    shank.Height = l_bolt + 2*extra
-    pos = FreeCAD.Vector(0,0,-extra)
-    shank.Placement = FreeCAD.Placement(pos, V0ROT, V0)
-    elements.append (shank)
-    # head:
-    if hex_head == 0:
-        head =  doc.addObject("Part::Cylinder", name + "_head")
-        head.Radius = r_head
-    else:
-        head =  doc.addObject("Part::Prism", name + "_head")
-        head.Polygon = 6
-        head.Circumradius = r_head
-
-    head.Height = l_head + extra
-    if headdown == 1:
-        zposhead = -extra
-    else:
-        zposhead = l_bolt - l_head
-    poshead =  FreeCAD.Vector(0,0,zposhead)
-    head.Placement.Base = poshead
-    elements.append (head)
-    # support for the shank:
-    if support==1 and kcomp.LAYER3D_H > 0:
-        sup1 = doc.addObject("Part::Prism", name + "_sup1")
-        sup1.Polygon = 3
-        sup1.Circumradius = r_shank * 2
-        # we could put it just on top of the head, but since we are going to 
-        # make an union, we put it from the bottom (no need to include extra)
-        # sup1.Height = kcomp.LAYER3D_H
-        # pos1 = FreeCAD.Vector(0,0,l_head)
-        # rot30z = FreeCAD.Rotation(VZ,30)
-        # sup1.Placement = FreeCAD.Placement(pos1, rot30z, V0)
-        sup1.Height = l_head + kcomp.LAYER3D_H
-        # rotation make only make sense for hexagonal head, but it doesn't
-        # matter for rounded head
-        rot30z = FreeCAD.Rotation(VZ,30)
-        if headdown == 1:
-            zposheadsup1 = 0
-        else:
-            zposheadsup1 = l_bolt - l_head - kcomp.LAYER3D_H
-        sup1.Placement.Base = FreeCAD.Vector(0,0,zposheadsup1)
-        sup1.Placement.Rotation = rot30z
-        # take vertex away:
-        if hex_head == 0:
-            sup1away = doc.addObject("Part::Cylinder", name + "_sup1away")
-            sup1away.Radius = r_head
-        else:
-            sup1away = doc.addObject("Part::Prism", name + "_sup1away")
-            sup1away.Polygon = 6
-            sup1away.Circumradius = r_head
-        # again, we take all the height
-        sup1away.Height =  l_head + kcomp.LAYER3D_H
-        sup1away.Placement.Base = sup1.Placement.Base
-        sup1cut = doc.addObject("Part::Common", "sup1cut")
-        sup1cut.Base = sup1
-        sup1cut.Tool = sup1away
-        elements.append (sup1cut)
-        # another support
-        # 1.15 is the relationship between the Radius and the Apothem
-        # of the hexagon: sqrt(3)/2 . I make it slightly smaller
-        sup2 = doc.addObject("Part::Prism", name + "_sup2")
-        sup2.Polygon = 6
-        sup2.Circumradius = r_shank * 1.15
-        sup2.Height = l_head + 2* kcomp.LAYER3D_H
-        if headdown == 1:
-            zposheadsup2 = 0
-        else:
-            zposheadsup2 = l_bolt - l_head - 2* kcomp.LAYER3D_H
-        sup2.Placement.Base = FreeCAD.Vector(0,0,zposheadsup2)
-        elements.append (sup2)
-  
-    # union of elements
-    bolt =  doc.addObject("Part::MultiFuse", name)
-    bolt.Shapes = elements
+    # just one object, with the shape of the library of holes
+    bolt = doc.addObject("Part::Feature", name)
+    bolt.Shape = shp_bolt (r_shank, l_bolt, r_head, l_head,
+                           hex_head = hex_head, extra = extra,
+                           support = support, headdown = headdown)
     return bolt
 """
     bolt =  doc.addObject("Part::Fuse", name)
@@ -778,69 +806,189 @@ def addBoltNut_hole (r_shank,        l_bolt,
 
     # we have to bring the active document
     doc = FreeCAD.ActiveDocument
+    boltnut = doc.addObject("Part::Feature", name)
+    boltnut.Shape = shp_boltnut_hole (r_shank, l_bolt, r_head, l_head,
+                                      r_nut, l_nut,
+                                      hex_head = hex_head, extra = extra,
+                                      supp_head = supp_head,
+                                      supp_nut = supp_nut,
+                                      headdown = headdown)
+    return boltnut
+
+
+# -------------------- library of bolt holes -----------------------------
+# The holes of the bolts (addBolt) and of the bolts and nuts
+# (addBoltNut_hole) are the same for many parts, with the same kcomp
+# values (D912, D934, ...). The shape of each hole is made once, as one
+# solid, and kept in bolthole_shp_dict. The objects made with addBolt and
+# addBoltNut_hole are a Part::Feature with that shape, that can be moved
+# changing its Placement. shp_bolt and shp_boltnut_hole return a copy of
+# the shape of the library, so it is not changed when the shape that they
+# return is moved or modified
+# key: ('bolt' or 'boltnut', the dimensions (rounded), kcomp.LAYER3D_H)
+# value: the shape
+
+bolthole_shp_dict = {}
+
+def bolthole_key (kind, *dims):
+    return ((kind,) + tuple([round(dim, 6) for dim in dims])
+            + (kcomp.LAYER3D_H,))
+
+
+# ------------------- def shp_regprism
+# shape of a regular prism, as the Part::Prism, along the Z axis
+#     n_sides: number of sides of the polygon
+#     circ_r: circumradius of the polygon
+#     h: height
+#     zpos: position of the base on the Z axis
+#     rot: rotation (degrees) of the polygon around the Z axis. With 0, the
+#          first vertex is on the X axis
+
+def shp_regprism (n_sides, circ_r, h, zpos = 0, rot = 0):
+
+    pts = [FreeCAD.Vector(
+                     circ_r * math.cos(math.radians(rot + 360. * ind/n_sides)),
+                     circ_r * math.sin(math.radians(rot + 360. * ind/n_sides)),
+                     zpos)
+           for ind in range(n_sides)]
+    face = Part.Face(Part.makePolygon(pts + pts[:1]))
+    return face.extrude(FreeCAD.Vector(0, 0, h))
+
+
+# ------------------- def shp_bolt
+# shape of the hole of a bolt, the same arguments as addBolt
+# It is a copy of the shape of bolthole_shp_dict, that is made if it is
+# not there
+
+def shp_bolt (r_shank, l_bolt, r_head, l_head,
+              hex_head = 0, extra=1, support=1, headdown = 1):
+
+    with_support = (support==1 and kcomp.LAYER3D_H > 0)
+    key = bolthole_key ('bolt', r_shank, l_bolt, r_head, l_head,
+                        hex_head, extra, with_support, headdown)
+    shp_hole = bolthole_shp_dict.get(key)
+    if shp_hole is not None:
+        return shp_hole.copy()
+
+    elements = []
+    if hex_head == 0:
+        # rounded head: the shank and the head are made in one revolve
+        if headdown == 1:
+            rz_list = [(0, -extra), (r_head, -extra), (r_head, l_head),
+                       (r_shank, l_head), (r_shank, l_bolt + extra),
+                       (0, l_bolt + extra)]
+        else:
+            rz_list = [(0, -extra), (r_shank, -extra),
+                       (r_shank, l_bolt - l_head),
+                       (r_head, l_bolt - l_head), (r_head, l_bolt + extra),
+                       (0, l_bolt + extra)]
+        elements.append (shp_revolve_rz (rz_list))
+    else:
+        # shank
+        elements.append (Part.makeCylinder (r_shank, l_bolt + 2*extra,
+                                            FreeCAD.Vector(0,0,-extra)))
+        # head:
+        if headdown == 1:
+            zposhead = -extra
+        else:
+            zposhead = l_bolt - l_head
+        elements.append (shp_regprism (6, r_head, l_head + extra,
+                                       zpos = zposhead))
+    # support for the shank:
+    if with_support:
+        # from the bottom of the head, we make an union
+        if headdown == 1:
+            zposheadsup1 = 0
+        else:
+            zposheadsup1 = l_bolt - l_head - kcomp.LAYER3D_H
+        # rotation make only make sense for hexagonal head, but it doesn't
+        # matter for rounded head
+        shp_sup1 = shp_regprism (3, r_shank * 2, l_head + kcomp.LAYER3D_H,
+                                 zpos = zposheadsup1, rot = 30)
+        # take vertex away:
+        if hex_head == 0:
+            shp_sup1away = Part.makeCylinder (r_head,
+                                              l_head + kcomp.LAYER3D_H,
+                                              FreeCAD.Vector(0,0,zposheadsup1))
+        else:
+            shp_sup1away = shp_regprism (6, r_head, l_head + kcomp.LAYER3D_H,
+                                         zpos = zposheadsup1)
+        elements.append (shp_sup1.common(shp_sup1away))
+        # another support
+        # 1.15 is the relationship between the Radius and the Apothem
+        # of the hexagon: sqrt(3)/2 . I make it slightly smaller
+        if headdown == 1:
+            zposheadsup2 = 0
+        else:
+            zposheadsup2 = l_bolt - l_head - 2* kcomp.LAYER3D_H
+        elements.append (shp_regprism (6, r_shank * 1.15,
+                                       l_head + 2* kcomp.LAYER3D_H,
+                                       zpos = zposheadsup2))
+  
+    # union of elements
+    if len(elements) == 1:
+        shp_hole = elements[0]
+    else:
+        shp_hole = elements[0].multiFuse(elements[1:])
+    bolthole_shp_dict[key] = shp_hole
+    return shp_hole.copy()
+
+
+# ------------------- def shp_boltnut_hole
+# shape of the hole of a bolt and its nut, the same arguments as
+# addBoltNut_hole. It is a copy of the shape of bolthole_shp_dict, that is
+# made if it is not there
+
+def shp_boltnut_hole (r_shank,        l_bolt, 
+                      r_head,         l_head,
+                      r_nut,          l_nut,
+                      hex_head = 0,   extra=1,
+                      supp_head=1,    supp_nut=1,
+                      headdown=1):
+
+    with_support = (supp_nut == 1 and kcomp.LAYER3D_H > 0)
+    key = bolthole_key ('boltnut', r_shank, l_bolt, r_head, l_head,
+                        r_nut, l_nut, hex_head, extra, supp_head,
+                        with_support, headdown)
+    shp_hole = bolthole_shp_dict.get(key)
+    if shp_hole is not None:
+        return shp_hole.copy()
+
     elements = []
-    bolt = addBolt  (r_shank  = r_shank,
-                     l_bolt   = l_bolt,
-                     r_head   = r_head,
-                     l_head   = l_head,
-                     hex_head = hex_head,
-                     extra    = extra,
-                     support  = supp_head,
-                     headdown = headdown,
-                     name     = name + "_bolt")
-
-    nut = doc.addObject("Part::Prism", name + "_nut")
-    nut.Polygon = 6
-    nut.Circumradius = r_nut
-    nut.Height = l_nut + extra
     if headdown == 1:
-        pos = FreeCAD.Vector (0, 0, l_bolt - l_nut)
+        zpos_nut = l_bolt - l_nut
     else:
-        pos = FreeCAD.Vector (0, 0, -extra)
-    nut.Placement = FreeCAD.Placement(pos, V0ROT, V0)
-    elements.append (bolt)
-    elements.append (nut)
+        zpos_nut = -extra
+    elements.append (shp_regprism (6, r_nut, l_nut + extra, zpos = zpos_nut))
     # support for the nut
-    if supp_nut == 1 and kcomp.LAYER3D_H > 0:
-        supnut1 = doc.addObject("Part::Prism", name + "_nutsup1")
-        supnut1.Polygon = 3
-        supnut1.Circumradius = r_shank * 2
-        supnut1.Height = l_nut + kcomp.LAYER3D_H
+    if with_support:
         if headdown == 1:
-            pos_supnut1 = FreeCAD.Vector (0, 0,
-                                          l_bolt - l_nut - kcomp.LAYER3D_H)
+            zpos_supnut1 = l_bolt - l_nut - kcomp.LAYER3D_H
         else:
-            pos_supnut1 = V0
-        rot30z = FreeCAD.Rotation(VZ,30)
-        supnut1.Placement = FreeCAD.Placement(pos_supnut1, rot30z, V0)
+            zpos_supnut1 = 0
+        shp_supnut1 = shp_regprism (3, r_shank * 2, l_nut + kcomp.LAYER3D_H,
+                                    zpos = zpos_supnut1, rot = 30)
         # take vertex away:
-        supnut1away = doc.addObject("Part::Prism", name + "_supnut1away")
-        supnut1away.Polygon = 6
-        supnut1away.Circumradius = r_nut
-        supnut1away.Height =  supnut1.Height
-        supnut1away.Placement = FreeCAD.Placement(pos_supnut1, V0ROT, V0)
-        supnut1cut = doc.addObject("Part::Common", "supnut1_cut")
-        supnut1cut.Base = supnut1
-        supnut1cut.Tool = supnut1away
-        elements.append (supnut1cut)
+        shp_supnut1away = shp_regprism (6, r_nut, l_nut + kcomp.LAYER3D_H,
+                                        zpos = zpos_supnut1)
+        elements.append (shp_supnut1.common(shp_supnut1away))
         # the other support
         # 1.15 is the relationship between the Radius and the Apothem
         # of the hexagon: sqrt(3)/2 . I make it slightly smaller
-        supnut2 = doc.addObject("Part::Prism", name + "_supnut2")
-        supnut2.Polygon = 6
-        supnut2.Circumradius = r_shank * 1.15
-        supnut2.Height = l_nut + 2* kcomp.LAYER3D_H
         if headdown == 1:
-            pos_supnut2 = FreeCAD.Vector(0,0,
-                                         l_bolt - l_nut - 2*kcomp.LAYER3D_H)
+            zpos_supnut2 = l_bolt - l_nut - 2*kcomp.LAYER3D_H
         else:
-            pos_supnut2 = V0
-        supnut2.Placement = FreeCAD.Placement(pos_supnut2, V0ROT, V0)
-        elements.append (supnut2)
-
-    boltnut = doc.addObject("Part::MultiFuse", "boltnut")
-    boltnut.Shapes = elements
-    return boltnut
+            zpos_supnut2 = 0
+        elements.append (shp_regprism (6, r_shank * 1.15,
+                                       l_nut + 2* kcomp.LAYER3D_H,
+                                       zpos = zpos_supnut2))
+
+    shp_bolt_hole = shp_bolt (r_shank, l_bolt, r_head, l_head,
+                              hex_head = hex_head, extra = extra,
+                              support = supp_head, headdown = headdown)
+    shp_hole = shp_bolt_hole.multiFuse(elements)
+    bolthole_shp_dict[key] = shp_hole
+    return shp_hole.copy()
       
   
 # -------------------- NutHole -----------------------------
@@ -952,28 +1100,121 @@ class NutHole (object):
 
 
 
+# ---------------- class EdgeIndex -----------------------------------
+# Index of the edges of a shape, to select them without going through all
+# the edges and without comparing floats with ==, that misses edges after
+# any floating-point drift.
+# The edges are bucketed by their length, their direction and the position
+# of their center, rounded to the tolerance
+# Arguments:
+# shp: the shape (not the FreeCAD object) whose edges are indexed
+# tol: tolerance to consider two lengths or positions the same
+# Attributes:
+# shp : the shape
+# tol : the tolerance
+# edg_info : list of tuples (length, axis, center) for each edge.
+#            Its index is the edge number - 1
+#            axis: 'x', 'y', 'z' if it is a straight edge parallel to
+#            that axis, '' otherwise (curves or other directions)
+# len_dict : dictionary. key: the length divided by the tolerance,
+#            value: list of the edge numbers
+# axis_dict: dictionary. key: 'x', 'y', 'z' or ''.
+#            value: list of the edge numbers
+#
+# The edge numbers start on 1, as the Edges of Part::Fillet
+#
+# Example: edges of length 10 parallel to Z, on the bottom (z=0):
+#    edgind = EdgeIndex(box.Shape)
+#    edgind.get_ind(length = 10, axis = 'z', zpos = 0)
+
+class EdgeIndex (object):
+
+    def __init__ (self, shp, tol = LEN_TOL):
+        self.shp = shp
+        self.tol = tol
+        self.edg_info = []
+        self.len_dict = {}
+        self.axis_dict = {'x': [], 'y': [], 'z': [], '': []}
+        for edge_ind, edge_i in enumerate(shp.Edges, 1):
+            length = edge_i.Length
+            axis = ''
+            p0 = edge_i.Vertexes[0].Point
+            p1 = edge_i.Vertexes[-1].Point
+            vdif = p1 - p0
+            # it is a straight edge if the distance between the vertexes
+            # is its length
+            if abs(vdif.Length - length) <= tol:
+                if abs(vdif.y) <= tol and abs(vdif.z) <= tol:
+                    axis = 'x'
+                elif abs(vdif.x) <= tol and abs(vdif.z) <= tol:
+                    axis = 'y'
+                elif abs(vdif.x) <= tol and abs(vdif.y) <= tol:
+                    axis = 'z'
+            center = (p0 + p1).multiply(0.5)
+            self.edg_info.append((length, axis, center))
+            self.len_dict.setdefault(self.len_key(length), []).append(edge_ind)
+            self.axis_dict[axis].append(edge_ind)
+
+    def len_key (self, length):
+        return int(round(length / self.tol))
+
+    # returns a list with the edge numbers (starting on 1) of the edges
+    # that fulfill all the conditions that are not None:
+    # length: length of the edge
+    # axis: 'x', 'y', 'z': straight edge parallel to that axis
+    # xpos, ypos, zpos: position of the center of the edge on that axis
+    def get_ind (self, length = None, axis = None,
+                 xpos = None, ypos = None, zpos = None):
+        tol = self.tol
+        if length is not None:
+            key = self.len_key(length)
+            # the neighbour buckets, in case it has been rounded to them
+            ind_list = []
+            for key_i in (key - 1, key, key + 1):
+                for edge_ind in self.len_dict.get(key_i, []):
+                    if abs(self.edg_info[edge_ind-1][0] - length) <= tol:
+                        ind_list.append(edge_ind)
+            ind_list.sort()
+            if axis is not None:
+                ind_list = [ind for ind in ind_list
+                            if self.edg_info[ind-1][1] == axis]
+        elif axis is not None:
+            ind_list = list(self.axis_dict[axis])
+        else:
+            ind_list = list(range(1, len(self.edg_info) + 1))
+        for coord, pos in (('x', xpos), ('y', ypos), ('z', zpos)):
+            if pos is not None:
+                ind_list = [ind for ind in ind_list
+                            if abs(getattr(self.edg_info[ind-1][2], coord)
+                                   - pos) <= tol]
+        return ind_list
+
+    # same as get_ind, but returns the edges, not their numbers
+    def get_edges (self, length = None, axis = None,
+                   xpos = None, ypos = None, zpos = None):
+        ind_list = self.get_ind(length = length, axis = axis,
+                                xpos = xpos, ypos = ypos, zpos = zpos)
+        return [self.shp.Edges[ind-1] for ind in ind_list]
+
+# ---------------- end class EdgeIndex -------------------------------
+
+
 #  ---------------- Fillet on edges of a certain length
 #   box:   is the original shape we want to fillet
 #   e_len: the length of the edges that we want to fillet
 #   radius: the radius of the fillet
 #   name: the name of the shape we want to create
+#   axis: if not None, only the edges parallel to this axis: 'x', 'y', 'z'
+#   tol:  tolerance to compare the lengths
 
-def fillet_len (box, e_len, radius, name):
+def fillet_len (box, e_len, radius, name, axis = None, tol = LEN_TOL):
     # we have to bring the active document
     doc = FreeCAD.ActiveDocument
-    fllts_v = []
-    edge_ind = 1
-    #logger.debug('fillet_len: box %s - %s' %
-    #                     ( str(box), str(box.Shape)))
-    for edge_i in box.Shape.Edges:
-        #logging.debug('fillet_len: edge Length: %s' % str(edge_i.Length))
-        if edge_i.Length == e_len: # same length
-        # the index is appeneded (edge_ind),not the edge itself (edge_i)
-        # radius is twice, because it can be variable
-            #logging.debug('fillet_len: append edge. Length: %s ' ,
-            #               str(edge_i.Length))
-            fllts_v.append((edge_ind, radius, radius))
-        edge_ind += 1
+    edgind = EdgeIndex(box.Shape, tol)
+    # the index is appeneded (edge_ind),not the edge itself (edge_i)
+    # radius is twice, because it can be variable
+    fllts_v = [(edge_ind, radius, radius)
+               for edge_ind in edgind.get_ind(length = e_len, axis = axis)]
     box_fllt = doc.addObject ("Part::Fillet", name)
     box_fllt.Base = box
     box_fllt.Edges = fllts_v
@@ -982,6 +1223,50 @@ def fillet_len (box, e_len, radius, name):
       box.ViewObject.Visibility=False
     return box_fllt
 
+#  ---------------- Fillet on many edge groups of many objects at once
+#   fllt_list: list of tuples (box, edg_list, name). One Part::Fillet will
+#              be created for each box, with all its edge groups:
+#      box:   is the original FreeCAD object we want to fillet
+#      edg_list: list of tuples (e_len, axis, radius) of the edges to fillet
+#                e_len or axis can be None, as in EdgeIndex.get_ind
+#      name: the name of the fillet object
+#   tol:  tolerance to compare the lengths
+#   returns the list of the fillet objects, in the same order
+#
+#   The shape of each box is indexed just once for all its edge groups
+#   and the document is recomputed once, at the end
+
+def fillet_batch (fllt_list, tol = LEN_TOL):
+    doc = FreeCAD.ActiveDocument
+    fllt_fco_list = []
+    for box, edg_list, name in fllt_list:
+        edgind = EdgeIndex(box.Shape, tol)
+        fllt_dict = {} # to avoid repeating an edge on different groups
+        for e_len, axis, radius in edg_list:
+            for edge_ind in edgind.get_ind(length = e_len, axis = axis):
+                fllt_dict[edge_ind] = (edge_ind, radius, radius)
+        box_fllt = doc.addObject ("Part::Fillet", name)
+        box_fllt.Base = box
+        box_fllt.Edges = [fllt_dict[ind] for ind in sorted(fllt_dict)]
+        if box.ViewObject != None:
+            box.ViewObject.Visibility=False
+        fllt_fco_list.append(box_fllt)
+    doc.recompute()
+    return fllt_fco_list
+
+#  ---------------- shp_fillet_len
+#   same as fillet_len, but with shapes, no FreeCAD object is created
+#   shp:   the shape to fillet
+#   e_len: the length of the edges that we want to fillet
+#   radius: the radius of the fillet
+#   axis: if not None, only the edges parallel to this axis: 'x', 'y', 'z'
+#   returns the filleted shape
+
+def shp_fillet_len (shp, e_len, radius, axis = None, tol = LEN_TOL):
+    edgind = EdgeIndex(shp, tol)
+    edg_list = edgind.get_edges(length = e_len, axis = axis)
+    return shp.makeFillet(radius, edg_list)
+
 #  ---------------- calc_rot -----------------------------
 #  ---------------- Yaw, Pitch and Roll transfor
 #  Having an object with an orientation defined by 2 vectors
@@ -1006,7 +1291,7 @@ def calc_rot (vec1, vec2):
        elif vec2 == (0,0,-1):
            roll  = 0
        else:
-           print "error 1 in yaw-pitch-roll"
+           print ("error 1 in yaw-pitch-roll")
     elif vec1 == (-1,0,0):
        yaw = 180
        pitch = 0
@@ -1019,7 +1304,7 @@ def calc_rot (vec1, vec2):
        elif vec2 == (0,0,-1):
            roll  = 0
        else:
-           print "error 2 in yaw-pitch-roll"
+           print ("error 2 in yaw-pitch-roll")
     elif vec1 == (0,1,0):
        yaw = 90
        pitch = 0
@@ -1032,7 +1317,7 @@ def calc_rot (vec1, vec2):
        elif vec2 == (0,0,-1):
            roll  = 0
        else:
-           print "error 3 in yaw-pitch-roll"
+           print ("error 3 in yaw-pitch-roll")
     elif vec1 == (0,-1,0):
        yaw = -90
        pitch = 0
@@ -1045,7 +1330,7 @@ def calc_rot (vec1, vec2):
        elif vec2 == (0,0,-1):
            roll  = 0
        else:
-           print "error 4 in yaw-pitch-roll"
+           print ("error 4 in yaw-pitch-roll")
     elif vec1 == (0,0,1):
        pitch = -90
        yaw = 0
@@ -1058,7 +1343,7 @@ def calc_rot (vec1, vec2):
        elif vec2 == (0,-1,0):
            roll  = -90
        else:
-           print "error 5 in yaw-pitch-roll"
+           print ("error 5 in yaw-pitch-roll")
     elif vec1 == (0,0,-1):
        pitch = 90
        yaw = 0
@@ -1071,7 +1356,7 @@ def calc_rot (vec1, vec2):
        elif vec2 == (0,-1,0):
            roll  = -90
        else:
-           print "error 6 in yaw-pitch-roll"
+           print ("error 6 in yaw-pitch-roll")
 
     vrot = FreeCAD.Rotation(yaw,pitch,roll)
     return vrot
@@ -1103,7 +1388,7 @@ def calc_desp_ncen (Length, Width, Height,
             if cz == False:
                 z = Height / 2.0
         else:
-            print "error 1 in calc_desp_ncen"
+            print ("error 1 in calc_desp_ncen")
     elif abs(vec1[1]) == 1: # Y axis
         if abs(vec2[0]) == 1:   # X
             if cx == False:
@@ -1120,7 +1405,7 @@ def calc_desp_ncen (Length, Width, Height,
             if cz == False:
                 z = Height / 2.0
         else:
-            print "error 2 in calc_desp_ncen"
+            print ("error 2 in calc_desp_ncen")
     elif abs(vec1[2]) == 1: # Z axis
         if abs(vec2[0]) == 1:   # X
             if cx == False:
@@ -1137,9 +1422,9 @@ def calc_desp_ncen (Length, Width, Height,
             if cz == False:
                 z = Length / 2.0
         else:
-            print "error 3 in calc_desp_ncen"
+            print ("error 3 in calc_desp_ncen")
     else:
-        print "error 3 in calc_desp_ncen"
+        print ("error 3 in calc_desp_ncen")
 
 
     vdesp = FreeCAD.Vector(x,y,z)
@@ -0,0 +1,2618 @@
+# ----------------------------------------------------------------------------
+# -- FreeCAD stand-in
+# -- comps library
+# -- Pure Python stand-in of the FreeCAD modules used by the library
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The modules of the library import FreeCAD, Part, Draft, DraftVecUtils,...
+# at top level. This module has a lightweight implementation of the parts
+# of these modules that the library uses, so the library can be run on a
+# plain Python, without FreeCAD: for tests, dry runs of the layouts and
+# to track the performance.
+#
+# The backend is chosen by fcfun, with the environment variable
+# COMPS_BACKEND ('freecad', 'stub' or 'auto'), when it is imported before
+# the other modules of the library:
+#
+#    os.environ['COMPS_BACKEND'] = 'auto'  # the stub if there is no FreeCAD
+#    import fcfun
+#    import comps, parts3d
+#
+# fcfun calls install(), that puts these modules on sys.modules with the
+# names of the FreeCAD modules, so the library imports them as if they
+# were FreeCAD. fcfun.BACKEND tells which backend is in use
+#
+# The geometry is not computed with OCC:
+#  - vectors, rotations, placements, matrices and bounding boxes are exact
+#  - the primitives (lines, arcs, wires, planar faces, extrusions) are
+#    analytic: length, area, volume, bounding box and point containment
+#  - the booleans (fuse, cut, common) and the fillets are recorded as trees.
+#    The bounding box and containment come from the tree, the volume is
+#    estimated sampling the bounding box (VOL_SAMPLES per axis), unless it
+#    can be calculated directly (operands that don't overlap).
+#    The edges and faces of a boolean are the ones of its operands
+#  - Shape.copy() makes a new geometry. The shapes read from an object, the
+#    ones of a compound and the rigid Shape.transformed share it with
+#    their shape (Shape.isPartner), as in FreeCAD
+#  - the document objects (Part::Box, Part::Cut, Part::Extrusion,...)
+#    are recomputed each time their Shape is read
+#  - Shape.slice only cuts the extrusions (i.e. Part::Extrusion, addBox,
+#    the polygons extruded by prof2d) with a plane parallel to their base
+#  - there is no BREP: exportBrepToString, exportBrep and their imports
+#    write and read the shape pickled, in a format of the stub (see
+#    BREP_HEADER). So dedup with brep = True, print3d.estimate_parts with
+#    processes, the 'brep' snapshots and the buildsrv export run on the
+#    stub, but their files cannot be opened by FreeCAD
+#
+# Not implemented, they raise NotImplementedError (the modules that use
+# them need FreeCAD for that part):
+#  - Shape.tessellate: print3d.mesh_arrays, so print3d.overhang_report
+#    (unless it is given the mesh) and the 'mesh' snapshots
+#  - Shape.slice of the booleans, fillets and revolutions:
+#    print3d.slice_layers and estimate_print of most printed parts
+#  - the STEP and STL export
+# The document is saved as a JSON description (Document.saveAs), FCStd
+# files cannot be written or opened
+
+import copy
+import json
+import math
+import sys
+import base64
+import pickle
+import types
+import logging
+
+logger = logging.getLogger(__name__)
+
+# number of segments to discretize a full circle
+CIRC_SEG = 64
+# number of samples, on each axis, to estimate the volume of the booleans
+VOL_SAMPLES = 24
+# tolerance for geometric comparisons
+GEOM_TOL = 1e-7
+# first line of the shapes serialized by exportBrepToString
+BREP_HEADER = 'fcstub shape 1\n'
+
+BACKEND = 'stub'
+
+
+# ---------- class Quantity ------------------------------------------
+# Float with units, as the properties Length, Radius, ... of FreeCAD
+# objects. The units are not considered
+
+class Quantity (float):
+
+    @property
+    def Value (self):
+        return float(self)
+
+    @property
+    def UserString (self):
+        return '%s mm' % repr(float(self))
+
+
+# ---------- class Vector --------------------------------------------
+
+class Vector (object):
+
+    def __init__ (self, x = 0, y = 0, z = 0):
+        if isinstance(x, (Vector, tuple, list)):
+            x, y, z = x[0], x[1], x[2]
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __repr__ (self):
+        return 'Vector (%s, %s, %s)' % (repr(self.x), repr(self.y),
+                                        repr(self.z))
+
+    def __getitem__ (self, ind):
+        return (self.x, self.y, self.z)[ind]
+
+    def __len__ (self):
+        return 3
+
+    def __iter__ (self):
+        return iter((self.x, self.y, self.z))
+
+    def __add__ (self, other):
+        return Vector(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    __radd__ = __add__
+
+    def __sub__ (self, other):
+        return Vector(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def __rsub__ (self, other):
+        return Vector(other[0] - self.x, other[1] - self.y, other[2] - self.z)
+
+    def __neg__ (self):
+        return Vector(-self.x, -self.y, -self.z)
+
+    # vector * vector: dot product, as in FreeCAD
+    def __mul__ (self, other):
+        if isinstance(other, (Vector, tuple, list)):
+            return self.dot(Vector(other))
+        return Vector(self.x * other, self.y * other, self.z * other)
+
+    def __rmul__ (self, other):
+        return self.__mul__(other)
+
+    def __truediv__ (self, other):
+        return Vector(self.x / other, self.y / other, self.z / other)
+
+    __div__ = __truediv__
+
+    def __eq__ (self, other):
+        try:
+            return (    abs(self.x - other[0]) < GEOM_TOL
+                    and abs(self.y - other[1]) < GEOM_TOL
+                    and abs(self.z - other[2]) < GEOM_TOL)
+        except (TypeError, IndexError):
+            return False
+
+    def __ne__ (self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def getLength (self):
+        return math.sqrt(self.x*self.x + self.y*self.y + self.z*self.z)
+
+    def setLength (self, length):
+        cur = self.getLength()
+        if cur > 0:
+            self.multiply(length / cur)
+
+    Length = property(getLength, setLength)
+
+    def add (self, other):
+        return self + other
+
+    def sub (self, other):
+        return self - other
+
+    def negative (self):
+        return -self
+
+    # multiply and scale change the vector, as in FreeCAD
+    def multiply (self, factor):
+        self.x *= factor
+        self.y *= factor
+        self.z *= factor
+        return self
+
+    def scale (self, fx, fy, fz):
+        self.x *= fx
+        self.y *= fy
+        self.z *= fz
+        return self
+
+    def normalize (self):
+        length = self.getLength()
+        if length == 0:
+            raise ValueError('Cannot normalize null vector')
+        return self.multiply(1./length)
+
+    def dot (self, other):
+        return self.x * other[0] + self.y * other[1] + self.z * other[2]
+
+    def cross (self, other):
+        return Vector(self.y * other[2] - self.z * other[1],
+                      self.z * other[0] - self.x * other[2],
+                      self.x * other[1] - self.y * other[0])
+
+    def getAngle (self, other):
+        den = self.getLength() * Vector(other).getLength()
+        if den == 0:
+            return 0.
+        cosang = max(-1., min(1., self.dot(other) / den))
+        return math.acos(cosang)
+
+    def distanceToPoint (self, other):
+        return (self - other).getLength()
+
+    def isEqual (self, other, tol):
+        return (self - other).getLength() <= tol
+
+
+# ---------- class Rotation ------------------------------------------
+# stored as a quaternion (x, y, z, w), as FreeCAD Rotation.Q
+# Constructors, as in FreeCAD:
+#   Rotation ()                : identity
+#   Rotation (axis, angle)     : axis vector, angle in degrees
+#   Rotation (yaw, pitch, roll): degrees
+#   Rotation (vec_from, vec_to): rotation from one vector to the other
+#   Rotation (x, y, z, w)      : quaternion
+#   Rotation (Matrix)
+
+class Rotation (object):
+
+    def __init__ (self, *args):
+        if len(args) == 0:
+            q = (0., 0., 0., 1.)
+        elif len(args) == 1 and isinstance(args[0], Rotation):
+            q = args[0].Q
+        elif len(args) == 1 and isinstance(args[0], Matrix):
+            q = quat_from_matrix(args[0])
+        elif (len(args) == 2 and isinstance(args[0], (Vector, tuple, list))
+              and isinstance(args[1], (Vector, tuple, list))):
+            q = quat_from_vectors(Vector(args[0]), Vector(args[1]))
+        elif len(args) == 2:
+            q = quat_from_axis(Vector(args[0]), math.radians(args[1]))
+        elif len(args) == 3:
+            yaw, pitch, roll = [math.radians(ang) for ang in args]
+            q = quat_mult(quat_from_axis(Vector(0,0,1), yaw),
+                          quat_mult(quat_from_axis(Vector(0,1,0), pitch),
+                                    quat_from_axis(Vector(1,0,0), roll)))
+        elif len(args) == 4:
+            q = quat_norm(tuple([float(val) for val in args]))
+        else:
+            raise TypeError('Rotation: arguments not supported')
+        self.Q = q
+
+    def __repr__ (self):
+        return 'Rotation (%s, %s, %s, %s)' % self.Q
+
+    @property
+    def Axis (self):
+        x, y, z, w = self.Q
+        sin_half = math.sqrt(x*x + y*y + z*z)
+        if sin_half < GEOM_TOL:
+            return Vector(0,0,1)
+        return Vector(x/sin_half, y/sin_half, z/sin_half)
+
+    # in radians, as in FreeCAD
+    @property
+    def Angle (self):
+        x, y, z, w = self.Q
+        sin_half = math.sqrt(x*x + y*y + z*z)
+        return 2 * math.atan2(sin_half, w)
+
+    def isNull (self):
+        return self.Angle < GEOM_TOL
+
+    def multVec (self, vec):
+        x, y, z, w = self.Q
+        vec = Vector(vec)
+        # v' = v + 2w (q x v) + 2 q x (q x v)
+        q_v = Vector(x, y, z)
+        t = q_v.cross(vec) * 2
+        return vec + t * w + q_v.cross(t)
+
+    def multiply (self, other):
+        return Rotation(*quat_mult(self.Q, other.Q))
+
+    def __mul__ (self, other):
+        return self.multiply(other)
+
+    def inverted (self):
+        x, y, z, w = self.Q
+        return Rotation(-x, -y, -z, w)
+
+    def invert (self):
+        self.Q = self.inverted().Q
+
+    def __eq__ (self, other):
+        if not isinstance(other, Rotation):
+            return False
+        dot = sum([a*b for a, b in zip(self.Q, other.Q)])
+        return abs(abs(dot) - 1) < GEOM_TOL
+
+    def __ne__ (self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def toEuler (self):
+        x, y, z, w = self.Q
+        yaw = math.atan2(2*(w*z + x*y), 1 - 2*(y*y + z*z))
+        sinp = max(-1., min(1., 2*(w*y - z*x)))
+        pitch = math.asin(sinp)
+        roll = math.atan2(2*(w*x + y*z), 1 - 2*(x*x + y*y))
+        return (math.degrees(yaw), math.degrees(pitch), math.degrees(roll))
+
+    getYawPitchRoll = toEuler
+
+    def toMatrix (self):
+        cols = [self.multVec(Vector(1,0,0)), self.multVec(Vector(0,1,0)),
+                self.multVec(Vector(0,0,1))]
+        mat = Matrix()
+        for row in range(3):
+            for col in range(3):
+                mat.A[row][col] = cols[col][row]
+        return mat
+
+
+def quat_norm (q):
+    length = math.sqrt(sum([val*val for val in q]))
+    return tuple([val/length for val in q])
+
+
+def quat_mult (q1, q2):
+    x1, y1, z1, w1 = q1
+    x2, y2, z2, w2 = q2
+    return (w1*x2 + x1*w2 + y1*z2 - z1*y2,
+            w1*y2 - x1*z2 + y1*w2 + z1*x2,
+            w1*z2 + x1*y2 - y1*x2 + z1*w2,
+            w1*w2 - x1*x2 - y1*y2 - z1*z2)
+
+
+# angle in radians
+def quat_from_axis (axis, angle):
+    length = axis.Length
+    if length == 0:
+        return (0., 0., 0., 1.)
+    sin_half = math.sin(angle/2.) / length
+    return (axis.x * sin_half, axis.y * sin_half, axis.z * sin_half,
+            math.cos(angle/2.))
+
+
+def quat_from_vectors (vec_from, vec_to):
+    v0 = Vector(vec_from).normalize()
+    v1 = Vector(vec_to).normalize()
+    dot = v0.dot(v1)
+    if dot < -1 + GEOM_TOL:
+        # opposite: any perpendicular axis
+        perp = v0.cross(Vector(1,0,0))
+        if perp.Length < GEOM_TOL:
+            perp = v0.cross(Vector(0,1,0))
+        return quat_from_axis(perp, math.pi)
+    axis = v0.cross(v1)
+    return quat_norm((axis.x, axis.y, axis.z, 1 + dot))
+
+
+def quat_from_matrix (mat):
+    a = mat.A
+    trace = a[0][0] + a[1][1] + a[2][2]
+    if trace > 0:
+        s = 0.5 / math.sqrt(trace + 1.0)
+        q = ((a[2][1] - a[1][2]) * s, (a[0][2] - a[2][0]) * s,
+             (a[1][0] - a[0][1]) * s, 0.25 / s)
+    elif a[0][0] > a[1][1] and a[0][0] > a[2][2]:
+        s = 2.0 * math.sqrt(1.0 + a[0][0] - a[1][1] - a[2][2])
+        q = (0.25 * s, (a[0][1] + a[1][0]) / s, (a[0][2] + a[2][0]) / s,
+             (a[2][1] - a[1][2]) / s)
+    elif a[1][1] > a[2][2]:
+        s = 2.0 * math.sqrt(1.0 + a[1][1] - a[0][0] - a[2][2])
+        q = ((a[0][1] + a[1][0]) / s, 0.25 * s, (a[1][2] + a[2][1]) / s,
+             (a[0][2] - a[2][0]) / s)
+    else:
+        s = 2.0 * math.sqrt(1.0 + a[2][2] - a[0][0] - a[1][1])
+        q = ((a[0][2] + a[2][0]) / s, (a[1][2] + a[2][1]) / s, 0.25 * s,
+             (a[1][0] - a[0][1]) / s)
+    return quat_norm(q)
+
+
+# ---------- class Matrix --------------------------------------------
+# 4x4 matrix, A is the list of rows.
+# As in FreeCAD, scale, move and rotateX/Y/Z change the matrix
+
+class Matrix (object):
+
+    def __init__ (self, *args):
+        self.A = [[1.,0.,0.,0.], [0.,1.,0.,0.], [0.,0.,1.,0.], [0.,0.,0.,1.]]
+        if len(args) == 1 and isinstance(args[0], Matrix):
+            self.A = [list(row) for row in args[0].A]
+        elif len(args) == 16:
+            self.A = [[float(args[4*row + col]) for col in range(4)]
+                      for row in range(4)]
+
+    def __repr__ (self):
+        return 'Matrix (%s)' % ', '.join([repr(val) for row in self.A
+                                          for val in row])
+
+    def unity (self):
+        self.A = Matrix().A
+
+    def multiply (self, other):
+        if isinstance(other, Matrix):
+            res = Matrix()
+            res.A = [[sum([self.A[row][k] * other.A[k][col]
+                           for k in range(4)])
+                      for col in range(4)] for row in range(4)]
+            return res
+        return self.multVec(other)
+
+    __mul__ = multiply
+
+    def multVec (self, vec):
+        a = self.A
+        return Vector(a[0][0]*vec[0] + a[0][1]*vec[1] + a[0][2]*vec[2] + a[0][3],
+                      a[1][0]*vec[0] + a[1][1]*vec[1] + a[1][2]*vec[2] + a[1][3],
+                      a[2][0]*vec[0] + a[2][1]*vec[1] + a[2][2]*vec[2] + a[2][3])
+
+    # just the linear part, for directions
+    def multDir (self, vec):
+        return self.multVec(vec) - self.multVec(Vector(0,0,0))
+
+    def scale (self, *args):
+        if len(args) == 1:
+            sx, sy, sz = Vector(args[0])
+        elif len(args) == 3:
+            sx, sy, sz = args
+        else:
+            raise TypeError('Matrix.scale: arguments not supported')
+        mat = Matrix()
+        mat.A[0][0], mat.A[1][1], mat.A[2][2] = sx, sy, sz
+        self.A = (mat * self).A
+
+    def move (self, vec):
+        for row in range(3):
+            self.A[row][3] += vec[row]
+
+    def rotateX (self, angle):
+        self.A = (Rotation(Vector(1,0,0), math.degrees(angle)).toMatrix()
+                  * self).A
+
+    def rotateY (self, angle):
+        self.A = (Rotation(Vector(0,1,0), math.degrees(angle)).toMatrix()
+                  * self).A
+
+    def rotateZ (self, angle):
+        self.A = (Rotation(Vector(0,0,1), math.degrees(angle)).toMatrix()
+                  * self).A
+
+    def determinant (self):
+        a = self.A
+        return (  a[0][0] * (a[1][1]*a[2][2] - a[1][2]*a[2][1])
+                - a[0][1] * (a[1][0]*a[2][2] - a[1][2]*a[2][0])
+                + a[0][2] * (a[1][0]*a[2][1] - a[1][1]*a[2][0]))
+
+    def inverse (self):
+        a = self.A
+        det = self.determinant()
+        if abs(det) < GEOM_TOL:
+            raise ValueError('Matrix not invertible')
+        inv = Matrix()
+        for row in range(3):
+            for col in range(3):
+                r0, r1 = [r for r in range(3) if r != col]
+                c0, c1 = [c for c in range(3) if c != row]
+                minor = a[r0][c0] * a[r1][c1] - a[r0][c1] * a[r1][c0]
+                inv.A[row][col] = ((-1) ** (row + col)) * minor / det
+        trans = inv.multDir(Vector(a[0][3], a[1][3], a[2][3]))
+        for row in range(3):
+            inv.A[row][3] = -trans[row]
+        return inv
+
+    # True if the linear part is a rotation (no scale, no mirror)
+    def isRigid (self):
+        cols = [self.multDir(vec) for vec in (Vector(1,0,0), Vector(0,1,0),
+                                              Vector(0,0,1))]
+        return (    all([abs(col.Length - 1) < GEOM_TOL for col in cols])
+                and abs(self.determinant() - 1) < GEOM_TOL)
+
+
+# ---------- class Placement -----------------------------------------
+# Constructors, as in FreeCAD:
+#   Placement ()
+#   Placement (Placement)
+#   Placement (Matrix), only rigid transformations
+#   Placement (base, rotation)
+#   Placement (base, rotation, center): rotation around center
+
+class Placement (object):
+
+    def __init__ (self, *args):
+        self.base = Vector()
+        self.rot = Rotation()
+        if len(args) == 1 and isinstance(args[0], Placement):
+            self.Base = args[0].Base
+            self.Rotation = args[0].Rotation
+        elif len(args) == 1 and isinstance(args[0], Matrix):
+            self.Rotation = Rotation(args[0])
+            self.Base = Vector(args[0].A[0][3], args[0].A[1][3],
+                               args[0].A[2][3])
+        elif len(args) == 2:
+            self.Base = args[0]
+            self.Rotation = args[1]
+        elif len(args) == 3:
+            rot = Rotation(args[1])
+            center = Vector(args[2])
+            self.Base = Vector(args[0]) + center - rot.multVec(center)
+            self.Rotation = rot
+        elif len(args) != 0:
+            raise TypeError('Placement: arguments not supported')
+
+    def getBase (self):
+        return self.base
+
+    def setBase (self, vec):
+        self.base = Vector(vec)
+
+    Base = property(getBase, setBase)
+
+    def getRotation (self):
+        return self.rot
+
+    def setRotation (self, rot):
+        if isinstance(rot, Rotation):
+            self.rot = Rotation(rot)
+        else:
+            self.rot = Rotation(*rot)
+
+    Rotation = property(getRotation, setRotation)
+
+    def __repr__ (self):
+        return 'Placement [Pos=%r, Rot=%r]' % (self.base, self.rot)
+
+    def copy (self):
+        return Placement(self)
+
+    def multVec (self, vec):
+        return self.rot.multVec(vec) + self.base
+
+    def multiply (self, other):
+        return Placement(self.base + self.rot.multVec(other.Base),
+                         self.rot.multiply(other.Rotation))
+
+    __mul__ = multiply
+
+    def inverse (self):
+        rot_inv = self.rot.inverted()
+        return Placement(-rot_inv.multVec(self.base), rot_inv)
+
+    def move (self, vec):
+        self.base = self.base + vec
+
+    def isNull (self):
+        return self.base == (0,0,0) and self.rot.isNull()
+
+    def toMatrix (self):
+        mat = self.rot.toMatrix()
+        mat.move(self.base)
+        return mat
+
+    def __eq__ (self, other):
+        return (    isinstance(other, Placement)
+                and self.base == other.Base and self.rot == other.Rotation)
+
+    def __ne__ (self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+
+# ---------- class BoundBox ------------------------------------------
+# Constructors:
+#   BoundBox (): empty, not valid until something is added
+#   BoundBox (xmin, ymin, zmin, xmax, ymax, zmax)
+#   BoundBox (vec_min, vec_max)
+
+class BoundBox (object):
+
+    def __init__ (self, *args):
+        inf = float('inf')
+        self.XMin, self.YMin, self.ZMin = inf, inf, inf
+        self.XMax, self.YMax, self.ZMax = -inf, -inf, -inf
+        if len(args) == 6:
+            (self.XMin, self.YMin, self.ZMin,
+             self.XMax, self.YMax, self.ZMax) = [float(val) for val in args]
+        elif len(args) == 2:
+            self.add(Vector(args[0]))
+            self.add(Vector(args[1]))
+        elif len(args) == 1 and isinstance(args[0], BoundBox):
+            self.add(args[0])
+        elif len(args) != 0:
+            raise TypeError('BoundBox: arguments not supported')
+
+    def __repr__ (self):
+        return 'BoundBox (%s, %s, %s, %s, %s, %s)' % (
+                    self.XMin, self.YMin, self.ZMin,
+                    self.XMax, self.YMax, self.ZMax)
+
+    def isValid (self):
+        return (    self.XMin <= self.XMax and self.YMin <= self.YMax
+                and self.ZMin <= self.ZMax)
+
+    @property
+    def XLength (self):
+        return self.XMax - self.XMin
+
+    @property
+    def YLength (self):
+        return self.YMax - self.YMin
+
+    @property
+    def ZLength (self):
+        return self.ZMax - self.ZMin
+
+    @property
+    def Center (self):
+        return Vector((self.XMin + self.XMax)/2., (self.YMin + self.YMax)/2.,
+                      (self.ZMin + self.ZMax)/2.)
+
+    @property
+    def DiagonalLength (self):
+        if not self.isValid():
+            return 0.
+        return Vector(self.XLength, self.YLength, self.ZLength).Length
+
+    def add (self, *args):
+        if len(args) == 1 and isinstance(args[0], BoundBox):
+            if not args[0].isValid():
+                return
+            pts = [Vector(args[0].XMin, args[0].YMin, args[0].ZMin),
+                   Vector(args[0].XMax, args[0].YMax, args[0].ZMax)]
+        elif len(args) == 3:
+            pts = [Vector(*args)]
+        else:
+            pts = [Vector(args[0])]
+        for pt in pts:
+            self.XMin = min(self.XMin, pt.x)
+            self.YMin = min(self.YMin, pt.y)
+            self.ZMin = min(self.ZMin, pt.z)
+            self.XMax = max(self.XMax, pt.x)
+            self.YMax = max(self.YMax, pt.y)
+            self.ZMax = max(self.ZMax, pt.z)
+
+    def united (self, other):
+        res = BoundBox(self)
+        res.add(other)
+        return res
+
+    def intersect (self, other):
+        return (    self.isValid() and other.isValid()
+                and self.XMin <= other.XMax + GEOM_TOL
+                and other.XMin <= self.XMax + GEOM_TOL
+                and self.YMin <= other.YMax + GEOM_TOL
+                and other.YMin <= self.YMax + GEOM_TOL
+                and self.ZMin <= other.ZMax + GEOM_TOL
+                and other.ZMin <= self.ZMax + GEOM_TOL)
+
+    def intersected (self, other):
+        if not self.intersect(other):
+            return BoundBox()
+        return BoundBox(max(self.XMin, other.XMin), max(self.YMin, other.YMin),
+                        max(self.ZMin, other.ZMin), min(self.XMax, other.XMax),
+                        min(self.YMax, other.YMax), min(self.ZMax, other.ZMax))
+
+    def isInside (self, *args):
+        if len(args) == 1 and isinstance(args[0], BoundBox):
+            other = args[0]
+            return (    self.isInside(other.XMin, other.YMin, other.ZMin)
+                    and self.isInside(other.XMax, other.YMax, other.ZMax))
+        pt = Vector(*args) if len(args) == 3 else Vector(args[0])
+        return (    self.XMin - GEOM_TOL <= pt.x <= self.XMax + GEOM_TOL
+                and self.YMin - GEOM_TOL <= pt.y <= self.YMax + GEOM_TOL
+                and self.ZMin - GEOM_TOL <= pt.z <= self.ZMax + GEOM_TOL)
+
+    def enlarge (self, dist):
+        self.XMin -= dist
+        self.YMin -= dist
+        self.ZMin -= dist
+        self.XMax += dist
+        self.YMax += dist
+        self.ZMax += dist
+
+    def getPoint (self, ind):
+        return Vector(self.XMax if ind & 1 else self.XMin,
+                      self.YMax if ind & 2 else self.YMin,
+                      self.ZMax if ind & 4 else self.ZMin)
+
+    # bounding box of the 8 corners transformed by the matrix
+    def transformed (self, mat):
+        res = BoundBox()
+        if self.isValid():
+            for ind in range(8):
+                res.add(mat.multVec(self.getPoint(ind)))
+        return res
+
+
+# ---------------------------------------------------------------------
+# -- Shapes
+# ---------------------------------------------------------------------
+
+# ---------- class Shape ---------------------------------------------
+# base class of the shapes. Each shape has its geometry in its local
+# coordinates and the Placement.
+# The subclasses implement:
+#   local_bbox ()     : BoundBox in local coordinates
+#   local_inside (pt) : True if the local point is inside
+#   local_volume ()   : volume
+#   local_edges (), local_faces (), local_vertexes (): in local coordinates
+#   geom_transformed (mat) : new shape with the geometry transformed by the
+#                            matrix, and identity placement
+
+class Shape (object):
+
+    ShapeType = 'Shape'
+
+    def __init__ (self):
+        self.plm = Placement()
+        self.vol_cache = None
+
+    def getPlacement (self):
+        return self.plm
+
+    def setPlacement (self, plm):
+        self.plm = Placement(plm)
+
+    Placement = property(getPlacement, setPlacement)
+
+    def __repr__ (self):
+        return '<%s object>' % self.ShapeType
+
+    # only the empty shape, Part.Shape ()
+    def isNull (self):
+        return self.ShapeType == 'Shape'
+
+    def isValid (self):
+        return True
+
+    def check (self, *args):
+        pass
+
+    # new shape with the same geometry (the TShape of OCC), and its own
+    # placement, as the shapes read from an object or in a compound
+    def partner (self):
+        shp = copy.copy(self)
+        shp.plm = Placement(self.plm)
+        shp.tshape = self.get_tshape()
+        return shp
+
+    # the copies have their own geometry, as in FreeCAD
+    def copy (self):
+        shp = self.partner()
+        shp.tshape = object()
+        return shp
+
+    def get_tshape (self):
+        if 'tshape' not in self.__dict__:
+            self.tshape = object()
+        return self.tshape
+
+    def isPartner (self, other):
+        return self.get_tshape() is other.get_tshape()
+
+    def removeSplitter (self):
+        return self.copy()
+
+    def hashCode (self):
+        return id(self)
+
+    # ------------ queries
+    @property
+    def BoundBox (self):
+        return self.local_bbox().transformed(self.plm.toMatrix())
+
+    def isInside (self, pt, tol = GEOM_TOL, checkface = True):
+        local_pt = self.plm.inverse().multVec(pt)
+        if not self.local_bbox().isInside(local_pt):
+            return False
+        return self.local_inside(local_pt)
+
+    @property
+    def Volume (self):
+        if self.vol_cache is None:
+            self.vol_cache = self.local_volume()
+        return self.vol_cache
+
+    @property
+    def Mass (self):
+        return self.Volume
+
+    def local_bbox (self):
+        return BoundBox()
+
+    def local_inside (self, pt):
+        return False
+
+    def local_volume (self):
+        return 0.
+
+    def local_edges (self):
+        return []
+
+    def local_faces (self):
+        return []
+
+    def local_vertexes (self):
+        pts = []
+        for edg in self.local_edges():
+            for vtx in edg.Vertexes:
+                if not [pt for pt in pts if pt == vtx.Point]:
+                    pts.append(vtx.Point)
+        return [Vertex(pt) for pt in pts]
+
+    def global_matrix (self):
+        return self.plm.toMatrix()
+
+    @property
+    def Edges (self):
+        mat = self.global_matrix()
+        return [edg.geom_transformed(mat) for edg in self.local_edges()]
+
+    @property
+    def Faces (self):
+        mat = self.global_matrix()
+        return [face.geom_transformed(mat) for face in self.local_faces()]
+
+    @property
+    def Vertexes (self):
+        mat = self.global_matrix()
+        return [Vertex(mat.multVec(vtx.Point))
+                for vtx in self.local_vertexes()]
+
+    @property
+    def Wires (self):
+        return []
+
+    @property
+    def Solids (self):
+        return []
+
+    @property
+    def Shells (self):
+        return []
+
+    @property
+    def CenterOfMass (self):
+        return self.plm.multVec(self.local_center())
+
+    # center of mass, sampling the bounding box
+    def local_center (self):
+        pts = self.sample_points()
+        if not pts:
+            return self.local_bbox().Center
+        return Vector(sum([pt.x for pt in pts]) / len(pts),
+                      sum([pt.y for pt in pts]) / len(pts),
+                      sum([pt.z for pt in pts]) / len(pts))
+
+    # points of the grid of VOL_SAMPLES**3 on the bounding box that are
+    # inside the shape (local coordinates)
+    def sample_points (self):
+        bbox = self.local_bbox()
+        if not bbox.isValid():
+            return []
+        pts = []
+        steps = [(bbox.XMin, bbox.XLength / VOL_SAMPLES),
+                 (bbox.YMin, bbox.YLength / VOL_SAMPLES),
+                 (bbox.ZMin, bbox.ZLength / VOL_SAMPLES)]
+        for i in range(VOL_SAMPLES):
+            x = steps[0][0] + (i + 0.5) * steps[0][1]
+            for j in range(VOL_SAMPLES):
+                y = steps[1][0] + (j + 0.5) * steps[1][1]
+                for k in range(VOL_SAMPLES):
+                    pt = Vector(x, y, steps[2][0] + (k + 0.5) * steps[2][1])
+                    if self.local_inside(pt):
+                        pts.append(pt)
+        return pts
+
+    def sampled_volume (self):
+        bbox = self.local_bbox()
+        if not bbox.isValid():
+            return 0.
+        bbox_vol = bbox.XLength * bbox.YLength * bbox.ZLength
+        return bbox_vol * len(self.sample_points()) / float(VOL_SAMPLES ** 3)
+
+    # ------------ transformations
+    def translate (self, vec):
+        self.plm = Placement(Vector(vec), Rotation()).multiply(self.plm)
+        return self
+
+    def rotate (self, base, axis, angle):
+        rot = Placement(Vector(), Rotation(Vector(axis), angle), Vector(base))
+        self.plm = rot.multiply(self.plm)
+        return self
+
+    def transformShape (self, mat, copy = False):
+        if mat.isRigid():
+            self.plm = Placement(mat).multiply(self.plm)
+        else:
+            shp = self.transformGeometry(mat)
+            self.__dict__.update(shp.__dict__)
+            self.tshape = object()
+        return self
+
+    # new shape with the geometry transformed, including its placement
+    def transformGeometry (self, mat):
+        return self.geom_transformed(mat.multiply(self.plm.toMatrix()))
+
+    # a rigid transformation only moves the shape, the geometry is shared
+    def transformed (self, mat):
+        if mat.isRigid():
+            shp = self.partner()
+            shp.plm = Placement(mat).multiply(self.plm)
+            return shp
+        return self.transformGeometry(mat)
+
+    def mirror (self, base, normal):
+        return self.transformGeometry(mirror_matrix(Vector(base),
+                                                    Vector(normal)))
+
+    def geom_transformed (self, mat):
+        raise NotImplementedError('%s: geometry transformation'
+                                  % self.ShapeType)
+
+    # ------------ booleans
+    def fuse (self, other):
+        return Boolean('fuse', [self] + shape_list(other))
+
+    def cut (self, other):
+        return Boolean('cut', [self] + shape_list(other))
+
+    def common (self, other):
+        return Boolean('common', [self] + shape_list(other))
+
+    def multiFuse (self, others):
+        return self.fuse(others)
+
+    def makeFillet (self, radius, edges):
+        return Fillet(self, radius, edges)
+
+    def makeChamfer (self, dist, edges):
+        return Fillet(self, dist, edges, chamfer = True)
+
+    # ------------ not implemented, see the header
+    # list of the wires of the section by the plane normal to the
+    # direction at that distance from the origin
+    def slice (self, direction, dist):
+        raise NotImplementedError('fcstub: slice of a %s needs FreeCAD, '
+                                  'only the extrusions are sliced'
+                                  % self.__class__.__name__)
+
+    def tessellate (self, tol):
+        raise NotImplementedError('fcstub: tessellate needs FreeCAD')
+
+    def exportStep (self, filename):
+        raise NotImplementedError('fcstub: STEP export needs FreeCAD')
+
+    def exportStl (self, filename):
+        raise NotImplementedError('fcstub: STL export needs FreeCAD')
+
+    # ------------ serialization
+    # There is no BREP: the strings and files have the shape pickled, see
+    # BREP_HEADER. Only the stub can read them, and the stub cannot read
+    # the BREP of FreeCAD
+    def exportBrepToString (self):
+        shp = copy.deepcopy(self)
+        clear_caches(shp, set())
+        return BREP_HEADER + base64.b64encode(pickle.dumps(shp, 2)).decode()
+
+    def importBrepFromString (self, brep):
+        if not brep.startswith(BREP_HEADER):
+            raise ValueError('fcstub: it is not a shape of the stub, '
+                             'the BREP of FreeCAD cannot be read')
+        shp = pickle.loads(base64.b64decode(brep[len(BREP_HEADER):]))
+        self.__class__ = shp.__class__
+        self.__dict__.update(shp.__dict__)
+        self.tshape = object()
+
+    def exportBrep (self, filename):
+        with open(filename, 'w') as f_brep:
+            f_brep.write(self.exportBrepToString())
+
+    def importBrep (self, filename):
+        with open(filename) as f_brep:
+            self.importBrepFromString(f_brep.read())
+
+
+# the caches of the shapes in the tree of obj are emptied, so the shapes
+# of the same geometry are serialized the same
+def clear_caches (obj, seen_set):
+    if id(obj) in seen_set:
+        return
+    seen_set.add(id(obj))
+    if isinstance(obj, Shape):
+        obj.vol_cache = None
+        obj.__dict__.pop('tshape', None)
+        obj = obj.__dict__
+    if isinstance(obj, dict):
+        obj = list(obj.values())
+    if isinstance(obj, (list, tuple)):
+        for elem in obj:
+            clear_caches(elem, seen_set)
+
+
+def shape_list (shapes):
+    if isinstance(shapes, (list, tuple)):
+        return list(shapes)
+    return [shapes]
+
+
+# matrix of the reflection on the plane defined by a point and its normal
+def mirror_matrix (base, normal):
+    nor = Vector(normal).normalize()
+    mat = Matrix()
+    for row in range(3):
+        for col in range(3):
+            mat.A[row][col] = (1. if row == col else 0.) - 2*nor[row]*nor[col]
+    trans = nor * (2 * base.dot(nor))
+    mat.move(trans)
+    return mat
+
+
+# ---------- class Vertex --------------------------------------------
+
+class Vertex (Shape):
+
+    ShapeType = 'Vertex'
+
+    def __init__ (self, pt):
+        Shape.__init__(self)
+        self.pt = Vector(pt)
+
+    @property
+    def Point (self):
+        return self.plm.multVec(self.pt)
+
+    @property
+    def X (self):
+        return self.Point.x
+
+    @property
+    def Y (self):
+        return self.Point.y
+
+    @property
+    def Z (self):
+        return self.Point.z
+
+    def local_bbox (self):
+        return BoundBox(self.pt, self.pt)
+
+    def local_vertexes (self):
+        return [self]
+
+    def geom_transformed (self, mat):
+        return Vertex(mat.multVec(self.pt))
+
+
+# ---------- Geometries: LineSegment and Circle ----------------------
+# Part.Line (0.16) and Part.LineSegment are segments between 2 points,
+# toShape returns the edge
+
+class LineSegment (object):
+
+    def __init__ (self, p1 = None, p2 = None):
+        self.StartPoint = Vector(p1) if p1 is not None else Vector()
+        self.EndPoint = Vector(p2) if p2 is not None else Vector(1,0,0)
+
+    def toShape (self):
+        return Edge('line', p1 = self.StartPoint, p2 = self.EndPoint)
+
+
+class Circle (object):
+
+    def __init__ (self, center = None, normal = None, radius = 1.):
+        self.Center = Vector(center) if center is not None else Vector()
+        self.Axis = Vector(normal) if normal is not None else Vector(0,0,1)
+        self.Radius = float(radius)
+
+    def toShape (self, ang0 = 0., ang1 = 2*math.pi):
+        return Edge('circle', center = self.Center, axis = self.Axis,
+                    radius = self.Radius, ang0 = ang0, ang1 = ang1)
+
+
+# two unit vectors perpendicular to the axis, and between them
+def perp_axes (axis):
+    axis = Vector(axis).normalize()
+    if abs(axis.z) < 0.9:
+        xdir = Vector(0,0,1).cross(axis).normalize()
+    else:
+        xdir = Vector(1,0,0) - axis * axis.x
+        xdir.normalize()
+    # FreeCAD: the x direction of a circle with normal Z is X
+    if axis == (0,0,1):
+        xdir = Vector(1,0,0)
+    elif axis == (0,0,-1):
+        xdir = Vector(1,0,0)
+    ydir = axis.cross(xdir)
+    return xdir, ydir
+
+
+# ---------- class Edge ----------------------------------------------
+# kind: 'line' : p1, p2
+#       'circle': center, axis, radius, ang0, ang1 (radians)
+# dihedral: angle between the faces of the solid that share the edge,
+#           to calculate the volume taken by a fillet. pi/2 if unknown
+
+class Edge (Shape):
+
+    ShapeType = 'Edge'
+
+    def __init__ (self, kind, p1 = None, p2 = None, center = None,
+                  axis = None, radius = 0., ang0 = 0., ang1 = 2*math.pi,
+                  xdir = None):
+        Shape.__init__(self)
+        self.kind = kind
+        self.dihedral = math.pi / 2
+        if kind == 'line':
+            self.p1 = Vector(p1)
+            self.p2 = Vector(p2)
+        else:
+            self.center = Vector(center)
+            self.axis = Vector(axis).normalize()
+            self.radius = float(radius)
+            self.ang0 = float(ang0)
+            self.ang1 = float(ang1)
+            if xdir is None:
+                xdir, ydir = perp_axes(self.axis)
+            else:
+                xdir = Vector(xdir).normalize()
+                ydir = self.axis.cross(xdir)
+            self.xdir = xdir
+            self.ydir = ydir
+
+    def point_at (self, ang):
+        return (  self.center + self.xdir * (self.radius * math.cos(ang))
+                + self.ydir * (self.radius * math.sin(ang)))
+
+    def isClosed (self):
+        if self.kind == 'line':
+            return False
+        return abs(self.ang1 - self.ang0 - 2*math.pi) < GEOM_TOL
+
+    # local start and end points
+    def ends (self):
+        if self.kind == 'line':
+            return self.p1, self.p2
+        return self.point_at(self.ang0), self.point_at(self.ang1)
+
+    # local points along the edge, from start to end
+    # deflection: maximum distance from the arcs to their segments, if
+    #             None: CIRC_SEG segments on a full circle
+    def local_points (self, deflection = None):
+        if self.kind == 'line':
+            return [self.p1, self.p2]
+        if deflection and deflection < self.radius:
+            seg_ang = 2 * math.acos(1 - deflection / self.radius)
+            nseg = max(2, int(math.ceil((self.ang1 - self.ang0) / seg_ang)))
+        else:
+            nseg = max(2, int(math.ceil(CIRC_SEG * (self.ang1 - self.ang0)
+                                        / (2*math.pi))))
+        step = (self.ang1 - self.ang0) / nseg
+        return [self.point_at(self.ang0 + ind * step)
+                for ind in range(nseg + 1)]
+
+    # only Deflection is taken, as in FreeCAD: discretize (Deflection = d)
+    def discretize (self, num = None, Deflection = None, **kwargs):
+        mat = self.global_matrix()
+        return [mat.multVec(pt) for pt in self.local_points(Deflection)]
+
+    @property
+    def Length (self):
+        if self.kind == 'line':
+            return (self.p2 - self.p1).Length
+        return self.radius * (self.ang1 - self.ang0)
+
+    @property
+    def Curve (self):
+        if self.kind == 'line':
+            p1, p2 = self.ends()
+            mat = self.global_matrix()
+            return LineSegment(mat.multVec(p1), mat.multVec(p2))
+        edg = self.geom_transformed(self.global_matrix())
+        return Circle(edg.center, edg.axis, edg.radius)
+
+    @property
+    def FirstParameter (self):
+        return 0. if self.kind == 'line' else self.ang0
+
+    @property
+    def LastParameter (self):
+        return self.Length if self.kind == 'line' else self.ang1
+
+    def local_bbox (self):
+        bbox = BoundBox()
+        if self.kind == 'line':
+            bbox.add(self.p1)
+            bbox.add(self.p2)
+        else:
+            for pt in self.local_points():
+                bbox.add(pt)
+        return bbox
+
+    def local_edges (self):
+        return [self]
+
+    def local_vertexes (self):
+        p1, p2 = self.ends()
+        if self.isClosed():
+            return [Vertex(p1)]
+        return [Vertex(p1), Vertex(p2)]
+
+    def geom_transformed (self, mat):
+        if self.kind == 'line':
+            edg = Edge('line', p1 = mat.multVec(self.p1),
+                       p2 = mat.multVec(self.p2))
+        else:
+            xdir = mat.multDir(self.xdir)
+            ydir = mat.multDir(self.ydir)
+            axis = xdir.cross(ydir)
+            edg = Edge('circle', center = mat.multVec(self.center),
+                       axis = axis, radius = self.radius * xdir.Length,
+                       ang0 = self.ang0, ang1 = self.ang1, xdir = xdir)
+        edg.dihedral = self.dihedral
+        return edg
+
+    def extrude (self, vec):
+        return Face([Wire([self])]).extrude(vec)
+
+
+# ---------- class Wire ----------------------------------------------
+# list of edges, in local coordinates
+
+class Wire (Shape):
+
+    ShapeType = 'Wire'
+
+    def __init__ (self, edges = None):
+        Shape.__init__(self)
+        self.edges = []
+        if edges is None:
+            edges = []
+        elif not isinstance(edges, (list, tuple)):
+            edges = [edges]
+        for elem in edges:
+            if isinstance(elem, (LineSegment, Circle)):
+                elem = elem.toShape()
+            # the edges are taken with their placement
+            self.edges.extend([edg.geom_transformed(elem.global_matrix())
+                               for edg in elem.local_edges()])
+
+    def local_edges (self):
+        return self.edges
+
+    @property
+    def Wires (self):
+        return [self]
+
+    @property
+    def Length (self):
+        return sum([edg.Length for edg in self.edges])
+
+    def fixWire (self, *args):
+        pass
+
+    def isClosed (self):
+        pts = self.local_points()
+        return len(pts) > 2 and pts[0] == pts[-1]
+
+    # points of the chained edges, from the start, in local coordinates.
+    # The edges are reversed when needed to get a continuous polygon
+    def local_points (self, deflection = None):
+        chain = self.chained_edges()
+        pts = []
+        for edg, reverse in chain:
+            edg_pts = edg.local_points(deflection)
+            if reverse:
+                edg_pts = edg_pts[::-1]
+            if pts and pts[-1] == edg_pts[0]:
+                edg_pts = edg_pts[1:]
+            pts.extend(edg_pts)
+        return pts
+
+    # list of tuples (edge, reversed) following the connectivity
+    def chained_edges (self):
+        if not self.edges:
+            return []
+        left = list(self.edges)
+        edg = left.pop(0)
+        chain = [(edg, False)]
+        cur_end = edg.ends()[1]
+        while left:
+            for ind, edg in enumerate(left):
+                start, end = edg.ends()
+                if start == cur_end:
+                    chain.append((edg, False))
+                    cur_end = end
+                    break
+                elif end == cur_end:
+                    chain.append((edg, True))
+                    cur_end = start
+                    break
+            else:
+                # not connected: starts a new chain
+                edg = left[0]
+                ind = 0
+                chain.append((edg, False))
+                cur_end = edg.ends()[1]
+            left.pop(ind)
+        return chain
+
+    # only Deflection is taken, as in FreeCAD: discretize (Deflection = d)
+    def discretize (self, num = None, Deflection = None, **kwargs):
+        mat = self.global_matrix()
+        return [mat.multVec(pt) for pt in self.local_points(Deflection)]
+
+    def local_bbox (self):
+        bbox = BoundBox()
+        for edg in self.edges:
+            bbox.add(edg.local_bbox())
+        return bbox
+
+    def geom_transformed (self, mat):
+        return Wire([edg.geom_transformed(mat) for edg in self.edges])
+
+    def extrude (self, vec):
+        # FreeCAD makes a shell, without volume
+        return Extrusion(Face([self]), vec, solid = False)
+
+
+# ---------- class Face ----------------------------------------------
+# planar face: the first wire is the outer wire, the rest are holes
+
+class Face (Shape):
+
+    ShapeType = 'Face'
+
+    def __init__ (self, wires):
+        Shape.__init__(self)
+        if isinstance(wires, Face):
+            wires = [wire.geom_transformed(wires.global_matrix())
+                     for wire in wires.wires]
+        elif not isinstance(wires, (list, tuple)):
+            wires = [wires]
+        self.wires = []
+        for wire in wires:
+            if isinstance(wire, Edge):
+                wire = Wire([wire])
+            self.wires.append(wire.geom_transformed(wire.global_matrix()))
+        self.set_plane()
+
+    # plane of the face: origin, normal and the 2 axes on the plane
+    def set_plane (self):
+        pts = self.wires[0].local_points() if self.wires else []
+        normal = Vector()
+        # Newell's method
+        for ind, pt in enumerate(pts):
+            nxt = pts[(ind + 1) % len(pts)]
+            normal = normal + Vector((pt.y - nxt.y) * (pt.z + nxt.z),
+                                     (pt.z - nxt.z) * (pt.x + nxt.x),
+                                     (pt.x - nxt.x) * (pt.y + nxt.y))
+        if normal.Length < GEOM_TOL:
+            circles = [edg for edg in self.wires[0].edges
+                       if edg.kind == 'circle'] if self.wires else []
+            normal = Vector(circles[0].axis) if circles else Vector(0,0,1)
+        self.normal = normal.normalize()
+        self.origin = pts[0] if pts else Vector()
+        self.udir, self.vdir = perp_axes(self.normal)
+
+    def to_2d (self, pt):
+        rel = pt - self.origin
+        return (rel.dot(self.udir), rel.dot(self.vdir))
+
+    @property
+    def Wires (self):
+        mat = self.global_matrix()
+        return [wire.geom_transformed(mat) for wire in self.wires]
+
+    @property
+    def OuterWire (self):
+        return self.Wires[0]
+
+    def local_edges (self):
+        return [edg for wire in self.wires for edg in wire.edges]
+
+    def local_faces (self):
+        return [self]
+
+    def local_bbox (self):
+        bbox = BoundBox()
+        for wire in self.wires:
+            bbox.add(wire.local_bbox())
+        return bbox
+
+    def geom_transformed (self, mat):
+        return Face([wire.geom_transformed(mat) for wire in self.wires])
+
+    def normalAt (self, u = 0, v = 0):
+        return self.plm.rot.multVec(self.normal)
+
+    # signed area of a wire on the plane of the face. Exact with arcs
+    def wire_area (self, wire):
+        area = 0.
+        for edg, reverse in wire.chained_edges():
+            start, end = edg.ends()
+            if reverse:
+                start, end = end, start
+            s2 = self.to_2d(start)
+            e2 = self.to_2d(end)
+            if edg.kind == 'line':
+                area += (s2[0] * e2[1] - e2[0] * s2[1]) / 2.
+            else:
+                c2 = self.to_2d(edg.center)
+                sweep = edg.ang1 - edg.ang0
+                if edg.axis.dot(self.normal) < 0:
+                    sweep = -sweep
+                if reverse:
+                    sweep = -sweep
+                a0 = math.atan2(s2[1] - c2[1], s2[0] - c2[0])
+                a1 = a0 + sweep
+                r = edg.radius
+                area += (  r * r * sweep
+                         + r * (  c2[0] * (math.sin(a1) - math.sin(a0))
+                                - c2[1] * (math.cos(a1) - math.cos(a0)))) / 2.
+        return area
+
+    def local_area (self):
+        areas = sorted([abs(self.wire_area(wire)) for wire in self.wires],
+                       reverse = True)
+        if not areas:
+            return 0.
+        return areas[0] - sum(areas[1:])
+
+    @property
+    def Area (self):
+        return self.local_area()
+
+    # centroid of the face, in local coordinates
+    def local_centroid (self):
+        # using the discretized polygons, with the sign of each wire
+        cx = cy = atot = 0.
+        areas = [abs(self.wire_area(wire)) for wire in self.wires]
+        outer = areas.index(max(areas)) if areas else 0
+        for ind, wire in enumerate(self.wires):
+            pts = [self.to_2d(pt) for pt in wire.local_points()]
+            wa = wcx = wcy = 0.
+            for j, p0 in enumerate(pts):
+                p1 = pts[(j + 1) % len(pts)]
+                cross = p0[0] * p1[1] - p1[0] * p0[1]
+                wa += cross / 2.
+                wcx += (p0[0] + p1[0]) * cross / 6.
+                wcy += (p0[1] + p1[1]) * cross / 6.
+            sign = 1 if ind == outer else -1
+            if wa < 0:
+                wa, wcx, wcy = -wa, -wcx, -wcy
+            atot += sign * wa
+            cx += sign * wcx
+            cy += sign * wcy
+        if atot == 0:
+            return self.origin
+        return (  self.origin + self.udir * (cx / atot)
+                + self.vdir * (cy / atot))
+
+    # point (local coordinates) on the plane inside the face: even-odd rule
+    def inside_2d (self, pt2):
+        inside = False
+        for wire in self.wires:
+            pts = [self.to_2d(pt) for pt in wire.local_points()]
+            for ind, p0 in enumerate(pts):
+                p1 = pts[(ind + 1) % len(pts)]
+                if (p0[1] > pt2[1]) != (p1[1] > pt2[1]):
+                    x_cross = (  p0[0] + (pt2[1] - p0[1])
+                               * (p1[0] - p0[0]) / (p1[1] - p0[1]))
+                    if pt2[0] < x_cross:
+                        inside = not inside
+        return inside
+
+    def local_inside (self, pt):
+        if abs((pt - self.origin).dot(self.normal)) > GEOM_TOL:
+            return False
+        return self.inside_2d(self.to_2d(pt))
+
+    # Face.cut(face) of a coplanar face: the face with a hole
+    def cut (self, other):
+        if isinstance(other, Face):
+            return Face(self.Wires + other.Wires[:1])
+        return Shape.cut(self, other)
+
+    def extrude (self, vec):
+        return Extrusion(self, vec)
+
+    # angle in degrees
+    def revolve (self, base, axis, angle = 360.):
+        return Revolution(self, base, axis, angle)
+
+
+# ---------- class Extrusion -----------------------------------------
+# solid made by the extrusion of a planar face along a vector
+# if solid is False, it is the shell, without volume
+
+class Extrusion (Shape):
+
+    ShapeType = 'Solid'
+
+    def __init__ (self, face, vec, solid = True):
+        Shape.__init__(self)
+        self.face = face.geom_transformed(face.global_matrix())
+        self.vec = Vector(vec)
+        self.solid = solid
+        if not solid:
+            self.ShapeType = 'Shell'
+
+    def height (self):
+        return self.vec.dot(self.face.normal)
+
+    def local_volume (self):
+        if not self.solid:
+            return 0.
+        return self.face.local_area() * abs(self.height())
+
+    @property
+    def Area (self):
+        lateral = 0.
+        for edg in self.face.local_edges():
+            pts = edg.local_points()
+            for ind in range(len(pts) - 1):
+                lateral += (pts[ind + 1] - pts[ind]).cross(self.vec).Length
+        return 2 * self.face.local_area() + lateral
+
+    def local_bbox (self):
+        bbox = self.face.local_bbox()
+        top = BoundBox(bbox)
+        top.XMin += self.vec.x
+        top.XMax += self.vec.x
+        top.YMin += self.vec.y
+        top.YMax += self.vec.y
+        top.ZMin += self.vec.z
+        top.ZMax += self.vec.z
+        bbox.add(top)
+        return bbox
+
+    def local_inside (self, pt):
+        if not self.solid:
+            return False
+        height = self.height()
+        if abs(height) < GEOM_TOL:
+            return False
+        t = (pt - self.face.origin).dot(self.face.normal) / height
+        if t < -GEOM_TOL or t > 1 + GEOM_TOL:
+            return False
+        return self.face.inside_2d(self.face.to_2d(pt - self.vec * t))
+
+    def local_center (self):
+        return self.face.local_centroid() + self.vec * 0.5
+
+    def local_edges (self):
+        bottom = self.face.local_edges()
+        top = []
+        side = []
+        # interior angle of the vertexes of the face, for the fillets
+        for wire in self.face.wires:
+            chain = wire.chained_edges()
+            for ind, (edg, reverse) in enumerate(chain):
+                moved = edg.geom_transformed(translation_matrix(self.vec))
+                top.append(moved)
+                start, end = edg.ends()
+                if reverse:
+                    start = end
+                if edg.isClosed():
+                    # seam of a cylinder
+                    seam = Edge('line', p1 = start, p2 = start + self.vec)
+                    seam.dihedral = math.pi
+                    side.append(seam)
+                    continue
+                prev_edg, prev_rev = chain[ind - 1]
+                lat = Edge('line', p1 = start, p2 = start + self.vec)
+                lat.dihedral = self.vertex_angle(prev_edg, prev_rev,
+                                                 edg, reverse)
+                side.append(lat)
+        return bottom + top + side
+
+    # interior angle between 2 consecutive edges (only lines, otherwise pi/2)
+    def vertex_angle (self, edg0, rev0, edg1, rev1):
+        if edg0.kind != 'line' or edg1.kind != 'line':
+            return math.pi / 2
+        s0, e0 = edg0.ends()
+        s1, e1 = edg1.ends()
+        if rev0:
+            s0, e0 = e0, s0
+        if rev1:
+            s1, e1 = e1, s1
+        return (s0 - e0).getAngle(e1 - s1)
+
+    def local_faces (self):
+        faces = [self.face, self.face.geom_transformed(
+                                          translation_matrix(self.vec))]
+        for edg in self.face.local_edges():
+            faces.append(edg_lateral_face(edg, self.vec))
+        return faces
+
+    def local_vertexes (self):
+        bottom = self.face.local_vertexes()
+        return bottom + [Vertex(vtx.pt + self.vec) for vtx in bottom]
+
+    def geom_transformed (self, mat):
+        return Extrusion(self.face.geom_transformed(mat), mat.multDir(self.vec),
+                         self.solid)
+
+    # only with a plane parallel to the base: the wires of the base, moved
+    def slice (self, direction, dist):
+        mat = self.global_matrix()
+        face = self.face.geom_transformed(mat)
+        vec = mat.multDir(self.vec)
+        direction = Vector(direction).normalize()
+        if face.normal.cross(direction).Length > GEOM_TOL:
+            Shape.slice(self, direction, dist)
+        height = vec.dot(direction)
+        if abs(height) < GEOM_TOL:
+            return []
+        t = (dist - face.origin.dot(direction)) / height
+        if t < - GEOM_TOL or t > 1 + GEOM_TOL:
+            return []
+        move = translation_matrix(vec * t)
+        return [wire.geom_transformed(move) for wire in face.wires]
+
+    @property
+    def Solids (self):
+        return [self] if self.solid else []
+
+
+# ---------- class Revolution ----------------------------------------
+# solid made revolving a planar face around an axis on its plane.
+# The face is a profile on one side of the axis. Only full revolutions
+# (360 degrees) are supported
+
+class Revolution (Shape):
+
+    ShapeType = 'Solid'
+
+    def __init__ (self, face, base, axis, angle = 360.):
+        Shape.__init__(self)
+        if abs(angle - 360.) > GEOM_TOL:
+            raise NotImplementedError('fcstub: only full revolutions')
+        self.face = face.geom_transformed(face.global_matrix())
+        self.base = Vector(base)
+        self.axis = Vector(axis).normalize()
+        # radial direction of the profile, on the plane of the face
+        rad = self.face.local_centroid() - self.base
+        rad = rad - self.axis * rad.dot(self.axis)
+        self.rdir = rad.normalize()
+
+    # (r, z) coordinates of a point, from the axis
+    def to_rz (self, pt):
+        rel = pt - self.base
+        z = rel.dot(self.axis)
+        return (rel - self.axis * z).Length, z
+
+    # profile point of the coordinates (r, z)
+    def from_rz (self, r, z):
+        return self.base + self.rdir * r + self.axis * z
+
+    def profile_rz (self):
+        return [self.to_rz(pt) for wire in self.face.wires
+                for pt in wire.local_points()]
+
+    # Pappus: area by the length of the circle of the centroid
+    def local_volume (self):
+        r_cen = self.to_rz(self.face.local_centroid())[0]
+        return self.face.local_area() * 2 * math.pi * r_cen
+
+    def local_center (self):
+        z_cen = self.to_rz(self.face.local_centroid())[1]
+        return self.base + self.axis * z_cen
+
+    # union of the circles of the points of the profile. Exact for polygons
+    def local_bbox (self):
+        bbox = BoundBox()
+        for r, z in self.profile_rz():
+            cen = self.base + self.axis * z
+            ext = [r * math.sqrt(max(0., 1 - self.axis[ind] ** 2))
+                   for ind in range(3)]
+            bbox.add(cen - Vector(ext))
+            bbox.add(cen + Vector(ext))
+        return bbox
+
+    def local_inside (self, pt):
+        r, z = self.to_rz(pt)
+        return self.face.inside_2d(self.face.to_2d(self.from_rz(r, z)))
+
+    # a circle for each vertex of the profile out of the axis, and the
+    # profile edges as seams
+    def local_edges (self):
+        edges = []
+        for vtx in self.face.local_vertexes():
+            r, z = self.to_rz(vtx.pt)
+            if r > GEOM_TOL:
+                edges.append(Edge('circle', center = self.base + self.axis * z,
+                                  axis = self.axis, radius = r))
+        for edg in self.face.local_edges():
+            seam = edg.geom_transformed(Matrix())
+            seam.dihedral = math.pi
+            edges.append(seam)
+        return edges
+
+    def local_faces (self):
+        return [self.face]
+
+    def geom_transformed (self, mat):
+        return Revolution(self.face.geom_transformed(mat),
+                          mat.multVec(self.base), mat.multDir(self.axis))
+
+    @property
+    def Solids (self):
+        return [self]
+
+
+def translation_matrix (vec):
+    mat = Matrix()
+    mat.move(vec)
+    return mat
+
+
+# lateral face of an edge extruded: just its outline
+def edg_lateral_face (edg, vec):
+    start, end = edg.ends()
+    moved = edg.geom_transformed(translation_matrix(vec))
+    face = Face([Wire([edg, Edge('line', p1 = end, p2 = end + vec),
+                       moved, Edge('line', p1 = start + vec, p2 = start)])])
+    return face
+
+
+# ---------- class Boolean -------------------------------------------
+# boolean operation recorded as a tree:
+# op: 'fuse', 'cut', 'common'. The first shape is the base, the rest
+# are the tools
+
+class Boolean (Shape):
+
+    ShapeType = 'Solid'
+
+    def __init__ (self, op, shapes):
+        Shape.__init__(self)
+        self.op = op
+        self.shapes = [shp.copy() for shp in shapes]
+        self.bbox_list = [shp.BoundBox for shp in self.shapes]
+
+    def local_bbox (self):
+        if self.op == 'fuse':
+            bbox = BoundBox()
+            for shp_bbox in self.bbox_list:
+                bbox.add(shp_bbox)
+            return bbox
+        elif self.op == 'cut':
+            return BoundBox(self.bbox_list[0])
+        bbox = BoundBox(self.bbox_list[0])
+        for shp_bbox in self.bbox_list[1:]:
+            bbox = bbox.intersected(shp_bbox)
+        return bbox
+
+    def child_inside (self, ind, pt):
+        return (    self.bbox_list[ind].isInside(pt)
+                and self.shapes[ind].isInside(pt))
+
+    def local_inside (self, pt):
+        if self.op == 'fuse':
+            return any([self.child_inside(ind, pt)
+                        for ind in range(len(self.shapes))])
+        elif self.op == 'cut':
+            if not self.child_inside(0, pt):
+                return False
+            return not any([self.child_inside(ind, pt)
+                            for ind in range(1, len(self.shapes))])
+        return all([self.child_inside(ind, pt)
+                    for ind in range(len(self.shapes))])
+
+    def disjoint (self):
+        for ind, bbox in enumerate(self.bbox_list):
+            for other in self.bbox_list[ind + 1:]:
+                if bbox.intersected(other).isValid():
+                    inter = bbox.intersected(other)
+                    if min(inter.XLength, inter.YLength, inter.ZLength) > 0:
+                        return False
+        return True
+
+    def local_volume (self):
+        if self.op == 'fuse' and self.disjoint():
+            return sum([shp.Volume for shp in self.shapes])
+        if self.op == 'cut':
+            base_bbox = self.bbox_list[0]
+            if not [bbox for bbox in self.bbox_list[1:]
+                    if base_bbox.intersected(bbox).isValid()]:
+                return self.shapes[0].Volume
+        return self.sampled_volume()
+
+    def local_edges (self):
+        return [edg for shp in self.shapes for edg in shp.Edges]
+
+    def local_faces (self):
+        return [face for shp in self.shapes for face in shp.Faces]
+
+    def geom_transformed (self, mat):
+        return Boolean(self.op, [shp.transformGeometry(mat)
+                                 for shp in self.shapes])
+
+    @property
+    def Solids (self):
+        return [self]
+
+
+# ---------- class Fillet --------------------------------------------
+# fillet (or chamfer) of edges of a shape. The volume subtracts the
+# material taken from the edges, using their dihedral angle
+
+class Fillet (Shape):
+
+    def __init__ (self, base, radius, edges, chamfer = False):
+        Shape.__init__(self)
+        self.base = base.copy()
+        self.ShapeType = base.ShapeType
+        self.radius = float(radius)
+        self.edges = list(edges)
+        self.chamfer = chamfer
+
+    def local_bbox (self):
+        return self.base.BoundBox
+
+    def local_inside (self, pt):
+        return self.base.isInside(pt)
+
+    # section taken from an edge with an interior angle phi
+    def edge_section (self, phi):
+        if phi >= math.pi - GEOM_TOL:
+            return 0.
+        r = self.radius
+        if self.chamfer:
+            return r * r * math.sin(phi) / 2.
+        return r * r / math.tan(phi / 2.) - r * r * (math.pi - phi) / 2.
+
+    def local_volume (self):
+        taken = sum([self.edge_section(edg.dihedral) * edg.Length
+                     for edg in self.edges])
+        return self.base.Volume - taken
+
+    def local_edges (self):
+        return self.base.Edges
+
+    def local_faces (self):
+        return self.base.Faces
+
+    def geom_transformed (self, mat):
+        return Fillet(self.base.transformGeometry(mat), self.radius,
+                      [edg.transformGeometry(mat) for edg in self.edges],
+                      self.chamfer)
+
+    @property
+    def Solids (self):
+        return [self]
+
+
+# ---------- class Compound ------------------------------------------
+
+class Compound (Shape):
+
+    ShapeType = 'Compound'
+
+    def __init__ (self, shapes = None):
+        Shape.__init__(self)
+        self.shapes = [shp.partner() for shp in (shapes or [])]
+
+    def isNull (self):
+        return not self.shapes
+
+    def local_bbox (self):
+        bbox = BoundBox()
+        for shp in self.shapes:
+            bbox.add(shp.BoundBox)
+        return bbox
+
+    def local_inside (self, pt):
+        return any([shp.isInside(pt) for shp in self.shapes])
+
+    def local_volume (self):
+        return sum([shp.Volume for shp in self.shapes])
+
+    def local_edges (self):
+        return [edg for shp in self.shapes for edg in shp.Edges]
+
+    def local_faces (self):
+        return [face for shp in self.shapes for face in shp.Faces]
+
+    def geom_transformed (self, mat):
+        return Compound([shp.transformGeometry(mat) for shp in self.shapes])
+
+    @property
+    def Solids (self):
+        return [sol for shp in self.shapes for sol in shp.Solids]
+
+    @property
+    def Wires (self):
+        return [wire for shp in self.shapes for wire in shp.Wires]
+
+
+# ---------------------------------------------------------------------
+# -- Document objects
+# ---------------------------------------------------------------------
+
+class ViewObject (object):
+
+    def __init__ (self):
+        self.Visibility = True
+        self.ShapeColor = (0.8, 0.8, 0.8)
+        self.LineColor = (0.1, 0.1, 0.1)
+        self.Transparency = 0
+
+    def isVisible (self):
+        return self.Visibility
+
+    def show (self):
+        self.Visibility = True
+
+    def hide (self):
+        self.Visibility = False
+
+
+# ---------- class DocumentObject ------------------------------------
+# The shape of the parametric objects is calculated each time it is read,
+# so it is always updated, there is no need to recompute.
+# make_shape returns the shape in the coordinates of the object, and then
+# the Placement of the object is applied
+
+class DocumentObject (object):
+
+    # properties that are quantities
+    QUANTITIES = ('Length', 'Width', 'Height', 'Radius', 'Circumradius',
+                  'Angle', 'Angle0', 'Angle1')
+
+    def __init__ (self, doc, type_id, name):
+        object.__setattr__(self, 'Placement', Placement())
+        self.Document = doc
+        self.TypeId = type_id
+        self.Name = name
+        self.Label = name
+        self.ViewObject = ViewObject()
+        self.stored_shape = None
+
+    def __setattr__ (self, name, value):
+        if name in self.QUANTITIES:
+            value = Quantity(value)
+        elif name == 'Placement':
+            value = Placement(value)
+        elif name == 'Shape':
+            # explicit shape: the placement of the object is the one of
+            # the shape
+            shp = value.partner()
+            shp.Placement = Placement()
+            object.__setattr__(self, 'stored_shape', shp)
+            value = Placement(value.Placement)
+            name = 'Placement'
+        object.__setattr__(self, name, value)
+
+    def __repr__ (self):
+        return '<%s object>' % self.TypeId
+
+    def isDerivedFrom (self, type_id):
+        return type_id in (self.TypeId, 'App::DocumentObject',
+                           'Part::Feature')
+
+    def touch (self):
+        pass
+
+    def make_shape (self):
+        if self.stored_shape is None:
+            return Shape()
+        return self.stored_shape
+
+    @property
+    def Shape (self):
+        shp = self.make_shape().partner()
+        shp.Placement = self.Placement.multiply(shp.Placement)
+        return shp
+
+    @property
+    def InList (self):
+        return [obj for obj in self.Document.Objects if self in obj.OutList]
+
+    @property
+    def OutList (self):
+        return []
+
+
+def obj_shape (obj):
+    if isinstance(obj, Shape):
+        return obj
+    return obj.Shape
+
+
+class FeatureBox (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Length = 10.
+        self.Width = 10.
+        self.Height = 10.
+
+    def make_shape (self):
+        return make_box(self.Length, self.Width, self.Height)
+
+
+class FeatureCylinder (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Radius = 2.
+        self.Height = 10.
+        self.Angle = 360.
+
+    def make_shape (self):
+        return make_cylinder(self.Radius, self.Height, angle = self.Angle)
+
+
+class FeaturePrism (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Polygon = 6
+        self.Circumradius = 2.
+        self.Height = 10.
+
+    def make_shape (self):
+        pts = [Vector(self.Circumradius * math.cos(2*math.pi*ind/self.Polygon),
+                      self.Circumradius * math.sin(2*math.pi*ind/self.Polygon),
+                      0) for ind in range(self.Polygon)]
+        face = Face(make_polygon(pts + pts[:1]))
+        return face.extrude(Vector(0, 0, self.Height))
+
+
+class FeaturePolygon (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Nodes = []
+        self.Close = False
+
+    def make_shape (self):
+        pts = [Vector(pt) for pt in self.Nodes]
+        if self.Close and pts and pts[0] != pts[-1]:
+            pts.append(pts[0])
+        return make_polygon(pts)
+
+
+class FeatureCircle (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Radius = 2.
+        self.Angle0 = 0.
+        self.Angle1 = 360.
+
+    def make_shape (self):
+        return make_circle(self.Radius, Vector(), Vector(0,0,1),
+                           self.Angle0, self.Angle1)
+
+
+class FeatureExtrusion (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Base = None
+        self.Dir = Vector(0,0,1)
+        self.Solid = False
+
+    @property
+    def OutList (self):
+        return [self.Base]
+
+    def make_shape (self):
+        base = self.Base.Shape
+        if isinstance(base, Face):
+            return base.extrude(Vector(self.Dir))
+        wires = base.Wires if base.Wires else [Wire([base])]
+        face = Face(wires)
+        return Extrusion(face, Vector(self.Dir), solid = bool(self.Solid))
+
+
+class FeatureBoolean (DocumentObject):
+
+    OPERATIONS = {'Part::Fuse'       : 'fuse',
+                  'Part::MultiFuse'  : 'fuse',
+                  'Part::Cut'        : 'cut',
+                  'Part::Common'     : 'common',
+                  'Part::MultiCommon': 'common'}
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Base = None
+        self.Tool = None
+        self.Shapes = []
+        self.Refine = False
+
+    @property
+    def OutList (self):
+        if self.TypeId.startswith('Part::Multi'):
+            return list(self.Shapes)
+        return [self.Base, self.Tool]
+
+    def make_shape (self):
+        return Boolean(self.OPERATIONS[self.TypeId],
+                       [obj.Shape for obj in self.OutList])
+
+
+class FeatureMirroring (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Source = None
+        self.Base = Vector()
+        self.Normal = Vector(0,0,1)
+
+    @property
+    def OutList (self):
+        return [self.Source]
+
+    def make_shape (self):
+        return self.Source.Shape.mirror(Vector(self.Base), Vector(self.Normal))
+
+
+class FeatureCompound (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Links = []
+
+    @property
+    def OutList (self):
+        return list(self.Links)
+
+    def make_shape (self):
+        return Compound([obj.Shape for obj in self.Links])
+
+
+# Edges: list of tuples (edge number starting on 1, radius1, radius2)
+class FeatureFillet (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Base = None
+        self.Edges = []
+
+    @property
+    def OutList (self):
+        return [self.Base]
+
+    def make_shape (self):
+        shp = self.Base.Shape
+        edges = shp.Edges
+        if not self.Edges:
+            return shp
+        # the stub takes one radius for all the edges
+        radius = self.Edges[0][1]
+        return shp.makeFillet(radius, [edges[fllt[0] - 1]
+                                       for fllt in self.Edges])
+
+
+# Draft clone: the local shape of the originals, with the placement
+# of the clone
+class FeatureClone (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Objects = []
+
+    @property
+    def OutList (self):
+        return list(self.Objects)
+
+    def make_shape (self):
+        shapes = []
+        for obj in self.Objects:
+            shp = obj.Shape
+            shp.Placement = Placement()
+            shapes.append(shp)
+        if len(shapes) == 1:
+            return shapes[0]
+        return Compound(shapes)
+
+
+class FeatureSketch (DocumentObject):
+
+    def __init__ (self, doc, type_id, name):
+        DocumentObject.__init__(self, doc, type_id, name)
+        self.Geometry = []
+        self.Constraints = []
+        self.Support = None
+        self.MapMode = 'Deactivated'
+
+    def addGeometry (self, geo, construction = False):
+        self.Geometry.append(geo)
+        return len(self.Geometry) - 1
+
+    def addConstraint (self, cons):
+        self.Constraints.append(cons)
+        return len(self.Constraints) - 1
+
+    def make_shape (self):
+        edges = [geo.toShape() for geo in self.Geometry]
+        if not edges:
+            return Shape()
+        return Wire(edges)
+
+
+OBJECT_TYPES = {
+        'Part::Feature'          : DocumentObject,
+        'Part::Box'              : FeatureBox,
+        'Part::Cylinder'         : FeatureCylinder,
+        'Part::Prism'            : FeaturePrism,
+        'Part::Polygon'          : FeaturePolygon,
+        'Part::Circle'           : FeatureCircle,
+        'Part::Extrusion'        : FeatureExtrusion,
+        'Part::Fuse'             : FeatureBoolean,
+        'Part::MultiFuse'        : FeatureBoolean,
+        'Part::Cut'              : FeatureBoolean,
+        'Part::Common'           : FeatureBoolean,
+        'Part::MultiCommon'      : FeatureBoolean,
+        'Part::Compound'         : FeatureCompound,
+        'Part::Mirroring'        : FeatureMirroring,
+        'Part::Fillet'           : FeatureFillet,
+        'Part::FeaturePython'    : FeatureClone,
+        'Sketcher::SketchObject' : FeatureSketch,
+        }
+
+
+# ---------- class Document ------------------------------------------
+
+class Document (object):
+
+    def __init__ (self, name):
+        self.Name = name
+        self.Label = name
+        self.FileName = ''
+        self.Objects = []
+
+    def __repr__ (self):
+        return '<Document object>'
+
+    def unique_name (self, name):
+        names = set([obj.Name for obj in self.Objects])
+        if name not in names:
+            return name
+        ind = 1
+        while '%s%03d' % (name, ind) in names:
+            ind += 1
+        return '%s%03d' % (name, ind)
+
+    def addObject (self, type_id, name = None):
+        if type_id not in OBJECT_TYPES:
+            raise ValueError('fcstub: object type not supported: %s'
+                             % type_id)
+        name = self.unique_name(name or type_id.split(':')[-1])
+        obj = OBJECT_TYPES[type_id](self, type_id, name)
+        self.Objects.append(obj)
+        return obj
+
+    def getObject (self, name):
+        for obj in self.Objects:
+            if obj.Name == name:
+                return obj
+        return None
+
+    def getObjectsByLabel (self, label):
+        return [obj for obj in self.Objects if obj.Label == label]
+
+    def removeObject (self, name):
+        self.Objects = [obj for obj in self.Objects if obj.Name != name]
+
+    # the shapes are always updated, just checks that they can be made
+    def recompute (self):
+        for obj in self.Objects:
+            obj.Shape
+        return len(self.Objects)
+
+    # FCStd files cannot be written without FreeCAD, it saves a json
+    # description of the objects
+    def saveAs (self, filename):
+        objs = []
+        for obj in self.Objects:
+            bbox = obj.Shape.BoundBox
+            objs.append({'name'     : obj.Name,
+                         'label'    : obj.Label,
+                         'type'     : obj.TypeId,
+                         'base'     : list(obj.Placement.Base),
+                         'rotation' : list(obj.Placement.Rotation.Q),
+                         'bbox'     : ([bbox.XMin, bbox.YMin, bbox.ZMin,
+                                        bbox.XMax, bbox.YMax, bbox.ZMax]
+                                       if bbox.isValid() else None)})
+        with open(filename, 'w') as fil:
+            json.dump({'document': self.Name, 'backend': BACKEND,
+                       'objects': objs}, fil, indent = 1)
+        self.FileName = filename
+
+    def save (self):
+        self.saveAs(self.FileName)
+
+
+# ---------------------------------------------------------------------
+# -- Functions of the modules
+# ---------------------------------------------------------------------
+
+def make_polygon (pts):
+    pts = [Vector(pt) for pt in pts]
+    return Wire([Edge('line', p1 = pts[ind], p2 = pts[ind + 1])
+                 for ind in range(len(pts) - 1)])
+
+
+# angles in degrees, as in Part.makeCircle
+def make_circle (radius, center = None, normal = None,
+                 ang0 = 0., ang1 = 360.):
+    ang0 = math.radians(ang0)
+    ang1 = math.radians(ang1)
+    if ang1 <= ang0:
+        ang1 += 2 * math.pi
+    return Edge('circle', center = center if center is not None else Vector(),
+                axis = normal if normal is not None else Vector(0,0,1),
+                radius = radius, ang0 = ang0, ang1 = ang1)
+
+
+def make_line (p1, p2):
+    return Edge('line', p1 = p1, p2 = p2)
+
+
+def make_box (length, width, height, pnt = None, direction = None):
+    pnt = Vector(pnt) if pnt is not None else Vector()
+    pts = [pnt, pnt + Vector(length, 0, 0), pnt + Vector(length, width, 0),
+           pnt + Vector(0, width, 0), pnt]
+    return Face(make_polygon(pts)).extrude(Vector(0, 0, height))
+
+
+def make_cylinder (radius, height, pnt = None, direction = None,
+                   angle = 360.):
+    pnt = Vector(pnt) if pnt is not None else Vector()
+    direction = (Vector(direction) if direction is not None
+                 else Vector(0,0,1))
+    edges = [make_circle(radius, pnt, direction, 0, angle)]
+    if abs(angle - 360.) > GEOM_TOL:
+        start, end = edges[0].ends()
+        edges.extend([make_line(end, pnt), make_line(pnt, start)])
+    face = Face([Wire(edges)])
+    return face.extrude(Vector(direction).normalize() * height)
+
+
+def make_compound (shapes):
+    return Compound(shapes)
+
+
+def part_show (shape, name = 'Shape'):
+    obj = FreeCAD_mod.ActiveDocument.addObject('Part::Feature', name)
+    obj.Shape = shape
+    return obj
+
+
+# ---------- Draft
+
+def draft_clone (obj, delta = None, forcedraft = False):
+    objs = obj if isinstance(obj, (list, tuple)) else [obj]
+    doc = objs[0].Document
+    clone = doc.addObject('Part::FeaturePython', 'Clone')
+    clone.Label = 'Clone'
+    clone.Objects = list(objs)
+    if len(objs) == 1:
+        clone.Placement = objs[0].Placement
+    if delta is not None:
+        clone.Placement.move(Vector(delta))
+    return clone
+
+
+# ---------- DraftVecUtils
+
+def scale_to (vec, length):
+    vec = Vector(vec)
+    if vec.Length == 0:
+        return vec
+    return vec * (length / vec.Length)
+
+
+def neg (vec):
+    return -Vector(vec)
+
+
+# angle in radians
+def vec_rotate (vec, angle, axis = None):
+    axis = Vector(axis) if axis is not None else Vector(0,0,1)
+    return Rotation(axis, math.degrees(angle)).multVec(vec)
+
+
+def vec_equals (v1, v2, precision = 6):
+    return (Vector(v1) - Vector(v2)).Length < 10 ** (-precision)
+
+
+def vec_is_null (vec):
+    return Vector(vec).Length < GEOM_TOL
+
+
+# ---------- FreeCAD documents
+
+class DocumentRegistry (object):
+
+    def __init__ (self):
+        self.docs = {}
+
+
+def new_document (name = 'Unnamed', label = None):
+    name_ok = name
+    ind = 1
+    while name_ok in REGISTRY.docs:
+        name_ok = '%s%d' % (name, ind)
+        ind += 1
+    doc = Document(name_ok)
+    if label is not None:
+        doc.Label = label
+    REGISTRY.docs[name_ok] = doc
+    FreeCAD_mod.ActiveDocument = doc
+    return doc
+
+
+def open_document (filename):
+    raise IOError('fcstub: FCStd files cannot be opened without FreeCAD: %s'
+                  % filename)
+
+
+def close_document (name):
+    doc = REGISTRY.docs.pop(name, None)
+    if doc is not None and FreeCAD_mod.ActiveDocument is doc:
+        FreeCAD_mod.ActiveDocument = (list(REGISTRY.docs.values())[-1]
+                                      if REGISTRY.docs else None)
+
+
+def get_document (name):
+    return REGISTRY.docs[name]
+
+
+def set_active_document (name):
+    FreeCAD_mod.ActiveDocument = REGISTRY.docs[name]
+
+
+def list_documents ():
+    return dict(REGISTRY.docs)
+
+
+class Console (object):
+
+    @staticmethod
+    def PrintMessage (msg):
+        logger.info(msg.rstrip())
+
+    @staticmethod
+    def PrintWarning (msg):
+        logger.warning(msg.rstrip())
+
+    @staticmethod
+    def PrintError (msg):
+        logger.error(msg.rstrip())
+
+
+# ---------- FreeCADGui, just what the scripts use
+
+class GuiView (object):
+
+    def setAxisCross (self, state):
+        pass
+
+    def viewIsometric (self):
+        pass
+
+    def fitAll (self):
+        pass
+
+
+class GuiDocument (object):
+
+    def __init__ (self, doc):
+        self.Document = doc
+        self.ActiveView = GuiView()
+
+    def getObject (self, name):
+        obj = self.Document.getObject(name)
+        return obj.ViewObject if obj is not None else None
+
+
+def gui_get_document (name):
+    return GuiDocument(get_document(name))
+
+
+REGISTRY = DocumentRegistry()
+
+
+# ---------------------------------------------------------------------
+# -- Modules
+# ---------------------------------------------------------------------
+
+def make_module (name, attrs):
+    mod = types.ModuleType(name)
+    mod.__dict__.update(attrs)
+    return mod
+
+
+Base_mod = make_module('FreeCAD.Base', {
+                'Vector'    : Vector,
+                'Rotation'  : Rotation,
+                'Placement' : Placement,
+                'Matrix'    : Matrix,
+                'BoundBox'  : BoundBox,
+                'Quantity'  : Quantity,
+                })
+
+FreeCAD_mod = make_module('FreeCAD', {
+                'BACKEND'   : BACKEND,
+                'Vector'    : Vector,
+                'Rotation'  : Rotation,
+                'Placement' : Placement,
+                'Matrix'    : Matrix,
+                'BoundBox'  : BoundBox,
+                'Quantity'  : Quantity,
+                'Units'     : make_module('FreeCAD.Units',
+                                          {'Quantity' : Quantity}),
+                'Base'      : Base_mod,
+                'Console'   : Console,
+                'GuiUp'     : 0,
+                'ActiveDocument'    : None,
+                'newDocument'       : new_document,
+                'openDocument'      : open_document,
+                'closeDocument'     : close_document,
+                'getDocument'       : get_document,
+                'setActiveDocument' : set_active_document,
+                'listDocuments'     : list_documents,
+                'Version'           : lambda : ['0', '16', 'stub'],
+                })
+
+Part_mod = make_module('Part', {
+                'Shape'         : Shape,
+                'Vertex'        : Vertex,
+                'Edge'          : Edge,
+                'Wire'          : Wire,
+                'Face'          : Face,
+                'Compound'      : Compound,
+                'Line'          : LineSegment,
+                'LineSegment'   : LineSegment,
+                'Circle'        : Circle,
+                'makePolygon'   : make_polygon,
+                'makeCircle'    : make_circle,
+                'makeLine'      : make_line,
+                'makeBox'       : make_box,
+                'makeCylinder'  : make_cylinder,
+                'makeCompound'  : make_compound,
+                'show'          : part_show,
+                })
+
+Draft_mod = make_module('Draft', {
+                'clone'     : draft_clone,
+                })
+
+DraftVecUtils_mod = make_module('DraftVecUtils', {
+                'scaleTo'   : scale_to,
+                'neg'       : neg,
+                'rotate'    : vec_rotate,
+                'equals'    : vec_equals,
+                'isNull'    : vec_is_null,
+                })
+
+DraftGeomUtils_mod = make_module('DraftGeomUtils', {})
+
+FreeCADGui_mod = make_module('FreeCADGui', {
+                'ActiveDocument'    : None,
+                'getDocument'       : gui_get_document,
+                })
+
+MODULES = {
+        'FreeCAD'        : FreeCAD_mod,
+        'Part'           : Part_mod,
+        'Draft'          : Draft_mod,
+        'DraftVecUtils'  : DraftVecUtils_mod,
+        'DraftGeomUtils' : DraftGeomUtils_mod,
+        'FreeCADGui'     : FreeCADGui_mod,
+        }
+
+
+# ---------- install -------------------------------------------------
+# Registers the stand-in modules in sys.modules, so the library imports
+# them instead of FreeCAD.
+# force: if False, FreeCAD is used if it can be imported
+# returns the backend in use: 'freecad' or 'stub'
+
+def install (force = False):
+    if not force:
+        try:
+            import FreeCAD
+            if getattr(FreeCAD, 'BACKEND', 'freecad') == 'freecad':
+                return 'freecad'
+        except ImportError:
+            pass
+    sys.modules.update(MODULES)
+    return BACKEND
+
+
+# removes the stand-in modules from sys.modules
+
+def uninstall ():
+    for name, mod in MODULES.items():
+        if sys.modules.get(name) is mod:
+            del sys.modules[name]
@@ -0,0 +1,214 @@
+# ----------------------------------------------------------------------------
+# -- Feature plans
+# -- comps library
+# -- Declarative plans of the solids to add and cut, built at once
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# Instead of making the booleans (Part::Fuse, Part::Cut, ...) while the
+# elements are created, the elements are added to a plan: the solids to
+# add and the tools to cut. The plans are compiled and built at the end:
+#  - the document is recomputed just once before, and once after
+#  - the tools that are out of the bounding box of the solid are dropped
+#  - the tools shared by several plans (for example, the top and the bottom
+#    part of a slider) are fused just once
+#  - the shapes that are not FreeCAD objects are put together in one
+#    Part::Feature, instead of one object for each
+#  - the groups of tools are cut from the largest to the smallest
+#
+#  plan_top = featplan.FeatPlan ("slider_top")
+#  plan_top.add (top_box)
+#  plan_top.cut ([hole0, hole1, shp_hole2])
+#  plan_bot = featplan.FeatPlan ("slider_bot")
+#  plan_bot.add (bot_box)
+#  plan_bot.cut ([hole0, hole1])
+#  top, bot = featplan.build_plans ([plan_top, plan_bot])
+
+import FreeCAD
+import Part
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- class FeatPlan --------------------------------------------
+# Plan of a solid: the elements to add, and the elements to cut.
+# The elements can be FreeCAD objects or shapes
+# ----- Arguments:
+# name: name of the FreeCAD object that will be built
+# ----- Attributes:
+# name:
+# add_list: list of the elements to add
+# cut_list: list of the elements to cut
+# fco:      FreeCAD object, once it is built
+
+class FeatPlan (object):
+
+    def __init__ (self, name):
+        self.name = name
+        self.add_list = []
+        self.cut_list = []
+        self.fco = None
+
+    # elem: FreeCAD object, shape, or a list of them
+    def add (self, elem):
+        if isinstance(elem, (list, tuple)):
+            self.add_list.extend(elem)
+        else:
+            self.add_list.append(elem)
+
+    def cut (self, elem):
+        if isinstance(elem, (list, tuple)):
+            self.cut_list.extend(elem)
+        else:
+            self.cut_list.append(elem)
+
+    def build (self):
+        return build_plans([self])[0]
+
+
+def is_shape (elem):
+    return isinstance(elem, Part.Shape)
+
+
+def elem_shape (elem):
+    if is_shape(elem):
+        return elem
+    return elem.Shape
+
+
+# key to identify an element, the same in different plans
+def elem_key (elem):
+    if is_shape(elem):
+        return ('shp', id(elem))
+    return ('fco', elem.Name)
+
+
+def bbox_volume (bbox):
+    if not bbox.isValid():
+        return 0
+    return bbox.XLength * bbox.YLength * bbox.ZLength
+
+
+# ---------- make_union -----------------------------------------------
+# FreeCAD object with the union of the elements:
+# the shapes are put in one Part::Feature, and then everything in one
+# Part::MultiFuse. If there is only one element, it is returned
+
+def make_union (elem_list, name):
+
+    doc = FreeCAD.ActiveDocument
+    fco_list = [elem for elem in elem_list if not is_shape(elem)]
+    shp_list = [elem for elem in elem_list if is_shape(elem)]
+    if shp_list:
+        fco_shp = doc.addObject("Part::Feature", name + "_shp")
+        if len(shp_list) == 1:
+            fco_shp.Shape = shp_list[0]
+        else:
+            fco_shp.Shape = Part.makeCompound(shp_list)
+        fco_list.append(fco_shp)
+    if len(fco_list) == 1:
+        return fco_list[0]
+    fco_union = doc.addObject("Part::MultiFuse", name)
+    fco_union.Shapes = fco_list
+    return fco_union
+
+
+# ---------- build_plans ----------------------------------------------
+# compiles and builds a list of plans, the shared tools are fused once
+# plan_list: list of FeatPlan
+# returns the list of the FreeCAD objects, in the same order
+
+def build_plans (plan_list):
+
+    doc = FreeCAD.ActiveDocument
+    # the elements have to be computed to know their bounding boxes
+    doc.recompute()
+
+    # bounding box of the elements, by key
+    bbox_dict = {}
+    for plan in plan_list:
+        for elem in plan.add_list + plan.cut_list:
+            key = elem_key(elem)
+            if key not in bbox_dict:
+                bbox_dict[key] = elem_shape(elem).BoundBox
+
+    # the tools, in the order they appear, with the plans that cut them
+    tool_keys = []
+    tool_plans = {}
+    tool_elems = {}
+    for plan_ind, plan in enumerate(plan_list):
+        plan_bbox = FreeCAD.BoundBox()
+        for elem in plan.add_list:
+            plan_bbox.add(bbox_dict[elem_key(elem)])
+        for elem in plan.cut_list:
+            key = elem_key(elem)
+            if not plan_bbox.intersect(bbox_dict[key]):
+                logger.debug('%s: tool out of the solid, not cut' % plan.name)
+                continue
+            if key not in tool_plans:
+                tool_keys.append(key)
+                tool_plans[key] = []
+                tool_elems[key] = elem
+            if plan_ind not in tool_plans[key]:
+                tool_plans[key].append(plan_ind)
+
+    # groups of tools, by the plans that cut them
+    # group_dict: key: tuple of plan indexes, value: list of elements
+    group_dict = {}
+    group_order = []
+    for key in tool_keys:
+        group = tuple(tool_plans[key])
+        if group not in group_dict:
+            group_dict[group] = []
+            group_order.append(group)
+        group_dict[group].append(tool_elems[key])
+
+    # one union for each group of tools
+    group_fco = {}
+    group_cost = {}
+    for group_num, group in enumerate(group_order):
+        elem_list = group_dict[group]
+        name = plan_list[group[0]].name + "_cut" + str(group_num)
+        group_fco[group] = make_union(elem_list, name)
+        group_bbox = FreeCAD.BoundBox()
+        for elem in elem_list:
+            group_bbox.add(bbox_dict[elem_key(elem)])
+        group_cost[group] = bbox_volume(group_bbox)
+
+    fco_list = []
+    for plan_ind, plan in enumerate(plan_list):
+        if not plan.add_list:
+            logger.error('%s: FeatPlan with nothing to add' % plan.name)
+            fco_list.append(None)
+            continue
+        # the largest solids first
+        add_list = sorted(plan.add_list, reverse = True,
+                          key = lambda elem: bbox_volume(
+                                                 bbox_dict[elem_key(elem)]))
+        plan_groups = [group for group in group_order if plan_ind in group]
+        # the largest tools first
+        plan_groups.sort(key = lambda group: group_cost[group],
+                         reverse = True)
+        if plan_groups:
+            fco = make_union(add_list, plan.name + "_add")
+        else:
+            fco = make_union(add_list, plan.name)
+        for group_num, group in enumerate(plan_groups):
+            if group_num == len(plan_groups) - 1:
+                cut_name = plan.name
+            else:
+                cut_name = plan.name + "_" + str(group_num)
+            fco_cut = doc.addObject("Part::Cut", cut_name)
+            fco_cut.Base = fco
+            fco_cut.Tool = group_fco[group]
+            fco = fco_cut
+        plan.fco = fco
+        fco_list.append(fco)
+
+    doc.recompute()
+    return fco_list
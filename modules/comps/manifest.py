@@ -0,0 +1,230 @@
+# ----------------------------------------------------------------------------
+# -- Build manifest
+# -- comps library
+# -- What has been built, to know what changes from one build to another
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The manifest of a build has, for each part of the assembly (see
+# snapshot.snapshot_parts), a hash of its shape on its own coordinates
+# (dedup.shape_fingerprint), its placement, bounding box and volume, and
+# the parameters it was made with (the attributes of its handler). It also
+# has the constants of the build (i.e. the ones of goliat.py and kcomp).
+# Comparing the manifests of 2 builds tells the parts that have been
+# added, removed, moved (the same shape on another place) or reshaped
+# (another shape, they have to be printed or exported again).
+#
+#  man = manifest.build_manifest (doc, consts = [kcomp, globals()])
+#  manifest.write_manifest (man, 'goliat_manifest.json')
+#  diff = manifest.diff_manifest (manifest.read_manifest ('old.json'), man)
+#
+# from the command line: python manifest.py old.json new.json
+
+import os
+import sys
+import json
+import types
+import hashlib
+import logging
+
+# the stand-in of fcstub.py if FreeCAD cannot be imported, for the diff
+os.environ.setdefault('COMPS_BACKEND', 'auto')
+import fcfun
+
+import FreeCAD
+import dedup
+import snapshot
+
+logger = logging.getLogger(__name__)
+
+
+# types of the values of the parameters and constants that are taken
+PARAM_TYPES = (bool, int, float, str)
+
+
+# ---------- simple_params --------------------------------------------
+# the values of a dictionary that are numbers, strings or tuples/lists of
+# them, and whose key doesn't start with '_'
+# upper: if True, only the keys in capitals (constants)
+
+def simple_params (var_dict, upper = False):
+
+    param_dict = {}
+    for key, value in var_dict.items():
+        if key.startswith('_') or (upper and key != key.upper()):
+            continue
+        if isinstance(value, PARAM_TYPES):
+            param_dict[key] = value
+        elif (isinstance(value, (tuple, list))
+              and all([isinstance(elem, PARAM_TYPES) for elem in value])):
+            param_dict[key] = list(value)
+    return param_dict
+
+
+# ---------- shape_hash -----------------------------------------------
+# hash (hexadecimal string) of the shape on its own coordinates, the same
+# for the shapes moved by their placement (see dedup.shape_fingerprint)
+
+def shape_hash (shp, ndigits = 3):
+    fprint = dedup.shape_fingerprint(dedup.local_shape(shp),
+                                     ndigits = ndigits)
+    return hashlib.md5(repr(fprint).encode()).hexdigest()
+
+
+# ---------- part_record ----------------------------------------------
+# the record of a part on the manifest
+# fco:       FreeCAD object
+# h_part:    handler of the part (i.e. comps.RectRndBar), its simple
+#            attributes are the parameters of the part. None if it has not
+# ndigits:   decimal digits that are compared
+
+def part_record (fco, h_part = None, ndigits = 3):
+
+    shp = fco.Shape
+    bbox = shp.BoundBox
+    plm = shp.Placement
+    return {'name'   : fco.Name,
+            'type'   : fco.TypeId,
+            'hash'   : shape_hash(shp, ndigits),
+            'pos'    : [round(coord, ndigits) + 0. for coord in plm.Base],
+            'rot'    : [round(coord, 6) + 0. for coord in plm.Rotation.Q],
+            'bbox'   : [round(coord, ndigits) + 0.
+                        for coord in (bbox.XMin, bbox.YMin, bbox.ZMin,
+                                      bbox.XMax, bbox.YMax, bbox.ZMax)],
+            'volume' : round(shp.Volume, ndigits),
+            'params' : (simple_params(vars(h_part))
+                        if h_part is not None else {})}
+
+
+# ---------- build_manifest -------------------------------------------
+# manifest of the parts of a document
+# doc:      FreeCAD document, if None, the active document
+# handlers: dictionary of the handlers of the parts, key: label
+# consts:   list of modules or dictionaries, their constants (names in
+#           capitals) are the parameters of the build
+# fco_list: list of the objects, if None, see snapshot.snapshot_parts
+# returns a dictionary:
+#   'document': name of the document
+#   'params':   constants of the build
+#   'parts':    dictionary of the records of the parts (part_record),
+#               key: label. If the label is repeated: label#2, label#3,...
+
+def build_manifest (doc = None, handlers = None, consts = None,
+                    fco_list = None, ndigits = 3):
+
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    if fco_list is None:
+        fco_list = snapshot.snapshot_parts(doc)
+    handlers = handlers or {}
+    params = {}
+    for const in consts or []:
+        if isinstance(const, types.ModuleType):
+            params.update(simple_params(vars(const), upper = True))
+        else:
+            params.update(simple_params(const, upper = True))
+
+    parts = {}
+    for fco in fco_list:
+        key = fco.Label
+        ind = 2
+        while key in parts:
+            key = '%s#%d' % (fco.Label, ind)
+            ind += 1
+        parts[key] = part_record(fco, handlers.get(fco.Label), ndigits)
+    return {'document' : doc.Name,
+            'params'   : params,
+            'parts'    : parts}
+
+
+def write_manifest (man, path):
+    with open(path, 'w') as fil:
+        json.dump(man, fil, indent = 1, sort_keys = True)
+
+
+def read_manifest (path):
+    with open(path) as fil:
+        return json.load(fil)
+
+
+# ---------- diff_manifest --------------------------------------------
+# compares the manifests of 2 builds
+# returns a dictionary with the labels of the parts (sorted lists):
+#   'added'   : parts only on the new one
+#   'removed' : parts only on the old one
+#   'reshaped': parts whose shape has changed (they may be moved too)
+#   'moved'   : parts with the same shape, on another place
+#   'same'    : parts that have not changed
+#   'params'  : list of the constants of the build that have changed:
+#               tuples (name, old value, new value), None if it is not on
+#               one of them
+#   'part_params': dictionary of the parts whose parameters have changed,
+#               with a list as 'params'
+
+def diff_manifest (old_man, new_man):
+
+    old_parts = old_man['parts']
+    new_parts = new_man['parts']
+    diff = {'added'       : sorted([key for key in new_parts
+                                    if key not in old_parts]),
+            'removed'     : sorted([key for key in old_parts
+                                    if key not in new_parts]),
+            'reshaped'    : [],
+            'moved'       : [],
+            'same'        : [],
+            'params'      : param_changes(old_man['params'],
+                                          new_man['params']),
+            'part_params' : {}}
+    for key in sorted(new_parts.keys()):
+        if key not in old_parts:
+            continue
+        old_rec = old_parts[key]
+        new_rec = new_parts[key]
+        if (old_rec['hash'] != new_rec['hash']
+            or old_rec['volume'] != new_rec['volume']):
+            diff['reshaped'].append(key)
+        elif (old_rec['pos'] != new_rec['pos']
+              or old_rec['rot'] != new_rec['rot']
+              or old_rec['bbox'] != new_rec['bbox']):
+            diff['moved'].append(key)
+        else:
+            diff['same'].append(key)
+        changes = param_changes(old_rec['params'], new_rec['params'])
+        if changes:
+            diff['part_params'][key] = changes
+    return diff
+
+
+# list of (name, old value, new value) of the parameters that are not the
+# same on 2 dictionaries
+def param_changes (old_params, new_params):
+    return [(key, old_params.get(key), new_params.get(key))
+            for key in sorted(set(old_params) | set(new_params))
+            if old_params.get(key) != new_params.get(key)]
+
+
+# ---------- needs_work -----------------------------------------------
+# labels of the parts that a stage has to do again after a build, from
+# the diff (diff_manifest)
+# stage: 'export', 'slice': the ones that are new or have another shape,
+#        'interference': also the ones that have been moved
+
+def needs_work (diff, stage = 'export'):
+    label_list = diff['added'] + diff['reshaped']
+    if stage == 'interference':
+        label_list += diff['moved']
+    return sorted(label_list)
+
+
+if __name__ == '__main__':
+    diff = diff_manifest(read_manifest(sys.argv[1]),
+                         read_manifest(sys.argv[2]))
+    for kind in ('added', 'removed', 'reshaped', 'moved'):
+        print ('%s (%d): %s' % (kind, len(diff[kind]),
+                                ', '.join(diff[kind])))
+    for name, old_val, new_val in diff['params']:
+        print ('param %s: %s -> %s' % (name, old_val, new_val))
@@ -0,0 +1,716 @@
+# ----------------------------------------------------------------------------
+# -- Part Dimensions
+# -- comps library
+# -- Python classes that calculate the dimensions of the 3D printed parts
+# -- without building their geometry (dry run)
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# These classes don't use FreeCAD, Part or any OCC call. They only have
+# the dimensions, positions and bounding boxes of the printed parts.
+# The classes of parts3d and beltcl inherit from them, so the dimensions
+# are calculated in just one place. To lay out the assembly or make sweeps
+# of the parameters, these classes can be used directly:
+#
+#    dims = partdims.EndShaftSliderDims (slidrod_r = 6.0, holdrod_r = 6.0,
+#                                        holdrod_sep = 150.0,
+#                                        name = "slider_left")
+#    print (dims.length, dims.belt_sep, dims.bbox_top)
+#
+# Bounding boxes are tuples: (xmin, ymin, zmin, xmax, ymax, zmax)
+# Points are tuples: (x, y, z)
+
+import logging
+
+import kcomp
+
+from kcomp import TOL
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- bbox_rotz -----------------------------------------------
+# rotates a bounding box a multiple of 90 degrees around the Z axis
+# and then it translates it
+# bbox : tuple (xmin, ymin, zmin, xmax, ymax, zmax)
+# angle: degrees, multiple of 90: 0, 90, 180, -90, 270
+# base : tuple (x, y, z) of the translation, after the rotation
+# returns the new bounding box
+
+def bbox_rotz (bbox, angle = 0, base = (0,0,0)):
+    xmin, ymin, zmin, xmax, ymax, zmax = bbox
+    angle = angle % 360
+    if angle == 90:     # (x,y) -> (-y,x)
+        xmin, ymin, xmax, ymax = -ymax, xmin, -ymin, xmax
+    elif angle == 180:  # (x,y) -> (-x,-y)
+        xmin, ymin, xmax, ymax = -xmax, -ymax, -xmin, -ymin
+    elif angle == 270:  # (x,y) -> (y,-x)
+        xmin, ymin, xmax, ymax = ymin, -xmax, ymax, -xmin
+    elif angle != 0:
+        logger.error('bbox_rotz: angle not multiple of 90: %s' % str(angle))
+    return (xmin + base[0], ymin + base[1], zmin + base[2],
+            xmax + base[0], ymax + base[1], zmax + base[2])
+
+
+# ---------- bbox_union -----------------------------------------------
+# bounding box that includes all the bounding boxes of the list
+
+def bbox_union (bbox_list):
+    return (min([bb[0] for bb in bbox_list]),
+            min([bb[1] for bb in bbox_list]),
+            min([bb[2] for bb in bbox_list]),
+            max([bb[3] for bb in bbox_list]),
+            max([bb[4] for bb in bbox_list]),
+            max([bb[5] for bb in bbox_list]))
+
+
+# ---------- set_m3_tol -----------------------------------------------
+# sets on obj the dimensions of the M3 bolts and nuts with the tolerance
+# tol. They are the same as the ones of kcomp, that are calculated with
+# kcomp.TOL when kcomp is imported:
+# M3_HEAD_L, M3_HEAD_R_TOL, M3_SHANK_R_TOL, M3_NUT_L, M3_NUT_R_TOL,
+# M3NUT_HOLE_H, M3_2APOT_TOL
+
+def set_m3_tol (obj, tol):
+    obj.M3_HEAD_L = kcomp.D912_HEAD_L[3] + tol
+    obj.M3_HEAD_R_TOL = kcomp.M3_HEAD_R + tol/2.0
+    obj.M3_SHANK_R_TOL = 3 / 2.0 + tol/2.0
+    obj.M3_NUT_L = kcomp.NUT_D934_L[3] + tol
+    obj.M3_NUT_R_TOL = kcomp.M3_NUT_R + 1.5*tol
+    obj.M3NUT_HOLE_H = kcomp.NUT_HOLE_MULT_H * obj.M3_NUT_L
+    obj.M3_2APOT_TOL = 2* obj.M3_NUT_R_TOL * 0.866
+
+
+# ---------- set_bolt_tol ---------------------------------------------
+# sets on obj the tolerances of the sliders with the tolerance of the
+# printer tol: tol, MTOL, MLTOL and the dimensions of its bolts (of
+# diameter obj.BOLT_D) with MTOL:
+# BOLT_HEAD_L, BOLT_HEAD_R_TOL, BOLT_SHANK_R_TOL, BOLT_NUT_L, BOLT_NUT_R_TOL
+# returns MTOL
+
+def set_bolt_tol (obj, tol):
+    obj.tol = tol
+    MTOL = tol - 0.1 # reducing the tolrances, it was too tolerant :)
+    obj.MTOL = MTOL
+    obj.MLTOL = tol - 0.05
+    BOLT_D = obj.BOLT_D
+    obj.BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
+    obj.BOLT_HEAD_R_TOL = obj.BOLT_HEAD_R + MTOL/2.0
+    obj.BOLT_SHANK_R_TOL = BOLT_D / 2.0 + MTOL/2.0
+    obj.BOLT_NUT_L = kcomp.NUT_D934_L[BOLT_D] + MTOL
+    obj.BOLT_NUT_R_TOL = obj.BOLT_NUT_R + 1.5*MTOL
+    return MTOL
+
+
+# ---------- class Gt2BeltClampDims ----------------------------------
+# Dimensions of the belt clamp and tensioner, see beltcl.Gt2BeltClamp
+# Arguments:
+#  base_h:  height of the base
+#  midblock: 0 or 1. It will add a none/single width middle block
+#  tol:     tolerance of the printer, of the holes of the leadscrew and its
+#           nut and of the container
+# Attributes: the class constants and
+# CBASE_H, CBASE_RAIL_DIV, CBASE_RAIL, CBASE_WALL, CBASERAILIND,
+# CB_MW, CBASE_W, CBASERAILIND_SIG, TotW, extind: see beltcl.Gt2BeltClamp
+# tol, and the M3_* dimensions with tol: see set_m3_tol
+# bbox : bounding box, the corner in (0,0,0), not considering the holes
+
+class Gt2BeltClampDims (object):
+
+    # space for the 2 belts to clamp them
+    # the GT2 belt is 1.38mm width. 2 together facing teeth will be about 2mm
+    # I make it 2.8mm
+    # Internal Width of the Clamp Block
+    CB_IW = 2.8
+    # Width of the exterior clamp blocks (Y axis)
+    CB_W = 4.0
+    # Length of the clamp blocks (X axis)
+    CB_L = 12.0
+    # GT2 height is 6 mm, making the heigth 8mm
+    C_H = 8.0
+    # GT2 Clamp Cylinder radius
+    CCYL_R = 4.0
+    # separation between the clamp blocks and the clamp cylinder
+    CS = 3.0
+
+    # separation of the nut hole from the edge
+    NUT_HOLE_EDGSEP = 3
+
+    # how much the rail is inside
+    #
+    #  ________________________________________________
+    # |
+    # |   __________________________
+    #  \                        ____ CBASERAILIND
+    #   |
+    #  /  _____ CBASE_RAIL ___
+    # |
+    # |_________________________ CBASE_WALL _________ CBASE_H
+    #
+    # |-|
+    #   CBASERAILIND_SIG (it is 45 degrees). SIG: can be + or -
+    #
+    # if midblock > 0 this will be the indentation,
+    # if midblock == 0 it will be outward, like this:
+    #     _________
+    #    |         |
+    #   /           \
+    #  |             |
+    #   \           /
+    #    |_________|
+
+    CBASE_L = CB_L + CS + 2*CCYL_R
+
+    def __init__ (self, base_h, midblock, tol = TOL):
+        self.base_place = (0,0,0)
+        self.tol = tol
+        set_m3_tol (self, tol)
+        # Clamp base
+        self.CBASE_H = base_h
+        # divides how much is rail and how much is wall
+        # It has to be greater than 1. If it is 1, there is no wall.
+        # if it is 2. Half is wall, half is indent
+        self.CBASE_RAIL_DIV = 1.6 #2.0
+        self.CBASE_RAIL = self.CBASE_H / self.CBASE_RAIL_DIV # rail for the base
+        # the part that is wall, divided by 2, because one goes at the bottom
+        # and the other on top
+        # rail for the base
+        self.CBASE_WALL = (self.CBASE_H - self.CBASE_RAIL)/2.0
+        # Indentation, if midblock == 0, the Indentation is negative, which
+        # means it will be outward, otherwise, inward
+        self.CBASERAILIND = self.CBASE_RAIL/3.0
+
+        self.midblock = midblock
+        # Width of the interior/middle clamp blocks
+        self.CB_MW = midblock * self.CB_W
+        if midblock == 0:
+            self.CBASE_W =     self.CB_IW + 2 * self.CB_W
+            self.CBASERAILIND_SIG = - self.CBASERAILIND
+            # Since the indentation is outwards, we have to add it
+            self.TotW = self.CBASE_W + 2 *  self.CBASERAILIND
+            # external indent, so all the internal elements have to have this
+            # nternal offset. In Y axis
+            self.extind = self.CBASERAILIND
+        else:
+            self.CBASE_W = 2 * self.CB_IW + 2 * self.CB_W + self.CB_MW
+            self.CBASERAILIND_SIG = self.CBASERAILIND
+            # Since the indentation is inward, it is just the base
+            self.TotW = self.CBASE_W
+            # no external indent, so the internal elements don't have to have
+            # this internal offset
+            self.extind = 0
+
+        # the clamp blocks are C_H over the base
+        self.bbox = (0, 0, 0,
+                     self.CBASE_L, self.TotW, self.CBASE_H + self.C_H)
+
+# ---------- end class Gt2BeltClampDims ------------------------------
+
+
+# ---------- class EndShaftSliderDims --------------------------------
+# Dimensions of the slider that goes on a rod and supports the end of
+# another rod, see parts3d.EndShaftSlider for the drawings
+# Arguments:
+#     slidrod_r : radius of the rod where the slider runs on
+#     holdrod_r : radius of the rod that this slider holds
+#     holdrod_sep : separation between the rods that are holded
+#     name        : name of the part
+#     holdrod_cen : 1: if the piece is centered on the perpendicular
+#     side        : 'left' or 'right' (slidding on axis Y)
+#                 : 'bottom' or 'top' (slidding on axis X)
+#     tol         : tolerance of the printer, see set_tol
+# Attributes: the same as parts3d.EndShaftSlider, that don't need the
+# geometry, and also:
+# tol, MTOL, MLTOL and the *_TOL and *_L of the bolts: see set_tol
+# bearing_l, bearing_l_tol, bearing_d, bearing_d_tol, bearing_r,
+# bearing_r_tol : dimensions of the linear bearings (with tolerances)
+# holdrod_r_tol : radius of the hold rods, with tolerance
+# holdrod_insert: length of the hold rod that is inserted in the slider
+# sliderod_r    : radius of the hole for the slide rod
+# slid_posx     : X position of the slider box (side 'left')
+# y_offs        : Y offset, if it is centered
+# bearing0_pos_y, bearing1_pos_y: Y position of the linear bearings
+# bolt_left_pos_x, bolt_right_pos_x, bolt_low_pos_y, bolt_high_pos_y,
+# bolt_lowmid_pos_y, bolt_highmid_pos_y : positions of the bolts that
+#                  hold the top and bottom parts
+# bolt_pull_pos_x, bolt_pullow_pos_y, bolt_pulhigh_pos_y: positions of
+#                  the bolts of the idle pulleys
+# pdent_ur, pdent_ul, pdent_dr, pdent_dl: points of the dent (side 'left')
+# rotz     : rotation in degrees around Z, depending on the side
+# rotz_base: position (tuple) of the rotated parts, depending on the side
+# bbox_top : bounding box of the top part, rotated by its side
+# bbox_bot : bounding box of the bottom part, rotated by its side
+
+class EndShaftSliderDims (object):
+
+    # Separation from the end of the linear bearing to the end of the piece
+    # on the Heigth dimension (Z)
+    OUT_SEP_H = 3.0
+
+    # Minimum separation between the bearings, on the slide direction
+    MIN_BEAR_SEP = 3.0
+
+    # Ratio between the length of the rod (shaft) that is inserted in the slider
+    # and the diameter of the holded shaft
+    HOLDROD_INS_RATIO = 2.0
+
+    # Radius to fillet the sides
+    FILLT_R = 2.0
+
+    # Space for the sliding rod, to be added to its radius, and to be cut
+    SLIDEROD_SPACE = 1.5
+
+    # tolerance on their length for the bearings. Larger because the holes
+    # usually are too tight and it doesn't matter how large is the hole
+    #TOL_BEARING_L = 2.0 # printed in black and was too loose
+    TOL_BEARING_L = 1.0 # reduced
+
+    MTOL = TOL - 0.1 # reducing the tolrances, it was too tolerant :)
+    MLTOL = TOL - 0.05 # reducing the tolrances, it was too tolerant :)
+
+    # Bolts to hold the top and bottom parts:
+    BOLT_D = 4
+    BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_D] / 2.0
+    BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
+    BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0
+    BOLT_SHANK_R_TOL = BOLT_D / 2.0 + MTOL/2.0
+    BOLT_NUT_R = kcomp.NUT_D934_D[BOLT_D] / 2.0
+    BOLT_NUT_L = kcomp.NUT_D934_L[BOLT_D] + MTOL
+    #  1.5 TOL because diameter values are minimum, so they may be larger
+    BOLT_NUT_R_TOL = BOLT_NUT_R + 1.5*MTOL
+
+    # Bolts for the pulleys
+    BOLTPUL_R = 4
+    BOLTPUL_SHANK_R_TOL = BOLTPUL_R / 2.0 + MTOL/2.0
+    BOLTPUL_NUT_R = kcomp.NUT_D934_D[BOLTPUL_R] / 2.0
+    BOLTPUL_NUT_L = kcomp.NUT_D934_L[BOLTPUL_R] + MTOL
+    #  1.5 TOL because diameter values are minimum, so they may be larger
+    BOLTPUL_NUT_R_TOL = BOLTPUL_NUT_R + 1.5*MTOL
+
+    def __init__ (self, slidrod_r, holdrod_r, holdrod_sep,
+                  name, holdrod_cen = 1, side = 'left', tol = TOL):
+
+        self.set_tol (tol)
+        self.base_place = (0,0,0)
+        self.slidrod_r = slidrod_r
+        self.holdrod_r = holdrod_r
+        self.holdrod_sep = holdrod_sep
+        self.holdrod_cen = holdrod_cen
+        self.name        = name
+        self.side        = side
+
+        # Separation from the end of the linear bearing to the end of the piece
+        # on the width dimension (perpendicular to the movement)
+        if self.BOLT_D == 3:
+            self.OUT_SEP_W = 8.0
+            # on the length dimension (parallel to the movement)
+            self.OUT_SEP_L = 10.0
+        elif self.BOLT_D == 4:
+            self.OUT_SEP_W = 10.0
+            self.OUT_SEP_L = 14.0
+        else:
+            logger.error('EndShaftSlider: bolt size not defined')
+
+        bearing_l     = kcomp.LMEUU_L[int(2*slidrod_r)]
+        bearing_d     = kcomp.LMEUU_D[int(2*slidrod_r)]
+        bearing_r     = bearing_d / 2.0
+        self.bearing_l     = bearing_l
+        self.bearing_l_tol = bearing_l + self.TOL_BEARING_L
+        self.bearing_d     = bearing_d
+        self.bearing_d_tol = bearing_d + 2.0 * self.MLTOL
+        self.bearing_r     = bearing_r
+        self.bearing_r_tol = bearing_r + self.MLTOL
+
+        self.holdrod_r_tol =  holdrod_r + self.MLTOL/2.0
+
+        holdrod_insert = self.HOLDROD_INS_RATIO * (2*slidrod_r)
+        self.holdrod_insert = holdrod_insert
+
+        self.slide2holdrod = bearing_r + self.MIN_BEAR_SEP
+        if side == 'right' or side == 'top':
+            # the distance will be negative, either on the X axis (right)
+            # or on the Y axis (top)
+            self.slide2holdrod_sign = - self.slide2holdrod
+        else:
+            self.slide2holdrod_sign = self.slide2holdrod
+
+        # calculation of the width
+        # dimensions should not depend on tolerances
+        self.width = (  bearing_d     #bearing_d_tol
+                      + self.OUT_SEP_W
+                      + holdrod_insert
+                      + self.MIN_BEAR_SEP )
+
+        # calculation of the length
+        # it can be determined by the holdrod_sep (separation of the hold rods)
+        # or by the dimensions of the linear bearings. It will be the largest
+        # of these two:
+        # tlen: total length ..
+        tlen_holdrod = holdrod_sep + 2 * self.OUT_SEP_L + 2 * holdrod_r
+        tlen_bearing = (  2 * bearing_l
+                        + 2* self.OUT_SEP_L
+                        + self.MIN_BEAR_SEP)
+        if tlen_holdrod > tlen_bearing:
+            self.length = tlen_holdrod
+            logger.debug('length comes from holdrod')
+        else:
+            self.length = tlen_bearing
+            logger.debug('length comes from bearing: Check for errors')
+
+        self.partheight = (  bearing_r
+                           + self.OUT_SEP_H)
+
+        # distance from the center of the hold rod to the end on the sliding
+        # direction
+        self.holdrod2end = (self.length - holdrod_sep)/2
+
+        if holdrod_cen == 1:
+            # offset if it is centered on the y
+            self.y_offs = - self.length/2.0
+        else:
+            self.y_offs = 0
+        y_offs = self.y_offs
+
+        self.slid_posx = - (bearing_r + self.OUT_SEP_W)
+
+        # Not bearing_l_tol, because the tol will be added on top and bottom
+        # automatically
+        self.bearing0_pos_y = self.OUT_SEP_L + y_offs
+        self.bearing1_pos_y = (  self.length - (self.OUT_SEP_L + bearing_l)
+                               + y_offs)
+
+        self.sliderod_r = slidrod_r + self.SLIDEROD_SPACE
+
+        # -------------------- bolts and nuts
+        self.bolt_left_pos_x =  -(  bearing_r
+                                  + self.OUT_SEP_W
+                                  + self.sliderod_r) / 2.0
+
+        self.bolt_right_pos_x =   (  bearing_r
+                                   + self.MIN_BEAR_SEP
+                                   + 0.6 * holdrod_insert )
+
+        self.bolt_low_pos_y =  self.OUT_SEP_L / 2.0 + y_offs
+        self.bolt_high_pos_y =  self.length - self.OUT_SEP_L / 2.0 + y_offs
+
+        self.bolt_lowmid_pos_y = (  1.5 * self.OUT_SEP_L
+                                  + 2 * holdrod_r + y_offs)
+        self.bolt_highmid_pos_y = (  self.length
+                                   - 1.5 * self.OUT_SEP_L
+                                   - 2 * holdrod_r  # no _tol
+                                   + y_offs)
+
+        self.bolt_pull_pos_x =   (  self.bearing_r_tol
+                                  + self.MIN_BEAR_SEP
+                                  + 0.25 * holdrod_insert )
+        self.bolt_pullow_pos_y = (  2.5 * self.OUT_SEP_L
+                                  + 2 * holdrod_r + y_offs)
+        self.bolt_pulhigh_pos_y = (  self.length
+                                   - 2.5 * self.OUT_SEP_L
+                                   - 2 * holdrod_r  # no _tol
+                                   + y_offs)
+
+        # separation between the axis iddle pulleys
+        self.idlepull_axsep = self.bolt_pulhigh_pos_y - self.bolt_pullow_pos_y
+        # separation between the inner part of the iddle pulleys
+        # ie: idlepull_axsep - the diameter of the pulley (bearing)
+        # -1 is because the belt is 1.38mm thick. So in each side we can
+        # substract 0.5 mm
+        self.belt_sep = (  self.idlepull_axsep
+                         - kcomp.get_idlepull_maxbear_d(
+                                               kcomp.idlepull_name_list)
+                         - 1)
+
+        # --- dent in the interior to save plastic, see EndShaftSlider
+        self.pdent_ur = ( self.width + self.slid_posx + 1,
+                          self.bolt_highmid_pos_y - 1,
+                         -self.partheight - 1)
+        self.pdent_ul = ( self.bolt_pull_pos_x + 1,
+                          self.bolt_pulhigh_pos_y - self.OUT_SEP_L ,
+                         -self.partheight - 1)
+        self.pdent_dr = ( self.width + self.slid_posx + 1,
+                          self.bolt_lowmid_pos_y +1,
+                         -self.partheight - 1)
+        self.pdent_dl = ( self.bolt_pull_pos_x + 1,
+                          self.bolt_pullow_pos_y + self.OUT_SEP_L ,
+                         -self.partheight - 1)
+        # dent dimensions
+        # the length is actually shorter, because it is 1 mm inside.
+        #
+        #        ur  ____ ovdent_l
+        #         /|                 h_over= (1/ovdent_w)*(ovdent_l-dent_sl)/2.
+        #        /_| ___ dent_l      h_over= triang_h_ov / ovdent_w
+        #       /| |
+        #      / | |          dent_l = ovdent_l -2*lm
+        #     /  | |
+        # ul /___|_| __ dent_sl
+        #    |     |
+        #    |     |
+        #    |     |
+        # dl |_____| __
+        #    \   | |
+        #     \  | |
+        #      \ | |
+        #       \|_| ___
+        #        \ |
+        #         \| ____
+        #          dr
+        #         1
+        #    |---|  dent_w
+        #    |-----| ovdent_w
+        #
+        # the dimensions of the dent overlaped (ov), to make the shape
+        self.ovdent_w = abs(self.pdent_ur[0] - self.pdent_ul[0]) # longer width
+        self.dent_w   = self.ovdent_w - 1
+        # longer  Length
+        self.ovdent_l = abs(self.pdent_ur[1] - self.pdent_dr[1])
+        # shorter Length
+        self.dent_sl  = abs(self.pdent_ul[1] - self.pdent_dl[1])
+        # the height of the overlap triangle
+        triang_h_ov = abs(self.pdent_ur[1] - self.pdent_ul[1])
+        self.dent_l = ( self.ovdent_l
+                       - 2*(triang_h_ov / self.ovdent_w)) # h_over
+
+        # --- rotation of the parts depending on the side
+        # the bearings are not included, they have their own rules
+        if side == 'right':
+            self.rotz = 180
+            if holdrod_cen == False:
+                self.rotz_base = (0, self.length, 0)
+            else:
+                self.rotz_base = (0, 0, 0)
+        elif side == 'bottom':
+            self.rotz = 90
+            if holdrod_cen == False:
+                self.rotz_base = (self.length, 0, 0)
+            else:
+                self.rotz_base = (0, 0, 0)
+        elif side == 'top':
+            self.rotz = -90
+            self.rotz_base = (0, 0, 0)
+        else: # 'left', default condition
+            self.rotz = 0
+            self.rotz_base = (0, 0, 0)
+
+        bbox_top = (self.slid_posx, y_offs, 0,
+                    self.slid_posx + self.width, y_offs + self.length,
+                    self.partheight)
+        bbox_bot = (self.slid_posx, y_offs, -self.partheight,
+                    self.slid_posx + self.width, y_offs + self.length,
+                    0)
+        self.bbox_top = bbox_rotz(bbox_top, self.rotz, self.rotz_base)
+        self.bbox_bot = bbox_rotz(bbox_bot, self.rotz, self.rotz_base)
+
+    # --------------------------------------------------------------------
+    # sets the tolerances: MTOL, MLTOL and the dimensions of the bolts with
+    # tolerances (see set_bolt_tol), and the ones of the bolts of the idle
+    # pulleys. The class constants are the ones of kcomp.TOL, that is the
+    # default
+    # tol: tolerance of the printer. The outer dimensions of the part don't
+    #      depend on it, only the holes and some of their positions
+
+    def set_tol (self, tol):
+        MTOL = set_bolt_tol (self, tol)
+        BOLTPUL_R = self.BOLTPUL_R
+        self.BOLTPUL_SHANK_R_TOL = BOLTPUL_R / 2.0 + MTOL/2.0
+        self.BOLTPUL_NUT_L = kcomp.NUT_D934_L[BOLTPUL_R] + MTOL
+        self.BOLTPUL_NUT_R_TOL = self.BOLTPUL_NUT_R + 1.5*MTOL
+
+# ---------- end class EndShaftSliderDims ----------------------------
+
+
+# ---------- class CentralSliderDims ---------------------------------
+# Dimensions of the central slider that moves on the X axis,
+# see parts3d.CentralSlider for the drawings
+# Arguments:
+#     rod_r   : radius of the rods where the slider runs on
+#     rod_sep : separation between the rods
+#     name    : name of the part
+#     belt_sep: separation between the belt
+#     dent_w  : width of the dent, if no dent is needed, just dent_w = 0
+#     dent_l  : length of the dent,
+#     dent_sl : small dimension of the dent length
+#     tol     : tolerance of the printer, see set_tol
+# Attributes: the same as parts3d.CentralSlider, that don't need the
+# geometry, and also:
+# tol, MTOL, MLTOL and the *_TOL and *_L of the bolts, and the M3_*
+# dimensions with tol (see set_m3_tol): see set_tol
+# bearing_l, bearing_l_tol, bearing_d, bearing_d_tol, bearing_r,
+# bearing_r_tol : dimensions of the linear bearings (with tolerances)
+# triang_h : height of the triangle of the dent (if dent_w != 0)
+# fbcl_w, fbcl_l: width and length of the fixed belt clamps
+# fbclt_pos : position (tuple) of the top (positive Y) fixed belt clamp
+# fbclb_pos : position (tuple) of the bottom (negative Y) fixed belt clamp
+# fbcl_xmin, fbcl_xmax, fbcl_ymin, fbcl_ymax: limits of the base of the
+#             top fixed belt clamp. The bottom has the Y limits negated
+# h_bclten : Gt2BeltClampDims of the belt clamp tensioner
+# beltclamp_w: total width of the belt clamp tensioner
+# bc_nuthole_x : X position of the nut hole of the belt tensioner
+# bc_car_xend  : X position of the end of the belt tensioner carriage
+# bbox_top : bounding box of the top part
+# bbox_bot : bounding box of the bottom part, including the fixed belt
+#            clamps
+
+class CentralSliderDims (object):
+
+    # Separation from the end of the linear bearing to the end of the piece
+    # on the Heigth dimension (Z)
+    OUT_SEP_H = 2.0  # smaller to test 3.0
+
+    # Minimum separation between the bearings, on the slide direction
+    MIN_BEAR_SEP = 2.0  # smaller to test 3.0
+
+    # Radius to fillet the sides
+    FILLT_R = 3.0 # larger to 2.0
+
+    # Space for the sliding rod, to be added to its radius, and to be cut
+    ROD_SPACE = 1.5
+
+    # tolerance on their length for the bearings. Larger because the holes
+    # usually are too tight and it doesn't matter how large is the hole
+    #TOL_BEARING_L = 2.0 # printed in black and was too loose
+    TOL_BEARING_L = 1.0 # reduced, good
+
+    MTOL = TOL - 0.1 # reducing the tolrances, it was too tolerant :)
+    MLTOL = TOL - 0.05 # reducing the tolrances, it was too tolerant :)
+
+    # Bolts to hold the top and bottom parts:
+    BOLT_D = 4
+    BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_D] / 2.0
+    BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
+    BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0
+    BOLT_SHANK_R_TOL = BOLT_D / 2.0 + MTOL/2.0
+    BOLT_NUT_R = kcomp.NUT_D934_D[BOLT_D] / 2.0
+    BOLT_NUT_L = kcomp.NUT_D934_L[BOLT_D] + MTOL
+    #  1.5 TOL because diameter values are minimum, so they may be larger
+    BOLT_NUT_R_TOL = BOLT_NUT_R + 1.5*MTOL
+
+    def __init__ (self, rod_r, rod_sep, name, belt_sep,
+                  dent_w, dent_l, dent_sl, tol = TOL):
+
+        self.set_tol (tol)
+        self.base_place = (0,0,0)
+        self.rod_r      = rod_r
+        self.rod_sep    = rod_sep
+        self.name       = name
+        self.belt_sep   = belt_sep
+        self.dent_w     = dent_w
+        if dent_w == 0:
+            self.dent_l     = 0
+            self.dent_sl    = 0
+            self.ovdent_w   = 0
+            self.ovdent_l   = 0
+        else:
+            self.dent_l     = dent_l
+            self.dent_sl    = dent_sl
+            self.ovdent_w   = dent_w + 1
+
+        bearing_l     = kcomp.LMEUU_L[int(2*rod_r)]
+        bearing_d     = kcomp.LMEUU_D[int(2*rod_r)]
+        bearing_r     = bearing_d / 2.0
+        self.bearing_l     = bearing_l
+        self.bearing_l_tol = bearing_l + self.TOL_BEARING_L
+        self.bearing_d     = bearing_d
+        self.bearing_d_tol = bearing_d + 2.0 * self.MLTOL
+        self.bearing_r     = bearing_r
+        self.bearing_r_tol = bearing_r + self.MLTOL
+
+        # separation from the end of the linear bearing to the end
+        self.OUT_SEP_MOV = 4.0
+        if self.BOLT_D == 3:
+            self.OUT_SEP_MOVPP = 10.0
+        elif self.BOLT_D == 4:
+            self.OUT_SEP_MOVPP = 10.0
+        else:
+            logger.error('Bolt Size not defined in CentralSlider')
+
+        self.length = rod_sep + 2 * bearing_r + 2 * self.OUT_SEP_MOVPP
+        self.width  = bearing_l + 2 * self.OUT_SEP_MOV
+        self.partheight  = bearing_r + self.OUT_SEP_H
+        self.totwidth  = self.width + 2*self.dent_w
+
+        slid_x = self.width
+
+        # height of the triangle of the dent (no overlaped)
+        if dent_w != 0:
+            self.triang_h = (dent_l - dent_sl) / 2.
+            h_over = self.triang_h / dent_w
+            self.ovdent_l = dent_l + 2 * h_over
+
+        # --------------------- Fixed belt clamps (fbcl)
+        # the width of the belt_clamp (on the X axis):
+        self.fbcl_w = Gt2BeltClampDims.CB_IW + 2*Gt2BeltClampDims.CB_W
+        # the length of the belt_clamp (on the Y axis):
+        self.fbcl_l = Gt2BeltClampDims.CBASE_L
+        fbcl_w = self.fbcl_w
+
+        # top (positive Y)
+        # Y position:
+        fbclt_pos_y = ( self.belt_sep /2.0 -1 )
+        # X position will be on the intersection of the border of the slider
+        # with the Y position (fbclt_po_y)
+        # There are 3 parts:
+        # above the dent: fbclt_pos_y > dent_l/2.
+        # on the dent: dent_l/2. > fbclt_pos_y > dent_sl/.2
+        # below the dent: fbclt_pos_y < dent_sl/.2
+        # the position is related to the center of the belt clamp. So we
+        # have to substract fbcl_w/2.
+        if fbclt_pos_y >= dent_l/2. :
+            fbclt_pos_x = slid_x/2. - fbcl_w/2.
+        elif fbclt_pos_y <= dent_sl/2. :
+            fbclt_pos_x = self.totwidth/2. - fbcl_w/2.
+        else:
+            # calculate the intersection of the line with the fbclt_pos_y:
+            #a triangle calculation: b/h = B/H
+            h = fbclt_pos_y - dent_sl/2.
+            b = h * (dent_w/self.triang_h)
+            fbclt_pos_x =  self.totwidth/2. - fbcl_w/2. - b
+        self.fbclt_pos = (fbclt_pos_x, fbclt_pos_y, self.partheight)
+        self.fbclb_pos = (fbclt_pos_x, -fbclt_pos_y, self.partheight)
+
+        self.fbcl_xmin = fbclt_pos_x - fbcl_w/2.
+        self.fbcl_xmax = self.totwidth/2. + 1
+        self.fbcl_ymax = dent_l / 2.
+        self.fbcl_ymin = fbclt_pos_y - Gt2BeltClampDims.CBASE_L
+
+        # ---------- Belt tensioner
+        self.h_bclten = Gt2BeltClampDims (base_h = self.partheight,
+                                          midblock = 0)
+        self.beltclamp_w = self.h_bclten.CBASE_W + 2 * self.h_bclten.extind
+        # fbcl_xmin is the x where the other clamp starts
+        # the x min, of the nut hole
+        self.bc_nuthole_x = (  self.fbcl_xmin
+                             - self.h_bclten.NUT_HOLE_EDGSEP
+                             - self.M3NUT_HOLE_H)
+        # the end of the carriage
+        self.bc_car_xend = self.bc_nuthole_x - self.h_bclten.NUT_HOLE_EDGSEP
+
+        # --- bounding boxes
+        if dent_w != 0:
+            half_x = self.totwidth / 2.
+            half_y = max(self.length, self.ovdent_l) / 2.
+        else:
+            half_x = slid_x / 2.
+            half_y = self.length / 2.
+        self.bbox_top = (-half_x, -half_y, 0,
+                          half_x,  half_y, self.partheight)
+        # the fixed belt clamps are on the bottom part, over the top part
+        # they are 0.1 lower, see CentralSlider
+        self.bbox_bot = (-half_x, -half_y, -self.partheight,
+                          half_x,  half_y,
+                          self.partheight + Gt2BeltClampDims.C_H - 0.1)
+
+    # --------------------------------------------------------------------
+    # sets the tolerances, see set_bolt_tol. Also the M3 bolts and nuts of
+    # the belt tensioner, see set_m3_tol
+
+    def set_tol (self, tol):
+        set_bolt_tol (self, tol)
+        set_m3_tol (self, tol)
+
+# ---------- end class CentralSliderDims -----------------------------
+
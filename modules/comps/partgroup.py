@@ -40,9 +40,42 @@ logging.basicConfig(level=logging.DEBUG,
 logger = logging.getLogger(__name__)
 
 
+# shapes of the washers and bearings already made, on the origin and
+# pointing to VZ. So identical components are made just once.
+# key: (r_out, r_in, thick)
+holcyl_shp_dict = {}
+
+# ----------- def shp_holcyl ---------------------------------------------
+# returns the shape of a kcomp.HollowCyl (washer or bearing): the cached
+# shape of the same dimensions placed on its position, sharing its solid
+# (see fcfun.shp_placed)
+# holcyl:   kcomp.HollowCyl
+# normal:   FreeCAD.Vector on the direction of the cylinder
+# pos:      FreeCAD.Vector of the position of the center of the base
+
+def shp_holcyl (holcyl, normal = VZ, pos = V0):
+
+    key = (holcyl.r_out, holcyl.r_in, holcyl.thick)
+    if key not in holcyl_shp_dict:
+        holcyl_shp_dict[key] = fcfun.shp_revolve_rz(
+                                     fcfun.rz_hollowcyl(holcyl.r_out,
+                                                        holcyl.r_in,
+                                                        holcyl.thick))
+    # the shape is not copied, just placed: it shares its solid
+    plm = FreeCAD.Placement(pos, FreeCAD.Rotation(VZ, normal))
+    return fcfun.shp_placed(holcyl_shp_dict[key], plm)
+
+
 # ----------- class BearWashGroup ----------------------------------------
 # Creates a group of bearings and washers to make idle pulleys
 # Receives a list of names 
+# The group is just one FreeCAD object (Part::Feature):
+#  - a compound of the washers and bearings, which shapes are shared with
+#    the ones of the same dimensions (holcyl_shp_dict)
+#  - or, if merged, a single solid made with one revolve of the profile of
+#    the stack. It is simpler, but the components are not separated.
+#    If 2 components that are together do not overlap radially, they
+#    cannot be one solid, and the compound is made
 # ----- Arguments:
 # holcyl_list:  list of objects kcomp.HollowCyl, that have the list of 
 #               objects that will be on this group. The ordering will be
@@ -51,28 +84,34 @@ logger = logging.getLogger(__name__)
 # pos:      FreeCAD.Vector that defines the position of the center of the 
 #           cylinder base       
 # name:     string with the name
+# merged:   True to make a single solid
 # ----- Attributes:
 # holcyl_list:
 # normal:   The normalized normal
 # pos:      The position (argument)
+# merged:   The argument
 # height:   The total height of all the components
 # count:    The number of components
-# fco_list: A list with all the freecad objects
+# shp_list: A list with the shapes of the components, empty if merged
+#           (and they could be merged)
+# fco_list: A list with all the freecad objects, just fco
 # d_maxwash: The largest diameter of all the washers
 # d_maxbear: The largest diameter of all the bearing
 # r_maxwash: The largest radius of all the washers
 # r_maxbear: The largest radius of all the bearing
-# fco      : cad object of the compound
+# fco      : cad object of the group
 
 class BearWashGroup (object):
 
     def __init__ (self, holcyl_list,
                   name = "bearwashgr", 
-                  normal = VZ, pos = V0):
+                  normal = VZ, pos = V0, merged = False):
         doc = FreeCAD.ActiveDocument
 
         self.holcyl_list = holcyl_list
         self.name = name
+        self.pos = pos
+        self.merged = merged
 
         group_h = 0 # the accumlated height
         # in case the length is not 1
@@ -83,19 +122,15 @@ class BearWashGroup (object):
 
         d_maxwash = 0
         d_maxbear = 0
-        fco_list = [] # list of the freecad objects
-        for ind, elem in enumerate(holcyl_list):
-            fco = fcfun.addCylHolePos(r_out = elem.r_out,
-                                      r_in  = elem.r_in,
-                                      h     = elem.thick,
-                                      name  = name + str(ind+1),
-                                      normal = norm_normal,
-                                      pos   = elem_pos)
-            fco_list.append(fco)
+        shp_list = [] # list of the shapes
+        pos_list = [] # position of each component
+        for elem in holcyl_list:
+            pos_list.append(elem_pos)
+            if not merged:
+                shp_list.append(shp_holcyl(elem, norm_normal, elem_pos))
             # adding the height on the same direction
-            elem_pos += DraftVecUtils.scaleTo(norm_normal, elem.thick)
-            #print 'index: ' + str(ind)  +' thick: ' +
-            #       str(elem.thick) + ' elem_pos: ' + str(elem_pos)
+            elem_pos = elem_pos + DraftVecUtils.scaleTo(norm_normal,
+                                                        elem.thick)
             group_h += elem.thick
             if elem.part == 'washer':
                 if d_maxwash < elem.d_out :
@@ -105,17 +140,32 @@ class BearWashGroup (object):
                     d_maxbear = elem.d_out
             
         self.height = group_h
-        self.fco_list = fco_list
         self.d_maxwash = d_maxwash
         self.d_maxbear = d_maxbear
         self.r_maxwash = d_maxwash/2.
         self.r_maxbear = d_maxbear/2.
-        self.count  = len(fco_list)
-
-        bearwashgroup = doc.addObject("Part::Compound", name)
-        bearwashgroup.Links = fco_list
+        self.count  = len(holcyl_list)
+
+        shp_group = None
+        if merged:
+            try:
+                rz_list = fcfun.rz_hollowcyl_stack(
+                              [(elem.r_out, elem.r_in, elem.thick)
+                               for elem in holcyl_list])
+                shp_group = fcfun.shp_revolve_rz(rz_list, norm_normal, pos)
+            except ValueError as err:
+                logger.warning('%s: not merged, %s' % (name, err))
+                shp_list = [shp_holcyl(elem, norm_normal, elem_pos)
+                            for elem, elem_pos in zip(holcyl_list, pos_list)]
+        if shp_group is None:
+            shp_group = Part.makeCompound(shp_list)
+        self.shp_list = shp_list
+
+        bearwashgroup = doc.addObject("Part::Feature", name)
+        bearwashgroup.Shape = shp_group
 
         self.fco = bearwashgroup
+        self.fco_list = [bearwashgroup]
         doc.recompute()
         
 
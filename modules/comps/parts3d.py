@@ -34,6 +34,8 @@ import kcomp    # import material constants and other constants
 import comps    # import my CAD components
 import beltcl   # import my CAD components
 import partgroup  # import my CAD components
+import partdims   # dimensions of the parts, without geometry
+import featplan   # plans of the solids to add and cut
 
 from fcfun import V0, VX, VY, VZ, V0ROT, addBox, addCyl, fillet_len
 from fcfun import addBolt, addBoltNut_hole, NutHole
@@ -57,6 +59,8 @@ logger = logging.getLogger(__name__)
 #     holdrod_cen : 1: if the piece is centered on the perpendicular 
 #     side        : 'left' or 'right' (slidding on axis Y)
 #                 : 'bottom' or 'top' (slidding on axis X)
+#     tol         : tolerance of the printer, see
+#                   partdims.EndShaftSliderDims.set_tol
 #
 #          Y      axis= 'y'    side='left'
 #          |
@@ -123,182 +127,128 @@ logger = logging.getLogger(__name__)
 #             It is (0,0,0) when initialized, it has to be changed using the
 #             function Base_Place
 
-class EndShaftSlider (object):
+class EndShaftSlider (partdims.EndShaftSliderDims):
 
-    # Separation from the end of the linear bearing to the end of the piece
-    # on the Heigth dimension (Z)
-    OUT_SEP_H = 3.0
+    # the class constants are in partdims.EndShaftSliderDims
 
-    # Minimum separation between the bearings, on the slide direction
-    MIN_BEAR_SEP = 3.0
+    # sliders already built, on side 'left'. The sliders with the same
+    # dimensions, on any side, are clones of them. So the 4 sliders of the
+    # machine are built once
+    # key: (document name, slidrod_r, holdrod_r, holdrod_sep, holdrod_cen,
+    #       tol)
+    # value: dictionary with the names of the FreeCAD objects, keys:
+    #        'top_slide', 'bot_slide', 'idlepulls', 'bearings'
+    build_dict = {}
 
-    # Ratio between the length of the rod (shaft) that is inserted in the slider
-    # and the diameter of the holded shaft
-    HOLDROD_INS_RATIO = 2.0
-
-    # Radius to fillet the sides
-    FILLT_R = 2.0
-
-    # Space for the sliding rod, to be added to its radius, and to be cut
-    SLIDEROD_SPACE = 1.5
-
-    # tolerance on their length for the bearings. Larger because the holes
-    # usually are too tight and it doesn't matter how large is the hole
-    #TOL_BEARING_L = 2.0 # printed in black and was too loose
-    TOL_BEARING_L = 1.0 # reduced
-
-    MTOL = TOL - 0.1 # reducing the tolrances, it was too tolerant :)
-    MLTOL = TOL - 0.05 # reducing the tolrances, it was too tolerant :)
-
-    # Bolts to hold the top and bottom parts:
-    BOLT_D = 4
-    BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_D] / 2.0
-    BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
-    BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0 
-    BOLT_SHANK_R_TOL = BOLT_D / 2.0 + MTOL/2.0
-    BOLT_NUT_R = kcomp.NUT_D934_D[BOLT_D] / 2.0
-    BOLT_NUT_L = kcomp.NUT_D934_L[BOLT_D] + MTOL
-    #  1.5 TOL because diameter values are minimum, so they may be larger
-    BOLT_NUT_R_TOL = BOLT_NUT_R + 1.5*MTOL
-
-    # Bolts for the pulleys
-    BOLTPUL_R = 4
-    BOLTPUL_SHANK_R_TOL = BOLTPUL_R / 2.0 + MTOL/2.0
-    BOLTPUL_NUT_R = kcomp.NUT_D934_D[BOLTPUL_R] / 2.0
-    BOLTPUL_NUT_L = kcomp.NUT_D934_L[BOLTPUL_R] + MTOL
-    #  1.5 TOL because diameter values are minimum, so they may be larger
-    BOLTPUL_NUT_R_TOL = BOLTPUL_NUT_R + 1.5*MTOL
+    # bodies (filleted box) already built, they don't depend on the
+    # tolerance, so they are shared by the sliders with different tol
+    # key: (document name, slidrod_r, holdrod_r, holdrod_sep, holdrod_cen)
+    # value: name of the FreeCAD object
+    body_dict = {}
 
     def __init__ (self, slidrod_r, holdrod_r, holdrod_sep, 
-                  name, holdrod_cen = 1, side = 'left'):
+                  name, holdrod_cen = 1, side = 'left', tol = TOL):
 
         doc = FreeCAD.ActiveDocument
-        self.base_place = (0,0,0)
-        self.slidrod_r = slidrod_r
-        self.holdrod_r = holdrod_r
-        self.holdrod_sep = holdrod_sep
-        self.holdrod_cen = holdrod_cen
-    
-        self.name        = name
-        #self.axis        = axis
-
-        # Separation from the end of the linear bearing to the end of the piece
-        # on the width dimension (perpendicular to the movement)
-        if self.BOLT_D == 3:
-            self.OUT_SEP_W = 8.0
-            # on the length dimension (parallel to the movement)
-            self.OUT_SEP_L = 10.0
-        elif self.BOLT_D == 4:
-            self.OUT_SEP_W = 10.0
-            self.OUT_SEP_L = 14.0
-        else:
-            print "not defined"
-
-        bearing_l     = kcomp.LMEUU_L[int(2*slidrod_r)] 
-        bearing_l_tol = bearing_l + self.TOL_BEARING_L
-        bearing_d     = kcomp.LMEUU_D[int(2*slidrod_r)]
-        bearing_d_tol = bearing_d + 2.0 * self.MLTOL
-        bearing_r     = bearing_d / 2.0
-        bearing_r_tol = bearing_r + self.MLTOL
-
-        holdrod_r_tol =  holdrod_r + self.MLTOL/2.0
-
-        holdrod_insert = self.HOLDROD_INS_RATIO * (2*slidrod_r) 
-
-        self.slide2holdrod = bearing_r + self.MIN_BEAR_SEP 
-        if side == 'right' or side == 'top':
-            # the distance will be negative, either on the X axis (right)
-            # or on the Y axis (top)
-            self.slide2holdrod_sign = - self.slide2holdrod
+        # all the dimensions, without building any geometry
+        partdims.EndShaftSliderDims.__init__ (self,
+                                              slidrod_r = slidrod_r,
+                                              holdrod_r = holdrod_r,
+                                              holdrod_sep = holdrod_sep,
+                                              name = name,
+                                              holdrod_cen = holdrod_cen,
+                                              side = side,
+                                              tol = tol)
+
+        fco_keys = ('top_slide', 'bot_slide', 'idlepulls', 'bearings')
+        key = (doc.Name, slidrod_r, holdrod_r, holdrod_sep, holdrod_cen, tol)
+        build = self.build_dict.get(key)
+        # in case the objects have been deleted
+        if build is not None:
+            if None in [doc.getObject(build[fco_key]) for fco_key in fco_keys]:
+                build = None
+
+        if build is None:
+            build = self.build_left (name)
+            self.build_dict[key] = build
+            new_build = True
         else:
-            self.slide2holdrod_sign = self.slide2holdrod
-    
-        # calculation of the width
-        # dimensions should not depend on tolerances
-        self.width = (  bearing_d     #bearing_d_tol
-                      + self.OUT_SEP_W
-                      + holdrod_insert
-                      + self.MIN_BEAR_SEP )
-
-
-        # calculation of the length
-        # it can be determined by the holdrod_sep (separation of the hold rods)
-        # or by the dimensions of the linear bearings. It will be the largest
-        # of these two: 
-        # tlen: total length ..
-        tlen_holdrod = holdrod_sep + 2 * self.OUT_SEP_L + 2 * holdrod_r
-        #tlen_holdrod = holdrod_sep + 2 * self.OUT_SEP_L + 2 * holdrod_r_tol
-        #tlen_bearing = (  2 * bearing_l_tol
-        tlen_bearing = (  2 * bearing_l
-                        + 2* self.OUT_SEP_L
-                        + self.MIN_BEAR_SEP)
-        if tlen_holdrod > tlen_bearing:
-            self.length = tlen_holdrod
-            print "length comes from holdrod"
-        else:
-            self.length = tlen_bearing
-            print "length comes from bearing: Check for errors"
-       
-
-        self.partheight = (  bearing_r
-                           + self.OUT_SEP_H)
-
-        
-        # distance from the center of the hold rod to the end on the sliding
-        # direction
-        self.holdrod2end = (self.length - holdrod_sep)/2
-
-#        if axis == 'x':
-#            slid_x = self.length
-#            slid_y = self.width
-#            slid_z = self.partheight
-#        else: # 'y': default
-        slid_x = self.width
-        slid_y = self.length
-        slid_z = self.partheight
+            new_build = False
 
-        if holdrod_cen == 1:
-            # offset if it is centered on the y
-            y_offs = - slid_y/2.0
+        # position of the parts, depending on the side
+        self.side_base = FreeCAD.Vector(self.rotz_base)
+        if new_build and side == 'left':
+            for fco_key in fco_keys:
+                setattr(self, fco_key, doc.getObject(build[fco_key]))
         else:
-            y_offs = 0
+            # the other sides are clones of the left side, rotated
+            side_plm = FreeCAD.Placement(self.side_base,
+                                         FreeCAD.Rotation(VZ, self.rotz))
+            for fco_key in fco_keys:
+                fco = doc.getObject(build[fco_key])
+                if new_build and fco.ViewObject != None:
+                    fco.ViewObject.Visibility = False
+                fco_clone = Draft.clone(fco)
+                fco_clone.Label = name + "_" + fco_key
+                fco_clone.Placement = side_plm
+                setattr(self, fco_key, fco_clone)
 
+        doc.recompute()
 
-        slid_posx = - (bearing_r + self.OUT_SEP_W)
-
+    # ---- end of __init__  EndShaftSlider
 
-        bearing0_pos_y = self.OUT_SEP_L
-        # Not bearing_l_tol, because the tol will be added on top and bottom
-        # automatically
-        bearing1_pos_y = self.length - (self.OUT_SEP_L + bearing_l)
-         
-        # adding the offset
-        bearing0_pos_y = bearing0_pos_y + y_offs
-        bearing1_pos_y = bearing1_pos_y + y_offs
+    # builds the slider for side 'left', returns a dictionary with the
+    # names of the FreeCAD objects: see build_dict.
+    # The bottom part is the top part mirrored, both have the same holes,
+    # but the holes of the bolts, that have the head on top and the nut
+    # on the bottom: they are cut from each part after mirroring
 
+    def build_left (self, name):
 
-        topslid_box = addBox(slid_x, slid_y, slid_z, "topsideslid_box")
-        topslid_box.Placement.Base = FreeCAD.Vector(slid_posx, y_offs, 0)
+        doc = FreeCAD.ActiveDocument
+        slidrod_r = self.slidrod_r
 
-        botslid_box = addBox(slid_x, slid_y, slid_z, "bosidetslid_box")
-        botslid_box.Placement.Base = FreeCAD.Vector(slid_posx, y_offs,
-                                                    -self.partheight)
+        bearing_l     = self.bearing_l
+        bearing_r     = self.bearing_r
+        holdrod_r_tol = self.holdrod_r_tol
+        holdrod_insert = self.holdrod_insert
 
-        topslid_fllt = fillet_len (topslid_box, slid_z, 
-                                  self.FILLT_R, "topsideslid_fllt")
-        botslid_fllt = fillet_len (botslid_box, slid_z,
-                                  self.FILLT_R, "botsideslid_fllt")
+        slid_x = self.width
+        slid_y = self.length
+        slid_z = self.partheight
 
-        # list of elements that cut:
+        y_offs = self.y_offs
+        slid_posx = self.slid_posx
+
+        bearing0_pos_y = self.bearing0_pos_y
+        bearing1_pos_y = self.bearing1_pos_y
+
+        body_key = (doc.Name, self.slidrod_r, self.holdrod_r,
+                    self.holdrod_sep, self.holdrod_cen)
+        topslid_fllt = None
+        if body_key in self.body_dict:
+            topslid_fllt = doc.getObject(self.body_dict[body_key])
+        if topslid_fllt is None:
+            topslid_box = addBox(slid_x, slid_y, slid_z, "topsideslid_box")
+            topslid_box.Placement.Base = FreeCAD.Vector(slid_posx, y_offs, 0)
+
+            # fillet the vertical edges, the bottom part is the mirror
+            topslid_fllt = fillet_len (topslid_box, slid_z, self.FILLT_R,
+                                       "topsideslid_fllt", axis = 'z')
+            self.body_dict[body_key] = topslid_fllt.Name
+
+        # list of elements that cut, symmetrical on plane XY (z=0):
+        symcutlist = []
+        # list of elements that cut, not symmetrical:
         cutlist = []
 
-        sliderod = fcfun.addCyl_pos (r = slidrod_r + self.SLIDEROD_SPACE,
+        sliderod = fcfun.addCyl_pos (r = self.sliderod_r,
                                h = slid_y +2,
                                name = "sliderod",
                                axis = 'y',
                                h_disp = y_offs - 1)
 
-        cutlist.append (sliderod)
+        symcutlist.append (sliderod)
 
         h_lmuu_0 = comps.LinBearing (
                          r_ext = bearing_r,
@@ -310,14 +260,14 @@ class EndShaftSlider (object):
                          r_tol  = self.MLTOL,
                          h_tol  = self.TOL_BEARING_L)
 
-        cutlist.append (h_lmuu_0.bearing_cont)
+        symcutlist.append (h_lmuu_0.bearing_cont)
 
         h_lmuu_1 = comps.LinBearingClone (
                                       h_lmuu_0,
                                       "lm" + str(int(2*slidrod_r)) + "uu_1",
                                       namadd = 0)
         h_lmuu_1.BasePlace ((0, bearing1_pos_y - bearing0_pos_y, 0))
-        cutlist.append (h_lmuu_1.bearing_cont)
+        symcutlist.append (h_lmuu_1.bearing_cont)
 
 
         # ------------ hold rods ----------------
@@ -334,7 +284,7 @@ class EndShaftSlider (object):
                                      0,
                                      self.holdrod2end + y_offs,
                                      0)
-        cutlist.append (holdrod_0)
+        symcutlist.append (holdrod_0)
 
         holdrod_1 = fcfun.addCyl_pos (
                                 r = holdrod_r_tol,
@@ -348,7 +298,7 @@ class EndShaftSlider (object):
                                        0,
                                        self.length - self.holdrod2end + y_offs,
                                        0)
-        cutlist.append (holdrod_1)
+        symcutlist.append (holdrod_1)
 
         # -------------------- bolts and nuts
         bolt0 = addBoltNut_hole (
@@ -362,34 +312,15 @@ class EndShaftSlider (object):
                             supp_head = 1, supp_nut=1,
                             headdown  = 0, name="bolt_hole")
 
-        #bolt_left_pos_x =  -(  bearing_r_tol
-        bolt_left_pos_x =  -(  bearing_r
-                             + self.OUT_SEP_W
-                             + sliderod.Base.Radius.Value) / 2.0
-
-        #bolt_right_pos_x =   (  bearing_r_tol
-        bolt_right_pos_x =   (  bearing_r
-                              + self.MIN_BEAR_SEP
-                              + 0.6 * holdrod_insert )
-
-        bolt_low_pos_y =  self.OUT_SEP_L / 2.0 + y_offs
-        bolt_high_pos_y =  self.length - self.OUT_SEP_L / 2.0 + y_offs
-
-        bolt_lowmid_pos_y =  1.5 * self.OUT_SEP_L + 2 * holdrod_r + y_offs
-        bolt_highmid_pos_y = (  self.length
-                             - 1.5 * self.OUT_SEP_L
-                             - 2 * holdrod_r  # no _tol
-                             + y_offs)
-
-        bolt_pull_pos_x =   (  bearing_r_tol
-                              + self.MIN_BEAR_SEP
-                              + 0.25 * holdrod_insert )
-        #bolt_pullow_pos_y =  2.5 * self.OUT_SEP_L + 2 * holdrod_r_tol + y_offs
-        bolt_pullow_pos_y =  2.5 * self.OUT_SEP_L + 2 * holdrod_r + y_offs
-        bolt_pulhigh_pos_y = (  self.length
-                             - 2.5 * self.OUT_SEP_L
-                             - 2 * holdrod_r  # no _tol
-                             + y_offs)
+        bolt_left_pos_x = self.bolt_left_pos_x
+        bolt_right_pos_x = self.bolt_right_pos_x
+        bolt_low_pos_y = self.bolt_low_pos_y
+        bolt_high_pos_y = self.bolt_high_pos_y
+        bolt_lowmid_pos_y = self.bolt_lowmid_pos_y
+        bolt_highmid_pos_y = self.bolt_highmid_pos_y
+        bolt_pull_pos_x = self.bolt_pull_pos_x
+        bolt_pullow_pos_y = self.bolt_pullow_pos_y
+        bolt_pulhigh_pos_y = self.bolt_pulhigh_pos_y
 
         bolt0.Placement.Base = FreeCAD.Vector (bolt_left_pos_x,
                                                self.length/2 + y_offs,
@@ -499,14 +430,6 @@ class EndShaftSlider (object):
                                          FreeCAD.Vector(0,0,2*self.partheight))
         idlepull0 = h_idlepull0.fco
 
-        # separation between the axis iddle pulleys
-        self.idlepull_axsep = bolt_pulhigh_pos_y - bolt_pullow_pos_y
-        # separation between the inner part of the iddle pulleys
-        # ie: idlepull_axsep - the diameter of the pulley (bearing)
-        # -1 is because the belt is 1.38mm thick. So in each side we can
-        # substract 0.5 mm
-        self.belt_sep = self.idlepull_axsep - h_idlepull0.d_maxbear - 1
-
         # Hole for Pulley Down
         boltpull1 = Draft.clone(boltpull0)
         boltpull1.Label = "boltpul_hole_1"
@@ -528,55 +451,11 @@ class EndShaftSlider (object):
         # --- make a dent in the interior to save plastic
         # points: p dent
 
-        pdent_ur = FreeCAD.Vector ( self.width + slid_posx + 1,
-                                    bolt_highmid_pos_y - 1,
-                                   -self.partheight - 1)
-        pdent_ul = FreeCAD.Vector ( bolt_pull_pos_x + 1,
-                                    bolt_pulhigh_pos_y - self.OUT_SEP_L ,
-                                   -self.partheight - 1)
-        pdent_dr = FreeCAD.Vector ( self.width + slid_posx + 1,
-                                    bolt_lowmid_pos_y +1,
-                                   -self.partheight - 1)
-        pdent_dl = FreeCAD.Vector ( bolt_pull_pos_x + 1,
-                                    bolt_pullow_pos_y + self.OUT_SEP_L ,
-                                   -self.partheight - 1)
-
-        # dent dimensions
-        # the length is actually shorter, because it is 1 mm inside.
-        #         
-        #        ur  ____ ovdent_l
-        #         /|                 h_over= (1/ovdent_w)*(ovdent_l-dent_sl)/2.
-        #        /_| ___ dent_l      h_over= triang_h_ov / ovdent_w
-        #       /| |    
-        #      / | |          dent_l = ovdent_l -2*lm
-        #     /  | |          
-        # ul /___|_| __ dent_sl
-        #    |     |
-        #    |     |
-        #    |     |
-        # dl |_____| __
-        #    \   | |
-        #     \  | |
-        #      \ | |
-        #       \|_| ___
-        #        \ |
-        #         \| ____
-        #          dr
-        #         1
-        #    |---|  dent_w
-        #    |-----| ovdent_w 
-        #
-        # the dimensions of the dent overlaped (ov), to make the shape
-        self.ovdent_w = abs(pdent_ur.x - pdent_ul.x) # longer width
-        self.dent_w   = self.ovdent_w - 1
-        self.ovdent_l = abs(pdent_ur.y - pdent_dr.y) # longer  Length 
-        self.dent_sl  = abs(pdent_ul.y - pdent_dl.y) # shorter Length 
-        # the height of the overlap triangle
-        triang_h_ov = abs(pdent_ur.y - pdent_ul.y)
-        self.dent_l = ( self.ovdent_l 
-                       - 2*(triang_h_ov / self.ovdent_w)) # h_over
-
-        pdent_list = [ pdent_ur, pdent_ul, pdent_dl, pdent_dr]
+        # dent dimensions: see partdims.EndShaftSliderDims
+        pdent_list = [ FreeCAD.Vector(self.pdent_ur),
+                       FreeCAD.Vector(self.pdent_ul),
+                       FreeCAD.Vector(self.pdent_dl),
+                       FreeCAD.Vector(self.pdent_dr)]
 
         dent_plane = doc.addObject("Part::Polygon", "dent_plane")
         dent_plane.Nodes = pdent_list
@@ -586,97 +465,51 @@ class EndShaftSlider (object):
         dent.Base = dent_plane
         dent.Dir = (0,0, 2*self.partheight +2)
         dent.Solid = True
-        cutlist.append (dent)
+        symcutlist.append (dent)
+
+        symholes = doc.addObject("Part::MultiFuse", "symholes")
+        symholes.Shapes = symcutlist
 
         holes = doc.addObject("Part::MultiFuse", "holes")
         holes.Shapes = cutlist
 
-
-        if side == 'right':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 180)
-            # h_lmuu_0.bearing. bearings stay the same
-            if holdrod_cen == False:
-                holes.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                idlepulls.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                topslid_fllt.Placement.Base = FreeCAD.Vector (0, self.length,0)
-                botslid_fllt.Placement.Base = FreeCAD.Vector (0, self.length,0)
-        elif side == 'bottom':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, 90)
-            h_lmuu_0.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-            # lmuu_1 has relative position to lmuu_0, so if rotating it
-            # to the other side and reseting its position will put it in its
-            # place
-            if holdrod_cen == True:
-                h_lmuu_1.bearing.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (0,0,0)
-            if holdrod_cen == False:
-                holes.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                idlepulls.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                topslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                botslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                h_lmuu_0.bearing.Placement.Base = FreeCAD.Vector (
-                                                          self.length,0,0)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (
-                           self.length - h_lmuu_1.bearing.Placement.Base.y ,0,0)
-                h_lmuu_1.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-        elif side == 'top':
-            holes.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            idlepulls.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            topslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            botslid_fllt.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-            h_lmuu_0.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, -90)
-            # lmuu_1 has relative position to lmuu_0, so if rotating it
-            # to the other side and reseting its position will put it in its
-            # place
-            if holdrod_cen == True:
-                h_lmuu_1.bearing.Placement.Rotation =  FreeCAD.Rotation (VZ, 90)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (0,0,0)
-            if holdrod_cen == False:
-                #holes.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #topslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #botslid_fllt.Placement.Base = FreeCAD.Vector (self.length,0,0)
-                #h_lmuu_0.bearing.Placement.Base = FreeCAD.Vector (
-                                                          #self.length,0,0)
-                h_lmuu_1.bearing.Placement.Base = FreeCAD.Vector (
-                                         h_lmuu_1.bearing.Placement.Base.y ,0,0)
-                h_lmuu_1.bearing.Placement.Rotation = FreeCAD.Rotation (VZ, -90)
-
-
-        # elif side == 'left':
-            # don't do anything, default condition
-
-        self.idlepulls = idlepulls
-
         bearings = doc.addObject("Part::Fuse", name + "_bear")
         bearings.Base = h_lmuu_0.bearing
         bearings.Tool = h_lmuu_1.bearing
-        self.bearings = bearings
+
+        topslid_sym = doc.addObject("Part::Cut", name + "_topsym")
+        topslid_sym.Base = topslid_fllt 
+        topslid_sym.Tool = symholes 
+
+        botslid_sym = doc.addObject("Part::Mirroring", name + "_botsym")
+        botslid_sym.Source = topslid_sym
+        botslid_sym.Base = V0
+        botslid_sym.Normal = VZ
 
         top_slide = doc.addObject("Part::Cut", name + "_top")
-        top_slide.Base = topslid_fllt 
+        top_slide.Base = topslid_sym 
         top_slide.Tool = holes 
-        self.top_slide = top_slide
 
         bot_slide = doc.addObject("Part::Cut", name + "_bot")
-        bot_slide.Base = botslid_fllt 
+        bot_slide.Base = botslid_sym 
         bot_slide.Tool = holes 
-        self.bot_slide = bot_slide
 
-    # ---- end of __init__  EndShaftSlider
+        return {'top_slide' : top_slide.Name,
+                'bot_slide' : bot_slide.Name,
+                'idlepulls' : idlepulls.Name,
+                'bearings'  : bearings.Name}
+
+    # ---- end of build_left  EndShaftSlider
 
     # move both sliders (top & bottom) and the bearings
+    # the position is added to the position given by the side
     def BasePlace (self, position = (0,0,0)):
         self.base_place = position
-        self.idlepulls.Placement.Base = FreeCAD.Vector(position)
-        self.bearings.Placement.Base = FreeCAD.Vector(position)
-        self.top_slide.Placement.Base = FreeCAD.Vector(position)
-        self.bot_slide.Placement.Base = FreeCAD.Vector(position)
+        base = self.side_base + FreeCAD.Vector(position)
+        self.idlepulls.Placement.Base = base
+        self.bearings.Placement.Base = base
+        self.top_slide.Placement.Base = base
+        self.bot_slide.Placement.Base = base
         
 
 
@@ -703,6 +536,8 @@ class EndShaftSlider (object):
 #     dent_w  : width of the dent, if no dent is needed, just dent_w = 0
 #     dent_l  : length of the dent, 
 #     dent_sl : small dimension of the dent length
+#     tol     : tolerance of the printer, see
+#               partdims.CentralSliderDims.set_tol
 #
 #           Y   
 #           |
@@ -781,67 +616,35 @@ class EndShaftSlider (object):
 #             It is (0,0,0) when initialized, it has to be changed using the
 #             function BasePlace
 
-class CentralSlider (object):
-
-    # Separation from the end of the linear bearing to the end of the piece
-    # on the Heigth dimension (Z)
-    OUT_SEP_H = 2.0  # smaller to test 3.0
+class CentralSlider (partdims.CentralSliderDims):
 
-    # Minimum separation between the bearings, on the slide direction
-    MIN_BEAR_SEP = 2.0  # smaller to test 3.0
+    # the class constants are in partdims.CentralSliderDims
 
-    # Radius to fillet the sides
-    FILLT_R = 3.0 # larger to 2.0
-
-    # Space for the sliding rod, to be added to its radius, and to be cut
-    ROD_SPACE = 1.5
-
-    # tolerance on their length for the bearings. Larger because the holes
-    # usually are too tight and it doesn't matter how large is the hole
-    #TOL_BEARING_L = 2.0 # printed in black and was too loose
-    TOL_BEARING_L = 1.0 # reduced, good
-
-    MTOL = TOL - 0.1 # reducing the tolrances, it was too tolerant :)
-    MLTOL = TOL - 0.05 # reducing the tolrances, it was too tolerant :)
-
-    # Bolts to hold the top and bottom parts:
-    BOLT_D = 4
-    BOLT_HEAD_R = kcomp.D912_HEAD_D[BOLT_D] / 2.0
-    BOLT_HEAD_L = kcomp.D912_HEAD_L[BOLT_D] + MTOL
-    BOLT_HEAD_R_TOL = BOLT_HEAD_R + MTOL/2.0 
-    BOLT_SHANK_R_TOL = BOLT_D / 2.0 + MTOL/2.0
-    BOLT_NUT_R = kcomp.NUT_D934_D[BOLT_D] / 2.0
-    BOLT_NUT_L = kcomp.NUT_D934_L[BOLT_D] + MTOL
-    #  1.5 TOL because diameter values are minimum, so they may be larger
-    BOLT_NUT_R_TOL = BOLT_NUT_R + 1.5*MTOL
+    # bodies already built: the filleted boxes with the dent. They don't
+    # depend on the tolerance, so they are shared by the sliders with
+    # different tol
+    # key: (document name, rod_r, rod_sep, belt_sep, dent_w, dent_l, dent_sl)
+    # value: dictionary with the names of the FreeCAD objects, keys:
+    #        'top': top body, 'bot_list': list of the bottom bodies
+    body_dict = {}
 
     def __init__ (self, rod_r, rod_sep, name, belt_sep,
-                  dent_w, dent_l, dent_sl):
+                  dent_w, dent_l, dent_sl, tol = TOL):
 
         doc = FreeCAD.ActiveDocument
-        self.base_place = (0,0,0)
-        self.rod_r      = rod_r
-        self.rod_sep    = rod_sep
-        self.name       = name
-        self.belt_sep   = belt_sep
-        self.dent_w     = dent_w
-        if dent_w == 0:
-            self.dent_l     = 0
-            self.dent_sl    = 0
-            self.ovdent_w   = 0
-            self.ovdent_l   = 0
-        else:
-            self.dent_l     = dent_l
-            self.dent_sl    = dent_sl
-            self.ovdent_w   = dent_w + 1
-            ovdent_w        = self.ovdent_w
-
-        bearing_l     = kcomp.LMEUU_L[int(2*rod_r)] 
-        bearing_l_tol = bearing_l + self.TOL_BEARING_L
-        bearing_d     = kcomp.LMEUU_D[int(2*rod_r)]
-        bearing_d_tol = bearing_d + 2.0 * self.MLTOL
-        bearing_r     = bearing_d / 2.0
-        bearing_r_tol = bearing_r + self.MLTOL
+        # all the dimensions, without building any geometry
+        partdims.CentralSliderDims.__init__ (self,
+                                             rod_r = rod_r,
+                                             rod_sep = rod_sep,
+                                             name = name,
+                                             belt_sep = belt_sep,
+                                             dent_w = dent_w,
+                                             dent_l = dent_l,
+                                             dent_sl = dent_sl,
+                                             tol = tol)
+
+        bearing_l     = self.bearing_l
+        bearing_r     = self.bearing_r
         #
         #    |  _____  |
         #    |_|     |_|
@@ -853,110 +656,32 @@ class CentralSlider (object):
         #    |-| OUT_SEP_MOV : separacion on the direction of the movement
         #    |---------| length
         #   
-        # separation from the end of the linear bearing to the end
-        self.OUT_SEP_MOV = 4.0
-        if self.BOLT_D == 3:
-            self.OUT_SEP_MOVPP = 10.0
-        elif self.BOLT_D == 4:
-            self.OUT_SEP_MOVPP = 10.0
-        else:
-            print "Bolt Size not defined in CentralSlider"
-
-
-        self.length = rod_sep + 2 * bearing_r + 2 * self.OUT_SEP_MOVPP
-        self.width  = bearing_l + 2 * self.OUT_SEP_MOV
-        self.partheight  = bearing_r + self.OUT_SEP_H
-        self.totwidth  = self.width + 2*self.dent_w
 
         slid_x = self.width
         slid_y = self.length
         slid_z = self.partheight
 
-        topcenslid_box = fcfun.addBox_cen (slid_x, slid_y, slid_z,
-                                  "topcenslid_box",
-                                  cx=True, cy=True, cz= False)
-        #logger.debug('topcenslid_box %s ' % str(topcenslid_box.Shape))
-        botcenslid_box = fcfun.addBox_cen (slid_x, slid_y, slid_z,
-                                 "botcenslid_box",
-                                  cx=True, cy=True, cz= False)
-        botcenslid_box.Placement.Base = FreeCAD.Vector(0, 0, -self.partheight)
-
-        # fillet
-        topcenslid_fllt = fillet_len (box = topcenslid_box,
-                                      e_len = slid_z,
-                                      radius = self.FILLT_R,
-                                      name = "topcenslid_fllt")
-        botcenslid_fllt = fillet_len (botcenslid_box, slid_z, self.FILLT_R,
-                                     "botcenslid_fllt")
+        body_key = (doc.Name, rod_r, rod_sep, belt_sep,
+                    dent_w, dent_l, dent_sl)
+        body = self.body_dict.get(body_key)
+        # in case the objects have been deleted
+        if body is not None:
+            if None in [doc.getObject(fco_name) for fco_name
+                                          in [body['top']] + body['bot_list']]:
+                body = None
+        if body is None:
+            body = self.build_body ()
+            self.body_dict[body_key] = body
+        topcenslid_dent = doc.getObject(body['top'])
+
+        # the top and bottom parts are built at the end, from their plans
+        plan_top = featplan.FeatPlan (name + "_top")
+        plan_bot = featplan.FeatPlan (name + "_bot")
 
         # list of elements to cut:
         cutlist = []
         # List to add to the bottom slider
-        addbotlist = []
-        # ----------------------------- outward dent
-        #               t                         y
-        #           tl ___ tr  (top right)        |_ x
-        #         lt  /   \  rt (right top)
-        #       lb   |     | rb (right bottom) r
-        #             \   /
-        #        bl    --- br  (bottom right)
-
-        # we have dent_l, dent_w and ovdent_w (dent_w + 1)
-        #         
-        #     tr  ____ ovdent_l
-        #    |\                 h_over = triang_h/dent_w
-        #    | \  _  ___ dent_l
-        #    | |\                triang_h
-        #    | | \                    
-        #    | |  \ rt    
-        # ul |_|___\ __ dent_sl
-        #    |     |
-        #    |     |
-        #    |     |
-        # dl |_____| __
-        #    | |   / rb
-        #    | |  / 
-        #    | | /  
-        #    | |/    ___
-        #    | /    
-        #    |/      ____
-        #     br
-        #     1
-        #      |---|  dent_w
-        #    |-----| ovdent_w 
-        #
-        # the dimensions of the dent overlaped (ov), to make the shape
-        # height of the triangle (no overlaped)
-        if dent_w != 0:
-            triang_h = (dent_l - dent_sl) / 2.
-            h_over = triang_h / dent_w
-            ovdent_l = dent_l + 2 * h_over
-            self.ovdent_l = ovdent_l
-
-            # slid_x-1 because the dent was calculated with 1mm of superposition
-            # points:
-            #p_dent_t  = FreeCAD.Vector(  0            , dent_l/2.0, 0)
-            p_dent_tr = FreeCAD.Vector(  slid_x/2. -1 , ovdent_l/2., 0)
-            p_dent_rt = FreeCAD.Vector(  slid_x/2. + dent_w , dent_sl/2., 0)
-            #p_dent_r  = FreeCAD.Vector(  slid_x/2. -1 + dent_w , 0          , 0)
-            dentwire = fcfun.wire_sim_xy([p_dent_tr, p_dent_rt])
-            dentface = Part.Face(dentwire)
-            shp_topdent = dentface.extrude(FreeCAD.Vector(0,0, slid_z))
-            shp_botdent = dentface.extrude(FreeCAD.Vector(0,0,-slid_z))
-            topdent = doc.addObject("Part::Feature", "topcenslidedent")
-            topdent.Shape = shp_topdent
-            botdent = doc.addObject("Part::Feature", "botcenslidedent")
-            botdent.Shape = shp_botdent
-
-            topcenslid_dent = doc.addObject("Part::Fuse","topcenslid_dent")
-            topcenslid_dent.Base = topcenslid_fllt
-            topcenslid_dent.Tool = topdent
-
-            botcenslid_dent = doc.addObject("Part::Fuse","botcenslid_dent")
-            botcenslid_dent.Base = botcenslid_fllt
-            botcenslid_dent.Tool = botdent
-        
-            addbotlist.append (botcenslid_dent)
+        addbotlist = [doc.getObject(fco_name) for fco_name in body['bot_list']]
 
         # --------------------- Hole for the rods ---------------
         toprod = fcfun.addCyl_pos ( r = rod_r + self.ROD_SPACE,
@@ -976,137 +701,46 @@ class CentralSlider (object):
         cutlist.append (botrod)
 
         # --------------------- Fixed belt clamps (fbcl)
-        # the width of the belt_clamp (on the X axis):
-        fbcl_w = beltcl.Gt2BeltClamp.CB_IW + 2*beltcl.Gt2BeltClamp.CB_W 
-        # the length of the belt_clamp (on the Y axis):
-        fbcl_l = beltcl.Gt2BeltClamp.CBASE_L
-    
-        # top (positive Y)
-        # Y position:
-        fbclt_pos_y = ( self.belt_sep /2.0 -1 )
-        # X position will be on the intersection of the border of the slider
-        # with the Y position (fbclt_po_y)
-        # There are 3 parts:
-        # above the dent: fbclt_pos_y > dent_l/2. 
-        # on the dent: dent_l/2. > fbclt_pos_y > dent_sl/.2
-        # below the dent: fbclt_pos_y < dent_sl/.2
-        # the position is related to the center of the belt clamp. So we
-        # have to substract fbcl_w/2.
-        if fbclt_pos_y >= dent_l/2. :
-            fbclt_pos_x = slid_x/2. - fbcl_w/2. 
-        elif fbclt_pos_y <= dent_sl/2. :
-            fbclt_pos_x = self.totwidth/2. - fbcl_w/2. 
-        else:
-            # calculate the intersection of the line with the fbclt_pos_y:
-            #a triangle calculation: b/h = B/H
-            h = fbclt_pos_y - dent_sl/2.
-            b = h * (dent_w/triang_h)
-            fbclt_pos_x =  self.totwidth/2. - fbcl_w/2. - b
-        fbclt_pos = FreeCAD.Vector(fbclt_pos_x,
-                                   fbclt_pos_y,
-                                   self.partheight )
-        #fco_fbclt = beltcl.fco_topbeltclamp (railaxis = '-y', bot_norm = '-z',
-        #                 pos = fbclt_pos, extra = 1, name = "fbclt")
-        shp_fbclt = beltcl.shp_topbeltclamp (railaxis = '-y', bot_norm = '-z',
-                         pos = fbclt_pos, extra = 1)
-
-        fbcl_xmin = fbclt_pos_x - fbcl_w/2. 
-
-        fbcl_xmax = self.totwidth/2. + 1
-
-        fbcl_ymax = dent_l / 2.
-        fbcl_ymin = fbclt_pos_y - beltcl.Gt2BeltClamp.CBASE_L 
+        # dimensions and positions: see partdims.CentralSliderDims
+        # top (positive Y) and bottom (negative Y) clamps
+        fbclt_pos_y = self.fbclt_pos[1]
+        fbclt_pos = FreeCAD.Vector(self.fbclt_pos)
+        fbclb_pos = FreeCAD.Vector(self.fbclb_pos)
 
-        doc.recompute()
+        fbcl_xmin = self.fbcl_xmin
+        fbcl_xmax = self.fbcl_xmax
+        fbcl_ymax = self.fbcl_ymax
+        fbcl_ymin = self.fbcl_ymin
 
-        # base to add to the lower slider:
-        bs_fbclt_p0 = FreeCAD.Vector (fbcl_xmin, fbcl_ymin, -1)
-        bs_fbclt_p1 = FreeCAD.Vector (fbcl_xmax, fbcl_ymin, -1)
-        bs_fbclt_p2 = FreeCAD.Vector (fbcl_xmax, fbcl_ymax, -1)
-        bs_fbclt_p3 = FreeCAD.Vector (fbcl_xmin, fbcl_ymax, -1)
-        bs_fbclt_wire = Part.makePolygon([bs_fbclt_p0,bs_fbclt_p1,
-                                          bs_fbclt_p2,bs_fbclt_p3,
-                                          bs_fbclt_p0])
-        bs_fbclt_face = Part.Face(bs_fbclt_wire)
-        shp_bs_fbclt_box = bs_fbclt_face.extrude(
-                                     FreeCAD.Vector(0,0,self.partheight+1))
-        shp_bs_fbclt = shp_bs_fbclt_box.common(topcenslid_dent.Shape)
-        #all: base with the beltclt
-        shp_afbclt = shp_bs_fbclt.fuse(shp_fbclt)
-        afbclt = doc.addObject("Part::Feature", "fbclt")
-        afbclt.Shape = shp_afbclt
-        addbotlist.append (afbclt)
-        afbclt.Placement.Base.z = -0.1
-
-        # base to cut to the lower slider:
-        cbs_fbclt_p0 = FreeCAD.Vector (fbcl_xmin -kcomp.TOL,
-                                       fbcl_ymin -kcomp.TOL, -1)
-        cbs_fbclt_p1 = FreeCAD.Vector (fbcl_xmax,
-                                       fbcl_ymin -kcomp.TOL, -1)
-        cbs_fbclt_p2 = FreeCAD.Vector (fbcl_xmax,
-                                       fbcl_ymax +kcomp.TOL, -1)
-        cbs_fbclt_p3 = FreeCAD.Vector (fbcl_xmin -kcomp.TOL,
-                                       fbcl_ymax +kcomp.TOL, -1)
-        cbs_fbclt_wire = Part.makePolygon([cbs_fbclt_p0,cbs_fbclt_p1,
-                                          cbs_fbclt_p2,cbs_fbclt_p3,
-                                          cbs_fbclt_p0])
-        cbs_fbclt_face = Part.Face(cbs_fbclt_wire)
-        shp_cbs_fbclt = cbs_fbclt_face.extrude(
-                                     FreeCAD.Vector(0,0,self.partheight+2))
-        cbs_fbclt = doc.addObject("Part::Feature", "cbs_cfbclt")
-        cbs_fbclt.Shape = shp_cbs_fbclt
-
-        cuttoplist = []
-        cuttoplist.append (cbs_fbclt)
-
-        # bottom belt clamp
-        fbclb_pos = FreeCAD.Vector( fbclt_pos_x,
-                                   -fbclt_pos_y,
-                                   self.partheight )
-        shp_fbclb = beltcl.shp_topbeltclamp (railaxis = 'y', bot_norm = '-z',
-                         pos = fbclb_pos, extra = 1)
-
-        # base to add to the lower slider:
-        bs_fbclb_p0 = FreeCAD.Vector (fbcl_xmin,-fbcl_ymin, -1)
-        bs_fbclb_p1 = FreeCAD.Vector (fbcl_xmax,-fbcl_ymin, -1)
-        bs_fbclb_p2 = FreeCAD.Vector (fbcl_xmax,-fbcl_ymax, -1)
-        bs_fbclb_p3 = FreeCAD.Vector (fbcl_xmin,-fbcl_ymax, -1)
-        bs_fbclb_wire = Part.makePolygon([bs_fbclb_p0,bs_fbclb_p1,
-                                          bs_fbclb_p2,bs_fbclb_p3,
-                                          bs_fbclb_p0])
-        bs_fbclb_face = Part.Face(bs_fbclb_wire)
-        shp_bs_fbclb_box = bs_fbclb_face.extrude(
-                                     FreeCAD.Vector(0,0,self.partheight+1))
-        shp_bs_fbclb = shp_bs_fbclb_box.common(topcenslid_dent.Shape)
-        #all: base with the beltclt
-        shp_afbclb = shp_bs_fbclb.fuse(shp_fbclb)
-        afbclb = doc.addObject("Part::Feature", "fbclb")
-        afbclb.Shape = shp_afbclb
-        addbotlist.append (afbclb)
-        afbclb.Placement.Base.z = -0.2
         doc.recompute()
 
-        # base to cut to the lower slider:
-        cbs_fbclb_p0 = FreeCAD.Vector (fbcl_xmin -kcomp.TOL,
-                                       -(fbcl_ymin -kcomp.TOL), -1)
-        cbs_fbclb_p1 = FreeCAD.Vector (fbcl_xmax,
-                                       -(fbcl_ymin -kcomp.TOL), -1)
-        cbs_fbclb_p2 = FreeCAD.Vector (fbcl_xmax,
-                                       -(fbcl_ymax +kcomp.TOL), -1)
-        cbs_fbclb_p3 = FreeCAD.Vector (fbcl_xmin -kcomp.TOL,
-                                       -(fbcl_ymax +kcomp.TOL), -1)
-        cbs_fbclb_wire = Part.makePolygon([cbs_fbclb_p0,cbs_fbclb_p1,
-                                          cbs_fbclb_p2,cbs_fbclb_p3,
-                                          cbs_fbclb_p0])
-        cbs_fbclb_face = Part.Face(cbs_fbclb_wire)
-        shp_cbs_fbclb = cbs_fbclb_face.extrude(
-                                     FreeCAD.Vector(0,0,self.partheight+2))
-        cbs_fbclb = doc.addObject("Part::Feature", "cbs_cfbclb")
-        cbs_fbclb.Shape = shp_cbs_fbclb
-
-        cuttoplist.append (cbs_fbclb)
+        # the bases are added to the lower slider, and their containers
+        # (with tolerance, but not on the outer side) cut to the top slider
+        (shp_fbcl_list,
+         shp_bs_fbcl_list,
+         shp_cbs_fbcl_list) = beltcl.shp_topbeltclamp_list (
+                 clamp_list = [('-y', '-z', fbclt_pos),
+                               ( 'y', '-z', fbclb_pos)],
+                 extra = 1,
+                 base_list = [(fbcl_xmin, fbcl_xmax,  fbcl_ymin,  fbcl_ymax),
+                              (fbcl_xmin, fbcl_xmax, -fbcl_ymax, -fbcl_ymin)],
+                 base_z = -1,
+                 base_h = self.partheight + 1,
+                 cont_h = self.partheight + 2,
+                 cont_offs = (self.tol, 0, self.tol, self.tol),
+                 base_common = topcenslid_dent.Shape)
 
-        doc.recompute()
+        #all: base with the beltclt
+        for shp_fbcl, shp_bs_fbcl, fbcl_name, fbcl_z in zip (shp_fbcl_list,
+                                                            shp_bs_fbcl_list,
+                                                            ["fbclt", "fbclb"],
+                                                            [-0.1, -0.2]):
+            afbcl = doc.addObject("Part::Feature", fbcl_name)
+            afbcl.Shape = shp_bs_fbcl.fuse(shp_fbcl)
+            addbotlist.append (afbcl)
+            afbcl.Placement.Base.z = fbcl_z
+
+        cuttoplist = list(shp_cbs_fbcl_list)
 
         parts_list = []
         # --------------------- Idle Pulley
@@ -1192,7 +826,8 @@ class CentralSlider (object):
         # ---------- Belt tensioner
 
         h_bclten0 =  beltcl.Gt2BeltClamp (base_h = slid_z,
-                                            midblock =0, name="bclten0")
+                                            midblock =0, name="bclten0",
+                                            tol = self.tol)
         bclten0 = h_bclten0.fco   # the FreeCad Object
         parts_list.append(bclten0)
         bclten0_cont = h_bclten0.fco_cont   # the container
@@ -1208,14 +843,14 @@ class CentralSlider (object):
         #  |_ 0 is here: I have to change it to be centered, and able to 
         #                rotate
       
-        beltclamp_w = h_bclten0.CBASE_W + 2 * h_bclten0.extind
+        beltclamp_w = self.beltclamp_w
         #h_bclten0.BasePlace ((    -(self.width/2. +self.dent_w) 
         #                            + h_bclten0.CBASE_L ,
 
-        h_bc_nuthole0 = NutHole (nut_r  = kcomp.M3_NUT_R_TOL,
-                           nut_h  = kcomp.M3NUT_HOLE_H,
+        h_bc_nuthole0 = NutHole (nut_r  = self.M3_NUT_R_TOL,
+                           nut_h  = self.M3NUT_HOLE_H,
                            # + TOL to have a little bit more room for the nut
-                           hole_h = slid_z/2. + TOL, 
+                           hole_h = slid_z/2. + self.tol, 
                            name   = "bccr_nuthole0",
                            extra  = 1,
                            # the height of the nut on the X axis
@@ -1224,13 +859,10 @@ class CentralSlider (object):
                            cy = 1, # centered on y, on the center of the hexagon
                            holedown = 0)
 
-        # fbcl_xmin is the x where the other clamp starts
-        # the x min, of the nut hole
-        bc_nuthole_x = (  fbcl_xmin
-                        - h_bclten0.NUT_HOLE_EDGSEP
-                        - h_bc_nuthole0.nut_h)
-        # the end of the carriage
-        bc_car_xend = bc_nuthole_x - h_bclten0.NUT_HOLE_EDGSEP
+        # the x min of the nut hole and the end of the carriage:
+        # see partdims.CentralSliderDims
+        bc_nuthole_x = self.bc_nuthole_x
+        bc_car_xend = self.bc_car_xend
 
         bc_nuthole0 = h_bc_nuthole0.fco # the FreeCad Object
         bc_nuthole0.Placement.Base = FreeCAD.Vector(
@@ -1251,7 +883,7 @@ class CentralSlider (object):
         # hole for the leadscrew of the belt clamp
         bcl_leads_h = ( self.width/2. + self.dent_w - bc_car_xend + 1)
         bcl_leads0 = fcfun.addCylPos (
-                             r=kcomp.M3_SHANK_R_TOL,
+                             r=self.M3_SHANK_R_TOL,
                              h= bcl_leads_h,
                              name = "bcl_leads0",
                              normal = VX,
@@ -1262,7 +894,7 @@ class CentralSlider (object):
         # add a hole to see below
         shp_box_pos = FreeCAD.Vector (-slid_x/2., fbclt_pos_y, -slid_z-1)
         shp_boxb = fcfun.shp_boxcenfill( x= slid_x/2.+bc_car_xend -2,
-                                         y= kcomp.M3_2APOT_TOL,
+                                         y= self.M3_2APOT_TOL,
                                          z= slid_z + 2,
                                          fillrad = 2,
                                          fx=0, fy=0, fz=1,
@@ -1275,7 +907,6 @@ class CentralSlider (object):
 
         beltholes_t = doc.addObject("Part::MultiFuse", "beltholes_t")
         beltholes_t.Shapes = beltholes_l
-        doc.recompute()
 
         bclten1 = Draft.clone(bclten0)
         bclten1.Label = 'bclten1'
@@ -1287,7 +918,6 @@ class CentralSlider (object):
         beltholes_b.Label = 'beltholes_b'
         beltholes_b.Placement.Base.y = - 2* fbclt_pos_y
 
-        doc.recompute()
         cutlist.append (beltholes_t)
         cutlist.append (beltholes_b)
 
@@ -1299,7 +929,8 @@ class CentralSlider (object):
                bolt_depth = 3.5, bolt_out = 2 + self.partheight/2.,
                normal= FreeCAD.Vector(0,0,1),
                #pos = FreeCAD.Vector(0,0,-self.partheight))
-               pos = FreeCAD.Vector(0,0,self.partheight/2.))
+               pos = FreeCAD.Vector(0,0,self.partheight/2.),
+               tol = self.tol)
 
         parts_list.append (h_nema14.fco)
         shp_contnema14 = h_nema14.shp_cont  # this is a shape, not a fco
@@ -1310,18 +941,16 @@ class CentralSlider (object):
                bolt_depth = 4.5, bolt_out = 2 + self.partheight/2.,
                normal= FreeCAD.Vector(0,0,1),
                #pos = FreeCAD.Vector(0,0,-self.partheight))
-               pos = FreeCAD.Vector(0,0,self.partheight/2.))
+               pos = FreeCAD.Vector(0,0,self.partheight/2.),
+               tol = self.tol)
 
         parts_list.append (h_nema17.fco)
         shp_contnema17 = h_nema17.shp_cont  # this is a shape, not a fco
         shp_contmotors = shp_contnema17.fuse(shp_contnema14)
-
-        contmotors = doc.addObject("Part::Feature", "contmotors")
-        contmotors.Shape = shp_contmotors
-        cutlist.append (contmotors)
+        cutlist.append (shp_contmotors)
 
         # ------ the small motor Nanotec STF2818X0504-A -- just the bolt holes
-        mtol = kcomp.TOL - 0.1
+        mtol = self.MTOL
         nanostf28_boltsep = 34.1
         bhole_motorstf0 = addBolt (
             r_shank =  1.5  + mtol/2., # nemabolt_d/2. + mtol/2.,
@@ -1348,45 +977,28 @@ class CentralSlider (object):
 
         cutlist.append (bholes_motorstf)
 
-        # ----------- final fusion of holes
-        holes = doc.addObject("Part::MultiFuse", "censlid_holes")
-        holes.Shapes = cutlist
-
-        holes_top = doc.addObject("Part::MultiFuse", "censlid_tophles")
-        holes_top.Shapes = cutlist + cuttoplist
-
         self.parts = parts_list
 
-        doc.recompute()
-
         # bearings fusion:
         bearings = doc.addObject("Part::Fuse", name + "_bear")
         bearings.Base = h_lmuu_0.bearing
         bearings.Tool = h_lmuu_1.bearing
         self.bearings = bearings
 
-        # ----- adding the belt clamps:
-        botcenslid_cl = doc.addObject("Part::MultiFuse", name + "_bot_cl")
-        botcenslid_cl.Shapes = addbotlist
+        # ----------- final fusions and cuts, all built at once
+        # the holes of cutlist are shared and fused once
+        plan_top.add (topcenslid_dent)
+        plan_top.cut (cutlist + cuttoplist)
+        # adding the belt clamps:
+        plan_bot.add (addbotlist)
+        plan_bot.cut (cutlist)
 
-        doc.recompute()
-        # ----------- final cut
-        topcenslid = doc.addObject("Part::Cut", name + "_top")
-        topcenslid.Base = topcenslid_dent
-        topcenslid.Tool = holes_top
-        self.top_slide = topcenslid
-
-        botcenslid = doc.addObject("Part::Cut", name + "_bot")
-        botcenslid.Base = botcenslid_cl
-        botcenslid.Tool = holes
-
-        doc.recompute()
+        topcenslid, botcenslid = featplan.build_plans ([plan_top, plan_bot])
         #botcenslid.Shape = botcenslid.Shape.removeSplitter()
 
+        self.top_slide = topcenslid
         self.bot_slide = botcenslid
 
-        doc.recompute()
-
 
     # move both sliders (top & bottom) and the bearings
     def BasePlace (self, position = (0,0,0)):
@@ -1396,12 +1008,149 @@ class CentralSlider (object):
         self.bearings.Placement.Base = FreeCAD.Vector(position)
         self.top_slide.Placement.Base = FreeCAD.Vector(position)
         self.bot_slide.Placement.Base = FreeCAD.Vector(position)
-        
 
-doc = FreeCAD.newDocument()
-#CentralSlider (rod_r = kcit.ROD_R, rod_sep = 150.0, name="central_slider")
-cs = CentralSlider (rod_r = 6, rod_sep = 150.0, name="central_slider",
-                    belt_sep = 100,  # check value
-                    dent_w = 18,
-                    dent_l = 122,
-                    dent_sl = 68)
+    # builds the body of the slider: the filleted boxes with the dent,
+    # that don't depend on the tolerance. Returns a dictionary with the
+    # names of the FreeCAD objects: see body_dict
+
+    def build_body (self):
+
+        doc = FreeCAD.ActiveDocument
+        slid_x = self.width
+        slid_y = self.length
+        slid_z = self.partheight
+        dent_w = self.dent_w
+        dent_l = self.dent_l
+        dent_sl = self.dent_sl
+
+        topcenslid_box = fcfun.addBox_cen (slid_x, slid_y, slid_z,
+                                  "topcenslid_box",
+                                  cx=True, cy=True, cz= False)
+        #logger.debug('topcenslid_box %s ' % str(topcenslid_box.Shape))
+        botcenslid_box = fcfun.addBox_cen (slid_x, slid_y, slid_z,
+                                 "botcenslid_box",
+                                  cx=True, cy=True, cz= False)
+        botcenslid_box.Placement.Base = FreeCAD.Vector(0, 0, -self.partheight)
+
+        # fillet the vertical edges of both boxes at once
+        topcenslid_fllt, botcenslid_fllt = fcfun.fillet_batch ([
+                  (topcenslid_box, [(slid_z, 'z', self.FILLT_R)],
+                   "topcenslid_fllt"),
+                  (botcenslid_box, [(slid_z, 'z', self.FILLT_R)],
+                   "botcenslid_fllt")])
+
+        # List of the bottom bodies
+        botlist = [botcenslid_fllt]
+        # ----------------------------- outward dent
+        #               t                         y
+        #           tl ___ tr  (top right)        |_ x
+        #         lt  /   \  rt (right top)
+        #       lb   |     | rb (right bottom) r
+        #             \   /
+        #        bl    --- br  (bottom right)
+
+        # we have dent_l, dent_w and ovdent_w (dent_w + 1)
+        #         
+        #     tr  ____ ovdent_l
+        #    |\                 h_over = triang_h/dent_w
+        #    | \  _  ___ dent_l
+        #    | |\                triang_h
+        #    | | \                    
+        #    | |  \ rt    
+        # ul |_|___\ __ dent_sl
+        #    |     |
+        #    |     |
+        #    |     |
+        # dl |_____| __
+        #    | |   / rb
+        #    | |  / 
+        #    | | /  
+        #    | |/    ___
+        #    | /    
+        #    |/      ____
+        #     br
+        #     1
+        #      |---|  dent_w
+        #    |-----| ovdent_w 
+        #
+        # the dimensions of the dent overlaped (ov), to make the shape
+        # height of the triangle (no overlaped)
+        if dent_w != 0:
+            ovdent_l = self.ovdent_l
+
+            # slid_x-1 because the dent was calculated with 1mm of superposition
+            # points:
+            #p_dent_t  = FreeCAD.Vector(  0            , dent_l/2.0, 0)
+            p_dent_tr = FreeCAD.Vector(  slid_x/2. -1 , ovdent_l/2., 0)
+            p_dent_rt = FreeCAD.Vector(  slid_x/2. + dent_w , dent_sl/2., 0)
+            #p_dent_r  = FreeCAD.Vector(  slid_x/2. -1 + dent_w , 0          , 0)
+            dentwire = fcfun.wire_sim_xy([p_dent_tr, p_dent_rt])
+            dentface = Part.Face(dentwire)
+            shp_topdent = dentface.extrude(FreeCAD.Vector(0,0, slid_z))
+            shp_botdent = dentface.extrude(FreeCAD.Vector(0,0,-slid_z))
+            topdent = doc.addObject("Part::Feature", "topcenslidedent")
+            topdent.Shape = shp_topdent
+
+            # the top is needed to make the base of the belt clamps
+            topcenslid_dent = doc.addObject("Part::Fuse","topcenslid_dent")
+            topcenslid_dent.Base = topcenslid_fllt
+            topcenslid_dent.Tool = topdent
+
+            # the bottom is added to the bottom part, at the end
+            botdent = doc.addObject("Part::Feature", "botcenslidedent")
+            botdent.Shape = shp_botdent
+            botlist.append (botdent)
+        else:
+            topcenslid_dent = topcenslid_fllt
+
+        return {'top'      : topcenslid_dent.Name,
+                'bot_list' : [fco.Name for fco in botlist]}
+
+
+# ---------- tol_range ------------------------------------------------
+# list of tolerances from tol_min to tol_max (included), every tol_step
+# rounded to avoid 0.30000000000000004
+
+def tol_range (tol_min = 0.2, tol_max = 0.6, tol_step = 0.05):
+    num = int(round((tol_max - tol_min) / tol_step)) + 1
+    return [round(tol_min + i * tol_step, 4) for i in range(num)]
+
+
+# ---------- tol_variants ---------------------------------------------
+# Builds the same part with different tolerances, to print them and
+# calibrate the printer. The body of the part, that doesn't depend on the
+# tolerance, is built once (see body_dict of the classes), only the holes
+# and the booleans are made for each tolerance
+# ----- Arguments:
+# part_class: class of the part, with the argument tol: EndShaftSlider,
+#             CentralSlider
+# tol_list:   list of the tolerances, see tol_range
+# name:       name of the parts, the tolerance is added: name_tol025
+# pos_step:   position (tuple) of each part from the previous one
+# kwargs:     the other arguments of the class
+# returns a list of the objects of the class, on the order of tol_list
+
+def tol_variants (part_class, tol_list, name, pos_step = (0,0,0), **kwargs):
+
+    part_list = []
+    for ind, tol in enumerate(tol_list):
+        part_name = name + "_tol%03d" % int(round(tol * 100))
+        logger.debug('building %s' % part_name)
+        part = part_class (name = part_name, tol = tol, **kwargs)
+        part.BasePlace ((ind * pos_step[0],
+                         ind * pos_step[1],
+                         ind * pos_step[2]))
+        part_list.append(part)
+    return part_list
+
+
+# only when it is run as a macro: not when it is imported, or loaded again
+# by buildsrv with other parameters
+if __name__ == '__main__':
+    doc = FreeCAD.newDocument()
+    #CentralSlider (rod_r = kcit.ROD_R, rod_sep = 150.0, name="central_slider")
+    cs = CentralSlider (rod_r = 6, rod_sep = 150.0, name="central_slider",
+                        belt_sep = 100,  # check value
+                        dent_w = 18,
+                        dent_l = 122,
+                        dent_sl = 68)
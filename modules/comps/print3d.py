@@ -0,0 +1,533 @@
+# ----------------------------------------------------------------------------
+# -- 3D printing estimates
+# -- comps library
+# -- Slices the printed parts in layers to estimate filament and print time
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The shape of a part is cut in planar sections (Shape.slice), one in the
+# middle of each layer of kcomp.LAYER3D_H. The wires of the sections are
+# discretized and the areas and perimeters of all the layers are computed
+# at once with numpy. With them, the filament and the time of each layer are
+# estimated, with a simple model of the printer: PERIM_N perimeters and
+# INFILL infill, see the constants below.
+# The shape has to be in the position it is going to be printed: the layers
+# are on the XY plane, from its lowest Z.
+#
+#  est = print3d.estimate_print (h_slider.fco.Shape, 'slider')
+#  logger.info ('%s: %d s' % (est['name'], est['time']))
+#  est_list = print3d.estimate_parts ([fco_top, fco_bot])
+#
+# It also finds the overhangs and bridges of the parts (overhang_report),
+# to know if they can be printed without supports
+
+import FreeCAD
+import Part
+import numpy
+import logging
+import math
+
+import kcomp
+import fcfun
+from fcfun import VZ
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- printer parameters (mm, mm/s, s)
+# width of the extruded line
+LINE_W = 0.45
+# number of perimeters of each layer
+PERIM_N = 2
+# infill density (0 to 1)
+INFILL = 0.2
+# speed printing the perimeters, and the infill
+PERIM_SPEED = 40.
+INFILL_SPEED = 60.
+# time to change of layer (movement of Z, retraction, ...)
+LAYER_T = 1.
+# diameter of the filament
+FILAMENT_D = 1.75
+
+
+# ---------- layer_z ---------------------------------------------------
+# returns the numpy array with the Z of the middle of the layers between
+# zmin and zmax
+
+def layer_z (zmin, zmax, layer_h = kcomp.LAYER3D_H):
+
+    n_layers = int(math.ceil(round((zmax - zmin) / layer_h, 6)))
+    return zmin + layer_h * (numpy.arange(n_layers) + 0.5)
+
+
+# ---------- wire_points ----------------------------------------------
+# returns the numpy array (n, 2) with the XY points of a closed wire,
+# without repeating the first point at the end
+# deflection: maximum distance from the curves to their segments
+
+def wire_points (wire, deflection = 0.01):
+
+    pts = numpy.array([(pt.x, pt.y) for pt in
+                       wire.discretize(Deflection = deflection)])
+    if len(pts) > 1 and numpy.allclose(pts[0], pts[-1]):
+        pts = pts[:-1]
+    return pts
+
+
+# ---------- points_in_polygon ----------------------------------------
+# returns a numpy array of booleans: if each point is inside the polygon
+# pts:  numpy array (n, 2)
+# poly: numpy array (m, 2) with the points of the polygon (closed)
+
+def points_in_polygon (pts, poly):
+
+    x = pts[:, 0][:, numpy.newaxis]
+    y = pts[:, 1][:, numpy.newaxis]
+    x0 = poly[:, 0][numpy.newaxis, :]
+    y0 = poly[:, 1][numpy.newaxis, :]
+    x1 = numpy.roll(poly[:, 0], -1)[numpy.newaxis, :]
+    y1 = numpy.roll(poly[:, 1], -1)[numpy.newaxis, :]
+    # the edges that cross the horizontal line of each point
+    cross = (y0 > y) != (y1 > y)
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+        x_cross = x0 + (y - y0) * (x1 - x0) / (y1 - y0)
+    # number of crosses on the right of the point
+    n_cross = numpy.sum(cross & (x < x_cross), axis = 1)
+    return (n_cross % 2) == 1
+
+
+# ---------- section_area_perim ---------------------------------------
+# area and perimeter of the sections of all the layers, at once.
+# The wires of each layer can be outer wires or holes, in any orientation:
+# a wire inside an odd number of wires of its layer is a hole
+# n_layers: number of layers
+# wire_list: list of tuples (layer index, numpy array (n, 2) of the points
+#            of a closed wire)
+# returns a tuple of 2 numpy arrays (n_layers): (area, perimeter)
+
+def section_area_perim (n_layers, wire_list):
+
+    area = numpy.zeros(n_layers)
+    perim = numpy.zeros(n_layers)
+    if not wire_list:
+        return area, perim
+
+    # all the points, with the index of their wire
+    pts = numpy.vstack([wire_pts for layer_ind, wire_pts in wire_list])
+    wire_ind = numpy.repeat(numpy.arange(len(wire_list)),
+                            [len(wire_pts) for layer_ind, wire_pts
+                                                            in wire_list])
+    wire_layer = numpy.array([layer_ind for layer_ind, wire_pts
+                                                            in wire_list])
+    # the next point of each point, on its own wire
+    starts = numpy.concatenate(([0], numpy.cumsum(
+                   [len(wire_pts) for layer_ind, wire_pts in wire_list])))
+    nxt = numpy.arange(len(pts)) + 1
+    nxt[starts[1:] - 1] = starts[:-1]
+    pts_nxt = pts[nxt]
+
+    # shoelace formula, and length of the segments, by wire
+    cross = pts[:, 0] * pts_nxt[:, 1] - pts_nxt[:, 0] * pts[:, 1]
+    wire_area = numpy.abs(numpy.bincount(wire_ind, weights = cross,
+                                         minlength = len(wire_list))) / 2.
+    seg_len = numpy.hypot(pts_nxt[:, 0] - pts[:, 0],
+                          pts_nxt[:, 1] - pts[:, 1])
+    wire_perim = numpy.bincount(wire_ind, weights = seg_len,
+                                minlength = len(wire_list))
+
+    # holes: only the layers with more than one wire
+    wire_sign = numpy.ones(len(wire_list))
+    layer_count = numpy.bincount(wire_layer, minlength = n_layers)
+    for layer_ind in numpy.nonzero(layer_count > 1)[0]:
+        layer_wires = numpy.nonzero(wire_layer == layer_ind)[0]
+        # first point of each wire of the layer
+        first_pts = pts[starts[layer_wires]]
+        depth = numpy.zeros(len(layer_wires), dtype = int)
+        for ind, wire in enumerate(layer_wires):
+            inside = points_in_polygon(first_pts, wire_list[wire][1])
+            inside[ind] = False
+            depth += inside
+        wire_sign[layer_wires] = numpy.where(depth % 2 == 1, -1., 1.)
+
+    area = numpy.bincount(wire_layer, weights = wire_sign * wire_area,
+                          minlength = n_layers)
+    perim = numpy.bincount(wire_layer, weights = wire_perim,
+                           minlength = n_layers)
+    return area, perim
+
+
+# ---------- slice_layers ---------------------------------------------
+# cuts the shape in the layers, and returns a tuple of 3 numpy arrays:
+# (z, area, perimeter) of each layer
+# shp: shape, in the position to be printed
+# layer_h: height of the layer
+# deflection: see wire_points
+
+def slice_layers (shp, layer_h = kcomp.LAYER3D_H, deflection = 0.01):
+
+    bbox = shp.BoundBox
+    z_arr = layer_z(bbox.ZMin, bbox.ZMax, layer_h)
+    wire_list = []
+    for layer_ind, z in enumerate(z_arr.tolist()):
+        for wire in shp.slice(VZ, z):
+            wire_pts = wire_points(wire, deflection)
+            if len(wire_pts) > 2:
+                wire_list.append((layer_ind, wire_pts))
+    area, perim = section_area_perim(len(z_arr), wire_list)
+    return z_arr, area, perim
+
+
+# ---------- layer_estimate -------------------------------------------
+# filament volume and time of each layer, from its area and perimeter
+# (numpy arrays): PERIM_N perimeters of LINE_W, and the rest of the area
+# with INFILL
+# returns a tuple of 2 numpy arrays: (volume, time)
+
+def layer_estimate (area, perim, layer_h = kcomp.LAYER3D_H):
+
+    perim_l = perim * PERIM_N
+    shell_area = numpy.minimum(area, perim_l * LINE_W)
+    infill_area = area - shell_area
+    infill_l = infill_area * INFILL / LINE_W
+    volume = (shell_area + infill_area * INFILL) * layer_h
+    time = perim_l / PERIM_SPEED + infill_l / INFILL_SPEED + LAYER_T
+    return volume, time
+
+
+# ---------- estimate_print -------------------------------------------
+# print estimate of a shape
+# shp:  shape, in the position to be printed
+# name: name of the part, for the report
+# returns a dictionary:
+#   'name'      : name of the part
+#   'layer_h'   : height of the layer
+#   'layers'    : number of layers
+#   'z'         : numpy array with the Z of the middle of each layer
+#   'area'      : numpy array with the area of each layer (mm2)
+#   'perimeter' : numpy array with the perimeter of each layer (mm)
+#   'layer_time': numpy array with the time of each layer (s)
+#   'volume'    : volume of filament (mm3)
+#   'filament_l': length of filament (mm)
+#   'time'      : print time (s)
+
+def estimate_print (shp, name = '', layer_h = kcomp.LAYER3D_H,
+                    deflection = 0.01):
+
+    z_arr, area, perim = slice_layers(shp, layer_h, deflection)
+    return layers_report(name, layer_h, z_arr, area, perim)
+
+
+def layers_report (name, layer_h, z_arr, area, perim):
+
+    volume, time = layer_estimate(area, perim, layer_h)
+    volume = float(numpy.sum(volume))
+    report = {'name'       : name,
+              'layer_h'    : layer_h,
+              'layers'     : len(z_arr),
+              'z'          : z_arr,
+              'area'       : area,
+              'perimeter'  : perim,
+              'layer_time' : time,
+              'volume'     : volume,
+              'filament_l' : volume / (math.pi * (FILAMENT_D / 2.) ** 2),
+              'time'       : float(numpy.sum(time))}
+    logger.debug('%s: %d layers, %.0f mm3, %.0f s'
+                 % (name, report['layers'], volume, report['time']))
+    return report
+
+
+# ---------- estimate_parts -------------------------------------------
+# print estimates of a list of parts
+# part_list: list of FreeCAD objects or shapes
+# name_list: names of the parts, if None, the Label of the objects
+# processes: number of processes to slice the parts. With 1 (default) they
+#            are sliced one after the other, in this process. If None, the
+#            number of cpus. The processes are started with 'spawn', not
+#            forked from this process (that can be the FreeCAD GUI), so
+#            they start a new python: it has to be able to import FreeCAD
+#            (in FreeCAD, set it with multiprocessing.set_executable).
+#            On python 2, or if the processes cannot be started, they are
+#            sliced one after the other
+# returns the list of the dictionaries of estimate_print, in the same order
+
+def slice_brep (args):
+    brep, layer_h, deflection = args
+    shp = Part.Shape()
+    shp.importBrepFromString(brep)
+    return slice_layers(shp, layer_h, deflection)
+
+
+def estimate_parts (part_list, name_list = None, layer_h = kcomp.LAYER3D_H,
+                    deflection = 0.01, processes = 1):
+
+    shp_list = []
+    for part in part_list:
+        if isinstance(part, Part.Shape):
+            shp_list.append(part)
+        else:
+            shp_list.append(part.Shape)
+    if name_list is None:
+        name_list = [getattr(part, 'Label', 'part%d' % ind)
+                     for ind, part in enumerate(part_list)]
+
+    layers_list = None
+    if processes != 1 and len(shp_list) > 1:
+        try:
+            import multiprocessing
+            # python 2 has no spawn
+            ctx = multiprocessing.get_context('spawn')
+            # the shapes go to the processes as BREP strings
+            args_list = [(shp.exportBrepToString(), layer_h, deflection)
+                         for shp in shp_list]
+            if fcfun.BACKEND == 'stub':
+                # the new processes have to install the stub too
+                import fcstub
+                pool = ctx.Pool(processes, initializer = fcstub.install)
+            else:
+                pool = ctx.Pool(processes)
+            try:
+                layers_list = pool.map(slice_brep, args_list)
+            finally:
+                pool.close()
+                pool.join()
+        except Exception as exc:
+            logger.warning('print3d: slicing without processes: %s' % exc)
+            layers_list = None
+    if layers_list is None:
+        layers_list = [slice_layers(shp, layer_h, deflection)
+                       for shp in shp_list]
+
+    return [layers_report(name, layer_h, z_arr, area, perim)
+            for name, (z_arr, area, perim) in zip(name_list, layers_list)]
+
+
+# ---------------------------------------------------------------------------
+# ---------- overhangs and bridges
+# The shape is tessellated once, and the normals and areas of all the
+# triangles are computed at once with numpy. A triangle facing down is:
+#   - an overhang, if its angle from the vertical is more than OVERHANG_ANG
+#   - a bridge, if it is horizontal (within BRIDGE_ANG): it is printed on
+#     the air, between the walls of the layer below
+# The triangles on the lowest Z are on the bed, they are not counted.
+# The triangles of each layer are split in regions, the triangles joined
+# by their vertexes (tri_regions): the span of a bridge is the smallest
+# side of the bounding box of its region
+#
+#  rep = print3d.overhang_report (h_slider.fco.Shape)
+#  if not print3d.is_printable (rep): ...
+
+# angle (degrees) from the vertical that can be printed without support
+OVERHANG_ANG = 45.
+# angle (degrees) from the horizontal that is taken as a bridge
+BRIDGE_ANG = 5.
+# longest bridge that can be printed (mm)
+MAX_BRIDGE = 10.
+
+
+# ---------- mesh_arrays ----------------------------------------------
+# tessellates the shape, returns a tuple of 2 numpy arrays:
+# (points (n, 3), triangles (m, 3) with the indexes of their points)
+# tol: tolerance of the tessellation
+
+def mesh_arrays (shp, tol = 0.1):
+
+    pts, tris = shp.tessellate(tol)
+    pts_arr = numpy.array([(pt.x, pt.y, pt.z) for pt in pts], dtype = float)
+    tris_arr = numpy.array(tris, dtype = int).reshape(-1, 3)
+    return pts_arr, tris_arr
+
+
+# ---------- facet_arrays ---------------------------------------------
+# returns a tuple of 3 numpy arrays of the triangles:
+# (unit normals (m, 3), areas (m), centroids (m, 3))
+# The triangles of the tessellation are oriented: their normal points out
+
+def facet_arrays (pts, tris):
+
+    p0 = pts[tris[:, 0]]
+    p1 = pts[tris[:, 1]]
+    p2 = pts[tris[:, 2]]
+    cross = numpy.cross(p1 - p0, p2 - p0)
+    norm = numpy.sqrt(numpy.sum(cross * cross, axis = 1))
+    areas = norm / 2.
+    norm[norm == 0] = 1
+    normals = cross / norm[:, numpy.newaxis]
+    centroids = (p0 + p1 + p2) / 3.
+    return normals, areas, centroids
+
+
+# ---------- overhang_report ------------------------------------------
+# analysis of the overhangs and bridges of a shape, in the position it is
+# going to be printed
+# shp: shape
+# layer_h: height of the layer, the bridges are grouped by layer
+# overhang_ang, bridge_ang: see OVERHANG_ANG, BRIDGE_ANG
+# tol: tolerance of the tessellation
+# n_worst: number of layers of the worst regions
+# mesh: tuple (pts, tris) of mesh_arrays, if the shape has already been
+#       tessellated
+# returns a dictionary:
+#   'overhang_area': area of the overhangs (mm2), without the bridges
+#   'bridge_area'  : area of the bridges (mm2)
+#   'bridge_z'     : numpy array with the Z of the layers with bridges
+#   'bridge_layer_area': numpy array with the bridge area of those layers
+#   'bridge_span'  : numpy array with the span of the longest bridge of
+#                    the layers
+#   'bridges'      : list of dictionaries, one for each bridge (region of
+#                    joined bridge triangles of a layer), with the keys:
+#                    'z', 'area', 'span', 'bbox' (xmin, ymin, xmax, ymax)
+#   'max_bridge'   : longest span (mm)
+#   'worst'        : list of n_worst dictionaries, the regions of a layer
+#                    with more area of overhangs and bridges, with the
+#                    keys: 'z', 'area', 'bbox' (xmin, ymin, xmax, ymax)
+
+def overhang_report (shp, layer_h = kcomp.LAYER3D_H,
+                     overhang_ang = OVERHANG_ANG, bridge_ang = BRIDGE_ANG,
+                     tol = 0.1, n_worst = 3, mesh = None):
+
+    if mesh is None:
+        mesh = mesh_arrays(shp, tol)
+    pts, tris = mesh
+    normals, areas, centroids = facet_arrays(pts, tris)
+    zmin = pts[:, 2].min() if len(pts) else 0
+
+    # the triangles on the bed are not overhangs
+    tri_zmax = pts[tris][:, :, 2].max(axis = 1)
+    on_bed = tri_zmax < zmin + layer_h / 2.
+    nz = normals[:, 2]
+    bridge = (nz < - math.cos(math.radians(bridge_ang))) & ~on_bed
+    overhang = ((nz < - math.sin(math.radians(overhang_ang)))
+                & ~on_bed & ~bridge)
+
+    report = {'overhang_area' : float(numpy.sum(areas[overhang])),
+              'bridge_area'   : float(numpy.sum(areas[bridge])),
+              'bridge_z'      : numpy.zeros(0),
+              'bridge_layer_area' : numpy.zeros(0),
+              'bridge_span'   : numpy.zeros(0),
+              'bridges'       : [],
+              'max_bridge'    : 0.,
+              'worst'         : []}
+
+    # by layers: the layer of each triangle, by its centroid
+    layer_ind = numpy.floor((centroids[:, 2] - zmin) / layer_h).astype(int)
+    layer_ind = numpy.maximum(layer_ind, 0)
+
+    if numpy.any(bridge):
+        reg_layer, reg_area, reg_bbox = region_arrays(
+                                            pts, tris[bridge],
+                                            layer_ind[bridge], areas[bridge])
+        xmin, ymin, xmax, ymax = reg_bbox
+        reg_span = numpy.minimum(xmax - xmin, ymax - ymin)
+        for reg in range(len(reg_layer)):
+            report['bridges'].append({
+                            'z'    : float(zmin + layer_h * reg_layer[reg]),
+                            'area' : float(reg_area[reg]),
+                            'span' : float(reg_span[reg]),
+                            'bbox' : (float(xmin[reg]), float(ymin[reg]),
+                                      float(xmax[reg]), float(ymax[reg]))})
+        layers, reg_lay = numpy.unique(reg_layer, return_inverse = True)
+        lay_area = numpy.bincount(reg_lay, weights = reg_area)
+        lay_span = numpy.zeros(len(layers))
+        numpy.maximum.at(lay_span, reg_lay, reg_span)
+        report['bridge_z'] = zmin + layer_h * layers
+        report['bridge_layer_area'] = lay_area
+        report['bridge_span'] = lay_span
+        report['max_bridge'] = float(reg_span.max())
+
+    unsup = overhang | bridge
+    if numpy.any(unsup):
+        reg_layer, reg_area, reg_bbox = region_arrays(
+                                            pts, tris[unsup],
+                                            layer_ind[unsup], areas[unsup])
+        xmin, ymin, xmax, ymax = reg_bbox
+        for reg in numpy.argsort(reg_area)[::-1][:n_worst].tolist():
+            if reg_area[reg] <= 0:
+                break
+            report['worst'].append({
+                            'z'    : float(zmin + layer_h * reg_layer[reg]),
+                            'area' : float(reg_area[reg]),
+                            'bbox' : (float(xmin[reg]), float(ymin[reg]),
+                                      float(xmax[reg]), float(ymax[reg]))})
+    logger.debug('overhangs: %.1f mm2, bridges: %.1f mm2, longest %.1f mm'
+                 % (report['overhang_area'], report['bridge_area'],
+                    report['max_bridge']))
+    return report
+
+
+# ---------- tri_regions ----------------------------------------------
+# region of each triangle: the triangles that share a vertex (by its
+# coordinates, the faces of the tessellation don't share their points)
+# are on the same region
+# ndigits: decimal digits of the coordinates that are compared
+# returns a numpy array (m) with the region of each triangle, from 0
+
+def tri_regions (pts, tris, ndigits = 4):
+
+    if len(tris) == 0:
+        return numpy.zeros(0, dtype = int)
+    # the same index for the points on the same coordinates
+    pt_ind = numpy.unique(numpy.round(pts, ndigits), axis = 0,
+                          return_inverse = True)[1].reshape(-1)
+    vert = pt_ind[tris]
+    # each vertex takes the smallest label of the triangles it is on,
+    # until they don't change
+    label = numpy.arange(pt_ind.max() + 1)
+    while True:
+        tri_label = label[vert].min(axis = 1)
+        new_label = label.copy()
+        for col in range(3):
+            numpy.minimum.at(new_label, vert[:, col], tri_label)
+        if numpy.array_equal(new_label, label):
+            break
+        label = new_label
+    return numpy.unique(label[vert[:, 0]], return_inverse = True)[1]
+
+
+# ---------- region_arrays --------------------------------------------
+# splits the triangles of each layer in regions (tri_regions)
+# tri_layer: layer of each triangle. tri_area: area of each triangle
+# returns a tuple (layer of each region, area of each region, bounding
+# box of the regions: a tuple of 4 numpy arrays, see layer_bbox)
+
+def region_arrays (pts, tris, tri_layer, tri_area):
+
+    tri_reg = tri_regions(pts, tris)
+    regs, tri_reg = numpy.unique(numpy.stack((tri_layer, tri_reg), axis = 1),
+                                 axis = 0, return_inverse = True)
+    tri_reg = tri_reg.reshape(-1)
+    reg_area = numpy.bincount(tri_reg, weights = tri_area,
+                              minlength = len(regs))
+    return (regs[:, 0], reg_area,
+            layer_bbox(pts, tris, tri_reg, len(regs)))
+
+
+# bounding box (XY) of the triangles of each layer, 4 numpy arrays
+# (n_layers): xmin, ymin, xmax, ymax. Inf if the layer has no triangles
+
+def layer_bbox (pts, tris, tri_layer, n_layers):
+
+    tri_pts = pts[tris]
+    xmin = numpy.full(n_layers, numpy.inf)
+    ymin = numpy.full(n_layers, numpy.inf)
+    xmax = numpy.full(n_layers, -numpy.inf)
+    ymax = numpy.full(n_layers, -numpy.inf)
+    numpy.minimum.at(xmin, tri_layer, tri_pts[:, :, 0].min(axis = 1))
+    numpy.minimum.at(ymin, tri_layer, tri_pts[:, :, 1].min(axis = 1))
+    numpy.maximum.at(xmax, tri_layer, tri_pts[:, :, 0].max(axis = 1))
+    numpy.maximum.at(ymax, tri_layer, tri_pts[:, :, 1].max(axis = 1))
+    return xmin, ymin, xmax, ymax
+
+
+# ---------- is_printable ---------------------------------------------
+# True if the part of the report (overhang_report) can be printed without
+# supports: no overhangs larger than max_overhang (mm2) and no bridges
+# longer than max_bridge (mm)
+
+def is_printable (report, max_overhang = 0., max_bridge = MAX_BRIDGE):
+
+    return (    report['overhang_area'] <= max_overhang
+            and report['max_bridge'] <= max_bridge)
@@ -0,0 +1,160 @@
+# ----------------------------------------------------------------------------
+# -- 2D profiles
+# -- comps library
+# -- Polygonal profiles on a plane, with their offsets, made with numpy
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# A profile is a closed polygon on the (u, v) coordinates of a plane.
+# The points are kept in a numpy array, so the offsets (for the tolerances),
+# mirrors and translations of all the points are one array operation, and
+# the FreeCAD vectors are only made at the end, to make the wire.
+#
+# Each point has an offset direction: how much it moves for an offset of
+# (offs_u, offs_v). By default it is the miter of its two edges, so the
+# profile grows (positive offset) or shrinks (negative) on all its sides.
+# It can be given for each point, to move only some of them
+#
+#   prof = prof2d.Profile2D ([(0,0), (10,0), (10,5), (0,5)])
+#   wire = prof.offset (kcomp.TOL).wire (plane = 'xy')
+#   prof_list = prof.offset_list ([(TOL, TOL), (-TOL/2, 0)])
+
+import FreeCAD
+import Part
+import numpy
+import logging
+
+from fcfun import V0, VX, VY, VZ
+
+logger = logging.getLogger(__name__)
+
+
+# axes (u, v) of each plane
+PLANE_AXES = { 'xy' : (VX, VY),
+               'yz' : (VY, VZ),
+               'xz' : (VX, VZ) }
+
+
+# ---------- class Profile2D -------------------------------------------
+# ----- Arguments:
+# pts:      list of (u, v) points of the polygon, or numpy array (n, 2).
+#           If the last point is the same as the first, it is taken out
+# offs_dir: list of (u, v) offset directions of each point, or numpy array
+#           (n, 2). If None, the miter of the edges of each point
+# ----- Attributes:
+# pts:      numpy array (n, 2) with the points
+# offs_dir: numpy array (n, 2) with the offset directions
+
+class Profile2D (object):
+
+    def __init__ (self, pts, offs_dir = None):
+        pts = numpy.array(pts, dtype = float)
+        if len(pts) > 1 and numpy.allclose(pts[0], pts[-1]):
+            pts = pts[:-1]
+        self.pts = pts
+        if offs_dir is None:
+            self.offs_dir = miter_dir(pts)
+        else:
+            offs_dir = numpy.array(offs_dir, dtype = float)
+            if len(offs_dir) != len(pts):
+                logger.error('Profile2D: %d points and %d offset directions'
+                             % (len(pts), len(offs_dir)))
+            self.offs_dir = offs_dir
+
+    def __len__ (self):
+        return len(self.pts)
+
+    # returns a new profile, with the points moved by the offset
+    # offs_u: offset on the u axis, the offset on both if offs_v is None
+    # offs_v: offset on the v axis
+
+    def offset (self, offs_u, offs_v = None):
+        if offs_v is None:
+            offs_v = offs_u
+        pts = self.pts + self.offs_dir * numpy.array([offs_u, offs_v])
+        return Profile2D(pts, self.offs_dir)
+
+    # returns a list of new profiles, one for each offset, all made in
+    # one array operation
+    # offs_list: list of offsets: (offs_u, offs_v) or just one number
+
+    def offset_list (self, offs_list):
+        offs = numpy.array([offs if isinstance(offs, (list, tuple))
+                                 else (offs, offs)
+                            for offs in offs_list], dtype = float)
+        # shape (len(offs_list), n, 2)
+        pts_arr = (self.pts[numpy.newaxis,:,:]
+                   + self.offs_dir[numpy.newaxis,:,:]
+                     * offs[:,numpy.newaxis,:])
+        return [Profile2D(pts, self.offs_dir) for pts in pts_arr]
+
+    # returns a new profile, moved (du, dv)
+
+    def translate (self, du = 0, dv = 0):
+        return Profile2D(self.pts + numpy.array([du, dv]), self.offs_dir)
+
+    # returns a new profile, mirrored on the line axis = pos
+    # axis: 'u' to change the u coordinates (u -> 2*pos - u), 'v' for v
+    # The order of the points is reversed to keep the orientation
+
+    def mirror (self, axis = 'u', pos = 0):
+        ind = {'u': 0, 'v': 1}[axis]
+        pts = self.pts.copy()
+        pts[:,ind] = 2 * pos - pts[:,ind]
+        offs_dir = self.offs_dir.copy()
+        offs_dir[:,ind] = - offs_dir[:,ind]
+        return Profile2D(pts[::-1], offs_dir[::-1])
+
+    # returns the numpy array (n, 3) of the points on the 3D space
+    # plane: 'xy', 'yz', 'xz': the plane of the (u, v) coordinates
+    # pos:   FreeCAD.Vector of the origin of the (u, v) coordinates
+
+    def pts3d (self, plane = 'xy', pos = V0):
+        axis_u, axis_v = PLANE_AXES[plane]
+        axes = numpy.array([tuple(axis_u), tuple(axis_v)])
+        return numpy.array(tuple(pos)) + self.pts.dot(axes)
+
+    # returns the list of FreeCAD.Vector of the points, see pts3d
+
+    def vectors (self, plane = 'xy', pos = V0):
+        return [FreeCAD.Vector(pt[0], pt[1], pt[2])
+                for pt in self.pts3d(plane, pos).tolist()]
+
+    # returns the closed wire of the profile, see pts3d
+
+    def wire (self, plane = 'xy', pos = V0):
+        vec_list = self.vectors(plane, pos)
+        return Part.makePolygon(vec_list + [vec_list[0]])
+
+    def face (self, plane = 'xy', pos = V0):
+        return Part.Face(self.wire(plane, pos))
+
+
+# ---------- miter_dir ------------------------------------------------
+# returns the numpy array (n, 2) of the miter directions of the points of
+# a closed polygon: moving each point by the miter times d, all the edges
+# move d outwards (inwards if d < 0), whatever the orientation
+# pts: numpy array (n, 2)
+
+def miter_dir (pts):
+
+    edges = numpy.roll(pts, -1, axis = 0) - pts
+    lengths = numpy.hypot(edges[:,0], edges[:,1])
+    lengths[lengths == 0] = 1
+    # twice the signed area: positive if counterclockwise
+    area2 = numpy.sum(pts[:,0] * numpy.roll(pts[:,1], -1)
+                      - numpy.roll(pts[:,0], -1) * pts[:,1])
+    sign = 1. if area2 >= 0 else -1.
+    # outward normal of each edge (from point i to point i+1)
+    normals = sign * numpy.column_stack((edges[:,1], -edges[:,0]))
+    normals = normals / lengths[:,numpy.newaxis]
+    # the edges that meet on each point: the previous one and its own
+    n_prev = numpy.roll(normals, 1, axis = 0)
+    cos = numpy.sum(n_prev * normals, axis = 1)
+    # parallel and opposite edges (cos = -1) do not have a miter
+    cos[cos < -0.999] = 0
+    return (n_prev + normals) / (1 + cos)[:,numpy.newaxis]
@@ -0,0 +1,250 @@
+# ----------------------------------------------------------------------------
+# -- Rod calculations
+# -- comps library
+# -- Deflection and natural frequency of the rods of the linear axes
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# The rods are round beams between 2 supports, simply supported (held on
+# the ends) or fixed (inserted in the part, as the rods held by the
+# EndShaftSlider). The carriage loads the rod on its linear bearings, at
+# some offsets of its center. The deflection is the closed formula of the
+# beam with point loads, and its own weight. The natural frequency of the
+# rod with the carriage is taken by the Dunkerley formula: the rod alone
+# and the mass of the carriage on the stiffness of the rod under the
+# bearings.
+# All the rods and all the positions of the carriage are calculated at
+# once with numpy:
+#
+#  rod_list = [rodcalc.rod_dict ('rody_00', RODY_R, framey_l, mass = 4.),
+#              ...]
+#  rep = rodcalc.rods_report (rod_list)
+#  logger.info (rep['max_defl'])
+
+import numpy
+import logging
+import math
+
+logger = logging.getLogger(__name__)
+
+
+# steel (N/mm2 and kg/mm3)
+E_STEEL = 210000.
+RHO_STEEL = 7.85e-6
+# gravity (m/s2): N/kg
+GRAV = 9.81
+
+# first root of the equation of the mode of vibration
+MODE_ROOT = { 'simple' : math.pi,
+              'fixed'  : 4.7300 }
+
+
+# ---------- rod_dict -------------------------------------------------
+# dictionary with the data of a rod
+# name:    name of the rod
+# rod_r:   radius of the rod
+# span:    distance between the supports of the rod
+# mass:    mass (kg) of the carriage that is carried by this rod
+# force:   other force (N) on the carriage, on the same direction as the
+#          weight, i.e: the force of the tool
+# offsets: positions of the linear bearings, from the center of the
+#          carriage. The load is shared by the bearings
+# support: 'simple': the rod is held on the ends, 'fixed': the rod is
+#          inserted on the supports and cannot turn
+# e_mod, rho: elastic modulus and density of the rod
+
+def rod_dict (name, rod_r, span, mass = 0, force = 0, offsets = (0,),
+              support = 'simple', e_mod = E_STEEL, rho = RHO_STEEL):
+
+    if support not in MODE_ROOT:
+        logger.error('rodcalc: support not defined: ' + support)
+    return {'name'    : name,
+            'rod_r'   : rod_r,
+            'span'    : span,
+            'mass'    : mass,
+            'force'   : force,
+            'offsets' : tuple(offsets),
+            'support' : support,
+            'e_mod'   : e_mod,
+            'rho'     : rho}
+
+
+# ---------- endslider_rods -------------------------------------------
+# the rods held by 2 EndShaftSlider (see partdims.EndShaftSliderDims):
+# they are inserted on the sliders, so they are fixed, and the span is
+# the length of the rod out of the sliders. The carriage (i.e. the
+# CentralSlider) has a bearing on each rod.
+# h_endsl: EndShaftSliderDims (or EndShaftSlider) of the sliders
+# rod_l:   length of the rods
+# mass, force: of the carriage, shared by the 2 rods
+# returns a list of 2 rod dictionaries
+
+def endslider_rods (h_endsl, rod_l, mass = 0, force = 0, name = 'holdrod'):
+
+    span = rod_l - 2 * h_endsl.holdrod_insert
+    return [rod_dict(name + '_' + str(ind), h_endsl.holdrod_r, span,
+                     mass = mass / 2., force = force / 2., offsets = (0,),
+                     support = 'fixed')
+            for ind in range(2)]
+
+
+# ---------- slidrod_offsets ------------------------------------------
+# offsets of the 2 linear bearings of an EndShaftSlider on the rod it
+# slides, from the center of the slider
+
+def slidrod_offsets (h_endsl):
+
+    cen_y = h_endsl.y_offs + h_endsl.length / 2.
+    return tuple([pos_y + h_endsl.bearing_l / 2. - cen_y
+                  for pos_y in (h_endsl.bearing0_pos_y,
+                                h_endsl.bearing1_pos_y)])
+
+
+# ---------- rod_arrays -----------------------------------------------
+# numpy arrays of the data of a list of rods, on the first dimension. The
+# offsets are a (n_rods, n_bearings) array, the rods with less bearings
+# have bearings without load (share array)
+
+def rod_arrays (rod_list):
+
+    n_bear = max([len(rod['offsets']) for rod in rod_list])
+    arr = {}
+    for key in ('rod_r', 'span', 'mass', 'force', 'e_mod', 'rho'):
+        arr[key] = numpy.array([rod[key] for rod in rod_list], dtype = float)
+    arr['fixed'] = numpy.array([rod['support'] == 'fixed'
+                                for rod in rod_list])
+    arr['offsets'] = numpy.zeros((len(rod_list), n_bear))
+    arr['share'] = numpy.zeros((len(rod_list), n_bear))
+    for ind, rod in enumerate(rod_list):
+        n_rod = len(rod['offsets'])
+        arr['offsets'][ind, :n_rod] = rod['offsets']
+        arr['share'][ind, :n_rod] = 1. / n_rod
+    arr['inertia'] = math.pi * arr['rod_r'] ** 4 / 4.
+    arr['area'] = math.pi * arr['rod_r'] ** 2
+    arr['ei'] = arr['e_mod'] * arr['inertia']
+    # weight of the rod by length (N/mm)
+    arr['q'] = arr['rho'] * arr['area'] * GRAV
+    arr['root'] = numpy.where(arr['fixed'], MODE_ROOT['fixed'],
+                              MODE_ROOT['simple'])
+    return arr
+
+
+# ---------- point_defl -----------------------------------------------
+# deflection on x of a beam of span under a unitary point load on a
+# all the arguments are numpy arrays that can be broadcasted
+# fixed: True if the beam is fixed on both ends, False if simply supported
+
+def point_defl (x, a, span, ei, fixed):
+
+    # on the right of the load, it is the same as the mirrored beam
+    left = x <= a
+    xm = numpy.where(left, x, span - x)
+    am = numpy.where(left, a, span - a)
+    bm = span - am
+    defl_simple = bm * xm * (span ** 2 - bm ** 2 - xm ** 2) / (6 * ei * span)
+    defl_fixed = (  bm ** 2 * xm ** 2 * (3 * am * span - 3 * am * xm - bm * xm)
+                  / (6 * ei * span ** 3))
+    return numpy.where(fixed, defl_fixed, defl_simple)
+
+
+# ---------- uniform_defl ---------------------------------------------
+# deflection on x of a beam of span under a uniform load q (by length)
+
+def uniform_defl (x, span, ei, q, fixed):
+
+    defl_simple = q * x * (span ** 3 - 2 * span * x ** 2 + x ** 3) / (24 * ei)
+    defl_fixed = q * x ** 2 * (span - x) ** 2 / (24 * ei)
+    return numpy.where(fixed, defl_fixed, defl_simple)
+
+
+# ---------- travel_pos -----------------------------------------------
+# positions of the center of the carriage along the travel: n_pos
+# positions from the first support, the bearings are always between the
+# supports. Returns a (n_rods, n_pos) array
+
+def travel_pos (arr, n_pos = 21):
+
+    margin = numpy.abs(arr['offsets']).max(axis = 1)
+    frac = numpy.linspace(0, 1, n_pos)
+    return (margin[:, numpy.newaxis]
+            + frac * (arr['span'] - 2 * margin)[:, numpy.newaxis])
+
+
+# ---------- rods_report ----------------------------------------------
+# deflection and natural frequency of a list of rods (rod_dict), for all
+# the positions of the carriage along the travel, at once
+# n_pos: number of positions of the carriage
+# n_x:   number of points of the deflection curves
+# self_weight: if True, the weight of the rod is added to the load
+# returns a dictionary, the arrays have the rods on the first dimension:
+#   'names'    : list of the names of the rods
+#   'pos'      : (n_rods, n_pos) positions of the center of the carriage
+#   'x'        : (n_rods, n_x) points of the deflection curves
+#   'defl'     : (n_rods, n_pos, n_x) deflection curves (mm) for each
+#                position of the carriage
+#   'load_defl': (n_rods, n_pos) mean deflection under the bearings (mm),
+#                what the carriage goes down
+#   'max_defl' : (n_rods) largest load_defl along the travel
+#   'freq'     : (n_rods, n_pos) first natural frequency (Hz) of the rod
+#                with the carriage
+#   'rod_freq' : (n_rods) first natural frequency of the rod alone
+#   'min_freq' : (n_rods) smallest freq along the travel
+
+def rods_report (rod_list, n_pos = 21, n_x = 41, self_weight = True):
+
+    arr = rod_arrays(rod_list)
+    pos = travel_pos(arr, n_pos)
+    span = arr['span'][:, numpy.newaxis, numpy.newaxis, numpy.newaxis]
+    ei = arr['ei'][:, numpy.newaxis, numpy.newaxis, numpy.newaxis]
+    fixed = arr['fixed'][:, numpy.newaxis, numpy.newaxis, numpy.newaxis]
+    load = arr['mass'] * GRAV + arr['force']
+    # (n_rods, n_bear) load on each bearing
+    bear_load = load[:, numpy.newaxis] * arr['share']
+    # (n_rods, n_pos, n_bear, 1) positions of the bearings
+    bear_pos = (pos[:, :, numpy.newaxis]
+                + arr['offsets'][:, numpy.newaxis, :])[..., numpy.newaxis]
+
+    # deflection curves
+    x_pts = numpy.linspace(0, 1, n_x) * arr['span'][:, numpy.newaxis]
+    x4 = x_pts[:, numpy.newaxis, numpy.newaxis, :]
+    unit = point_defl(x4, bear_pos, span, ei, fixed)
+    defl = numpy.einsum('rpbx,rb->rpx', unit, bear_load)
+    # deflection under the bearings: (n_rods, n_pos, n_bear, n_bear)
+    unit_bear = point_defl(bear_pos.swapaxes(2, 3), bear_pos, span, ei, fixed)
+    # under each bearing, by the unitary load on all the bearings shared
+    bear_defl = numpy.einsum('rpbc,rb->rpc', unit_bear, arr['share'])
+    # mean under the bearings, by unitary load of the carriage
+    unit_load_defl = numpy.einsum('rpc,rc->rp', bear_defl, arr['share'])
+    load_defl = unit_load_defl * load[:, numpy.newaxis]
+    if self_weight:
+        q_arr = arr['q'][:, numpy.newaxis, numpy.newaxis]
+        defl += uniform_defl(x4[:, 0], span[:, 0], ei[:, 0], q_arr,
+                             fixed[:, 0])
+        weight_bear = uniform_defl(bear_pos[..., 0], span[..., 0],
+                                   ei[..., 0], q_arr, fixed[..., 0])
+        load_defl += numpy.einsum('rpb,rb->rp', weight_bear, arr['share'])
+
+    # natural frequency of the rod alone, N/mm -> N/m in the square root
+    rod_freq = (  arr['root'] ** 2 / (2 * math.pi * arr['span'] ** 2)
+                * numpy.sqrt(1000. * arr['ei'] / (arr['rho'] * arr['area'])))
+    # the mass of the carriage on the stiffness of the rod under it
+    # (on the supports it is infinite)
+    with numpy.errstate(divide = 'ignore'):
+        stiff = 1000. / unit_load_defl
+    inv_mass_freq2 = (2 * math.pi) ** 2 * arr['mass'][:, numpy.newaxis] / stiff
+    freq = 1. / numpy.sqrt(1. / rod_freq[:, numpy.newaxis] ** 2
+                           + inv_mass_freq2)
+
+    return {'names'     : [rod['name'] for rod in rod_list],
+            'pos'       : pos,
+            'x'         : x_pts,
+            'defl'      : defl,
+            'load_defl' : load_defl,
+            'max_defl'  : load_defl.max(axis = 1),
+            'freq'      : freq,
+            'rod_freq'  : rod_freq,
+            'min_freq'  : freq.min(axis = 1)}
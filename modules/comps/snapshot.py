@@ -0,0 +1,325 @@
+# ----------------------------------------------------------------------------
+# -- Snapshot
+# -- comps library
+# -- The built assembly on a binary file, to be loaded without recomputing
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+# A snapshot has the parts of the assembly once they are built: the shapes
+# and a table with the name, label, placement, bounding box and volume of
+# each part. The parts with the same shape (see dedup) share it. The shapes
+# are saved as BREP (to be loaded in FreeCAD) or as triangles (to be shown
+# by a viewer), optionally compressed with zlib. Everything is on one file
+# that is mapped in memory (mmap) to be read: the table and the triangles
+# that are not compressed are numpy arrays on the file, they are not read
+# until they are used.
+#
+# The file:
+#   MAGIC (8 bytes), length of the header (8 bytes, little endian)
+#   header: JSON, with the list of the shapes and the metadata of the parts
+#   table:  numpy array of TABLE_DTYPE, one row for each part
+#   shapes: the BREP or the points (float32 (n, 3)) and the triangles
+#           (int32 (m, 3)) of each shape
+# Each block starts at a multiple of 8 bytes.
+#
+#  snapshot.write_snapshot (doc, 'goliat.snap', kind = 'mesh')
+#  snap = snapshot.Snapshot ('goliat.snap')
+#  pts, tris = snap.mesh (snap.find ('framez_00'))
+
+import FreeCAD
+import Part
+import os
+import json
+import mmap
+import zlib
+import struct
+import logging
+import numpy
+
+import dedup
+import print3d
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b'CSNAP001'
+ALIGN = 8
+
+# one row for each part: its shape is the index of the list of shapes of
+# the header, its placement is the position and the quaternion of the
+# rotation, the bounding box is (xmin, ymin, zmin, xmax, ymax, zmax)
+TABLE_DTYPE = numpy.dtype([('name',   'S64'),
+                           ('label',  'S64'),
+                           ('shape',  '<i4'),
+                           ('pos',    '<f8', (3,)),
+                           ('rot',    '<f8', (4,)),
+                           ('bbox',   '<f8', (6,)),
+                           ('volume', '<f8')])
+
+
+# bytes to add to take the size to a multiple of ALIGN
+def pad_len (size):
+    return (- size) % ALIGN
+
+
+# ---------- snapshot_parts -------------------------------------------
+# the parts of a document: the objects that are not inside others, and
+# the objects inside the compounds (Part::Compound)
+
+def snapshot_parts (doc):
+
+    fco_list = []
+    def add_fco (fco):
+        if fco.TypeId == 'Part::Compound':
+            for link in fco.Links:
+                add_fco(link)
+        elif fco not in fco_list:
+            fco_list.append(fco)
+    for fco in doc.Objects:
+        if not fco.InList:
+            add_fco(fco)
+    return fco_list
+
+
+# ---------- shape_blob -----------------------------------------------
+# bytes of a shape, on its own coordinates
+# kind: 'brep' or 'mesh'
+# tol:  tolerance of the triangles, if mesh
+# returns a tuple (bytes, dictionary with its description for the header)
+
+def shape_blob (shp_local, kind = 'mesh', tol = 0.1):
+
+    if kind == 'brep':
+        blob = shp_local.exportBrepToString().encode()
+        return blob, {'kind': 'brep'}
+    pts, tris = print3d.mesh_arrays(shp_local, tol)
+    pts_b = pts.astype('<f4').tobytes()
+    blob = pts_b + tris.astype('<i4').tobytes()
+    return blob, {'kind'   : 'mesh',
+                  'n_pts'  : len(pts),
+                  'n_tris' : len(tris)}
+
+
+# ---------- write_snapshot -------------------------------------------
+# writes the snapshot of the parts of a document
+# doc:      FreeCAD document, if None, the active document
+# path:     file of the snapshot
+# kind:     'brep' or 'mesh', see shape_blob
+# compress: if True, the shapes are compressed (zlib)
+# tol:      tolerance of the triangles
+# fco_list: list of the objects, if None, see snapshot_parts
+# meta:     dictionary of the metadata of the parts (any that can be saved
+#           as JSON), key: label
+# returns a dictionary with the report:
+#   'parts', 'shapes': number of parts and of different shapes
+#   'size': size of the file
+
+def write_snapshot (doc = None, path = 'snapshot.snap', kind = 'mesh',
+                    compress = False, tol = 0.1, fco_list = None,
+                    meta = None):
+
+    if doc is None:
+        doc = FreeCAD.ActiveDocument
+    if fco_list is None:
+        fco_list = snapshot_parts(doc)
+
+    table = numpy.zeros(len(fco_list), dtype = TABLE_DTYPE)
+    shape_list = []
+    blob_list = []
+    # key: fingerprint and position of the shape, value: index of the shape
+    shape_ind_dict = {}
+    for row, fco in enumerate(fco_list):
+        shp = fco.Shape
+        shp_local = dedup.local_shape(shp)
+        bbox_local = shp_local.BoundBox
+        # the same shape, on the same coordinates
+        canon = dedup.canonical_vertexes(shp_local, rotate = False)
+        shp_key = (dedup.shape_fingerprint(shp_local, canon = canon),
+                   round(bbox_local.XMin, 3), round(bbox_local.YMin, 3),
+                   round(bbox_local.ZMin, 3))
+        if shp_key not in shape_ind_dict:
+            blob, desc = shape_blob(shp_local, kind, tol)
+            desc['size'] = len(blob)
+            if compress:
+                blob = zlib.compress(blob)
+                desc['zsize'] = len(blob)
+            shape_ind_dict[shp_key] = len(shape_list)
+            shape_list.append(desc)
+            blob_list.append(blob)
+        bbox = shp.BoundBox
+        plm = shp.Placement
+        table['name'][row] = fco.Name.encode()[:64]
+        table['label'][row] = fco.Label.encode()[:64]
+        table['shape'][row] = shape_ind_dict[shp_key]
+        table['pos'][row] = (plm.Base.x, plm.Base.y, plm.Base.z)
+        table['rot'][row] = tuple(plm.Rotation.Q)
+        table['bbox'][row] = (bbox.XMin, bbox.YMin, bbox.ZMin,
+                              bbox.XMax, bbox.YMax, bbox.ZMax)
+        table['volume'][row] = shp.Volume
+
+    # offsets from the start of the table
+    offset = len(table.tobytes()) + pad_len(len(table.tobytes()))
+    for desc, blob in zip(shape_list, blob_list):
+        desc['offset'] = offset
+        offset += len(blob) + pad_len(len(blob))
+    header = {'document' : doc.Name,
+              'compress' : compress,
+              'rows'     : len(table),
+              'shapes'   : shape_list,
+              'meta'     : meta or {}}
+    header_b = json.dumps(header).encode()
+    header_b += b' ' * pad_len(len(header_b))
+
+    with open(path, 'wb') as fil:
+        fil.write(MAGIC)
+        fil.write(struct.pack('<Q', len(header_b)))
+        fil.write(header_b)
+        for blob in [table.tobytes()] + blob_list:
+            fil.write(blob)
+            fil.write(b'\0' * pad_len(len(blob)))
+    report = {'parts'  : len(table),
+              'shapes' : len(shape_list),
+              'size'   : os.path.getsize(path)}
+    logger.info('snapshot: %d parts, %d shapes, %d bytes'
+                % (report['parts'], report['shapes'], report['size']))
+    return report
+
+
+# ---------- class Snapshot -------------------------------------------
+# reads a snapshot, mapped in memory
+# path: file of the snapshot
+# Attributes:
+# header: dictionary of the header (see write_snapshot)
+# table:  numpy array of TABLE_DTYPE, on the file
+# meta:   dictionary of the metadata of the parts
+
+class Snapshot (object):
+
+    def __init__ (self, path):
+
+        self.path = path
+        with open(path, 'rb') as fil:
+            self.mm = mmap.mmap(fil.fileno(), 0, access = mmap.ACCESS_READ)
+        if self.mm[:len(MAGIC)] != MAGIC:
+            self.mm.close()
+            raise ValueError('snapshot: not a snapshot file: ' + path)
+        header_len = struct.unpack('<Q', self.mm[8:16])[0]
+        self.header = json.loads(self.mm[16:16 + header_len].decode())
+        self.meta = self.header['meta']
+        # start of the table, the offsets of the shapes are from here
+        self.data_start = 16 + header_len
+        self.table = numpy.frombuffer(self.mm, dtype = TABLE_DTYPE,
+                                      count = self.header['rows'],
+                                      offset = self.data_start)
+
+    def __len__ (self):
+        return len(self.table)
+
+    def close (self):
+        self.table = None
+        try:
+            self.mm.close()
+        except BufferError:
+            pass  # arrays of mesh still use it, it is closed with them
+
+    # labels of the parts
+    def labels (self):
+        return [label.decode() for label in self.table['label']]
+
+    # row of the part with that label (or name)
+    def find (self, label):
+        label_b = label.encode()
+        rows = numpy.nonzero((self.table['label'] == label_b)
+                             | (self.table['name'] == label_b))[0]
+        if len(rows) == 0:
+            raise KeyError('snapshot: part not found: ' + label)
+        return int(rows[0])
+
+    # bytes of the shape of the part of the row, uncompressed
+    def blob (self, row):
+        desc = self.header['shapes'][self.table[row]['shape']]
+        start = self.data_start + desc['offset']
+        if self.header['compress']:
+            return zlib.decompress(self.mm[start:start + desc['zsize']])
+        return self.mm[start:start + desc['size']]
+
+    # ---------- mesh
+    # points (n, 3) and triangles (m, 3) of the part of the row, on its own
+    # coordinates if local, or on its place. If the shapes are not
+    # compressed, and local, the arrays are on the file (not copied)
+    def mesh (self, row, local = False):
+
+        desc = self.header['shapes'][self.table[row]['shape']]
+        if desc['kind'] != 'mesh':
+            raise ValueError('snapshot: the shapes are not triangles')
+        if self.header['compress']:
+            buf = self.blob(row)
+            start = 0
+        else:
+            buf = self.mm
+            start = self.data_start + desc['offset']
+        pts = numpy.frombuffer(buf, dtype = '<f4', count = 3 * desc['n_pts'],
+                               offset = start).reshape(-1, 3)
+        tris = numpy.frombuffer(buf, dtype = '<i4',
+                                count = 3 * desc['n_tris'],
+                                offset = start + 12 * desc['n_pts'])
+        tris = tris.reshape(-1, 3)
+        if not local:
+            pts = self.transform(row, pts)
+        return pts, tris
+
+    # the points (n, 3) on the place of the part of the row
+    def transform (self, row, pts):
+        mat = quat_matrix(self.table[row]['rot'])
+        return numpy.dot(pts, mat.T) + self.table[row]['pos']
+
+    # FreeCAD placement of the part of the row
+    def placement (self, row):
+        return FreeCAD.Placement(FreeCAD.Vector(tuple(self.table[row]['pos'])),
+                                 FreeCAD.Rotation(*self.table[row]['rot']))
+
+    # ---------- shape
+    # FreeCAD shape of the part of the row, on its place (only BREP)
+    def shape (self, row):
+        desc = self.header['shapes'][self.table[row]['shape']]
+        if desc['kind'] != 'brep':
+            raise ValueError('snapshot: the shapes are not BREP')
+        shp = Part.Shape()
+        shp.importBrepFromString(bytes(self.blob(row)).decode())
+        shp.Placement = self.placement(row)
+        return shp
+
+    # ---------- load_doc
+    # makes a Part::Feature for each part on a document (only BREP). The
+    # parts with the same shape share it
+    def load_doc (self, doc = None):
+
+        if doc is None:
+            doc = FreeCAD.newDocument(self.header['document'])
+        shp_dict = {}
+        for row in range(len(self.table)):
+            shp_ind = int(self.table[row]['shape'])
+            if shp_ind not in shp_dict:
+                shp_dict[shp_ind] = self.shape(row)
+            fco = doc.addObject('Part::Feature',
+                                self.table[row]['name'].decode())
+            fco.Shape = shp_dict[shp_ind]
+            fco.Placement = self.placement(row)
+            fco.Label = self.table[row]['label'].decode()
+        return doc
+
+
+# rotation matrix (3, 3) of a quaternion (x, y, z, w)
+def quat_matrix (quat):
+    x, y, z, w = quat
+    return numpy.array(
+               [[1 - 2 * (y * y + z * z), 2 * (x * y - z * w),
+                 2 * (x * z + y * w)],
+                [2 * (x * y + z * w), 1 - 2 * (x * x + z * z),
+                 2 * (y * z - x * w)],
+                [2 * (x * z - y * w), 2 * (y * z + x * w),
+                 1 - 2 * (x * x + y * y)]])
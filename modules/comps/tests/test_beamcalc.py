@@ -0,0 +1,57 @@
+# ----------------------------------------------------------------------------
+# -- Tests of beamcalc
+# -- comps library
+# -- The frame model against the closed formulas of the beams
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import os
+import subprocess
+import sys
+import pytest
+
+import beamcalc
+
+
+LENGTH = 400.
+LOAD = 200.
+
+
+def test_rect_section ():
+    sect = beamcalc.rndbar_section(30, 20, 0)
+    assert sect['A'] == pytest.approx(600)
+    assert sect['Iy'] == pytest.approx(30 * 20 ** 3 / 12.)
+    assert sect['Iz'] == pytest.approx(20 * 30 ** 3 / 12.)
+    # the rounded corners take out area and inertia
+    sect_r = beamcalc.rndbar_section(30, 20, 3)
+    assert sect_r['A'] == pytest.approx(600 - (4 - 3.14159265) * 9)
+    assert sect_r['Iy'] < sect['Iy']
+
+
+# a column fixed on its foot, with a lateral load at the height h:
+# the deflection under the load is P h^3 / 3EI
+@pytest.mark.parametrize('load_h', [LENGTH, LENGTH / 2., LENGTH / 3.])
+def test_cantilever (load_h):
+    sect = beamcalc.rndbar_section(20, 20, 0)
+    frame = beamcalc.FrameModel()
+    frame.add_beam((0, 0, 0), (0, 0, LENGTH), sect, ydir = (0, 1, 0))
+    res = frame.solve([((0, 0, load_h), (LOAD, 0, 0))])
+    defl = LOAD * load_h ** 3 / (3 * beamcalc.E_ALU * sect['Iy'])
+    assert res['load_disp'][0][0] == pytest.approx(defl, rel = 1e-6)
+    assert res['stiffness'][0] == pytest.approx(LOAD / defl, rel = 1e-6)
+    # the top goes down with the slope after the load
+    top = res['disp'][res['max_node']]
+    slope = LOAD * load_h ** 2 / (2 * beamcalc.E_ALU * sect['Iy'])
+    assert top[0] == pytest.approx(defl + slope * (LENGTH - load_h),
+                                   rel = 1e-6)
+
+
+# the solver does not need FreeCAD: only add_bar reads a FreeCAD object
+def test_no_freecad ():
+    code = "import sys; sys.modules['FreeCAD'] = None; import beamcalc"
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.call([sys.executable, '-c', code], cwd = cwd) == 0
@@ -0,0 +1,63 @@
+# ----------------------------------------------------------------------------
+# -- Tests of beltpath
+# -- comps library
+# -- The length of the belt against the closed formulas
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import math
+import numpy
+import pytest
+
+import beltpath
+
+
+# 2 pulleys of radius r at the distance d: 2d + 2 pi r
+@pytest.mark.parametrize('dist, r', [(300., 6.), (120., 10.)])
+def test_two_pulleys (dist, r):
+    rep = beltpath.belt_length([[(0, 0), (dist, 0)]], [r, r], [1, 1],
+                               closed = True)
+    assert rep['length'][0] == pytest.approx(2 * dist + 2 * math.pi * r)
+    assert rep['wrap'][0] == pytest.approx([math.pi, math.pi])
+    assert rep['teeth'][0] == pytest.approx(rep['length'][0]
+                                            / beltpath.GT2_PITCH)
+
+
+# open belt from a clamp, around a pulley (clockwise, it is on the right
+# of the belt) and back to another clamp
+def test_clamps ():
+    r = 8.
+    rep = beltpath.belt_length([[(0, r), (200, 0), (0, -r)]], [0, r, 0],
+                               [1, -1, 1])
+    assert rep['length'][0] == pytest.approx(400 + math.pi * r)
+
+
+# the clamps move with the gantry, from the clamp on the right, around the
+# 2 pulleys, to the clamp on the left: the belt length does not change
+def test_route_variation ():
+    r = 6.
+    route = [beltpath.pulley('clamp_0', (5, r), 0, moves = (1, 0)),
+             beltpath.pulley('pull_1', (300, 0), r, side = -1),
+             beltpath.pulley('pull_0', (-300, 0), r, side = -1),
+             beltpath.pulley('clamp_1', (-5, r), 0, moves = (1, 0))]
+    gantry_pos = numpy.column_stack((numpy.linspace(-200, 200, 9),
+                                     numpy.zeros(9)))
+    rep = beltpath.route_length(route, gantry_pos)
+    assert rep['names'][1] == 'pull_1'
+    assert rep['length'] == pytest.approx(1190 + 2 * math.pi * r)
+    assert rep['variation'] == pytest.approx(0, abs = 1e-9)
+
+
+# the pulleys on the line of the belt are not wrapped, whatever the rounding
+def test_straight_wrap ():
+    ang = 0.5894382049421951
+    dist_list = [0, 198.96196208960126, 437.69173391890007]
+    centers = [[(dist * math.cos(ang), dist * math.sin(ang))
+                for dist in dist_list]]
+    rep = beltpath.belt_length(centers, [6, 6, 6], [1, 1, 1])
+    assert rep['wrap'][0, 1] == pytest.approx(0, abs = 1e-6)
+    assert rep['length'][0] == pytest.approx(dist_list[-1])
@@ -0,0 +1,75 @@
+# ----------------------------------------------------------------------------
+# -- Tests of fcfun
+# -- comps library
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import pytest
+
+import FreeCAD
+import Part
+import fcfun
+import beltcl
+import kcomp
+import partgroup
+
+
+# the shapes of the library of holes are not changed by the ones returned
+def test_bolthole_copy ():
+    shp_hole = fcfun.shp_bolt(1.7, 20, 3, 3)
+    shp_hole.Placement.Base = FreeCAD.Vector(10, 0, 0)
+    shp_hole2 = fcfun.shp_bolt(1.7, 20, 3, 3)
+    assert shp_hole2 is not shp_hole
+    assert tuple(shp_hole2.Placement.Base) == (0, 0, 0)
+    shp_nut = fcfun.shp_boltnut_hole(1.7, 20, 3, 3, 3.2, 2.5)
+    shp_nut.Placement.Base = FreeCAD.Vector(0, 10, 0)
+    shp_nut2 = fcfun.shp_boltnut_hole(1.7, 20, 3, 3, 3.2, 2.5)
+    assert tuple(shp_nut2.Placement.Base) == (0, 0, 0)
+    assert shp_nut2.Volume == pytest.approx(shp_nut.Volume)
+
+
+def test_hollowcyl_stack ():
+    # washer, bearing, washer
+    cyl_list = [(6, 2, 1), (6.5, 2, 5), (6, 2, 1)]
+    rz_list = fcfun.rz_hollowcyl_stack(cyl_list, z0 = 1)
+    assert rz_list == [(2, 1), (6, 1), (6, 2), (6.5, 2), (6.5, 7), (6, 7),
+                       (6, 8), (2, 8)]
+    # the inner radius of one is larger than the outer of the next one
+    with pytest.raises(ValueError):
+        fcfun.rz_hollowcyl_stack([(6, 2, 1), (8, 6, 2)])
+
+
+# the placed shapes share the geometry, only their placement changes
+def test_shp_placed ():
+    shp = Part.makeBox(20, 10, 5)
+    plm = FreeCAD.Placement(FreeCAD.Vector(30, 0, 0),
+                            FreeCAD.Rotation(fcfun.VZ, 90))
+    shp_pl = fcfun.shp_placed(shp, plm)
+    assert shp_pl.isPartner(shp)
+    assert not shp.copy().isPartner(shp)
+    assert tuple(shp.Placement.Base) == (0, 0, 0)
+    bbox = shp_pl.BoundBox
+    assert (bbox.XMin, bbox.YMin, bbox.XMax, bbox.YMax) == pytest.approx(
+                                                           (20, 0, 30, 20))
+    assert shp_pl.Volume == pytest.approx(1000)
+    # the belt clamps
+    shp_cl0 = beltcl.shp_topbeltclamp(pos = FreeCAD.Vector(0, 0, 0))
+    shp_cl1 = beltcl.shp_topbeltclamp(railaxis = 'y',
+                                      pos = FreeCAD.Vector(50, 0, 0))
+    assert shp_cl0.isPartner(shp_cl1)
+    assert shp_cl1.BoundBox.XMin > shp_cl0.BoundBox.XMax
+
+
+# the washers and bearings of the same dimensions share their solid
+def test_holcyl_shared ():
+    FreeCAD.newDocument('test_holcyl_shared')
+    group = partgroup.BearWashGroup(kcomp.idlepull_name_list,
+                                    pos = FreeCAD.Vector(0, 0, 10))
+    shp_wash0, shp_wash1 = group.shp_list[1], group.shp_list[3]
+    assert shp_wash0.isPartner(shp_wash1)
+    assert shp_wash1.BoundBox.ZMin > shp_wash0.BoundBox.ZMax
+    assert not shp_wash0.isPartner(group.shp_list[2])
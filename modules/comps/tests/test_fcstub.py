@@ -0,0 +1,90 @@
+# ----------------------------------------------------------------------------
+# -- Tests of fcstub
+# -- comps library
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import os
+import sys
+import math
+import subprocess
+import pytest
+
+import FreeCAD
+import Part
+import fcfun
+
+from fcfun import VZ
+
+pytestmark = pytest.mark.skipif(fcfun.BACKEND != 'stub',
+                                reason = 'FreeCAD is installed')
+
+
+def test_slice_box ():
+    box = Part.makeBox(20, 10, 5, FreeCAD.Vector(1, 2, 3))
+    wire_list = box.slice(VZ, 4)
+    assert len(wire_list) == 1
+    pts = wire_list[0].discretize(Deflection = 0.1)
+    assert set([pt.z for pt in pts]) == set([4])
+    assert box.slice(VZ, 9) == []
+
+
+def test_slice_cylinder ():
+    cyl = Part.makeCylinder(3, 5)
+    wire = cyl.slice(VZ, 2)[0]
+    for deflection in (0.1, 0.01):
+        pts = wire.discretize(Deflection = deflection)
+        # the middle of the segments are not farther than the deflection
+        for pt0, pt1 in zip(pts[:-1], pts[1:]):
+            mid = (pt0 + pt1) * 0.5
+            assert 3 - math.hypot(mid.x, mid.y) <= deflection + 1e-9
+
+
+def test_not_implemented ():
+    box = Part.makeBox(2, 2, 2)
+    shp_cut = box.cut(Part.makeBox(1, 1, 1))
+    with pytest.raises(NotImplementedError):
+        shp_cut.slice(VZ, 1)
+    with pytest.raises(NotImplementedError):
+        box.slice(FreeCAD.Vector(1, 0, 0), 1)
+    with pytest.raises(NotImplementedError):
+        box.tessellate(0.1)
+    with pytest.raises(NotImplementedError):
+        box.exportStep('box.step')
+
+
+# the shapes read from their strings are the same, and so are the strings
+# of the same geometry
+def test_brep_string ():
+    shp_hole = Part.makeCylinder(2, 5, FreeCAD.Vector(5, 5, 0))
+    shp = Part.makeBox(20, 10, 5).cut(shp_hole)
+    shp.Placement.Base = FreeCAD.Vector(1, 2, 3)
+    brep = shp.exportBrepToString()
+    shp.Volume  # the cache of the volume is not written
+    assert shp.copy().exportBrepToString() == brep
+    shp_read = Part.Shape()
+    shp_read.importBrepFromString(brep)
+    assert shp_read.Volume == pytest.approx(shp.Volume)
+    assert tuple(shp_read.Placement.Base) == (1, 2, 3)
+    assert not shp_read.isPartner(shp)
+    with pytest.raises(ValueError):
+        Part.Shape().importBrepFromString('DBRep_DrawableShape\n')
+
+
+# the backend is chosen when fcfun is imported
+def test_backend ():
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = "import fcfun; print(fcfun.BACKEND)"
+    for choice in ('stub', 'auto'):
+        env = dict(os.environ, COMPS_BACKEND = choice)
+        out = subprocess.check_output([sys.executable, '-c', code],
+                                      cwd = cwd, env = env)
+        assert out.decode().split() == ['stub']
+    env = dict(os.environ, COMPS_BACKEND = 'occ')
+    assert subprocess.call([sys.executable, '-c', code], cwd = cwd, env = env,
+                           stdout = subprocess.DEVNULL,
+                           stderr = subprocess.DEVNULL) != 0
@@ -0,0 +1,72 @@
+# ----------------------------------------------------------------------------
+# -- Tests of featplan
+# -- comps library
+# -- The plans give the same solids as the booleans made one by one
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import pytest
+
+import FreeCAD
+import Part
+import featplan
+
+from fcfun import addBox, addCyl
+
+
+def bbox_tuple (shp):
+    bbox = shp.BoundBox
+    return (bbox.XMin, bbox.YMin, bbox.ZMin, bbox.XMax, bbox.YMax, bbox.ZMax)
+
+
+# the top and the bottom of a slider, cut by shared holes
+def slider_elems ():
+    top = addBox(40, 20, 10, 'top')
+    bot = addBox(40, 20, 10, 'bot')
+    bot.Placement.Base = FreeCAD.Vector(0, 0, -10)
+    hole0 = addCyl(3, 30, 'hole0')
+    hole0.Placement.Base = FreeCAD.Vector(10, 10, -15)
+    hole1 = addCyl(3, 30, 'hole1')
+    hole1.Placement.Base = FreeCAD.Vector(30, 10, -15)
+    # only on the top
+    shp_hole2 = Part.makeBox(6, 6, 4, FreeCAD.Vector(17, 7, 7))
+    return top, bot, [hole0, hole1], shp_hole2
+
+
+def test_build_plans ():
+    FreeCAD.newDocument('test_build_plans')
+    top, bot, hole_list, shp_hole2 = slider_elems()
+    plan_top = featplan.FeatPlan('slider_top')
+    plan_top.add(top)
+    plan_top.cut(hole_list + [shp_hole2])
+    plan_bot = featplan.FeatPlan('slider_bot')
+    plan_bot.add(bot)
+    plan_bot.cut(hole_list)
+    fco_top, fco_bot = featplan.build_plans([plan_top, plan_bot])
+
+    shp_top = top.Shape
+    for tool in hole_list + [shp_hole2]:
+        shp_top = shp_top.cut(featplan.elem_shape(tool))
+    shp_bot = bot.Shape
+    for tool in hole_list:
+        shp_bot = shp_bot.cut(tool.Shape)
+    assert fco_top.Shape.Volume == pytest.approx(shp_top.Volume, rel = 1e-3)
+    assert fco_bot.Shape.Volume == pytest.approx(shp_bot.Volume, rel = 1e-3)
+    assert bbox_tuple(fco_top.Shape) == pytest.approx(bbox_tuple(shp_top))
+    assert bbox_tuple(fco_bot.Shape) == pytest.approx(bbox_tuple(shp_bot))
+
+
+def test_tool_out ():
+    FreeCAD.newDocument('test_tool_out')
+    box = addBox(10, 10, 10, 'box')
+    plan = featplan.FeatPlan('box_plan')
+    plan.add(box)
+    plan.cut(Part.makeBox(5, 5, 5, FreeCAD.Vector(20, 0, 0)))
+    fco = plan.build()
+    # nothing to cut, it is the box
+    assert fco.Name == box.Name
+    assert fco.Shape.Volume == pytest.approx(1000)
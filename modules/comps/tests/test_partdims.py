@@ -0,0 +1,97 @@
+# ----------------------------------------------------------------------------
+# -- Tests of partdims
+# -- comps library
+# -- The dimensions without geometry are the ones of the parts built
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import pytest
+
+import FreeCAD
+import kcomp
+import partdims
+import parts3d
+
+
+def shape_bbox (fco):
+    bbox = fco.Shape.BoundBox
+    return (bbox.XMin, bbox.YMin, bbox.ZMin, bbox.XMax, bbox.YMax, bbox.ZMax)
+
+
+def test_bbox_rotz ():
+    bbox = (1, 2, 3, 4, 6, 8)
+    assert partdims.bbox_rotz(bbox, 90) == (-6, 1, 3, -2, 4, 8)
+    assert partdims.bbox_rotz(bbox, 180) == (-4, -6, 3, -1, -2, 8)
+    assert partdims.bbox_rotz(bbox, -90, (1, 1, 1)) == (3, -3, 4, 7, 0, 9)
+    assert partdims.bbox_union([bbox, (0, 5, 4, 2, 7, 5)]) == (0, 2, 3,
+                                                               4, 7, 8)
+
+
+def test_m3_tol ():
+    dims = partdims.CentralSliderDims(rod_r = 6, rod_sep = 150.,
+                                      name = 'cs', belt_sep = 100,
+                                      dent_w = 18, dent_l = 122,
+                                      dent_sl = 68)
+    assert dims.M3_HEAD_R_TOL == pytest.approx(kcomp.M3_HEAD_R_TOL)
+    assert dims.M3NUT_HOLE_H == pytest.approx(kcomp.M3NUT_HOLE_H)
+    dims.set_tol(2 * kcomp.TOL)
+    assert dims.M3_HEAD_R_TOL > kcomp.M3_HEAD_R_TOL
+
+
+@pytest.mark.parametrize('side', ['left', 'right', 'top', 'bottom'])
+@pytest.mark.parametrize('holdrod_cen', [0, 1])
+def test_endshaftslider (side, holdrod_cen):
+    FreeCAD.newDocument('test_endshaftslider')
+    kwargs = dict(slidrod_r = 6, holdrod_r = 6, holdrod_sep = 150.,
+                  holdrod_cen = holdrod_cen, side = side)
+    dims = partdims.EndShaftSliderDims(name = 'dims', **kwargs)
+    slider = parts3d.EndShaftSlider(name = 'slider', **kwargs)
+    assert shape_bbox(slider.top_slide) == pytest.approx(dims.bbox_top)
+    assert shape_bbox(slider.bot_slide) == pytest.approx(dims.bbox_bot)
+
+
+def test_centralslider ():
+    FreeCAD.newDocument('test_centralslider')
+    kwargs = dict(rod_r = 6, rod_sep = 150., belt_sep = 100,
+                  dent_w = 18, dent_l = 122, dent_sl = 68)
+    dims = partdims.CentralSliderDims(name = 'dims', **kwargs)
+    slider = parts3d.CentralSlider(name = 'slider', **kwargs)
+    assert shape_bbox(slider.top_slide) == pytest.approx(dims.bbox_top)
+    assert shape_bbox(slider.bot_slide) == pytest.approx(dims.bbox_bot)
+
+
+# both sliders take the tolerances of their bolts from set_bolt_tol
+@pytest.mark.parametrize('tol', [0.2, kcomp.TOL, 0.6])
+def test_bolt_tol (tol):
+    es_dims = partdims.EndShaftSliderDims(slidrod_r = 6, holdrod_r = 6,
+                                          holdrod_sep = 150., name = 'es',
+                                          tol = tol)
+    cs_dims = partdims.CentralSliderDims(rod_r = 6, rod_sep = 150.,
+                                         name = 'cs', belt_sep = 100,
+                                         dent_w = 18, dent_l = 122,
+                                         dent_sl = 68, tol = tol)
+    for dims in (es_dims, cs_dims):
+        assert dims.tol == tol
+        assert dims.MTOL == pytest.approx(tol - 0.1)
+        assert dims.MLTOL == pytest.approx(tol - 0.05)
+        assert dims.BOLT_SHANK_R_TOL == pytest.approx(dims.BOLT_D / 2.
+                                                      + (tol - 0.1) / 2.)
+        assert dims.BOLT_NUT_L == pytest.approx(
+                           kcomp.NUT_D934_L[dims.BOLT_D] + tol - 0.1)
+
+
+# the nut hole of the belt tensioner leaves a wall of NUT_HOLE_EDGSEP to
+# the fixed belt clamp, whatever the tolerance
+@pytest.mark.parametrize('tol', [0.2, kcomp.TOL, 0.6])
+def test_nuthole_wall (tol):
+    doc = FreeCAD.newDocument('test_nuthole_wall')
+    slider = parts3d.CentralSlider(rod_r = 6, rod_sep = 150., name = 'cs',
+                                   belt_sep = 100, dent_w = 18, dent_l = 122,
+                                   dent_sl = 68, tol = tol)
+    nuthole = doc.getObject('bccr_nuthole0')
+    wall = slider.fbcl_xmin - nuthole.Shape.BoundBox.XMax
+    assert wall == pytest.approx(slider.h_bclten.NUT_HOLE_EDGSEP)
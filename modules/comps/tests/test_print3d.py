@@ -0,0 +1,97 @@
+# ----------------------------------------------------------------------------
+# -- Tests of print3d
+# -- comps library
+# -- The sections of simple shapes, against their areas and perimeters
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import math
+import numpy
+import pytest
+
+import FreeCAD
+import Part
+import print3d
+
+
+def rect (x, y, len_x, len_y):
+    return numpy.array([(x, y), (x + len_x, y), (x + len_x, y + len_y),
+                        (x, y + len_y)], dtype = float)
+
+
+def square (x, y, side):
+    return rect(x, y, side, side)
+
+
+def circle (cx, cy, r, n_pts = 720):
+    ang = numpy.linspace(0, 2 * math.pi, n_pts, endpoint = False)
+    return numpy.column_stack((cx + r * numpy.cos(ang),
+                               cy + r * numpy.sin(ang)))
+
+
+def test_layer_z ():
+    z_arr = print3d.layer_z(0, 1., 0.3)
+    assert z_arr == pytest.approx([0.15, 0.45, 0.75, 1.05])
+    assert len(print3d.layer_z(0, 0.9, 0.3)) == 3
+
+
+# a 20x10 rectangle with a hole of radius 3, extruded
+def test_slice_layers_hole ():
+    vec_list = [FreeCAD.Vector(pt) for pt in ((0, 0, 0), (20, 0, 0),
+                                              (20, 10, 0), (0, 10, 0))]
+    outer = Part.makePolygon(vec_list + [vec_list[0]])
+    hole = Part.Wire(Part.makeCircle(3, FreeCAD.Vector(10, 5, 0)))
+    shp = Part.Face([outer, hole]).extrude(FreeCAD.Vector(0, 0, 2))
+    z_arr, area, perim = print3d.slice_layers(shp, layer_h = 0.5,
+                                              deflection = 0.001)
+    assert z_arr == pytest.approx([0.25, 0.75, 1.25, 1.75])
+    assert area == pytest.approx(200 - 9 * math.pi, rel = 1e-4)
+    assert perim == pytest.approx(60 + 6 * math.pi, rel = 1e-4)
+
+
+def test_section_orientation ():
+    # the holes can be in any orientation
+    for hole in (circle(10, 5, 3), circle(10, 5, 3)[::-1]):
+        area, perim = print3d.section_area_perim(1, [(0, rect(0, 0, 20, 10)),
+                                                     (0, hole)])
+        assert area[0] == pytest.approx(200 - 9 * math.pi, rel = 1e-4)
+
+
+# a square with a square hole, with an island inside the hole, and a hole
+# inside the island: the depth of each wire tells if it is a hole
+def test_section_nested ():
+    wire_list = [(0, square(0, 0, 40)),
+                 (0, square(5, 5, 30)),
+                 (0, square(10, 10, 20)),
+                 (0, square(15, 15, 10)[::-1]),
+                 (1, square(0, 0, 40)),
+                 (2, square(50, 0, 5))]
+    area, perim = print3d.section_area_perim(3, wire_list)
+    assert area == pytest.approx([1600 - 900 + 400 - 100, 1600, 25])
+    assert perim == pytest.approx([160 + 120 + 80 + 40, 160, 20])
+
+
+def test_points_in_polygon ():
+    pts = numpy.array([(5, 5), (15, 5), (-1, 5), (5, 10.5)])
+    inside = print3d.points_in_polygon(pts, square(0, 0, 10))
+    assert inside.tolist() == [True, False, False, False]
+
+
+# the parts sliced in other processes have the same estimates
+def test_estimate_parts ():
+    shp_list = [Part.makeBox(20, 10, 5),
+                Part.makeBox(10, 10, 8, FreeCAD.Vector(30, 0, 0))]
+    est_list = print3d.estimate_parts(shp_list, ['box0', 'box1'])
+    assert [est['name'] for est in est_list] == ['box0', 'box1']
+    # the box 1 is higher
+    assert est_list[1]['layers'] > est_list[0]['layers']
+    est_proc_list = print3d.estimate_parts(shp_list, ['box0', 'box1'],
+                                           processes = 2)
+    for est, est_proc in zip(est_list, est_proc_list):
+        assert est_proc['layers'] == est['layers']
+        assert est_proc['time'] == pytest.approx(est['time'])
+        assert est_proc['filament_l'] == pytest.approx(est['filament_l'])
@@ -0,0 +1,94 @@
+# ----------------------------------------------------------------------------
+# -- Tests of prof2d
+# -- comps library
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import numpy
+import pytest
+
+import FreeCAD
+import prof2d
+import beltcl
+
+
+RECT = [(0, 0), (10, 0), (10, 5), (0, 5)]
+
+
+# the points of the base of the clamp, as they were made before prof2d
+def base_list_v (clamp, offs_y = 0, offs_z = 0):
+    if clamp.CBASERAILIND_SIG < 0:
+        offs_zsig = - offs_z
+    else:
+        offs_zsig = offs_z
+    ind = clamp.CBASERAILIND
+    ind_sig = clamp.CBASERAILIND_SIG
+    wall = clamp.CBASE_WALL
+    lv_list = [(0 - offs_y, 0),
+               (0 - offs_y, wall + offs_zsig),
+               (ind_sig - offs_y, wall + ind + offs_zsig),
+               (ind_sig - offs_y, wall + 2 * ind - offs_zsig),
+               (0 - offs_y, wall + clamp.CBASE_RAIL - offs_zsig),
+               (0 - offs_y, clamp.CBASE_H)]
+    # the right side is the left side, mirrored
+    rv_list = [(clamp.CBASE_W - y, z) for y, z in lv_list]
+    pts = lv_list + rv_list[::-1]
+    if ind_sig < 0:
+        pts = [(y - ind_sig, z) for y, z in pts]
+    return [FreeCAD.Vector(0, y, z) for y, z in pts]
+
+
+def test_offset_rect ():
+    prof = prof2d.Profile2D(RECT)
+    # the same on both orientations
+    for prof_i in (prof, prof2d.Profile2D(RECT[::-1])):
+        pts = prof_i.offset(1).pts
+        assert pts.min(axis = 0) == pytest.approx([-1, -1])
+        assert pts.max(axis = 0) == pytest.approx([11, 6])
+    pts = prof.offset(-1, 0.5).pts
+    assert pts.min(axis = 0) == pytest.approx([1, -0.5])
+    assert pts.max(axis = 0) == pytest.approx([9, 5.5])
+
+
+def test_offset_list ():
+    prof = prof2d.Profile2D([(0, 0), (8, 0), (8, 2), (3, 6), (0, 6)])
+    offs_list = [0.2, (0.4, -0.1), (-0.3, 0)]
+    for prof_i, offs in zip(prof.offset_list(offs_list), offs_list):
+        if not isinstance(offs, tuple):
+            offs = (offs, offs)
+        assert numpy.allclose(prof_i.pts, prof.offset(*offs).pts)
+
+
+def test_mirror ():
+    prof = prof2d.Profile2D(RECT).translate(2, 1)
+    mir = prof.mirror('u', 0)
+    assert mir.pts.min(axis = 0) == pytest.approx([-12, 1])
+    assert mir.pts.max(axis = 0) == pytest.approx([-2, 6])
+    # the orientation is kept, so the offsets still grow it
+    assert mir.offset(1).pts.min(axis = 0) == pytest.approx([-13, 0])
+
+
+def test_wire ():
+    prof = prof2d.Profile2D(RECT)
+    face = prof.face(plane = 'xz', pos = FreeCAD.Vector(0, 3, 0))
+    assert face.Area == pytest.approx(50)
+    bbox = face.BoundBox
+    assert (bbox.XMax, bbox.YMin, bbox.ZMax) == pytest.approx((10, 3, 5))
+
+
+# get_base_list_v, made with prof2d, gives the points it gave before
+@pytest.mark.parametrize('midblock', [0, 1])
+@pytest.mark.parametrize('offs', [(0, 0), (-0.2, -0.4), (0.4, 0), (0.4, 0.2)])
+def test_clamp_base (midblock, offs):
+    FreeCAD.newDocument('test_clamp_base')
+    clamp = beltcl.Gt2BeltClamp(base_h = 8, midblock = midblock,
+                                name = 'clamp')
+    pts = clamp.get_base_list_v(*offs)
+    pts_ref = base_list_v(clamp, *offs)
+    assert len(pts) == len(pts_ref)
+    for pt, pt_ref in zip(pts, pts_ref):
+        assert tuple(pt) == pytest.approx(tuple(pt_ref))
@@ -0,0 +1,59 @@
+# ----------------------------------------------------------------------------
+# -- Tests of rodcalc
+# -- comps library
+# -- The deflection of the rods against the closed formulas
+# ----------------------------------------------------------------------------
+# -- (c) agent
+# -- October-2026
+# ----------------------------------------------------------------------------
+# --- LGPL Licence
+# ----------------------------------------------------------------------------
+
+import math
+import pytest
+
+import rodcalc
+
+
+ROD_R = 4.
+SPAN = 500.
+FORCE = 50.
+
+
+# a load on the middle: P L^3 / 48EI if simply supported, P L^3 / 192EI
+# if fixed
+@pytest.mark.parametrize('support, factor', [('simple', 48.),
+                                             ('fixed', 192.)])
+def test_center_load (support, factor):
+    rod = rodcalc.rod_dict('rod', ROD_R, SPAN, force = FORCE,
+                           support = support)
+    rep = rodcalc.rods_report([rod], n_pos = 21, self_weight = False)
+    ei = rodcalc.E_STEEL * math.pi * ROD_R ** 4 / 4.
+    defl = FORCE * SPAN ** 3 / (factor * ei)
+    assert rep['pos'][0, 10] == pytest.approx(SPAN / 2.)
+    assert rep['load_defl'][0, 10] == pytest.approx(defl)
+    assert rep['max_defl'][0] == pytest.approx(defl)
+    # the curve on the middle of the span
+    assert rep['defl'][0, 10, 20] == pytest.approx(defl)
+
+
+# the weight of the rod: 5 q L^4 / 384EI and q L^4 / 384EI on the middle
+@pytest.mark.parametrize('support, factor', [('simple', 5.), ('fixed', 1.)])
+def test_self_weight (support, factor):
+    rod = rodcalc.rod_dict('rod', ROD_R, SPAN, support = support)
+    rep = rodcalc.rods_report([rod], n_pos = 21, n_x = 41)
+    ei = rodcalc.E_STEEL * math.pi * ROD_R ** 4 / 4.
+    q = rodcalc.RHO_STEEL * math.pi * ROD_R ** 2 * rodcalc.GRAV
+    assert rep['defl'][0, 0, 20] == pytest.approx(
+                                        factor * q * SPAN ** 4 / (384 * ei))
+
+
+def test_rods_at_once ():
+    rod_list = [rodcalc.rod_dict('rod0', ROD_R, SPAN, force = FORCE),
+                rodcalc.rod_dict('rod1', 2 * ROD_R, SPAN, force = FORCE,
+                                 offsets = (-20, 20), support = 'fixed')]
+    rep = rodcalc.rods_report(rod_list)
+    for ind, rod in enumerate(rod_list):
+        rep_1 = rodcalc.rods_report([rod])
+        assert rep['max_defl'][ind] == pytest.approx(rep_1['max_defl'][0])
+        assert rep['min_freq'][ind] == pytest.approx(rep_1['min_freq'][0])